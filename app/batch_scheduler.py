@@ -0,0 +1,302 @@
+"""
+Cross-job dynamic batching for ZipVoice sampling.
+
+Without this, every running job calls model.sample() on its own thread with
+only its own chunks, so several concurrent jobs (typically many short
+notification sentences) each launch tiny batches and under-use the device.
+
+BatchScheduler owns a single sampling thread. Jobs submit their text chunks
+as SampleRequest items and wait on the returned futures. The sampling thread
+gathers pending chunks from all jobs that share the same sampling parameters
+(num_step, guidance_scale, t_shift, speed), packs them into one model.sample()
+call within the max_duration budget, and routes each item's predicted
+features back to the job that submitted it. Vocoding stays on the job thread.
+
+Chunks from different voices can share a batch: prompt features are padded
+to the longest prompt and masked through prompt_features_lens, exactly like
+the multi-utterance batches used during training.
+
+Batches are watched between ODE steps (model.sample's step_callback):
+
+  - a batch whose chunks have all been cancelled is aborted at the next step;
+  - each chunk's on_step callback gets per-step progress;
+  - if chunks of a more urgent priority class arrive while a batch is
+    running, they are sampled as a nested batch right away and the running
+    batch resumes afterwards, so a high-priority request does not wait for
+    all steps of a long low-priority batch.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple
+
+import torch
+from torch.amp import autocast
+
+from app.metrics import time_stage
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SampleRequest:
+    """One text chunk waiting to be sampled."""
+    owner: str                              # Job id, used for round-robin packing
+    tokens: List[int]
+    prompt_tokens: List[int]
+    prompt_features: torch.Tensor           # (1, T, C) — on the model device, scaled
+    prompt_duration: float
+    token_duration: float
+    speed: float
+    num_step: int
+    guidance_scale: float
+    t_shift: float
+    is_cancelled: Optional[Callable[[], bool]] = None
+    priority: int = 1                       # Class rank of the job, lower is more urgent (app.scheduler)
+    on_step: Optional[Callable[[int, int], None]] = None   # (steps_done, num_step), called on the sampling thread
+    future: Future = field(default_factory=Future, repr=False)
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def group_key(self) -> Tuple:
+        """Requests with the same key can be sampled in one model.sample() call."""
+        return (self.num_step, float(self.guidance_scale), float(self.t_shift), float(self.speed))
+
+    @property
+    def duration(self) -> float:
+        """Estimated prompt + generated duration, same cost model as batchify_tokens()."""
+        return self.prompt_duration + len(self.tokens) * self.token_duration
+
+    def cancelled(self) -> bool:
+        return self.is_cancelled is not None and self.is_cancelled()
+
+
+class _BatchAborted(Exception):
+    pass
+
+
+class BatchScheduler:
+    """Packs text chunks from concurrent jobs into shared model.sample() calls."""
+
+    def __init__(
+        self,
+        model: torch.nn.Module,
+        device: torch.device,
+        max_duration: float = 100,
+        max_wait: float = 0.01,
+    ):
+        """
+        Args:
+            model: The ZipVoice / ZipVoiceDistill model.
+            device: Torch device the model lives on.
+            max_duration: Max total duration (sec) of one packed batch.
+            max_wait: How long (sec) the oldest pending chunk may wait for
+                chunks from other jobs before its batch is launched.
+        """
+        self.model = model
+        self.device = device
+        self.max_duration = max_duration
+        self.max_wait = max_wait
+        self._cond = threading.Condition()
+        self._pending: List[SampleRequest] = []
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        # Counters for monitoring batch efficiency
+        self.batches_run = 0
+        self.items_run = 0
+        self.batches_aborted = 0
+        self.preemptions = 0
+
+    def start(self):
+        """Start the sampling thread (idempotent)."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._loop, name="zipvoice-batcher", daemon=True
+            )
+            self._thread.start()
+
+    def close(self):
+        """Stop the sampling thread; pending requests are cancelled."""
+        with self._cond:
+            self._closed = True
+            for req in self._pending:
+                req.future.cancel()
+            self._pending.clear()
+            self._cond.notify_all()
+
+    def submit(self, **kwargs) -> Future:
+        """
+        Queue one chunk for sampling.
+
+        Accepts the SampleRequest fields as keyword arguments and returns a
+        Future resolving to the predicted features of that chunk, shape
+        (T, C), with prompt frames removed. The future is cancelled if the
+        request's is_cancelled() turns true before it is sampled.
+        """
+        req = SampleRequest(**kwargs)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("BatchScheduler is closed")
+            self._pending.append(req)
+            self._cond.notify_all()
+        return req.future
+
+    # ── Sampling thread ──────────────────────────────────────────────
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                # Give other jobs a short window to add chunks to this batch
+                deadline = self._pending[0].enqueued_at + self.max_wait
+                remaining = deadline - time.monotonic()
+                while remaining > 0 and not self._closed:
+                    self._cond.wait(remaining)
+                    remaining = deadline - time.monotonic()
+                batch = self._take_batch()
+            if batch:
+                self._run_batch(batch)
+
+    def _take_batch(self, above_priority: Optional[int] = None) -> List[SampleRequest]:
+        """
+        Pop the next batch from the pending list. Caller holds the lock.
+
+        With above_priority, only chunks more urgent than that rank are taken.
+        """
+        # Drop chunks whose job has been cancelled in the meantime
+        live = []
+        for req in self._pending:
+            if req.cancelled():
+                req.future.cancel()
+            else:
+                live.append(req)
+        self._pending = live
+        if above_priority is not None:
+            live = [r for r in live if r.priority < above_priority]
+        if not live:
+            return []
+
+        # The oldest chunk of the most urgent class decides which parameter
+        # group runs next
+        key = min(live, key=lambda r: (r.priority, r.enqueued_at)).group_key
+        candidates = [r for r in live if r.group_key == key]
+        candidates.sort(key=lambda r: r.priority)
+
+        # Round-robin over jobs so one long document does not crowd out
+        # short requests that arrived just after it.
+        by_owner = {}
+        for req in candidates:
+            by_owner.setdefault(req.owner, []).append(req)
+        queues = list(by_owner.values())
+
+        batch: List[SampleRequest] = []
+        used = 0.0
+        added = True
+        while queues and added:
+            added = False
+            for q in queues:
+                req = q[0]
+                if batch and used + req.duration > self.max_duration:
+                    continue  # this job's next chunk does not fit any more
+                batch.append(req)
+                used += req.duration
+                q.pop(0)
+                added = True
+            queues = [q for q in queues if q]
+
+        taken = set(id(r) for r in batch)
+        self._pending = [r for r in self._pending if id(r) not in taken]
+        return batch
+
+    def _step_callback(self, batch: List[SampleRequest]) -> Callable[[int, int], None]:
+        """Between ODE steps: abort dead batches, report progress, let urgent chunks in."""
+        rank = min(r.priority for r in batch)
+
+        def on_step(step: int, total: int):
+            live = [r for r in batch if not r.cancelled()]
+            if not live:
+                raise _BatchAborted()
+            for req in live:
+                if req.on_step is not None:
+                    try:
+                        req.on_step(step, total)
+                    except Exception:
+                        pass
+            if step == total or self._closed:
+                return
+            with self._cond:
+                urgent = self._take_batch(above_priority=rank)
+            if urgent:
+                self.preemptions += 1
+                logger.debug(f"[Batcher] {len(urgent)} urgent chunks preempt a batch at step {step}/{total}")
+                self._run_batch(urgent)
+
+        return on_step
+
+    @torch.inference_mode()
+    def _run_batch(self, batch: List[SampleRequest]):
+        first = batch[0]
+        try:
+            with autocast(device_type=self.device.type), time_stage("sampling"):
+                max_prompt_len = max(r.prompt_features.size(1) for r in batch)
+                prompt_features = torch.cat(
+                    [
+                        torch.nn.functional.pad(
+                            r.prompt_features,
+                            (0, 0, 0, max_prompt_len - r.prompt_features.size(1)),
+                        )
+                        for r in batch
+                    ],
+                    dim=0,
+                )
+                prompt_features_lens = torch.tensor(
+                    [r.prompt_features.size(1) for r in batch], device=self.device
+                )
+                (
+                    pred_features,
+                    pred_features_lens,
+                    pred_prompt_features,
+                    pred_prompt_features_lens,
+                ) = self.model.sample(
+                    tokens=[r.tokens for r in batch],
+                    prompt_tokens=[r.prompt_tokens for r in batch],
+                    prompt_features=prompt_features,
+                    prompt_features_lens=prompt_features_lens,
+                    speed=first.speed,
+                    t_shift=first.t_shift,
+                    duration="predict",
+                    num_step=first.num_step,
+                    guidance_scale=first.guidance_scale,
+                    step_callback=self._step_callback(batch),
+                )
+            for i, req in enumerate(batch):
+                if req.cancelled():
+                    req.future.cancel()
+                else:
+                    req.future.set_result(pred_features[i, : pred_features_lens[i]].clone())
+            self.batches_run += 1
+            self.items_run += len(batch)
+            logger.debug(
+                f"[Batcher] Sampled {len(batch)} chunks from "
+                f"{len(set(r.owner for r in batch))} jobs"
+            )
+            del pred_features, pred_features_lens, pred_prompt_features, pred_prompt_features_lens
+        except _BatchAborted:
+            self.batches_aborted += 1
+            logger.debug(f"[Batcher] Aborted batch of {len(batch)} cancelled chunks")
+            for req in batch:
+                req.future.cancel()
+        except Exception as e:
+            logger.warning(f"[Batcher] Batch of {len(batch)} chunks failed: {e}")
+            for req in batch:
+                if not req.future.done():
+                    req.future.set_exception(e)
+        finally:
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
@@ -10,12 +10,16 @@ Bracket segments (【ây ai】, 【kây pi ai】, 【C】 【E】 【O】, etc.)
   - num_step = BRACKET_NUM_STEP (default 64)
 
 Normal segments are generated with the user's requested speed/step.
+
+synthesize_blocks_cached() takes the text in blocks of whole sentences as
+they come out of normalization and joins the blocks the same way as the
+segments above.
 """
 
 import logging
 import re
 from dataclasses import dataclass
-from typing import List, Optional, Callable
+from typing import Iterable, Iterator, List, Optional, Callable
 
 import numpy as np
 import torch
@@ -550,8 +554,7 @@ def generate_sentence_with_brackets(
 
 
 @torch.inference_mode()
-def generate_sentence_with_brackets_cached(
-    save_path: str,
+def synthesize_with_brackets_cached(
     prompt_text: str,
     prompt_wav_tensor: torch.Tensor,
     prompt_rms: float,
@@ -571,16 +574,32 @@ def generate_sentence_with_brackets_cached(
     progress_cb: Optional[Callable[[int, int], None]] = None,
     bracket_speed: float = 0.5,
     bracket_num_step: int = 64,
+    batcher=None,
+    batch_owner: str = "",
+    is_cancelled: Optional[Callable[[], bool]] = None,
+    chunk_cache=None,
+    chunk_cache_ns: str = "",
+    batch_priority: int = 1,
+    preempt_cb: Optional[Callable[[], None]] = None,
+    tokenized_prompt=None,
 ):
     """
-    Cached version of generate_sentence_with_brackets.
+    Cached version of generate_sentence_with_brackets, returning the waveform.
     
     Uses pre-computed prompt tensors instead of file path,
     eliminating N × load_prompt_wav() I/O for N segments.
     
-    Falls back to generate_sentence_cached() for non-bracket text.
+    Falls back to synthesize_cached() for non-bracket text.
+    batcher / batch_owner / batch_priority / is_cancelled / preempt_cb
+    are forwarded to synthesize_cached() for cross-job batching and
+    step-level cancellation, chunk_cache / chunk_cache_ns for chunk reuse.
+    tokenized_prompt (app.cached_inference.PromptTokens of prompt_text) is
+    reused by every segment; without it the prompt is tokenized once here.
+
+    Returns:
+        (final_wav, metrics): waveform (C, T) on CPU and a metrics dict.
     """
-    from app.cached_inference import generate_sentence_cached
+    from app.cached_inference import synthesize_cached
 
     # Parse segments
     segments = parse_bracketed_text(text)
@@ -589,8 +608,7 @@ def generate_sentence_with_brackets_cached(
     # If no brackets, use standard cached generation
     if not any(s.is_bracket for s in segments):
         plain_text = " ".join(s.text for s in segments)
-        return generate_sentence_cached(
-            save_path=save_path,
+        return synthesize_cached(
             prompt_text=prompt_text,
             prompt_wav_tensor=prompt_wav_tensor,
             prompt_rms=prompt_rms,
@@ -608,21 +626,212 @@ def generate_sentence_with_brackets_cached(
             max_duration=max_duration,
             remove_long_sil=remove_long_sil,
             progress_cb=progress_cb,
+            batcher=batcher,
+            batch_owner=batch_owner,
+            is_cancelled=is_cancelled,
+            chunk_cache=chunk_cache,
+            chunk_cache_ns=chunk_cache_ns,
+            batch_priority=batch_priority,
+            preempt_cb=preempt_cb,
+            tokenized_prompt=tokenized_prompt,
         )
 
     import datetime as dt
-    import os
 
     logger.info(f"[Bracket Cached] Parsed {len(segments)} segments: "
                 f"{sum(1 for s in segments if s.is_bracket)} bracket, "
                 f"{sum(1 for s in segments if not s.is_bracket)} normal")
 
     start_t = dt.datetime.now()
-    segment_wavs: List[torch.Tensor] = []
+    segment_wavs: List[torch.Tensor] = list(iter_bracket_segments_cached(
+        segments=segments,
+        prompt_text=prompt_text,
+        prompt_wav_tensor=prompt_wav_tensor,
+        prompt_rms=prompt_rms,
+        prompt_features=prompt_features,
+        model=model,
+        vocoder=vocoder,
+        tokenizer=tokenizer,
+        feature_extractor=feature_extractor,
+        device=device,
+        num_step=num_step,
+        guidance_scale=guidance_scale,
+        speed=speed,
+        sampling_rate=sampling_rate,
+        max_duration=max_duration,
+        remove_long_sil=remove_long_sil,
+        progress_cb=progress_cb,
+        bracket_speed=bracket_speed,
+        bracket_num_step=bracket_num_step,
+        batcher=batcher,
+        batch_owner=batch_owner,
+        is_cancelled=is_cancelled,
+        chunk_cache=chunk_cache,
+        chunk_cache_ns=chunk_cache_ns,
+        batch_priority=batch_priority,
+        preempt_cb=preempt_cb,
+        tokenized_prompt=tokenized_prompt,
+    ))
+
+    # Cross-fade concatenate
+    if segment_wavs:
+        final_wav = cross_fade_concat(
+            segment_wavs, fade_duration=0.02, sample_rate=sampling_rate
+        )
+    else:
+        final_wav = torch.zeros(1, sampling_rate)
+
+    t = (dt.datetime.now() - start_t).total_seconds()
+    wav_seconds = final_wav.shape[-1] / sampling_rate
+    metrics = {
+        "t": t,
+        "t_no_vocoder": t,
+        "t_vocoder": 0.0,
+        "wav_seconds": wav_seconds,
+        "rtf": t / max(wav_seconds, 0.001),
+        "rtf_no_vocoder": t / max(wav_seconds, 0.001),
+        "rtf_vocoder": 0.0,
+    }
+
+    if progress_cb:
+        try:
+            progress_cb(100, 100)
+        except Exception:
+            pass
+
+    logger.info(f"[Bracket Cached] Done. Total time: {t:.2f}s, "
+                f"Audio: {wav_seconds:.2f}s, RTF: {metrics['rtf']:.4f}")
+
+    return final_wav.cpu(), metrics
+
+
+def generate_sentence_with_brackets_cached(save_path: str, **kwargs):
+    """
+    Run synthesize_with_brackets_cached() and save the result to save_path.
+
+    Takes the same keyword arguments as synthesize_with_brackets_cached().
+
+    Returns:
+        metrics dict with timing information.
+    """
+    final_wav, metrics = synthesize_with_brackets_cached(**kwargs)
+    torchaudio.save(save_path, final_wav, sample_rate=kwargs.get("sampling_rate", 24000))
+    return metrics
+
+
+def synthesize_blocks_cached(
+    text_blocks: Iterable[str],
+    sampling_rate: int = 24000,
+    progress_cb: Optional[Callable[[int, int], None]] = None,
+    **kwargs,
+):
+    """
+    synthesize_with_brackets_cached() over text that arrives in blocks.
+
+    Each block (one or more whole sentences) is synthesized as soon as it
+    is taken from text_blocks, so whatever produces the blocks keeps
+    working on the following ones meanwhile. A single block gives the same
+    audio as synthesize_with_brackets_cached() on its text; several blocks
+    are joined like segments: edge silence trimmed, GAP_PERIOD_MS after
+    every block but the last, cross-faded over 20 ms.
+
+    Takes the keyword arguments of synthesize_with_brackets_cached()
+    except text. progress_cb gets the progress within the current block.
+
+    Returns:
+        (final_wav, metrics): waveform (C, T) on CPU and a metrics dict.
+    """
+    import datetime as dt
+
+    start_t = dt.datetime.now()
+    block_wavs: List[torch.Tensor] = []
+    for block in text_blocks:
+        wav, _ = synthesize_with_brackets_cached(
+            text=block, sampling_rate=sampling_rate, progress_cb=progress_cb, **kwargs
+        )
+        block_wavs.append(wav)
+
+    if len(block_wavs) > 1:
+        block_wavs = [
+            _normalize_segment_silence(
+                wav, sampling_rate, gap_ms=GAP_PERIOD_MS if i < len(block_wavs) - 1 else 0,
+                trim_leading=True, trim_trailing=True,
+            )
+            for i, wav in enumerate(block_wavs)
+        ]
+        final_wav = cross_fade_concat(block_wavs, fade_duration=0.02, sample_rate=sampling_rate)
+    elif block_wavs:
+        final_wav = block_wavs[0]
+    else:
+        final_wav = torch.zeros(1, sampling_rate)
+
+    t = (dt.datetime.now() - start_t).total_seconds()
+    wav_seconds = final_wav.shape[-1] / sampling_rate
+    metrics = {
+        "t": t,
+        "blocks": len(block_wavs),
+        "wav_seconds": wav_seconds,
+        "rtf": t / max(wav_seconds, 0.001),
+    }
+    logger.info(f"[Blocks Cached] {len(block_wavs)} blocks. Total time: {t:.2f}s, "
+                f"Audio: {wav_seconds:.2f}s, RTF: {metrics['rtf']:.4f}")
+    return final_wav.cpu(), metrics
+
+
+def iter_bracket_segments_cached(
+    segments: List[TextSegment],
+    prompt_text: str,
+    prompt_wav_tensor: torch.Tensor,
+    prompt_rms: float,
+    prompt_features: torch.Tensor,
+    model: torch.nn.Module,
+    vocoder: torch.nn.Module,
+    tokenizer,
+    feature_extractor,
+    device: torch.device,
+    num_step: int = 32,
+    guidance_scale: float = 1.0,
+    speed: float = 1.0,
+    sampling_rate: int = 24000,
+    max_duration: float = 100,
+    remove_long_sil: bool = False,
+    progress_cb: Optional[Callable[[int, int], None]] = None,
+    bracket_speed: float = 0.5,
+    bracket_num_step: int = 64,
+    batcher=None,
+    batch_owner: str = "",
+    is_cancelled: Optional[Callable[[], bool]] = None,
+    chunk_cache=None,
+    chunk_cache_ns: str = "",
+    batch_priority: int = 1,
+    preempt_cb: Optional[Callable[[], None]] = None,
+    tokenized_prompt=None,
+) -> Iterator[torch.Tensor]:
+    """
+    Generate parsed (and merged) segments one by one, in text order.
+
+    Yields each segment's waveform (C, T) with its edge silence trimmed and
+    the punctuation-dependent gap appended, ready for cross_fade_concat()
+    with fade_duration=0.02. Used by generate_sentence_with_brackets_cached()
+    and by the streaming endpoint, which sends each segment as soon as it
+    is generated.
+
+    Failed segments are logged and skipped. Generation stops within one
+    ODE step once is_cancelled() returns True. The prompt is tokenized at
+    most once for all segments (not at all with tokenized_prompt).
+    """
+    from app.cached_inference import synthesize_cached, tokenize_prompt
+
+    if tokenized_prompt is None or not tokenized_prompt.matches(prompt_text, sampling_rate):
+        tokenized_prompt = tokenize_prompt(prompt_text, prompt_wav_tensor, tokenizer, sampling_rate)
+
     total_segments = len(segments)
     done_segments = 0
 
     for i, seg in enumerate(segments):
+        if is_cancelled is not None and is_cancelled():
+            return
+
         word_count = len(seg.text.split()) if not seg.is_bracket else 0
         is_short_normal = (not seg.is_bracket and word_count <= SHORT_SEGMENT_MAX_WORDS)
 
@@ -645,17 +854,13 @@ def generate_sentence_with_brackets_cached(
                      f"({seg_type}): '{seg.text[:50]}...' "
                      f"speed={seg_speed}, step={seg_step}")
 
-        tmp_dir = os.path.dirname(save_path) or "."
-        tmp_path = os.path.join(tmp_dir, f"_bracket_seg_{i}_{os.getpid()}.wav")
-
         try:
             def segment_progress(done, total):
                 if progress_cb:
                     overall = (done_segments + done / max(total, 1)) / max(total_segments, 1)
                     progress_cb(int(overall * 100), 100)
 
-            generate_sentence_cached(
-                save_path=tmp_path,
+            wav, _ = synthesize_cached(
                 prompt_text=prompt_text,
                 prompt_wav_tensor=prompt_wav_tensor,
                 prompt_rms=prompt_rms,
@@ -673,19 +878,19 @@ def generate_sentence_with_brackets_cached(
                 max_duration=max_duration,
                 remove_long_sil=remove_long_sil,
                 progress_cb=segment_progress,
+                batcher=batcher,
+                batch_owner=batch_owner,
+                is_cancelled=is_cancelled,
+                chunk_cache=chunk_cache,
+                chunk_cache_ns=chunk_cache_ns,
+                batch_priority=batch_priority,
+                preempt_cb=preempt_cb,
+                tokenized_prompt=tokenized_prompt,
             )
 
-            wav, sr = torchaudio.load(tmp_path)
-            if sr != sampling_rate:
-                resampler = torchaudio.transforms.Resample(sr, sampling_rate)
-                wav = resampler(wav)
-
             is_last_segment = (i == len(segments) - 1)
             if is_last_segment:
-                wav = _normalize_segment_silence(
-                    wav, sampling_rate, gap_ms=0,
-                    trim_leading=True, trim_trailing=True,
-                )
+                gap_ms = 0
             else:
                 punct_type = _detect_trailing_punctuation(seg.text)
                 if punct_type == 'period':
@@ -694,55 +899,17 @@ def generate_sentence_with_brackets_cached(
                     gap_ms = GAP_COMMA_MS
                 else:
                     gap_ms = GAP_NONE_MS
-                wav = _normalize_segment_silence(
-                    wav, sampling_rate, gap_ms=gap_ms,
-                    trim_leading=True, trim_trailing=True,
-                )
-
-            segment_wavs.append(wav)
+            wav = _normalize_segment_silence(
+                wav, sampling_rate, gap_ms=gap_ms,
+                trim_leading=True, trim_trailing=True,
+            )
 
         except Exception as e:
+            if is_cancelled is not None and is_cancelled():
+                return  # sampling stopped mid-segment
             logger.error(f"[Bracket Cached] Failed segment {i+1}: {e}")
             done_segments += 1
             continue
-        finally:
-            if os.path.exists(tmp_path):
-                try:
-                    os.remove(tmp_path)
-                except OSError:
-                    pass
 
         done_segments += 1
-
-    # Cross-fade concatenate
-    if segment_wavs:
-        final_wav = cross_fade_concat(
-            segment_wavs, fade_duration=0.02, sample_rate=sampling_rate
-        )
-    else:
-        final_wav = torch.zeros(1, sampling_rate)
-
-    torchaudio.save(save_path, final_wav.cpu(), sample_rate=sampling_rate)
-
-    t = (dt.datetime.now() - start_t).total_seconds()
-    wav_seconds = final_wav.shape[-1] / sampling_rate
-    metrics = {
-        "t": t,
-        "t_no_vocoder": t,
-        "t_vocoder": 0.0,
-        "wav_seconds": wav_seconds,
-        "rtf": t / max(wav_seconds, 0.001),
-        "rtf_no_vocoder": t / max(wav_seconds, 0.001),
-        "rtf_vocoder": 0.0,
-    }
-
-    if progress_cb:
-        try:
-            progress_cb(100, 100)
-        except Exception:
-            pass
-
-    logger.info(f"[Bracket Cached] Done. Total time: {t:.2f}s, "
-                f"Audio: {wav_seconds:.2f}s, RTF: {metrics['rtf']:.4f}")
-
-    return metrics
+        yield wav
@@ -7,16 +7,24 @@ pre-processed prompt tensors instead of a file path.
 
 This avoids redundant I/O (torchaudio.load), resampling, silence removal,
 RMS normalization, and feature extraction on every inference call for the
-same voice.
+same voice. With tokenized_prompt (a PromptTokens, see tokenize_prompt())
+the prompt text is not punctuated and tokenized again either.
+
+iter_sentence_cached() is the streaming variant: it yields vocoded chunks
+in text order as soon as each one is ready instead of returning the merged
+waveform at the end.
 """
 
 import logging
-from typing import Optional, Callable
+from concurrent.futures import CancelledError
+from typing import Optional, Callable, Iterator, List, Tuple
 
 import torch
 import torchaudio
 import datetime as dt
+from dataclasses import dataclass
 
+from app.metrics import time_stage
 from zipvoice.utils.infer import (
     add_punctuation,
     chunk_tokens_punctuation,
@@ -28,9 +36,168 @@ from zipvoice.utils.infer import (
 logger = logging.getLogger(__name__)
 
 
+def _solver_callback(
+    is_cancelled: Optional[Callable[[], bool]],
+    preempt_cb: Optional[Callable[[], None]],
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> Callable[[int, int], None]:
+    """step_callback for model.sample() on the calling thread: cancel, yield, report."""
+    def on_step(step: int, total: int):
+        if is_cancelled is not None and is_cancelled():
+            raise CancelledError()
+        if preempt_cb is not None:
+            preempt_cb()
+        if progress is not None:
+            progress(step, total)
+    return on_step
+
+
+@dataclass(frozen=True)
+class PromptTokens:
+    """
+    The prompt side of _prepare_chunks(), which only depends on the voice.
+
+    engine._warm_voice_cache() computes it once per voice (Voice.
+    cached_prompt_tokens); synthesize_cached() and iter_sentence_cached()
+    take it as tokenized_prompt and skip add_punctuation() and the prompt's
+    tokenization, once per call and once per bracket segment.
+    """
+    prompt_text: str            # text it was made from
+    sampling_rate: int
+    tokens: Tuple[str, ...]     # add_punctuation(prompt_text) as str tokens
+    token_ids: List[List[int]]  # tokenizer.tokens_to_token_ids([tokens])
+    duration: float             # prompt seconds
+    token_duration: float       # seconds per prompt token at speed 1.0
+
+    def matches(self, prompt_text: str, sampling_rate: int) -> bool:
+        return self.prompt_text == prompt_text and self.sampling_rate == sampling_rate
+
+    def token_duration_at(self, speed: float) -> float:
+        if speed == 1.0:
+            return self.token_duration
+        return self.duration / (len(self.tokens) * speed)
+
+
+def tokenize_prompt(
+    prompt_text: str,
+    prompt_wav_tensor: torch.Tensor,
+    tokenizer,
+    sampling_rate: int,
+) -> PromptTokens:
+    """Tokenize a voice prompt the way _prepare_chunks() does."""
+    duration = prompt_wav_tensor.shape[-1] / sampling_rate
+    tokens = tokenizer.texts_to_tokens([add_punctuation(prompt_text)])[0]
+    return PromptTokens(
+        prompt_text=prompt_text,
+        sampling_rate=sampling_rate,
+        tokens=tuple(tokens),
+        token_ids=tokenizer.tokens_to_token_ids([tokens]),
+        duration=duration,
+        token_duration=duration / (len(tokens) * 1.0),
+    )
+
+
+def _prepare_chunks(
+    prompt_text: str,
+    prompt_wav_tensor: torch.Tensor,
+    text: str,
+    tokenizer,
+    speed: float,
+    sampling_rate: int,
+    tokenized_prompt: Optional[PromptTokens] = None,
+) -> Tuple[float, float, List[List[int]], List[List[int]]]:
+    """
+    Tokenize text and prompt, and split the text into ~25 s chunks.
+
+    The prompt is only tokenized when tokenized_prompt is not given (or was
+    made from another prompt text).
+
+    Returns:
+        (prompt_duration, token_duration, chunked_tokens, prompt_tokens)
+    """
+    with time_stage("tokenization"):
+        if tokenized_prompt is None or not tokenized_prompt.matches(prompt_text, sampling_rate):
+            tokenized_prompt = tokenize_prompt(prompt_text, prompt_wav_tensor, tokenizer, sampling_rate)
+        prompt_duration = tokenized_prompt.duration
+
+        # Add punctuation in the end if there is not
+        text = add_punctuation(text)
+
+        # Tokenize text (str tokens), punctuations will be preserved.
+        tokens_str = tokenizer.texts_to_tokens([text])[0]
+
+        # Chunk text so that each len(prompt wav + generated wav) is around 25 seconds.
+        token_duration = tokenized_prompt.token_duration_at(speed)
+        max_tokens = int((25 - prompt_duration) / token_duration)
+        chunked_tokens_str = chunk_tokens_punctuation(tokens_str, max_tokens=max_tokens)
+
+        # Tokenize text (int tokens)
+        chunked_tokens = tokenizer.tokens_to_token_ids(chunked_tokens_str)
+    return prompt_duration, token_duration, chunked_tokens, tokenized_prompt.token_ids
+
+
+def _decode_features(
+    pred_feat: torch.Tensor,
+    vocoder: torch.nn.Module,
+    prompt_rms: float,
+    target_rms: float,
+    feat_scale: float,
+) -> torch.Tensor:
+    """Vocode predicted features (T, C) of one chunk into a CPU waveform (1, T)."""
+    with time_stage("vocoder"):
+        feat_i = (pred_feat.permute(1, 0) / feat_scale)[None]  # (1, C, T)
+        wav_gpu = vocoder.decode(feat_i).squeeze(1).clamp(-1, 1)
+        if prompt_rms < target_rms:
+            wav_gpu = wav_gpu * prompt_rms / target_rms
+        return wav_gpu.cpu()
+
+
+class _ChunkLookup:
+    """Chunk-cache keys and hits of one call; store() adds newly generated chunks."""
+
+    def __init__(self, cache, keys: List[str]):
+        self.cache = cache
+        self.keys = keys
+        self.hits = {}
+
+    def store(self, idx: int, wav: torch.Tensor):
+        if self.cache is not None:
+            self.cache.put(self.keys[idx], wav)
+
+
+def _lookup_chunks(
+    chunk_cache,
+    namespace: str,
+    chunked_tokens: List[List[int]],
+    speed: float,
+    num_step: int,
+    guidance_scale: float,
+    t_shift: float,
+) -> Tuple[_ChunkLookup, List[int]]:
+    """
+    Look every chunk up in chunk_cache.
+
+    Returns the lookup (with .hits: index -> waveform) and the indices of
+    chunks that still have to be generated, in text order.
+    """
+    if chunk_cache is None:
+        return _ChunkLookup(None, []), list(range(len(chunked_tokens)))
+    lookup = _ChunkLookup(chunk_cache, [
+        chunk_cache.make_key(namespace, toks, speed, num_step, guidance_scale, t_shift)
+        for toks in chunked_tokens
+    ])
+    misses = []
+    for idx, key in enumerate(lookup.keys):
+        wav = chunk_cache.get(key)
+        if wav is None:
+            misses.append(idx)
+        else:
+            lookup.hits[idx] = wav
+    return lookup, misses
+
+
 @torch.inference_mode()
-def generate_sentence_cached(
-    save_path: str,
+def synthesize_cached(
     prompt_text: str,
     # --- Pre-cached prompt data (replaces prompt_wav: str) ---
     prompt_wav_tensor: torch.Tensor,       # (C, T) — already loaded, silence-removed, rms-normed
@@ -53,9 +220,17 @@ def generate_sentence_cached(
     max_duration: float = 100,
     remove_long_sil: bool = False,
     progress_cb: Optional[Callable[[int, int], None]] = None,
+    batcher=None,
+    batch_owner: str = "",
+    is_cancelled: Optional[Callable[[], bool]] = None,
+    chunk_cache=None,
+    chunk_cache_ns: str = "",
+    batch_priority: int = 1,
+    preempt_cb: Optional[Callable[[], None]] = None,
+    tokenized_prompt: Optional[PromptTokens] = None,
 ):
     """
-    Generate waveform using pre-cached prompt data.
+    Generate a waveform using pre-cached prompt data, without saving it.
 
     Equivalent to zipvoice.bin.infer_zipvoice.generate_sentence() but
     skips the following per-call overhead:
@@ -68,7 +243,6 @@ def generate_sentence_cached(
     generation, vocoder, cross-fade) is identical.
 
     Args:
-        save_path: Path to save the generated wav.
         prompt_text: Transcription of the prompt wav.
         prompt_wav_tensor: Pre-processed prompt waveform tensor (C, T).
         prompt_rms: Original RMS of the prompt waveform.
@@ -87,41 +261,42 @@ def generate_sentence_cached(
         max_duration: Max duration per batch (seconds).
         remove_long_sil: Whether to remove long silences.
         progress_cb: Progress callback.
+        batcher: Optional app.batch_scheduler.BatchScheduler. When given,
+                 chunks are sampled through the shared cross-job batcher
+                 instead of this call's own batches.
+        batch_owner: Job id reported to the batcher for fair packing.
+        is_cancelled: Optional predicate; chunks still waiting in the
+                      batcher are dropped once it returns True.
+        chunk_cache: Optional app.chunk_cache.ChunkCache. Cached chunks skip
+                     model.sample() and vocoder.decode(); only misses are
+                     batched, and their waveforms are added to the cache.
+        chunk_cache_ns: Cache namespace identifying the voice prompt and
+                        model (chunks of different voices never mix).
+        batch_priority: Priority rank of the job in the batcher (lower is
+                        more urgent, see app.scheduler.PRIORITY_CLASSES).
+        preempt_cb: Optional; called between ODE steps when sampling on
+                    this thread. It may block while more urgent jobs run.
+        tokenized_prompt: Optional PromptTokens of prompt_text (the voice's
+                          cached_prompt_tokens); skips tokenizing the
+                          prompt on every call.
+
+    Between ODE steps, sampling on this thread stops with CancelledError
+    once is_cancelled() is true, and progress_cb is called with per-step
+    progress; exceptions it raises there abort the call.
 
     Returns:
-        metrics dict with timing information.
+        (final_wav, metrics): waveform (C, T) on CPU and a metrics dict
+        with timing information.
     """
     # Move prompt features to device
     prompt_features_dev = prompt_features.to(device)
 
-    prompt_duration = prompt_wav_tensor.shape[-1] / sampling_rate
-
-    # Add punctuation in the end if there is not
-    text = add_punctuation(text)
-    prompt_text = add_punctuation(prompt_text)
-
-    # Tokenize text (str tokens), punctuations will be preserved.
-    tokens_str = tokenizer.texts_to_tokens([text])[0]
-    prompt_tokens_str = tokenizer.texts_to_tokens([prompt_text])[0]
-
-    # Chunk text so that each len(prompt wav + generated wav) is around 25 seconds.
-    token_duration = (prompt_wav_tensor.shape[-1] / sampling_rate) / (
-        len(prompt_tokens_str) * speed
-    )
-    max_tokens = int((25 - prompt_duration) / token_duration)
-    chunked_tokens_str = chunk_tokens_punctuation(tokens_str, max_tokens=max_tokens)
-
-    # Tokenize text (int tokens)
-    chunked_tokens = tokenizer.tokens_to_token_ids(chunked_tokens_str)
-    prompt_tokens = tokenizer.tokens_to_token_ids([prompt_tokens_str])
-
-    # Batchify chunked texts for faster processing
-    tokens_batches, chunked_index = batchify_tokens(
-        chunked_tokens, max_duration, prompt_duration, token_duration
+    prompt_duration, token_duration, chunked_tokens, prompt_tokens = _prepare_chunks(
+        prompt_text, prompt_wav_tensor, text, tokenizer, speed, sampling_rate, tokenized_prompt
     )
 
     GEN_W, VOC_W = 95, 5
-    total_gen_units = sum(len(b) for b in tokens_batches) or 1
+    total_gen_units = len(chunked_tokens) or 1
     total_voc_units = total_gen_units
     total_units = GEN_W * total_gen_units + VOC_W * total_voc_units
     done_units = 0
@@ -130,8 +305,68 @@ def generate_sentence_cached(
     start_t = dt.datetime.now()
     chunked_wavs_cpu = []
 
+    # Reuse chunks synthesized before (by any job); only misses are generated
+    chunk_lookup, miss_indices = _lookup_chunks(
+        chunk_cache, chunk_cache_ns, chunked_tokens, speed, num_step, guidance_scale, t_shift
+    )
+    for idx, wav_cpu in chunk_lookup.hits.items():
+        chunked_wavs_cpu.append((idx, wav_cpu))
+        done_units += GEN_W
+
+    if batcher is not None:
+        # Fraction of the ODE steps done for chunks currently being sampled
+        in_flight = {}
+
+        def chunk_progress(idx):
+            def on_step(step, total):
+                in_flight[idx] = step / total
+                if progress_cb:
+                    progress_cb(done_units + int(GEN_W * sum(in_flight.values())), total_units)
+            return on_step
+
+        # Hand every chunk to the shared batcher; it packs them together
+        # with chunks of other running jobs that use the same parameters.
+        futures = [
+            batcher.submit(
+                owner=batch_owner,
+                tokens=chunked_tokens[i],
+                prompt_tokens=prompt_tokens[0],
+                prompt_features=prompt_features_dev,
+                prompt_duration=prompt_duration,
+                token_duration=token_duration,
+                speed=speed,
+                num_step=num_step,
+                guidance_scale=guidance_scale,
+                t_shift=t_shift,
+                is_cancelled=is_cancelled,
+                priority=batch_priority,
+                on_step=chunk_progress(i),
+            )
+            for i in miss_indices
+        ]
+        for chunk_idx, future in zip(miss_indices, futures):
+            pred_feat = future.result()  # (T, C)
+            wav_cpu = _decode_features(pred_feat, vocoder, prompt_rms, target_rms, feat_scale)
+            chunked_wavs_cpu.append((chunk_idx, wav_cpu))
+            chunk_lookup.store(chunk_idx, wav_cpu)
+            del pred_feat
+            in_flight.pop(chunk_idx, None)
+            if progress_cb:
+                try:
+                    done_units += GEN_W
+                    progress_cb(done_units, total_units)
+                except Exception:
+                    pass
+        tokens_batches = []
+    else:
+        # Batchify chunked texts for faster processing
+        tokens_batches, chunked_index = batchify_tokens(
+            [chunked_tokens[i] for i in miss_indices], max_duration, prompt_duration, token_duration
+        )
+
     for batch_idx, batch_tokens in enumerate(tokens_batches):
         batch_prompt_tokens = prompt_tokens * len(batch_tokens)
+        batch_units = GEN_W * len(batch_tokens)
 
         batch_prompt_features = prompt_features_dev.repeat(len(batch_tokens), 1, 1)
         batch_prompt_features_lens = torch.full(
@@ -139,40 +374,48 @@ def generate_sentence_cached(
         )
 
         # Generate features
-        (
-            pred_features,
-            pred_features_lens,
-            pred_prompt_features,
-            pred_prompt_features_lens,
-        ) = model.sample(
-            tokens=batch_tokens,
-            prompt_tokens=batch_prompt_tokens,
-            prompt_features=batch_prompt_features,
-            prompt_features_lens=batch_prompt_features_lens,
-            speed=speed,
-            t_shift=t_shift,
-            duration="predict",
-            num_step=num_step,
-            guidance_scale=guidance_scale,
-        )
+        with time_stage("sampling"):
+            (
+                pred_features,
+                pred_features_lens,
+                pred_prompt_features,
+                pred_prompt_features_lens,
+            ) = model.sample(
+                tokens=batch_tokens,
+                prompt_tokens=batch_prompt_tokens,
+                prompt_features=batch_prompt_features,
+                prompt_features_lens=batch_prompt_features_lens,
+                speed=speed,
+                t_shift=t_shift,
+                duration="predict",
+                num_step=num_step,
+                guidance_scale=guidance_scale,
+                step_callback=_solver_callback(
+                    is_cancelled, preempt_cb,
+                    progress=(lambda step, total: progress_cb(done_units + batch_units * step // total, total_units))
+                    if progress_cb else None,
+                ),
+            )
 
         # Postprocess predicted features
         pred_features = pred_features.permute(0, 2, 1) / feat_scale  # (B, C, T)
         for i in range(pred_features.size(0)):
-            feat_i = pred_features[i][None, :, : pred_features_lens[i]]
-            wav_gpu = vocoder.decode(feat_i).squeeze(1).clamp(-1, 1)
-            if prompt_rms < target_rms:
-                wav_gpu = wav_gpu * prompt_rms / target_rms
-            wav_cpu = wav_gpu.cpu()
-            global_chunk_index = chunked_index[
+            with time_stage("vocoder"):
+                feat_i = pred_features[i][None, :, : pred_features_lens[i]]
+                wav_gpu = vocoder.decode(feat_i).squeeze(1).clamp(-1, 1)
+                if prompt_rms < target_rms:
+                    wav_gpu = wav_gpu * prompt_rms / target_rms
+                wav_cpu = wav_gpu.cpu()
+            global_chunk_index = miss_indices[chunked_index[
                 sum(len(b) for b in tokens_batches[:batch_idx]) + i
-            ]
+            ]]
             chunked_wavs_cpu.append((global_chunk_index, wav_cpu))
+            chunk_lookup.store(global_chunk_index, wav_cpu)
         del pred_features, pred_features_lens, pred_prompt_features, pred_prompt_features_lens
         torch.cuda.empty_cache()
         if progress_cb:
             try:
-                done_units += GEN_W * len(batch_tokens)
+                done_units += batch_units
                 progress_cb(done_units, total_units)
             except Exception:
                 pass
@@ -207,10 +450,190 @@ def generate_sentence_cached(
         "rtf_vocoder": rtf_vocoder,
     }
 
-    torchaudio.save(save_path, final_wav.cpu(), sample_rate=sampling_rate)
     if progress_cb:
         try:
             progress_cb(total_units, total_units)
         except Exception:
             pass
+    return final_wav.cpu(), metrics
+
+
+def generate_sentence_cached(save_path: str, **kwargs):
+    """
+    Generate a waveform with synthesize_cached() and save it to save_path.
+
+    Takes the same keyword arguments as synthesize_cached().
+
+    Returns:
+        metrics dict with timing information.
+    """
+    final_wav, metrics = synthesize_cached(**kwargs)
+    torchaudio.save(save_path, final_wav, sample_rate=kwargs.get("sampling_rate", 24000))
     return metrics
+
+
+def _ordered_batches(
+    chunked_tokens: List[List[int]],
+    max_duration: float,
+    prompt_duration: float,
+    token_duration: float,
+) -> Iterator[List[int]]:
+    """
+    Group chunk indices into batches that keep text order.
+
+    The first chunk always runs alone so the first audio is ready after one
+    chunk's worth of sampling. Later batches pack consecutive chunks up to
+    max_duration, like batchify_tokens() but without sorting by length.
+    """
+    if not chunked_tokens:
+        return
+    yield [0]
+    batch: List[int] = []
+    used = 0.0
+    for idx in range(1, len(chunked_tokens)):
+        dur = prompt_duration + len(chunked_tokens[idx]) * token_duration
+        if batch and used + dur > max_duration:
+            yield batch
+            batch, used = [], 0.0
+        batch.append(idx)
+        used += dur
+    if batch:
+        yield batch
+
+
+@torch.inference_mode()
+def iter_sentence_cached(
+    prompt_text: str,
+    prompt_wav_tensor: torch.Tensor,
+    prompt_rms: float,
+    prompt_features: torch.Tensor,
+    text: str,
+    model: torch.nn.Module,
+    vocoder: torch.nn.Module,
+    tokenizer,
+    device: torch.device,
+    num_step: int = 16,
+    guidance_scale: float = 1.0,
+    speed: float = 1.0,
+    t_shift: float = 0.5,
+    target_rms: float = 0.1,
+    feat_scale: float = 0.1,
+    sampling_rate: int = 24000,
+    max_duration: float = 100,
+    progress_cb: Optional[Callable[[int, int], None]] = None,
+    batcher=None,
+    batch_owner: str = "",
+    is_cancelled: Optional[Callable[[], bool]] = None,
+    chunk_cache=None,
+    chunk_cache_ns: str = "",
+    batch_priority: int = 1,
+    preempt_cb: Optional[Callable[[], None]] = None,
+    tokenized_prompt: Optional[PromptTokens] = None,
+) -> Iterator[Tuple[torch.Tensor, bool]]:
+    """
+    Streaming variant of synthesize_cached().
+
+    Yields (wav, is_last) per text chunk, in text order, as soon as the
+    chunk is vocoded. wav is a CPU tensor (1, T) that has not been
+    cross-faded or silence-trimmed; feed it through
+    app.streaming.StreamingCrossFader to get the same audio as
+    synthesize_cached() would produce.
+
+    Arguments are the same as synthesize_cached(). progress_cb is called
+    with (chunks_done, total_chunks); unlike synthesize_cached(), its
+    exceptions propagate so callers can stop the stream.
+    """
+    prompt_features_dev = prompt_features.to(device)
+    prompt_duration, token_duration, chunked_tokens, prompt_tokens = _prepare_chunks(
+        prompt_text, prompt_wav_tensor, text, tokenizer, speed, sampling_rate, tokenized_prompt
+    )
+    chunk_lookup, miss_indices = _lookup_chunks(
+        chunk_cache, chunk_cache_ns, chunked_tokens, speed, num_step, guidance_scale, t_shift
+    )
+
+    def generate_misses() -> Iterator[torch.Tensor]:
+        """Waveforms of the cache misses, in miss_indices order."""
+        if batcher is not None:
+            def submit(idx):
+                return batcher.submit(
+                    owner=batch_owner,
+                    tokens=chunked_tokens[idx],
+                    prompt_tokens=prompt_tokens[0],
+                    prompt_features=prompt_features_dev,
+                    prompt_duration=prompt_duration,
+                    token_duration=token_duration,
+                    speed=speed,
+                    num_step=num_step,
+                    guidance_scale=guidance_scale,
+                    t_shift=t_shift,
+                    is_cancelled=is_cancelled,
+                    priority=batch_priority,
+                )
+
+            # Submit the first chunk alone so it is not packed together with
+            # the rest of the text; the remaining chunks are sampled while the
+            # first one is vocoded and sent.
+            futures = [submit(miss_indices[0])] if miss_indices else []
+            for n, idx in enumerate(miss_indices):
+                pred_feat = futures[n].result()  # (T, C)
+                if n == 0:
+                    futures.extend(submit(i) for i in miss_indices[1:])
+                wav_cpu = _decode_features(pred_feat, vocoder, prompt_rms, target_rms, feat_scale)
+                del pred_feat
+                chunk_lookup.store(idx, wav_cpu)
+                yield wav_cpu
+            return
+
+        miss_tokens = [chunked_tokens[i] for i in miss_indices]
+        for batch_positions in _ordered_batches(
+            miss_tokens, max_duration, prompt_duration, token_duration
+        ):
+            if is_cancelled is not None and is_cancelled():
+                return
+            batch_tokens = [miss_tokens[p] for p in batch_positions]
+            with time_stage("sampling"):
+                (
+                    pred_features,
+                    pred_features_lens,
+                    pred_prompt_features,
+                    pred_prompt_features_lens,
+                ) = model.sample(
+                    tokens=batch_tokens,
+                    prompt_tokens=prompt_tokens * len(batch_tokens),
+                    prompt_features=prompt_features_dev.repeat(len(batch_tokens), 1, 1),
+                    prompt_features_lens=torch.full(
+                        (len(batch_tokens),), prompt_features_dev.size(1), device=device
+                    ),
+                    speed=speed,
+                    t_shift=t_shift,
+                    duration="predict",
+                    num_step=num_step,
+                    guidance_scale=guidance_scale,
+                    step_callback=_solver_callback(is_cancelled, preempt_cb),
+                )
+            wavs = [
+                _decode_features(
+                    pred_features[i, : pred_features_lens[i]],
+                    vocoder, prompt_rms, target_rms, feat_scale,
+                )
+                for i in range(len(batch_tokens))
+            ]
+            del pred_features, pred_features_lens, pred_prompt_features, pred_prompt_features_lens
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+            for p, wav_cpu in zip(batch_positions, wavs):
+                chunk_lookup.store(miss_indices[p], wav_cpu)
+                yield wav_cpu
+
+    total = len(chunked_tokens)
+    generated = generate_misses()
+    for idx in range(total):
+        if idx in chunk_lookup.hits:
+            wav_cpu = chunk_lookup.hits[idx]
+        else:
+            wav_cpu = next(generated, None)
+            if wav_cpu is None:  # cancelled
+                return
+        if progress_cb:
+            progress_cb(idx + 1, total)
+        yield wav_cpu, idx + 1 == total
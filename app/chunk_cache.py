@@ -0,0 +1,178 @@
+"""
+Chunk-level waveform cache shared across jobs.
+
+Long documents from different callers often share sentences (greetings,
+disclaimers, signatures). The result cache only helps when a whole request
+repeats, so generate/synthesize_cached() would still re-sample and
+re-vocode every shared chunk. ChunkCache stores the vocoded waveform of
+each text chunk, keyed by everything that determines it:
+
+    (voice/model namespace, chunk token ids, speed, num_step,
+     guidance_scale, t_shift)
+
+The chunk loop looks every chunk up first and batches only the misses.
+
+Storage is two-level LRU: recently used chunks stay in memory, and chunks
+evicted from memory are spilled to disk with torch.save, so a restart or a
+burst of new text does not throw them away. Both levels are size-bounded.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional, Sequence
+
+import torch
+
+logger = logging.getLogger(__name__)
+
+
+class ChunkCache:
+    """Two-level (memory + disk) LRU cache of vocoded chunk waveforms."""
+
+    def __init__(self, max_memory_bytes: int, spill_dir: Optional[str] = None, max_disk_bytes: int = 0):
+        """
+        Args:
+            max_memory_bytes: Budget for waveforms kept in memory.
+            spill_dir: Directory for chunks evicted from memory; None
+                       disables the disk level.
+            max_disk_bytes: Budget for the disk level.
+        """
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.spill_dir = spill_dir if spill_dir and max_disk_bytes > 0 else None
+        self._lock = threading.Lock()
+        self._mem: "OrderedDict[str, torch.Tensor]" = OrderedDict()
+        self._mem_bytes = 0
+        self._disk: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if self.spill_dir:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            self._index_disk()
+
+    @staticmethod
+    def make_key(
+        namespace: str,
+        tokens: Sequence[int],
+        speed: float,
+        num_step: int,
+        guidance_scale: float,
+        t_shift: float,
+    ) -> str:
+        """Key of one chunk. namespace identifies the voice prompt and model."""
+        raw = f"{namespace}|{','.join(map(str, tokens))}|{float(speed)}|{int(num_step)}|" \
+              f"{float(guidance_scale)}|{float(t_shift)}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _index_disk(self):
+        """Pick up chunks spilled by a previous process, oldest first."""
+        entries = []
+        for name in os.listdir(self.spill_dir):
+            if not name.endswith(".pt"):
+                continue
+            path = os.path.join(self.spill_dir, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, name[:-3], st.st_size))
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self._disk_bytes += size
+        self._trim_disk()
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.spill_dir, f"{key}.pt")
+
+    def get(self, key: str) -> Optional[torch.Tensor]:
+        """Return the cached waveform (C, T) on CPU, or None."""
+        with self._lock:
+            wav = self._mem.get(key)
+            if wav is not None:
+                self._mem.move_to_end(key)
+                self.hits += 1
+                return wav
+            on_disk = key in self._disk
+            if on_disk:
+                self._disk.move_to_end(key)
+        if on_disk:
+            try:
+                wav = torch.load(self._disk_path(key), map_location="cpu")
+            except Exception:
+                wav = None
+            if wav is not None:
+                with self._lock:
+                    self.hits += 1
+                    self.disk_hits += 1
+                self.put(key, wav)  # promote back to memory
+                return wav
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, wav: torch.Tensor):
+        """Store a chunk waveform; may spill older chunks to disk."""
+        wav = wav.detach().cpu()
+        size = wav.numel() * wav.element_size()
+        if size > self.max_memory_bytes:
+            if self.spill_dir and key not in self._disk:
+                self._spill(key, wav)
+            return
+        spilled = []
+        with self._lock:
+            old = self._mem.pop(key, None)
+            if old is not None:
+                self._mem_bytes -= old.numel() * old.element_size()
+            self._mem[key] = wav
+            self._mem_bytes += size
+            while self._mem_bytes > self.max_memory_bytes and self._mem:
+                old_key, old_wav = self._mem.popitem(last=False)
+                self._mem_bytes -= old_wav.numel() * old_wav.element_size()
+                if self.spill_dir and old_key not in self._disk:
+                    spilled.append((old_key, old_wav))
+        for old_key, old_wav in spilled:
+            self._spill(old_key, old_wav)
+
+    def _spill(self, key: str, wav: torch.Tensor):
+        path = self._disk_path(key)
+        tmp = f"{path}.part"
+        try:
+            torch.save(wav, tmp)
+            os.replace(tmp, path)
+            size = os.path.getsize(path)
+        except OSError as e:
+            logger.warning(f"[ChunkCache] Could not spill chunk to disk: {e}")
+            return
+        with self._lock:
+            self._disk[key] = size
+            self._disk_bytes += size
+            self._trim_disk()
+
+    def _trim_disk(self):
+        """Remove least-recently-spilled chunks over the disk budget. Caller holds the lock."""
+        while self._disk_bytes > self.max_disk_bytes and self._disk:
+            key, size = self._disk.popitem(last=False)
+            self._disk_bytes -= size
+            try:
+                os.remove(self._disk_path(key))
+            except OSError:
+                pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / max(lookups, 1),
+                "memory_chunks": len(self._mem),
+                "memory_bytes": self._mem_bytes,
+                "disk_chunks": len(self._disk),
+                "disk_bytes": self._disk_bytes,
+            }
@@ -0,0 +1,279 @@
+"""
+Multi-process inference pool for CPU-only nodes.
+
+On CPU, _execute_sync runs under asyncio.to_thread, so concurrent jobs share
+one interpreter: Python-level work contends for the GIL and every job's
+intra-op thread pool competes for the same cores. CPUWorkerPool runs
+synthesis in N spawned processes instead:
+
+  - The engine exports the model and vocoder weights once to WEIGHTS_DIR
+    (tmpfs /dev/shm when available). Each worker builds the modules and
+    loads the weights with torch.load(mmap=True) +
+    load_state_dict(assign=True), so the parameters are views of the same
+    shared pages rather than N private copies.
+  - Each worker gets a fixed intra-op thread count and, on Linux, its own
+    slice of cores (sched_setaffinity), so workers do not oversubscribe.
+  - The engine process keeps normalization, caching, encoding and the job
+    state; it sends the normalized text and the cached prompt tensors over
+    IPC and gets the waveform back. Progress and cancellation flags are
+    shared through a multiprocessing Manager.
+
+Only the cached-prompt synthesis paths are dispatched; streaming and the
+file-based fallbacks stay in the engine process.
+"""
+
+import logging
+import os
+import tempfile
+import multiprocessing as mp
+from concurrent.futures import CancelledError, ProcessPoolExecutor, TimeoutError
+from typing import Callable, Dict, Optional
+
+import torch
+
+logger = logging.getLogger(__name__)
+
+# Per-process state of a worker, set by _init_worker()
+_worker: Dict[str, object] = {}
+
+
+class WorkerCancelled(Exception):
+    pass
+
+
+def default_weights_dir() -> str:
+    """Directory for exported weights; tmpfs keeps the shared pages in RAM."""
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(base, "zipvoice_weights")
+
+
+def export_weights(module: torch.nn.Module, path: str) -> str:
+    """Save module's state_dict for mmap loading by the workers."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.part"
+    torch.save(module.state_dict(), tmp)
+    os.replace(tmp, path)
+    return path
+
+
+def _load_shared(module: torch.nn.Module, path: str) -> torch.nn.Module:
+    state_dict = torch.load(path, mmap=True, weights_only=True, map_location="cpu")
+    module.load_state_dict(state_dict, assign=True)
+    return module
+
+
+def _pin_threads(index: int, threads: int):
+    torch.set_num_threads(threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass  # already set in this process
+    if hasattr(os, "sched_getaffinity"):
+        cores = sorted(os.sched_getaffinity(0))
+        start = (index * threads) % len(cores)
+        mine = [cores[(start + i) % len(cores)] for i in range(min(threads, len(cores)))]
+        try:
+            os.sched_setaffinity(0, mine)
+        except OSError as e:
+            logger.warning(f"[CPU Workers] Could not pin worker {index} to cores {mine}: {e}")
+
+
+def _init_worker(spec: dict, counter, progress, cancelled):
+    """ProcessPoolExecutor initializer: pin threads and load the model once."""
+    from zipvoice.bin.infer_zipvoice import (
+        get_vocoder, VocosFbank, ZipVoice, ZipVoiceDistill, EmiliaTokenizer,
+    )
+
+    with counter.get_lock():
+        index = counter.value
+        counter.value += 1
+    _pin_threads(index, spec["threads"])
+
+    if spec["tokenizer"] == "espeak":
+        from app.settings import PHONEME_CACHE_SIZE
+        from app.tokenizer import LoggingEspeakTokenizer
+        tokenizer = LoggingEspeakTokenizer(token_file=spec["token_file"], lang=spec["lang"],
+                                           cache_size=PHONEME_CACHE_SIZE)
+    else:
+        tokenizer = EmiliaTokenizer(token_file=spec["token_file"])
+
+    if spec["model_name"] == "zipvoice":
+        model = ZipVoice(**spec["model_cfg"], vocab_size=tokenizer.vocab_size, pad_id=tokenizer.pad_id)
+    else:
+        model = ZipVoiceDistill(**spec["model_cfg"], vocab_size=None, pad_id=None)
+    model = _load_shared(model, spec["model_weights"]).eval()
+    vocoder = _load_shared(get_vocoder(spec["vocos_dir"]), spec["vocoder_weights"]).eval()
+
+    _worker.update(
+        index=index,
+        model=model,
+        vocoder=vocoder,
+        tokenizer=tokenizer,
+        feature_extractor=VocosFbank(),
+        progress=progress,
+        cancelled=cancelled,
+    )
+
+
+def _worker_ready() -> int:
+    return os.getpid()
+
+
+@torch.inference_mode()
+def _synthesize_in_worker(job_id: str, params: dict) -> torch.Tensor:
+    from app.bracket_inference import has_brackets, synthesize_with_brackets_cached
+    from app.cached_inference import synthesize_cached
+
+    progress, cancelled = _worker["progress"], _worker["cancelled"]
+
+    def is_cancelled() -> bool:
+        return job_id in cancelled
+
+    def progress_cb(done: int, total: int):
+        progress[job_id] = float(done) / max(total, 1)
+        if is_cancelled():
+            raise WorkerCancelled(job_id)
+
+    if is_cancelled():
+        raise WorkerCancelled(job_id)
+
+    params = dict(params)
+    bracket_speed = params.pop("bracket_speed")
+    bracket_num_step = params.pop("bracket_num_step")
+    common = dict(
+        model=_worker["model"],
+        vocoder=_worker["vocoder"],
+        tokenizer=_worker["tokenizer"],
+        feature_extractor=_worker["feature_extractor"],
+        device=torch.device("cpu"),
+        progress_cb=progress_cb,
+        is_cancelled=is_cancelled,
+        **params,
+    )
+    if has_brackets(params["text"]):
+        wav, _ = synthesize_with_brackets_cached(
+            bracket_speed=bracket_speed, bracket_num_step=bracket_num_step, **common
+        )
+    else:
+        wav, _ = synthesize_cached(**common)
+    return wav
+
+
+class CPUWorkerPool:
+    """N spawned processes, each holding an mmap-shared copy of the model."""
+
+    def __init__(
+        self,
+        num_workers: int,
+        threads_per_worker: int,
+        model: torch.nn.Module,
+        vocoder: torch.nn.Module,
+        model_name: str,
+        model_cfg: dict,
+        token_file: str,
+        tokenizer: str,
+        lang: str,
+        vocos_dir: Optional[str],
+        weights_dir: Optional[str] = None,
+    ):
+        """
+        Args:
+            num_workers: Number of worker processes.
+            threads_per_worker: Intra-op threads per worker; 0 splits the
+                                available cores evenly.
+            model, vocoder: Loaded modules of the engine; their weights are
+                            exported once for the workers to mmap.
+            model_name, model_cfg, token_file, tokenizer, lang, vocos_dir:
+                What the workers need to rebuild the same modules.
+            weights_dir: Where to export the weights (default: /dev/shm).
+        """
+        self.num_workers = num_workers
+        if threads_per_worker <= 0:
+            cores = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+            threads_per_worker = max(1, cores // num_workers)
+        self.threads_per_worker = threads_per_worker
+
+        weights_dir = weights_dir or default_weights_dir()
+        model_weights = export_weights(model, os.path.join(weights_dir, f"model-{os.getpid()}.pt"))
+        vocoder_weights = export_weights(vocoder, os.path.join(weights_dir, f"vocoder-{os.getpid()}.pt"))
+        self._weight_files = [model_weights, vocoder_weights]
+
+        spec = dict(
+            threads=threads_per_worker,
+            model_name=model_name,
+            model_cfg=model_cfg,
+            token_file=token_file,
+            tokenizer=tokenizer,
+            lang=lang,
+            vocos_dir=vocos_dir,
+            model_weights=model_weights,
+            vocoder_weights=vocoder_weights,
+        )
+        ctx = mp.get_context("spawn")
+        self._manager = ctx.Manager()
+        self._progress = self._manager.dict()
+        self._cancelled = self._manager.dict()
+        self._executor = ProcessPoolExecutor(
+            max_workers=num_workers,
+            mp_context=ctx,
+            initializer=_init_worker,
+            initargs=(spec, ctx.Value("i", 0), self._progress, self._cancelled),
+        )
+        # Start every worker now so model loading errors surface at startup
+        pids = [f.result() for f in [self._executor.submit(_worker_ready) for _ in range(num_workers)]]
+        print(f"[CPU Workers] {len(set(pids))} worker processes ready, "
+              f"{threads_per_worker} threads each (weights in {weights_dir})")
+
+    def synthesize(
+        self,
+        job_id: str,
+        params: dict,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+        poll_interval: float = 0.2,
+    ) -> torch.Tensor:
+        """
+        Run synthesize_(with_brackets_)cached in a worker and wait for the waveform.
+
+        Args:
+            job_id: Job id, used for the shared progress/cancel flags.
+            params: Keyword arguments of synthesize_cached minus the model
+                    components, plus bracket_speed and bracket_num_step.
+            is_cancelled: Polled while waiting; once True the worker is told
+                          to stop and CancelledError is raised.
+            on_progress: Called with (done, 1000) as the worker reports.
+
+        Returns:
+            Waveform (C, T) on CPU.
+        """
+        future = self._executor.submit(_synthesize_in_worker, job_id, params)
+        try:
+            while True:
+                try:
+                    return future.result(timeout=poll_interval)
+                except TimeoutError:
+                    pass
+                if is_cancelled is not None and is_cancelled():
+                    self._cancelled[job_id] = True
+                    future.cancel()
+                    raise CancelledError(job_id)
+                if on_progress is not None:
+                    on_progress(int(self._progress.get(job_id, 0.0) * 1000), 1000)
+        except WorkerCancelled:
+            raise CancelledError(job_id)
+        finally:
+            self._progress.pop(job_id, None)
+            if future.done():
+                self._cancelled.pop(job_id, None)
+            else:
+                # The worker still reads the flag; drop it once it has stopped
+                future.add_done_callback(lambda _: self._cancelled.pop(job_id, None))
+
+    def close(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._manager.shutdown()
+        for path in self._weight_files:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
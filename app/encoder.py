@@ -0,0 +1,106 @@
+"""
+Off-thread audio encoding for finished jobs.
+
+Jobs used to save a WAV with torchaudio.save(), spawn `ffmpeg` to turn it
+into a 64k MP3 and delete the WAV, all on the inference thread. AudioEncoder
+takes the final waveform in memory and encodes it on a small thread pool,
+so the inference thread can pick up the next job immediately:
+
+  - MP3 is encoded in-process through torchaudio's FFmpeg bindings
+    (libavcodec/libmp3lame), no subprocess and no intermediate WAV.
+  - If the FFmpeg bindings are unavailable, raw PCM is piped to the
+    `ffmpeg` binary instead, which still avoids the WAV round trip.
+  - Files are written to a temporary name and renamed into place, so a
+    half-written file is never visible under /files.
+"""
+
+import logging
+import os
+import subprocess
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import torch
+import torchaudio
+
+from app.metrics import time_stage
+
+logger = logging.getLogger(__name__)
+
+
+def _encode_mp3_inprocess(wav: torch.Tensor, sampling_rate: int, path: str, bitrate_kbps: int):
+    from torchaudio.io import CodecConfig
+
+    torchaudio.save(
+        path, wav, sampling_rate,
+        format="mp3",
+        backend="ffmpeg",
+        compression=CodecConfig(bit_rate=bitrate_kbps * 1000),
+    )
+
+
+def _encode_mp3_pipe(wav: torch.Tensor, sampling_rate: int, path: str, bitrate_kbps: int):
+    audio_np = (wav.numpy() * 32768.0).clip(-32768, 32767).astype("<i2")
+    cmd = [
+        "ffmpeg", "-y", "-loglevel", "error",
+        "-f", "s16le", "-ar", str(sampling_rate), "-ac", str(audio_np.shape[0]), "-i", "pipe:0",
+        "-c:a", "libmp3lame", "-b:a", f"{bitrate_kbps}k", "-f", "mp3", path,
+    ]
+    subprocess.run(cmd, input=audio_np.T.tobytes(), check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
+
+class AudioEncoder:
+    """Encodes finished waveforms to wav/mp3 files on a worker pool."""
+
+    def __init__(self, max_workers: int = 2, mp3_bitrate_kbps: int = 64):
+        self.mp3_bitrate_kbps = mp3_bitrate_kbps
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="audio-encoder")
+        self._lock = threading.Lock()
+        self._inprocess_mp3 = True  # switched off after the first failure
+
+    def submit(self, wav: torch.Tensor, sampling_rate: int, out_path: str, audio_type: str = "mp3") -> Future:
+        """
+        Queue encoding of wav (C, T) to out_path.
+
+        The extension of out_path is replaced to match audio_type. Returns a
+        Future resolving to the path of the written file.
+        """
+        wav = wav.detach().to("cpu", torch.float32)
+        final_path = os.path.splitext(out_path)[0] + (".mp3" if audio_type == "mp3" else ".wav")
+        return self._pool.submit(self.encode, wav, sampling_rate, final_path, audio_type)
+
+    def encode(self, wav: torch.Tensor, sampling_rate: int, path: str, audio_type: str = "mp3") -> str:
+        """Encode synchronously to path (written atomically) and return path."""
+        tmp_path = f"{path}.part"
+        try:
+            if audio_type == "mp3":
+                with time_stage("encoding"):
+                    self._encode_mp3(wav, sampling_rate, tmp_path)
+            else:
+                with time_stage("file_write"):
+                    torchaudio.save(tmp_path, wav, sampling_rate, format="wav")
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+        return path
+
+    def _encode_mp3(self, wav: torch.Tensor, sampling_rate: int, path: str):
+        if self._inprocess_mp3:
+            try:
+                _encode_mp3_inprocess(wav, sampling_rate, path, self.mp3_bitrate_kbps)
+                return
+            except Exception as e:
+                with self._lock:
+                    if self._inprocess_mp3:
+                        self._inprocess_mp3 = False
+                        logger.warning(f"[Encoder] In-process MP3 encoding unavailable ({e}); "
+                                       f"piping PCM to ffmpeg instead")
+        _encode_mp3_pipe(wav, sampling_rate, path, self.mp3_bitrate_kbps)
+
+    def close(self):
+        self._pool.shutdown(wait=True)
@@ -1,7 +1,7 @@
-import os, json, uuid, asyncio, datetime as dt, torch, safetensors.torch, time
+import os, json, uuid, asyncio, datetime as dt, torch, torchaudio, safetensors.torch, time
 import gc  # <--- NEW: Needed for garbage collection
-from dataclasses import dataclass, field
-from typing import Optional, Dict
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from typing import Optional, Dict, List, AsyncIterator, Iterator
 from huggingface_hub import hf_hub_download
 from torch.amp import autocast
 from zipvoice.utils.checkpoint import load_checkpoint
@@ -10,45 +10,53 @@ from zipvoice.bin.infer_zipvoice import (
     ZipVoice, ZipVoiceDistill, EmiliaTokenizer, EspeakTokenizer,
     load_trt, HUGGINGFACE_REPO, MODEL_DIR
 )
-from app.normalizer.processing import normalize_vietnamese_text
-from app.bracket_inference import has_brackets, generate_sentence_with_brackets
-from app.cached_inference import generate_sentence_cached
+from app.normalizer.pipeline import get_normalization_pipeline
+from app.normalizer.dictionary_cache import get_dictionary_cache
+from app.normalizer.sentence_cache import get_sentence_cache, split_sentences
+from app.normalizer.llm_client import get_llm_normalizer
+from app.bracket_inference import (
+    has_brackets, generate_sentence_with_brackets, synthesize_with_brackets_cached,
+    parse_bracketed_text, merge_segments, iter_bracket_segments_cached, synthesize_blocks_cached,
+)
+from app.cached_inference import synthesize_cached, iter_sentence_cached, tokenize_prompt
+from app.encoder import AudioEncoder
+from app.result_cache import ResultCache, make_key
+from app.chunk_cache import ChunkCache
+from app.streaming import (
+    StreamingCrossFader, trim_leading_silence, trim_trailing_silence,
+    to_pcm16, wav_stream_header,
+)
+from app.batch_scheduler import BatchScheduler
+from app.scheduler import JobScheduler, estimate_job_cost
+from app.cpu_workers import CPUWorkerPool
+from app import metrics
 from zipvoice.utils.infer import load_prompt_wav, remove_silence, rms_norm
 
 from .settings import (
     RESULTS_DIR, MODEL_NAME, ZIPVOICE_MODEL_DIR, VOCOS_LOCAL_DIR,
-    DEVICE, TOKENIZER, LANG_TOKENIZER, MAX_DURATION,
-    BRACKET_SPEED, BRACKET_NUM_STEP
+    DEVICE, TOKENIZER, LANG_TOKENIZER, PHONEME_CACHE_SIZE, MAX_DURATION,
+    BRACKET_SPEED, BRACKET_NUM_STEP, DYNAMIC_BATCHING, BATCH_WAIT_MS,
+    ENCODER_WORKERS, MP3_BITRATE_KBPS, JOBS_DB_PATH,
+    RESULT_CACHE, RESULT_CACHE_MAX_MB,
+    CHUNK_CACHE, CHUNK_CACHE_MEMORY_MB, CHUNK_CACHE_DISK_MB, CHUNK_CACHE_DIR,
+    SCHEDULER_AGING_SECONDS, CPU_WORKERS, CPU_WORKER_THREADS, CPU_WORKER_WEIGHTS_DIR,
+    USE_LLM_NORMALIZER, OVERLAP_NORMALIZATION, NORMALIZE_WORKERS,
 )
 from .registry import VoiceRegistry, Voice
+from .job_store import JobStore, TTSJob, TERMINAL_STATUSES
 
 class JobCancelledError(Exception):
     pass
 
-@dataclass
-class TTSJob:
-    id: str
-    text: str
-    voice_id: str
-    out_wav_path: str
-    speed: float = 1.0
-    num_step: Optional[int] = None
-    guidance_scale: Optional[float] = None
-    remove_long_sil: bool = False
-    audio_type: str = "mp3"
-    status: str = "queued" 
-    progress: float = 0.0
-    error: Optional[str] = None
-    created_at: dt.datetime = field(default_factory=dt.datetime.utcnow)
-    finished_at: Optional[dt.datetime] = None
-
 class ZipVoiceEngine:
     def __init__(self, registry: VoiceRegistry):
         self.device = torch.device(DEVICE if torch.cuda.is_available() else "cpu")
         os.makedirs(RESULTS_DIR, exist_ok=True)
         self.registry = registry
         self.max_concurrent = int(os.getenv("MAX_CONCURRENT", "2"))
-        self.sema = asyncio.Semaphore(self.max_concurrent)
+        # Admission by priority class, then shortest expected job (see app/scheduler.py)
+        self.scheduler = JobScheduler(self.max_concurrent, aging_seconds=SCHEDULER_AGING_SECONDS)
+        self.loop: Optional[asyncio.AbstractEventLoop] = None  # set by run()
 
         # -- Load model config & weights --
         if ZIPVOICE_MODEL_DIR:
@@ -67,7 +75,8 @@ class ZipVoiceEngine:
         if TOKENIZER == "espeak":
             #self.tokenizer = EspeakTokenizer(token_file=token_file, lang=LANG_TOKENIZER)
             from app.tokenizer import LoggingEspeakTokenizer
-            self.tokenizer = LoggingEspeakTokenizer(token_file=token_file, lang=LANG_TOKENIZER)
+            self.tokenizer = LoggingEspeakTokenizer(token_file=token_file, lang=LANG_TOKENIZER,
+                                                    cache_size=PHONEME_CACHE_SIZE)
         else:
             self.tokenizer = EmiliaTokenizer(token_file=token_file)
 
@@ -85,13 +94,72 @@ class ZipVoiceEngine:
             load_checkpoint(filename=model_ckpt, model=self.model, strict=True)
 
         self.model = self.model.to(self.device, dtype=torch.float16).eval()
+        # Identifies the weights in result cache keys
+        self.model_id = f"{MODEL_NAME}:{os.path.abspath(model_ckpt)}:{os.path.getmtime(model_ckpt)}"
 
         self.vocoder = get_vocoder(VOCOS_LOCAL_DIR).to(self.device).eval()
         self.feature_extractor = VocosFbank()
         self.sampling_rate = cfg["feature"]["sampling_rate"]
 
+        # Cross-job batching: one sampling thread packs chunks of all running jobs
+        self.batcher: Optional[BatchScheduler] = None
+        if DYNAMIC_BATCHING:
+            self.batcher = BatchScheduler(
+                self.model, self.device,
+                max_duration=MAX_DURATION, max_wait=BATCH_WAIT_MS / 1000.0,
+            )
+            self.batcher.start()
+
+        # Vocoded chunks shared across jobs (memory LRU, spilling to disk)
+        self.chunk_cache: Optional[ChunkCache] = None
+        if CHUNK_CACHE:
+            self.chunk_cache = ChunkCache(
+                max_memory_bytes=int(CHUNK_CACHE_MEMORY_MB * 1024 * 1024),
+                spill_dir=CHUNK_CACHE_DIR,
+                max_disk_bytes=int(CHUNK_CACHE_DISK_MB * 1024 * 1024),
+            )
+
+        # CPU-only nodes: synthesize in worker processes sharing mmap'd weights
+        self.cpu_pool: Optional[CPUWorkerPool] = None
+        if CPU_WORKERS > 0 and self.device.type == "cpu":
+            self.cpu_pool = CPUWorkerPool(
+                num_workers=CPU_WORKERS,
+                threads_per_worker=CPU_WORKER_THREADS,
+                model=self.model,
+                vocoder=self.vocoder,
+                model_name=MODEL_NAME,
+                model_cfg=cfg["model"],
+                token_file=token_file,
+                tokenizer=TOKENIZER,
+                lang=LANG_TOKENIZER,
+                vocos_dir=VOCOS_LOCAL_DIR,
+                weights_dir=CPU_WORKER_WEIGHTS_DIR or None,
+            )
+
+        # Final wav/mp3 files are encoded off the inference thread
+        self.encoder = AudioEncoder(max_workers=ENCODER_WORKERS, mp3_bitrate_kbps=MP3_BITRATE_KBPS)
+
         self.queue: asyncio.Queue[str] = asyncio.Queue()
+        # Active (queued/running) jobs; finished jobs live in the store only
         self.jobs : Dict[str, TTSJob] = {}
+        self.store = JobStore(JOBS_DB_PATH)
+        # Finished results keyed by request; _cache_keys holds the keys a
+        # running job will be stored under once it is done.
+        self.result_cache: Optional[ResultCache] = None
+        if RESULT_CACHE:
+            self.result_cache = ResultCache(RESULTS_DIR, JOBS_DB_PATH, int(RESULT_CACHE_MAX_MB * 1024 * 1024))
+        self._cache_keys: Dict[str, List[str]] = {}
+        self.store.import_result_files(RESULTS_DIR)
+        self._recover_jobs()
+
+        metrics.REGISTRY.add_collector(self._collect_metrics)
+
+        # Word lists and patterns of the normalizer, loaded once for all jobs
+        self.normalizer = get_normalization_pipeline()
+        # Sentences of running jobs are normalized here while their first blocks synthesize
+        self.normalize_pool: Optional[ThreadPoolExecutor] = None
+        if OVERLAP_NORMALIZATION:
+            self.normalize_pool = ThreadPoolExecutor(max_workers=NORMALIZE_WORKERS, thread_name_prefix="normalize")
 
         # Pre-compute prompt tensors for all registered voices
         self._warm_voice_cache()
@@ -100,8 +168,9 @@ class ZipVoiceEngine:
         """Pre-compute prompt tensors for all registered voices.
         
         For each voice, loads the prompt wav, removes silence, normalizes RMS,
-        and extracts features. Results are cached on the Voice object to
-        avoid redundant I/O on every inference call.
+        extracts features and tokenizes the prompt text. Results are cached
+        on the Voice object to avoid redundant I/O and tokenization on every
+        inference call.
         """
         for voice in self.registry._voices.values():
             try:
@@ -116,76 +185,377 @@ class ZipVoiceEngine:
                 voice.cached_wav_tensor = wav
                 voice.cached_prompt_rms = rms.item() if isinstance(rms, torch.Tensor) else rms
                 voice.cached_prompt_features = features
+                voice.cached_prompt_tokens = tokenize_prompt(
+                    voice.prompt_text, wav, self.tokenizer, self.sampling_rate
+                )
                 
                 print(f"[Voice Cache] Cached '{voice.voice_id}': "
-                      f"wav={wav.shape}, features={features.shape}")
+                      f"wav={wav.shape}, features={features.shape}, "
+                      f"tokens={len(voice.cached_prompt_tokens.tokens)}")
             except Exception as e:
                 print(f"[Voice Cache] WARNING: Failed to cache '{voice.voice_id}': {e}")
                 # Will fall back to file-based loading at inference time
 
-    def get_job(self, job_id: str) -> Optional[TTSJob]:
-        if job_id in self.jobs:
-            return self.jobs[job_id]
-        
-        # Check for wav
-        wav_path = os.path.join(RESULTS_DIR, f"{job_id}.wav")
-        if os.path.exists(wav_path):
-            return TTSJob(
-                id=job_id,
-                text="<restored_from_disk>",
-                voice_id="<unknown>",
-                out_wav_path=wav_path,
-                audio_type="wav",
-                status="done",
-                progress=1.0,
-                finished_at=dt.datetime.fromtimestamp(os.path.getmtime(wav_path)),
-                error=None
-            )
+    def _collect_metrics(self):
+        """Refresh scrape-time gauges from the scheduler and cache counters."""
+        queue = self.scheduler.stats()
+        metrics.QUEUE_DEPTH.set(queue["waiting"])
+        metrics.RUNNING_JOBS.set(queue["running"])
+        if self.result_cache is not None:
+            st = self.result_cache.stats()
+            for stage, hits in st["hits"].items():
+                metrics.RESULT_CACHE_HITS.set_total(hits, stage=stage)
+            metrics.RESULT_CACHE_MISSES.set_total(st["misses"])
+            metrics.RESULT_CACHE_HIT_RATIO.set(st["hit_rate"])
+        if self.chunk_cache is not None:
+            st = self.chunk_cache.stats()
+            metrics.CHUNK_CACHE_HITS.set_total(st["hits"] - st["disk_hits"], level="memory")
+            metrics.CHUNK_CACHE_HITS.set_total(st["disk_hits"], level="disk")
+            metrics.CHUNK_CACHE_MISSES.set_total(st["misses"])
+            metrics.CHUNK_CACHE_HIT_RATIO.set(st["hit_rate"])
+        sentence_cache = get_sentence_cache()
+        if sentence_cache is not None:
+            st = sentence_cache.stats()
+            metrics.SENTENCE_CACHE_HITS.set_total(st["hits"] - st["db_hits"], level="memory")
+            metrics.SENTENCE_CACHE_HITS.set_total(st["db_hits"], level="db")
+            metrics.SENTENCE_CACHE_MISSES.set_total(st["misses"])
+            metrics.SENTENCE_CACHE_HIT_RATIO.set(st["hit_rate"])
+        phoneme_cache = getattr(self.tokenizer, "phoneme_cache", None)
+        if phoneme_cache is not None:
+            st = phoneme_cache.stats()
+            metrics.PHONEME_CACHE_HITS.set_total(st["hits"])
+            metrics.PHONEME_CACHE_MISSES.set_total(st["misses"])
+            metrics.PHONEME_CACHE_HIT_RATIO.set(st["hit_rate"])
+
+    def _recover_jobs(self):
+        """Re-queue jobs that were queued or running when the process stopped."""
+        pending = self.store.by_status(("queued", "running"))
+        for job in pending:
+            job.status = "queued"
+            job.progress = 0.0
+            self.jobs[job.id] = job
+            self.queue.put_nowait(job.id)
+        if pending:
+            self.store.save_many(pending)
+            print(f"[Engine] Re-queued {len(pending)} unfinished jobs from the job store.")
+
+    def _finalize(self, job: TTSJob):
+        """Persist a finished job and drop it from the active set."""
+        if job.status not in TERMINAL_STATUSES:
+            return
+        if job.finished_at is None:
+            job.finished_at = dt.datetime.utcnow()
+        self.store.save(job)
+        if self.jobs.pop(job.id, None) is not None:
+            metrics.JOBS.inc(status=job.status)
+        keys = self._cache_keys.pop(job.id, None)
+        if keys and job.status == "done" and self.result_cache is not None:
+            try:
+                self.result_cache.put(keys, job.out_wav_path)
+            except Exception as e:
+                print(f"[Result Cache] WARNING: could not store result of {job.id}: {e}")
 
-        # Check for mp3
-        mp3_path = os.path.join(RESULTS_DIR, f"{job_id}.mp3")
-        if os.path.exists(mp3_path):
-            return TTSJob(
-                id=job_id,
-                text="<restored_from_disk>",
-                voice_id="<unknown>",
-                out_wav_path=mp3_path,
-                audio_type="mp3",
-                status="done",
-                progress=1.0,
-                finished_at=dt.datetime.fromtimestamp(os.path.getmtime(mp3_path)),
-                error=None
-            )
-            
-        return None
+    def _result_key(self, job: TTSJob, voice: Voice, text: str, normalized: bool = True) -> str:
+        """
+        Cache key over the text and every parameter that changes the output.
+
+        The audio of raw (not normalized) text also depends on the normalizer
+        that reads it: its version (sources, word lists, settings) and the
+        learned dictionary, whose pairs are only ever added (so its size
+        tells its states apart).
+        """
+        try:
+            prompt_mtime = os.path.getmtime(voice.prompt_wav)
+        except OSError:
+            prompt_mtime = None
+        normalizer = None
+        if not normalized:
+            normalizer = (self.normalizer.version, get_dictionary_cache().size)
+        return make_key(
+            text=text,
+            normalizer=normalizer,
+            voice_id=job.voice_id,
+            prompt_text=voice.prompt_text,
+            prompt_wav=voice.prompt_wav,
+            prompt_mtime=prompt_mtime,
+            speed=float(job.speed),
+            num_step=job.num_step if job.num_step is not None else self.defaults["num_step"],
+            guidance_scale=float(job.guidance_scale if job.guidance_scale is not None
+                                 else self.defaults["guidance_scale"]),
+            remove_long_sil=bool(job.remove_long_sil),
+            audio_type="mp3" if job.audio_type == "mp3" else "wav",
+            model=self.model_id,
+            bracket=(BRACKET_SPEED, BRACKET_NUM_STEP),
+        )
+
+    def _chunk_cache_ns(self, voice: Voice) -> str:
+        """Chunk cache namespace: chunks are only shared within one voice prompt and model."""
+        try:
+            prompt_mtime = os.path.getmtime(voice.prompt_wav)
+        except OSError:
+            prompt_mtime = None
+        return f"{voice.voice_id}|{voice.prompt_wav}|{prompt_mtime}|{self.model_id}"
+
+    def _serve_from_cache(self, job: TTSJob, key: str, stage: str) -> bool:
+        """Finish job from the result cache if key is cached. Returns True on a hit."""
+        if self.result_cache is None:
+            return False
+        path = self.result_cache.materialize(key, os.path.join(RESULTS_DIR, job.id), stage=stage)
+        if path is None:
+            return False
+        job.out_wav_path = path
+        job.progress = 1.0
+        job.status = "done"
+        job.finished_at = dt.datetime.utcnow()
+        return True
+
+    def get_job(self, job_id: str) -> Optional[TTSJob]:
+        job = self.jobs.get(job_id)
+        if job is not None:
+            return job
+        return self.store.get(job_id)
 
     async def submit(self, text: str, voice_id: str,
-                     speed=1.0, num_step=None, guidance_scale=None, remove_long_sil=False, audio_type="mp3") -> str:
+                     speed=1.0, num_step=None, guidance_scale=None, remove_long_sil=False, audio_type="mp3",
+                     priority="normal") -> str:
         job_id = str(uuid.uuid4())
         out_path = os.path.join(RESULTS_DIR, f"{job_id}.wav")
-        job = TTSJob(job_id, text, voice_id, out_path, speed, num_step, guidance_scale, remove_long_sil, audio_type=audio_type)
+        job = TTSJob(job_id, text, voice_id, out_path, speed, num_step, guidance_scale, remove_long_sil,
+                     audio_type=audio_type, priority=priority)
+        try:
+            voice = self.registry.get(voice_id)
+        except KeyError as e:
+            job.status = "error"
+            job.error = str(e)
+            job.finished_at = dt.datetime.utcnow()
+            self.store.save(job)
+            metrics.JOBS.inc(status=job.status)
+            return job_id
+        if self.result_cache is not None:
+            raw_key = self._result_key(job, voice, text, normalized=False)
+            if self._serve_from_cache(job, raw_key, stage="submit"):
+                self.store.save(job)
+                metrics.JOBS.inc(status=job.status)
+                return job_id
+            self._cache_keys[job_id] = [raw_key]
         self.jobs[job_id] = job
+        self.store.save(job)
         await self.queue.put(job_id)
         return job_id
 
+    def create_stream_job(self, text: str, voice_id: str,
+                          speed=1.0, num_step=None, guidance_scale=None, priority="normal") -> TTSJob:
+        """Register a job for stream_audio(). It is not put on the queue."""
+        job_id = str(uuid.uuid4())
+        out_path = os.path.join(RESULTS_DIR, f"{job_id}.wav")
+        job = TTSJob(job_id, text, voice_id, out_path, speed, num_step, guidance_scale,
+                     audio_type="wav", priority=priority)
+        self.jobs[job_id] = job
+        return job
+
+    async def stream_audio(self, job: TTSJob, fmt: str = "wav") -> AsyncIterator[bytes]:
+        """
+        Synthesize a stream job and yield audio bytes as each chunk is vocoded.
+
+        fmt="wav" yields a streaming RIFF header followed by PCM16 frames,
+        fmt="pcm" yields raw PCM16 only. The job takes a concurrency slot
+        like a queued job, shows up in /v1/jobs/{id}, and the full audio is
+        saved as {id}.wav once the stream completes. If the consumer goes
+        away, the job is cancelled and generation stops after the current
+        chunk.
+        """
+        loop = asyncio.get_running_loop()
+        frames: asyncio.Queue = asyncio.Queue()
+
+        def emit(item):
+            loop.call_soon_threadsafe(frames.put_nowait, item)
+
+        async def produce():
+            try:
+                wait = await self.scheduler.acquire(job.id, job.priority, self._job_cost(job))
+                if wait is None:
+                    return
+                job.queue_wait = wait
+                try:
+                    if job.status == "cancelled":
+                        return
+                    await asyncio.to_thread(self._stream_sync, job, emit)
+                finally:
+                    self.scheduler.release(job.id)
+            finally:
+                self._finalize(job)
+                emit(None)
+
+        producer = asyncio.create_task(produce())
+        try:
+            if fmt == "wav":
+                yield wav_stream_header(self.sampling_rate)
+            while True:
+                item = await frames.get()
+                if item is None:
+                    break
+                yield item
+            await producer
+            if job.status == "error":
+                # Headers are already sent; a truncated body is the only signal left.
+                raise RuntimeError(f"Streaming job {job.id} failed: {job.error}")
+        finally:
+            if job.status in ("queued", "running"):
+                self.cancel_job(job.id)
+
+    def _iter_stream_pieces(self, job: TTSJob, voice: Voice, text: str,
+                            num_step: int, guidance: float, on_progress, is_cancelled) -> Iterator[torch.Tensor]:
+        """
+        Yield final (cross-faded, edge-trimmed) audio pieces for a stream job.
+
+        Mirrors the cached branches of _execute_sync(): text with 【X】
+        segments is streamed per segment, everything else per chunk.
+        """
+        common = dict(
+            prompt_text=voice.prompt_text,
+            prompt_wav_tensor=voice.cached_wav_tensor,
+            prompt_rms=voice.cached_prompt_rms,
+            prompt_features=voice.cached_prompt_features,
+            tokenized_prompt=voice.cached_prompt_tokens,
+            model=self.model,
+            vocoder=self.vocoder,
+            tokenizer=self.tokenizer,
+            device=self.device,
+            num_step=num_step,
+            guidance_scale=guidance,
+            speed=job.speed,
+            sampling_rate=self.sampling_rate,
+            max_duration=MAX_DURATION,
+            progress_cb=on_progress,
+            batcher=self.batcher,
+            batch_owner=job.id,
+            batch_priority=self.scheduler.priority_rank(job.priority),
+            is_cancelled=is_cancelled,
+            preempt_cb=self._preempt_cb(job),
+            chunk_cache=self.chunk_cache,
+            chunk_cache_ns=self._chunk_cache_ns(voice),
+        )
+
+        segments = merge_segments(parse_bracketed_text(text)) if has_brackets(text) else []
+        if any(s.is_bracket for s in segments):
+            # Segments come back already trimmed and padded with their gap
+            fader = StreamingCrossFader(fade_duration=0.02, sample_rate=self.sampling_rate)
+            for wav in iter_bracket_segments_cached(
+                segments=segments,
+                feature_extractor=self.feature_extractor,
+                bracket_speed=BRACKET_SPEED,
+                bracket_num_step=BRACKET_NUM_STEP,
+                **common,
+            ):
+                yield fader.push(wav)
+        else:
+            if segments:
+                text = " ".join(s.text for s in segments)
+            fader = StreamingCrossFader(fade_duration=0.1, sample_rate=self.sampling_rate)
+            first = True
+            for wav, is_last in iter_sentence_cached(text=text, **common):
+                # Same edge handling as remove_silence(only_edge=True) on the whole file
+                if first:
+                    wav = trim_leading_silence(wav, self.sampling_rate)
+                    first = False
+                if is_last:
+                    wav = trim_trailing_silence(wav, self.sampling_rate)
+                yield fader.push(wav)
+        tail = fader.flush()
+        if tail is not None:
+            yield tail
+
+    @torch.inference_mode()
+    def _stream_sync(self, job: TTSJob, emit):
+        if job.status == "cancelled": return
+
+        job.status = "running"
+        try:
+            voice: Voice = self.registry.get(job.voice_id)
+            if voice.cached_wav_tensor is None or voice.cached_prompt_features is None:
+                raise RuntimeError(f"Voice '{job.voice_id}' has no cached prompt; streaming needs a cached voice")
+
+            num_step = job.num_step if job.num_step is not None else self.defaults["num_step"]
+            guidance = job.guidance_scale if job.guidance_scale is not None else self.defaults["guidance_scale"]
+
+            def on_progress(done: int, total: int):
+                if job.status == "cancelled":
+                    raise JobCancelledError("Job was cancelled by user request.")
+                job.progress = float(done) / max(total, 1)
+
+            def is_cancelled() -> bool:
+                return job.status == "cancelled"
+
+            with metrics.time_stage("normalization"):
+                input_text = self.normalizer.normalize(job.text)
+
+            pieces = []
+            synth_start = time.perf_counter()
+            with autocast(device_type=self.device.type):
+                for piece in self._iter_stream_pieces(job, voice, input_text, num_step, guidance,
+                                                      on_progress, is_cancelled):
+                    if job.status == "cancelled":
+                        raise JobCancelledError("Job cancelled while streaming.")
+                    if piece.shape[-1] == 0:
+                        continue
+                    pieces.append(piece)
+                    emit(to_pcm16(piece))
+
+            if job.status == "cancelled":
+                raise JobCancelledError("Job cancelled at finalization.")
+
+            # Keep the full audio so /v1/jobs/{id}/audio works after the stream
+            final_wav = torch.cat(pieces, dim=-1) if pieces else torch.zeros(1, 0)
+            metrics.observe_job(job.voice_id, time.perf_counter() - synth_start,
+                                final_wav.shape[-1] / self.sampling_rate)
+            with metrics.time_stage("file_write"):
+                torchaudio.save(job.out_wav_path, final_wav, sample_rate=self.sampling_rate)
+            job.progress = 1.0
+            job.status = "done"
+
+        except (JobCancelledError, CancelledError):
+            job.status = "cancelled"
+            job.progress = 0.0
+            gc.collect()
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+            print(f"[Engine] Stream job {job.id} cancelled.")
+
+        except Exception as e:
+            job.status = "error"
+            job.error = str(e)
+            print(f"[Engine] Stream job {job.id} failed: {e}")
+        finally:
+            job.finished_at = dt.datetime.utcnow()
+
     def cancel_job(self, job_id: str) -> bool:
-        if job_id not in self.jobs: return False
-        job = self.jobs[job_id]
-        if job.status in ["done", "error", "cancelled"]: return True
+        job = self.jobs.get(job_id)
+        if job is None:
+            return self.store.get(job_id) is not None
+        if job.status in TERMINAL_STATUSES: return True
+        was_queued = job.status == "queued"
         job.status = "cancelled"
         job.finished_at = dt.datetime.utcnow()
+        # Also wakes a running job that is waiting after yielding its slot
+        self.scheduler.remove(job_id)
+        # A running job is finalized by its worker once generation stops
+        if was_queued:
+            self._finalize(job)
         return True
 
     def cancel_all_jobs(self) -> int:
         count = 0
-        for jid, job in self.jobs.items():
+        for job in list(self.jobs.values()):
             if job.status in ["queued", "running"]:
-                job.status = "cancelled"
-                job.finished_at = dt.datetime.utcnow()
+                self.cancel_job(job.id)
                 count += 1
         return count
 
     async def run(self):
+        self.loop = asyncio.get_running_loop()
+        if USE_LLM_NORMALIZER:
+            # LLM requests of all jobs share this loop and its connection pool
+            get_llm_normalizer().transport.attach_loop(self.loop)
         asyncio.create_task(self._memory_cleanup_loop())
         while True:
             job_id = await self.queue.get()
@@ -194,45 +564,87 @@ class ZipVoiceEngine:
     async def _memory_cleanup_loop(self):
         while True:
             await asyncio.sleep(3600)
-            now = dt.datetime.utcnow()
-            to_remove = []
-            for jid, job in self.jobs.items():
-                if job.status in ["done", "error", "cancelled"] and job.finished_at:
-                    age = (now - job.finished_at).total_seconds()
-                    if age > 86400: 
-                        to_remove.append(jid)
-            for jid in to_remove:
-                self.jobs.pop(jid, None)
-            if to_remove:
-                print(f"[Memory Cleaner] Removed {len(to_remove)} old jobs from RAM.")
+            cutoff = dt.datetime.utcnow() - dt.timedelta(days=1)
+            removed = self.store.delete_finished_before(("error", "cancelled"), cutoff)
+            if removed:
+                print(f"[Job Cleaner] Removed {removed} old failed/cancelled jobs from the job store.")
 
     def prune_disk_files(self, days: int) -> int:
         if days < 3: raise ValueError("Safety guard: Minimum retention is 3 days.")
-        now = time.time()
-        cutoff = now - (days * 86400)
+        cutoff = dt.datetime.utcnow() - dt.timedelta(days=days)
         count = 0
-        for filename in os.listdir(RESULTS_DIR):
-            if not (filename.endswith(".wav") or filename.endswith(".mp3")): continue
-            filepath = os.path.join(RESULTS_DIR, filename)
+        pruned = []
+        for job in self.store.finished_before("done", cutoff):
             try:
-                mtime = os.path.getmtime(filepath)
-                if mtime < cutoff:
-                    os.remove(filepath)
+                if os.path.exists(job.out_wav_path):
+                    os.remove(job.out_wav_path)
                     count += 1
-                    job_id = os.path.splitext(filename)[0]
-                    self.jobs.pop(job_id, None)
+                pruned.append(job.id)
             except OSError: pass
+        self.store.delete(pruned)
         return count
 
+    def _preempt_cb(self, job: TTSJob):
+        """Called between ODE steps: hand the slot to a more urgent waiting job."""
+        def preempt():
+            if self.loop is None or not self.scheduler.should_yield(job.id):
+                return
+            print(f"[Engine] Job {job.id} yields its slot to a higher-priority job.")
+            resumed = asyncio.run_coroutine_threadsafe(self.scheduler.yield_slot(job.id), self.loop).result()
+            if not resumed:
+                raise JobCancelledError("Job cancelled while preempted.")
+        return preempt
+
+    def _job_cost(self, job: TTSJob) -> float:
+        num_step = job.num_step if job.num_step is not None else self.defaults["num_step"]
+        return estimate_job_cost(job.text, num_step, BRACKET_NUM_STEP, BRACKET_SPEED)
+
     async def _admit(self, job_id):
-        async with self.sema:
+        job = None
+        try:
             job = self.jobs.get(job_id)
             if not job: return
             if job.status == "cancelled": return
-            await asyncio.to_thread(self._execute_sync, job)
+            wait = await self.scheduler.acquire(job_id, job.priority, self._job_cost(job))
+            if wait is None: return  # cancelled while waiting
+            job.queue_wait = wait
+            try:
+                if job.status == "cancelled": return
+                encoded = await asyncio.to_thread(self._execute_sync, job)
+            finally:
+                self.scheduler.release(job_id)
+            # Encoding runs on the encoder pool; the slot is already free for the next job
+            if encoded is not None:
+                await self._finish_encoding(job, encoded)
+        finally:
+            if job is not None:
+                self._finalize(job)
+
+    async def _finish_encoding(self, job: TTSJob, encoded: Future):
+        try:
+            path = await asyncio.wrap_future(encoded)
+            if job.status == "cancelled":
+                try: os.remove(path)
+                except OSError: pass
+                return
+            job.out_wav_path = path
+            job.progress = 1.0
+            job.status = "done"
+        except Exception as e:
+            if job.status != "cancelled":
+                job.status = "error"
+                job.error = f"Audio encoding failed: {e}"
+        finally:
+            job.finished_at = dt.datetime.utcnow()
 
     @torch.inference_mode()
-    def _execute_sync(self, job: TTSJob):
+    def _execute_sync(self, job: TTSJob) -> Optional[Future]:
+        """
+        Synthesize a job on the inference thread.
+
+        Returns the encoder Future for the final file, or None when the job
+        ended here (error, cancellation, or a file already written).
+        """
         if job.status == "cancelled": return
 
         job.status = "running"
@@ -252,25 +664,111 @@ class ZipVoiceEngine:
                 raise JobCancelledError("Job was cancelled by user request.")
             job.progress = float(done) / max(total, 1)
 
-        input_text = normalize_vietnamese_text(job.text)
+        def is_cancelled() -> bool:
+            return job.status == "cancelled"
 
+        # Determine if we can use cached inference
+        use_cached = (voice.cached_wav_tensor is not None
+                      and voice.cached_prompt_features is not None)
+
+        stream = None
         try:
+            # Multi-sentence text on the in-process path is synthesized block by
+            # block while its later sentences are still being normalized (with
+            # the LLM stage, from the document's single extraction on).
+            if self.normalize_pool is not None and use_cached and self.cpu_pool is None:
+                if len(split_sentences(job.text)) > 1:
+                    stream = self.normalizer.normalize_stream(job.text, self.normalize_pool)
+
+            if self.result_cache is not None:
+                keys = self._cache_keys.setdefault(
+                    job.id, [self._result_key(job, voice, job.text, normalized=False)]
+                )
+            if stream is None:
+                with metrics.time_stage("normalization"):
+                    input_text = self.normalizer.normalize(job.text)
+                if self.result_cache is not None:
+                    norm_key = self._result_key(job, voice, input_text)
+                    keys.append(norm_key)
+                    # Different raw text can normalize to the same input
+                    if self._serve_from_cache(job, norm_key, stage="normalized"):
+                        return None
+                    self.result_cache.record_miss()
+            elif self.result_cache is not None:
+                # The normalized text is only known after synthesis (key added below)
+                self.result_cache.record_miss()
+
+            synth_start = time.perf_counter()
             with autocast(device_type=self.device.type):
                 with torch.inference_mode():
-                    # Determine if we can use cached inference
-                    use_cached = (voice.cached_wav_tensor is not None 
-                                  and voice.cached_prompt_features is not None)
-                    
-                    if has_brackets(input_text):
+                    if stream is not None:
+                        def on_block_progress(done: int, total: int):
+                            finished = len(stream.normalized) - stream.block_sentences
+                            on_progress(finished * total + done * stream.block_sentences, len(stream) * total)
+
+                        final_wav, _ = synthesize_blocks_cached(
+                            text_blocks=stream,
+                            prompt_text=voice.prompt_text,
+                            prompt_wav_tensor=voice.cached_wav_tensor,
+                            prompt_rms=voice.cached_prompt_rms,
+                            prompt_features=voice.cached_prompt_features,
+                            tokenized_prompt=voice.cached_prompt_tokens,
+                            model=self.model,
+                            vocoder=self.vocoder,
+                            tokenizer=self.tokenizer,
+                            feature_extractor=self.feature_extractor,
+                            device=self.device,
+                            num_step=num_step,
+                            guidance_scale=guidance,
+                            speed=job.speed,
+                            sampling_rate=self.sampling_rate,
+                            max_duration=MAX_DURATION,
+                            remove_long_sil=job.remove_long_sil,
+                            progress_cb=on_block_progress,
+                            bracket_speed=BRACKET_SPEED,
+                            bracket_num_step=BRACKET_NUM_STEP,
+                            batcher=self.batcher,
+                            batch_owner=job.id,
+                            batch_priority=self.scheduler.priority_rank(job.priority),
+                            is_cancelled=is_cancelled,
+                            preempt_cb=self._preempt_cb(job),
+                            chunk_cache=self.chunk_cache,
+                            chunk_cache_ns=self._chunk_cache_ns(voice),
+                        )
+                        if self.result_cache is not None:
+                            keys.append(self._result_key(job, voice, stream.text))
+                    elif use_cached and self.cpu_pool is not None:
+                        # Sampling and vocoding run in a worker process
+                        final_wav = self.cpu_pool.synthesize(
+                            job.id,
+                            dict(
+                                prompt_text=voice.prompt_text,
+                                prompt_wav_tensor=voice.cached_wav_tensor,
+                                prompt_rms=voice.cached_prompt_rms,
+                                prompt_features=voice.cached_prompt_features,
+                                tokenized_prompt=voice.cached_prompt_tokens,
+                                text=input_text,
+                                num_step=num_step,
+                                guidance_scale=guidance,
+                                speed=job.speed,
+                                sampling_rate=self.sampling_rate,
+                                max_duration=MAX_DURATION,
+                                remove_long_sil=job.remove_long_sil,
+                                bracket_speed=BRACKET_SPEED,
+                                bracket_num_step=BRACKET_NUM_STEP,
+                            ),
+                            is_cancelled=is_cancelled,
+                            on_progress=on_progress,
+                        )
+                    elif has_brackets(input_text):
                         # Use bracket-aware inference for text with 【X】 markers
                         if use_cached:
-                            from app.bracket_inference import generate_sentence_with_brackets_cached
-                            _ = generate_sentence_with_brackets_cached(
-                                save_path=job.out_wav_path,
+                            final_wav, _ = synthesize_with_brackets_cached(
                                 prompt_text=voice.prompt_text,
                                 prompt_wav_tensor=voice.cached_wav_tensor,
                                 prompt_rms=voice.cached_prompt_rms,
                                 prompt_features=voice.cached_prompt_features,
+                                tokenized_prompt=voice.cached_prompt_tokens,
                                 text=input_text,
                                 model=self.model,
                                 vocoder=self.vocoder,
@@ -286,8 +784,16 @@ class ZipVoiceEngine:
                                 progress_cb=on_progress,
                                 bracket_speed=BRACKET_SPEED,
                                 bracket_num_step=BRACKET_NUM_STEP,
+                                batcher=self.batcher,
+                                batch_owner=job.id,
+                                batch_priority=self.scheduler.priority_rank(job.priority),
+                                is_cancelled=is_cancelled,
+                                preempt_cb=self._preempt_cb(job),
+                                chunk_cache=self.chunk_cache,
+                                chunk_cache_ns=self._chunk_cache_ns(voice),
                             )
                         else:
+                            final_wav = None
                             _ = generate_sentence_with_brackets(
                                 save_path=job.out_wav_path,
                                 prompt_text=voice.prompt_text,
@@ -311,12 +817,12 @@ class ZipVoiceEngine:
                     else:
                         if use_cached:
                             # Cached inference — skip prompt I/O
-                            _ = generate_sentence_cached(
-                                save_path=job.out_wav_path,
+                            final_wav, _ = synthesize_cached(
                                 prompt_text=voice.prompt_text,
                                 prompt_wav_tensor=voice.cached_wav_tensor,
                                 prompt_rms=voice.cached_prompt_rms,
                                 prompt_features=voice.cached_prompt_features,
+                                tokenized_prompt=voice.cached_prompt_tokens,
                                 text=input_text,
                                 model=self.model,
                                 vocoder=self.vocoder,
@@ -330,9 +836,17 @@ class ZipVoiceEngine:
                                 max_duration=MAX_DURATION,
                                 remove_long_sil=job.remove_long_sil,
                                 progress_cb=on_progress,
+                                batcher=self.batcher,
+                                batch_owner=job.id,
+                                batch_priority=self.scheduler.priority_rank(job.priority),
+                                is_cancelled=is_cancelled,
+                                preempt_cb=self._preempt_cb(job),
+                                chunk_cache=self.chunk_cache,
+                                chunk_cache_ns=self._chunk_cache_ns(voice),
                             )
                         else:
                             # Fallback: standard file-based inference
+                            final_wav = None
                             _ = generate_sentence(
                                 save_path=job.out_wav_path,
                                 prompt_text=voice.prompt_text,
@@ -355,20 +869,24 @@ class ZipVoiceEngine:
                 if job.status == "cancelled":
                     raise JobCancelledError("Job cancelled at finalization.")
 
-                if job.audio_type == "mp3":
-                    mp3_path = job.out_wav_path.replace(".wav", ".mp3")
-                    import subprocess
-                    # specific ffmpeg command for mp3 conversion
-                    cmd = ["ffmpeg", "-y", "-i", job.out_wav_path, "-c:a", "libmp3lame", "-b:a", "64k", mp3_path]
-                    subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                    if os.path.exists(job.out_wav_path):
-                        os.remove(job.out_wav_path)
-                    job.out_wav_path = mp3_path
-
-                job.progress = 1.0
-                job.status = "done"
-            
-        except JobCancelledError:
+                if final_wav is None:
+                    # File-based fallbacks have already written the wav
+                    if job.audio_type != "mp3":
+                        job.progress = 1.0
+                        job.status = "done"
+                        return None
+                    final_wav, _ = torchaudio.load(job.out_wav_path)
+                    os.remove(job.out_wav_path)
+                synth_seconds = time.perf_counter() - synth_start
+                if stream is not None:
+                    synth_seconds -= stream.wait_seconds  # blocked on normalization, not synthesizing
+                metrics.observe_job(job.voice_id, synth_seconds, final_wav.shape[-1] / self.sampling_rate)
+
+                return self.encoder.submit(
+                    final_wav, self.sampling_rate, job.out_wav_path, job.audio_type
+                )
+
+        except (JobCancelledError, CancelledError):
             # --- CANCELLATION CLEANUP ---
             job.status = "cancelled"
             job.progress = 0.0
@@ -396,4 +914,7 @@ class ZipVoiceEngine:
                 if torch.cuda.is_available():
                     torch.cuda.empty_cache()
         finally:
-            job.finished_at = dt.datetime.utcnow()
\ No newline at end of file
+            if stream is not None:
+                stream.cancel()
+            if job.status != "running":
+                job.finished_at = dt.datetime.utcnow()
\ No newline at end of file
@@ -0,0 +1,259 @@
+"""
+Durable job store for the TTS engine.
+
+Jobs used to live only in ZipVoiceEngine.jobs, so a restart lost every
+queued job, and get_job() probed RESULTS_DIR for {id}.wav / {id}.mp3 on
+every miss (which the SSE endpoint does 4× per second).
+
+JobStore keeps jobs in a local SQLite database in WAL mode:
+
+  - id is the primary key; status and finished_at are indexed, so lookups,
+    "all queued jobs" and "finished before X" are index queries.
+  - Rows are written on state transitions only (submitted, finished).
+    Progress of running jobs stays in memory on the TTSJob objects.
+  - WAL lets the SSE/status readers run while a job is being written.
+
+Timestamps are stored as ISO-8601 UTC strings so they sort correctly as
+text and the finished_at index can serve range queries.
+"""
+
+import datetime as dt
+import logging
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass, field, fields, astuple
+from typing import Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ("done", "error", "cancelled")
+
+
+@dataclass
+class TTSJob:
+    id: str
+    text: str
+    voice_id: str
+    out_wav_path: str
+    speed: float = 1.0
+    num_step: Optional[int] = None
+    guidance_scale: Optional[float] = None
+    remove_long_sil: bool = False
+    audio_type: str = "mp3"
+    status: str = "queued"
+    progress: float = 0.0
+    error: Optional[str] = None
+    created_at: dt.datetime = field(default_factory=dt.datetime.utcnow)
+    finished_at: Optional[dt.datetime] = None
+    priority: str = "normal"
+    queue_wait: Optional[float] = None      # seconds between submission and admission
+
+
+_COLUMNS = [f.name for f in fields(TTSJob)]
+
+# Columns added after the first release, applied to existing databases
+_ADDED_COLUMNS = {
+    "priority": "TEXT NOT NULL DEFAULT 'normal'",
+    "queue_wait": "REAL",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id              TEXT PRIMARY KEY,
+    text            TEXT NOT NULL,
+    voice_id        TEXT NOT NULL,
+    out_wav_path    TEXT NOT NULL,
+    speed           REAL NOT NULL,
+    num_step        INTEGER,
+    guidance_scale  REAL,
+    remove_long_sil INTEGER NOT NULL,
+    audio_type      TEXT,
+    status          TEXT NOT NULL,
+    progress        REAL NOT NULL,
+    error           TEXT,
+    created_at      TEXT NOT NULL,
+    finished_at     TEXT,
+    priority        TEXT NOT NULL DEFAULT 'normal',
+    queue_wait      REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status);
+CREATE INDEX IF NOT EXISTS idx_jobs_finished_at ON jobs(finished_at);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def _ts(value: Optional[dt.datetime]) -> Optional[str]:
+    return value.isoformat(timespec="microseconds") if value is not None else None
+
+
+def _parse_ts(value: Optional[str]) -> Optional[dt.datetime]:
+    return dt.datetime.fromisoformat(value) if value else None
+
+
+class JobStore:
+    """SQLite-backed (WAL) persistence for TTSJob records."""
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: SQLite database file. Keep it outside RESULTS_DIR, which
+                  is served statically under /files.
+        """
+        self.path = path
+        parent = os.path.dirname(os.path.abspath(path))
+        os.makedirs(parent, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+            existing = {r["name"] for r in self._conn.execute("PRAGMA table_info(jobs)")}
+            for name, decl in _ADDED_COLUMNS.items():
+                if name not in existing:
+                    self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {name} {decl}")
+
+    # ── Rows <-> TTSJob ──────────────────────────────────────────────
+
+    @staticmethod
+    def _to_row(job: TTSJob) -> tuple:
+        values = dict(zip(_COLUMNS, astuple(job)))
+        values["remove_long_sil"] = int(bool(job.remove_long_sil))
+        values["created_at"] = _ts(job.created_at)
+        values["finished_at"] = _ts(job.finished_at)
+        return tuple(values[c] for c in _COLUMNS)
+
+    @staticmethod
+    def _from_row(row: sqlite3.Row) -> TTSJob:
+        values = {c: row[c] for c in _COLUMNS}
+        values["remove_long_sil"] = bool(values["remove_long_sil"])
+        values["created_at"] = _parse_ts(values["created_at"])
+        values["finished_at"] = _parse_ts(values["finished_at"])
+        return TTSJob(**values)
+
+    # ── Writes ───────────────────────────────────────────────────────
+
+    def save(self, job: TTSJob):
+        """Insert or replace one job."""
+        self.save_many([job])
+
+    def save_many(self, jobs: Iterable[TTSJob]):
+        rows = [self._to_row(j) for j in jobs]
+        if not rows:
+            return
+        placeholders = ", ".join("?" for _ in _COLUMNS)
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    f"INSERT OR REPLACE INTO jobs ({', '.join(_COLUMNS)}) VALUES ({placeholders})",
+                    rows,
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def delete(self, job_ids: Iterable[str]) -> int:
+        ids = [(jid,) for jid in job_ids]
+        if not ids:
+            return 0
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.executemany("DELETE FROM jobs WHERE id = ?", ids)
+            self._conn.execute("COMMIT")
+        return len(ids)
+
+    def delete_finished_before(self, statuses: Iterable[str], cutoff: dt.datetime) -> int:
+        """Delete jobs in the given statuses that finished before cutoff."""
+        statuses = list(statuses)
+        with self._lock:
+            cur = self._conn.execute(
+                f"DELETE FROM jobs WHERE finished_at < ? "
+                f"AND status IN ({', '.join('?' for _ in statuses)})",
+                [_ts(cutoff), *statuses],
+            )
+        return cur.rowcount
+
+    # ── Reads ────────────────────────────────────────────────────────
+
+    def get(self, job_id: str) -> Optional[TTSJob]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._from_row(row) if row else None
+
+    def by_status(self, statuses: Iterable[str]) -> List[TTSJob]:
+        """Jobs in any of the given statuses, oldest first."""
+        statuses = list(statuses)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT * FROM jobs WHERE status IN ({', '.join('?' for _ in statuses)}) "
+                f"ORDER BY created_at",
+                statuses,
+            ).fetchall()
+        return [self._from_row(r) for r in rows]
+
+    def finished_before(self, status: str, cutoff: dt.datetime) -> List[TTSJob]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM jobs WHERE finished_at < ? AND status = ?",
+                (_ts(cutoff), status),
+            ).fetchall()
+        return [self._from_row(r) for r in rows]
+
+    # ── One-off migration ────────────────────────────────────────────
+
+    def import_result_files(self, results_dir: str) -> int:
+        """
+        Register audio files produced before the store existed as done jobs.
+
+        Runs once per database (recorded in the meta table), so the
+        directory is scanned at most one time.
+        """
+        with self._lock:
+            done = self._conn.execute(
+                "SELECT value FROM meta WHERE key = 'result_files_imported'"
+            ).fetchone()
+        if done or not os.path.isdir(results_dir):
+            return 0
+
+        jobs = []
+        for filename in os.listdir(results_dir):
+            job_id, ext = os.path.splitext(filename)
+            if ext not in (".wav", ".mp3") or job_id.startswith("_"):
+                continue
+            path = os.path.join(results_dir, filename)
+            try:
+                mtime = dt.datetime.utcfromtimestamp(os.path.getmtime(path))
+            except OSError:
+                continue
+            jobs.append(TTSJob(
+                id=job_id,
+                text="<restored_from_disk>",
+                voice_id="<unknown>",
+                out_wav_path=path,
+                audio_type=ext[1:],
+                status="done",
+                progress=1.0,
+                created_at=mtime,
+                finished_at=mtime,
+            ))
+        # Never overwrite rows that already exist
+        jobs = [j for j in jobs if self.get(j.id) is None]
+        self.save_many(jobs)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('result_files_imported', ?)",
+                (_ts(dt.datetime.utcnow()),),
+            )
+        logger.info(f"[JobStore] Imported {len(jobs)} existing result files")
+        return len(jobs)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
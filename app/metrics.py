@@ -0,0 +1,243 @@
+"""
+In-process metrics exposed in the Prometheus text format at /metrics.
+
+The engine used to throw away the timing dict of every synthesis call, so
+there was no way to see where a job's time went or how the service behaves
+under load. This module keeps a few counters, gauges and histograms in
+memory; nothing is pushed anywhere, a Prometheus server (or curl) scrapes
+GET /metrics.
+
+Metrics:
+    tts_queue_depth, tts_running_jobs      scheduler state (collected at scrape)
+    tts_stage_seconds{stage}               normalization, llm_extraction,
+                                           tokenization, sampling, vocoder,
+                                           encoding, file_write
+    tts_rtf{voice}                         synthesis time / audio duration
+    tts_audio_seconds_total{voice}
+    tts_jobs_total{status}                 finished jobs by final status
+    tts_result_cache_*, tts_chunk_cache_*  cache counters and hit ratios
+    tts_sentence_cache_*, tts_phoneme_cache_*
+    tts_llm_requests_total, tts_llm_errors_total{kind}
+    tts_sharded_normalizations_total{outcome}
+
+Stages are timed with `with time_stage("sampling"): ...`. Work done inside
+CPU worker processes (app/cpu_workers.py) is not visible here.
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Sequence, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+RTF_BUCKETS = (0.01, 0.02, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 1.5, 2.0, 5.0)
+BATCH_ITEM_BUCKETS = (1, 2, 4, 8, 16, 32, 64)
+
+LabelValues = Tuple[str, ...]
+_LE_INF = 'le="+Inf"'
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"{self.name} expects labels {self.label_names}, got {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.label_names)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"] + self._samples()
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        super().__init__(name, help, labels)
+        self._values: Dict[LabelValues, float] = {}
+        if not self.label_names:
+            self._values[()] = 0.0
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def set_total(self, value: float, **labels):
+        """Mirror a counter that is kept elsewhere (e.g. cache stats)."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.label_names, k)} {_format_value(v)}" for k, v in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        self.set_total(value, **labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> (bucket counts, sum, count)
+        self._values: Dict[LabelValues, List] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            if idx < len(self.buckets):
+                entry[0][idx] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, (list(v[0]), v[1], v[2])) for k, v in self._values.items())
+        lines = []
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, le)} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, _LE_INF)} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, key)} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], None]] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, fn: Callable[[], None]):
+        """fn is called before every scrape to refresh gauges from live state."""
+        self._collectors.append(fn)
+
+    def render(self) -> str:
+        for fn in self._collectors:
+            try:
+                fn()
+            except Exception:
+                pass
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+QUEUE_DEPTH = REGISTRY.register(Gauge("tts_queue_depth", "Jobs waiting for an execution slot"))
+RUNNING_JOBS = REGISTRY.register(Gauge("tts_running_jobs", "Jobs holding an execution slot"))
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    "tts_stage_seconds", "Time spent per pipeline stage", labels=("stage",)))
+RTF = REGISTRY.register(Histogram(
+    "tts_rtf", "Real-time factor of finished jobs (synthesis seconds / audio seconds)",
+    labels=("voice",), buckets=RTF_BUCKETS))
+AUDIO_SECONDS = REGISTRY.register(Counter(
+    "tts_audio_seconds_total", "Seconds of audio synthesized", labels=("voice",)))
+JOBS = REGISTRY.register(Counter("tts_jobs_total", "Finished jobs by final status", labels=("status",)))
+RESULT_CACHE_HITS = REGISTRY.register(Counter(
+    "tts_result_cache_hits_total", "Result cache hits", labels=("stage",)))
+RESULT_CACHE_MISSES = REGISTRY.register(Counter("tts_result_cache_misses_total", "Result cache misses"))
+RESULT_CACHE_HIT_RATIO = REGISTRY.register(Gauge("tts_result_cache_hit_ratio", "Result cache hit ratio"))
+CHUNK_CACHE_HITS = REGISTRY.register(Counter(
+    "tts_chunk_cache_hits_total", "Chunk cache hits", labels=("level",)))
+CHUNK_CACHE_MISSES = REGISTRY.register(Counter("tts_chunk_cache_misses_total", "Chunk cache misses"))
+CHUNK_CACHE_HIT_RATIO = REGISTRY.register(Gauge("tts_chunk_cache_hit_ratio", "Chunk cache hit ratio"))
+SENTENCE_CACHE_HITS = REGISTRY.register(Counter(
+    "tts_sentence_cache_hits_total", "Normalized sentences reused", labels=("level",)))
+SENTENCE_CACHE_MISSES = REGISTRY.register(Counter(
+    "tts_sentence_cache_misses_total", "Sentences that went through normalization"))
+SENTENCE_CACHE_HIT_RATIO = REGISTRY.register(Gauge("tts_sentence_cache_hit_ratio", "Sentence cache hit ratio"))
+PHONEME_CACHE_HITS = REGISTRY.register(Counter(
+    "tts_phoneme_cache_hits_total", "Texts whose espeak phonemes were reused (engine process)"))
+PHONEME_CACHE_MISSES = REGISTRY.register(Counter("tts_phoneme_cache_misses_total", "Texts phonemized by espeak"))
+PHONEME_CACHE_HIT_RATIO = REGISTRY.register(Gauge("tts_phoneme_cache_hit_ratio", "Phoneme cache hit ratio"))
+LLM_REQUESTS = REGISTRY.register(Counter("tts_llm_requests_total", "LLM API requests sent"))
+LLM_ERRORS = REGISTRY.register(Counter(
+    "tts_llm_errors_total",
+    "LLM API errors (request: failed attempt, failed: gave up, parse: bad response, "
+    "circuit_open: not sent, endpoint unhealthy)",
+    labels=("kind",)))
+LLM_CALLS_AVOIDED = REGISTRY.register(Counter(
+    "tts_llm_calls_avoided_total",
+    "LLM extraction requests not sent (no_candidates: nothing to extract, cache: answered from the cache)",
+    labels=("reason",)))
+LLM_BATCH_ITEMS = REGISTRY.register(Histogram(
+    "tts_llm_batch_items", "Extraction chunks sent per LLM request (coalesced across jobs)",
+    buckets=BATCH_ITEM_BUCKETS))
+LLM_CIRCUIT_OPEN = REGISTRY.register(Gauge(
+    "tts_llm_circuit_open", "1 while the LLM stage is skipped because the endpoint is failing"))
+SHARDED_NORMALIZATIONS = REGISTRY.register(Counter(
+    "tts_sharded_normalizations_total",
+    "Long documents normalized in sentence shards (rerun: again with corrected document context, "
+    "serial: fell back to one piece)",
+    labels=("outcome",)))
+
+
+@contextmanager
+def time_stage(stage: str):
+    """Observe the duration of the with-block in tts_stage_seconds{stage}."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.observe(time.perf_counter() - start, stage=stage)
+
+
+def observe_job(voice_id: str, synthesis_seconds: float, audio_seconds: float):
+    """Record RTF and audio duration of one synthesized job."""
+    if audio_seconds > 0:
+        RTF.observe(synthesis_seconds / audio_seconds, voice=voice_id)
+        AUDIO_SECONDS.inc(audio_seconds, voice=voice_id)
+
+
+def render() -> str:
+    return REGISTRY.render()
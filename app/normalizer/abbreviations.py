@@ -0,0 +1,70 @@
+"""
+Single-pass abbreviation expansion.
+
+TextNormalizer.norm_abbre() used to split the text into words twice and,
+for every word found in ABBRE, run str.replace() over the whole text. That
+is quadratic in the length of the text, also rewrites every other place
+the abbreviation occurs inside a longer word ("GB" in "128GB" once "GB"
+appears on its own), and never matches keys that contain spaces
+("NN & PTNT", "độ C").
+
+AbbreviationMatcher builds a character trie of the keys once and expands
+the text in one left-to-right scan over its words. From every word that
+begins some key it follows the trie as far as the text allows and takes
+the longest key that ends on a word boundary. Keys are matched
+case-sensitively, as before, and the expansion is lowercased as the
+whitespace-token pass used to do.
+"""
+
+import re
+from typing import Dict, Optional, Tuple
+
+_END = ""  # trie slot holding the expansion of the key ending at that node
+_WORD_RE = re.compile(r"\w+")
+_WORD_CHAR_RE = re.compile(r"\w")
+
+
+class AbbreviationMatcher:
+    """Character trie over an abbreviation dict, built once."""
+
+    def __init__(self, abbreviations: Dict[str, str]):
+        self.abbreviations = abbreviations
+        self._root: dict = {}
+        for key, value in abbreviations.items():
+            node = self._root
+            for ch in key:
+                node = node.setdefault(ch, {})
+            node[_END] = str(value).strip().lower()
+        # The first word of every key ("TP" for "TP.HCM"); the trie is only
+        # walked from occurrences of these words
+        self._heads = {m.group() for m in (_WORD_RE.match(key) for key in abbreviations) if m}
+
+    def _longest_match(self, text: str, start: int) -> Optional[Tuple[int, str]]:
+        """(end, expansion) of the longest key at start that ends on a word boundary."""
+        node, best = self._root, None
+        for i in range(start, len(text)):
+            node = node.get(text[i])
+            if node is None:
+                break
+            if _END in node and not _WORD_CHAR_RE.match(text, i + 1):
+                best = (i + 1, node[_END])
+        return best
+
+    def expand(self, text: str) -> str:
+        """Replace every abbreviation in text with its expansion."""
+        parts, copied = [], 0
+        for m in _WORD_RE.finditer(text):
+            start = m.start()
+            if start < copied or m.group() not in self._heads:
+                continue  # inside the previous match, or cannot start a key
+            match = self._longest_match(text, start)
+            if match is None:
+                continue
+            end, expansion = match
+            parts.append(text[copied:start])
+            parts.append(expansion)
+            copied = end
+        if not parts:
+            return text
+        parts.append(text[copied:])
+        return "".join(parts)
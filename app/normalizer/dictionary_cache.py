@@ -3,17 +3,56 @@ Persistent dictionary cache for English-to-Vietnamese phonetic pairs.
 
 Stores pairs learned from LLM responses across runs.
 On each new text, known words are replaced first (pre-LLM lookup),
-reducing the amount of work the LLM needs to do.
+reducing the amount of work the LLM needs to do. Lookups go through a
+LexiconMatcher that new pairs are inserted into, so the cost of a lookup
+does not grow with the size of the dictionary and updates do not rebuild it.
 
-File format: JSON object mapping lowercase English words to Vietnamese phonetic spellings.
-Example: {"subscription": "xắp scrip sần", "server": "sơ vơ"}
+update_pairs() used to rewrite the whole file (sorted, indented, in place)
+under the lock for every new pair, so each LLM-enriched request paid an
+O(N) serialize, a crash mid-write lost the dictionary, and other worker
+processes never saw pairs learned after they started. Now:
+
+  - New pairs are appended to a journal next to the snapshot, one JSON
+    line per pair, in a single O_APPEND write under an exclusive flock.
+  - Once the journal holds DICT_COMPACT_EVERY lines, a background thread
+    folds it into the snapshot: the merged dictionary is written to a
+    temporary file and renamed over the snapshot, then an empty journal
+    is renamed over the old one. Both renames are atomic; replaying a
+    journal whose pairs are already in the snapshot changes nothing.
+  - Every DICT_REFRESH_SECONDS, lookups pick up lines other processes
+    appended since the last read (or the snapshot a compaction left) and
+    insert only the new pairs into the matcher.
+
+The first spelling learned for a word wins everywhere (memory, journal
+replay, compaction), so all processes converge on the same dictionary.
+
+Files:
+  learned_dict.json          JSON object mapping lowercase English words to
+                             Vietnamese phonetic spellings (the snapshot).
+                             Example: {"subscription": "xắp scrip sần", "server": "sơ vơ"}
+  learned_dict.json.journal  {"generation": ...} header, then {"eng": ..., "vie": ...}
+                             per line, appended since the last compaction. A new
+                             generation tells readers the journal was replaced
+                             (inode numbers are reused, so they can't tell).
+  learned_dict.json.lock     flock target shared by all processes.
 """
+import contextlib
 import json
 import logging
-import re
+import os
 import threading
+import time
+import uuid
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+
+from app.normalizer.lexicon import LexiconMatcher
+from app.settings import DICT_COMPACT_EVERY, DICT_REFRESH_SECONDS, LEARNED_DICT_PATH
+
+try:
+    import fcntl
+except ImportError:  # not POSIX: thread safety only, one process per dictionary
+    fcntl = None
 
 logger = logging.getLogger(__name__)
 
@@ -21,49 +60,223 @@ DEFAULT_DICT_PATH = Path(__file__).parent / "learned_dict.json"
 
 
 class DictionaryCache:
-    """Thread-safe persistent dictionary for English→Vietnamese phonetic pairs."""
+    """Thread- and process-safe persistent dictionary for English→Vietnamese phonetic pairs."""
 
-    def __init__(self, path: Optional[str] = None):
+    def __init__(self, path: Optional[str] = None, refresh_seconds: float = DICT_REFRESH_SECONDS,
+                 compact_every: int = DICT_COMPACT_EVERY):
+        """
+        Args:
+            refresh_seconds: Minimum interval between checks for pairs other
+                processes added (0: check on every lookup).
+            compact_every: Journal lines that trigger a background compaction
+                (0: never compact).
+        """
         self.path = Path(path) if path else DEFAULT_DICT_PATH
+        self.journal_path = self.path.with_name(self.path.name + ".journal")
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+        self.refresh_seconds = refresh_seconds
+        self.compact_every = compact_every
         self._lock = threading.Lock()
         self._dict: Dict[str, str] = {}
-        self._pattern: Optional[re.Pattern] = None
+        self._matcher = LexiconMatcher()
+        self._generation: Optional[str] = None  # header of the journal read so far
+        self._journal_offset = 0
+        self._journal_lines = 0
+        self._next_refresh = 0.0
+        self._compacting = False
+        self.appended = 0
+        self.refreshed = 0
+        self.compactions = 0
         self._load()
 
-    def _load(self):
-        """Load dictionary from disk."""
-        if self.path.exists():
+    # ── Files ────────────────────────────────────────────────
+
+    @contextlib.contextmanager
+    def _file_lock(self, exclusive: bool):
+        """flock on the lock file: shared to read the journal, exclusive to write or compact."""
+        if fcntl is None:
+            yield
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
             try:
-                with open(self.path, 'r', encoding='utf-8') as f:
-                    self._dict = json.load(f)
-                self._rebuild_pattern()
-                logger.info(f"Loaded {len(self._dict)} learned pairs from {self.path}")
-            except Exception as e:
-                logger.warning(f"Failed to load dictionary cache: {e}")
-                self._dict = {}
-
-    def _save(self):
-        """Persist dictionary to disk."""
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _read_snapshot(self) -> Dict[str, str]:
+        if not self.path.exists():
+            return {}
         try:
-            self.path.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.path, 'w', encoding='utf-8') as f:
-                json.dump(self._dict, f, ensure_ascii=False, indent=2, sort_keys=True)
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
         except Exception as e:
-            logger.warning(f"Failed to save dictionary cache: {e}")
+            logger.warning(f"Failed to load dictionary cache: {e}")
+            return {}
 
-    def _rebuild_pattern(self):
-        """Rebuild the compiled regex pattern from current dictionary keys."""
-        if not self._dict:
-            self._pattern = None
+    def _journal_state(self) -> Tuple[Optional[str], int]:
+        """(generation, size) of the journal on disk; (None, 0) if there is none."""
+        try:
+            with open(self.journal_path, "rb") as f:
+                return _generation(f.readline()), os.fstat(f.fileno()).st_size
+        except FileNotFoundError:
+            return None, 0
+
+    def _read_journal(self, offset: int) -> Tuple[Optional[str], int, List[Tuple[str, str]]]:
+        """
+        Pairs in the journal after byte offset (0: after the header). Caller holds the file lock.
+
+        Returns (generation, offset after the last complete line, pairs).
+        A trailing line without a newline (a writer died mid-append) is left
+        unread; the next append terminates it and it is skipped as invalid.
+        """
+        try:
+            f = open(self.journal_path, "rb")
+        except FileNotFoundError:
+            return None, 0, []
+        with f:
+            header = f.readline()
+            if offset == 0:
+                offset = len(header)
+            f.seek(offset)
+            data = f.read()
+        end = data.rfind(b"\n") + 1
+        pairs = []
+        for line in data[:end].splitlines():
+            try:
+                record = json.loads(line)
+                pairs.append((record["eng"], record["vie"]))
+            except (ValueError, KeyError, TypeError):
+                logger.warning(f"Skipping invalid line in {self.journal_path}")
+        return _generation(header), offset + end, pairs
+
+    def _append_journal(self, pairs: List[Tuple[str, str]]) -> Tuple[Optional[str], int]:
+        """
+        Append pairs in one write. Caller holds the exclusive file lock.
+
+        Returns (generation if this write started the journal, else None;
+        journal size after the write).
+        """
+        data = "".join(json.dumps({"eng": eng, "vie": vie}, ensure_ascii=False) + "\n" for eng, vie in pairs)
+        generation = None
+        fd = os.open(self.journal_path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            size = os.fstat(fd).st_size
+            if size == 0:
+                generation = uuid.uuid4().hex
+                data = _header(generation) + data
+            elif os.pread(fd, 1, size - 1) != b"\n":
+                data = "\n" + data  # terminate a torn line left by a crashed writer
+            size += os.write(fd, data.encode("utf-8"))
+        finally:
+            os.close(fd)
+        return generation, size
+
+    def _merge(self, pairs) -> int:
+        """Insert pairs not known yet into the dictionary and matcher. Caller holds _lock."""
+        added = 0
+        for eng, vie in pairs:
+            if eng not in self._dict:
+                self._dict[eng] = vie
+                self._matcher.add(eng, vie)
+                added += 1
+        return added
+
+    def _load(self):
+        """Load the snapshot and replay the journal."""
+        with self._file_lock(exclusive=False):
+            snapshot = self._read_snapshot()
+            generation, offset, pairs = self._read_journal(0)
+        with self._lock:
+            self._dict = snapshot
+            self._matcher = LexiconMatcher(snapshot)
+            self._merge(pairs)
+            self._generation, self._journal_offset, self._journal_lines = generation, offset, len(pairs)
+            self._next_refresh = time.monotonic() + self.refresh_seconds
+        if self._dict:
+            logger.info(f"Loaded {len(self._dict)} learned pairs from {self.path} ({len(pairs)} from the journal)")
+
+    def refresh(self):
+        """Pick up pairs other processes appended or compacted since the last read."""
+        with self._file_lock(exclusive=False):
+            added = self._catch_up()
+        if added:
+            logger.info(f"Dictionary refreshed: +{added} pairs from other processes (total: {len(self._dict)})")
+
+    def _catch_up(self) -> int:
+        """Merge what was written to disk since the last read. Caller holds the file lock."""
+        generation, size = self._journal_state()
+        with self._lock:
+            known, offset = self._generation, self._journal_offset
+        if generation == known and size == offset:
+            return 0
+        snapshot = None
+        if generation != known:  # compacted by another process: its pairs are in the snapshot now
+            snapshot, offset = self._read_snapshot(), 0
+        generation, offset, pairs = self._read_journal(offset)
+        with self._lock:
+            added = self._merge(snapshot.items()) if snapshot else 0
+            added += self._merge(pairs)
+            if snapshot is not None:
+                self._journal_lines = 0
+            self._generation, self._journal_offset = generation, offset
+            self._journal_lines += len(pairs)
+            self.refreshed += added
+        return added
+
+    def _maybe_refresh(self):
+        now = time.monotonic()
+        if now < self._next_refresh:
             return
-        # Sort keys by length (longest first) to match multi-word phrases first
-        sorted_keys = sorted(self._dict.keys(), key=len, reverse=True)
-        escaped_keys = [re.escape(k) for k in sorted_keys]
-        pattern_str = r'\b(' + '|'.join(escaped_keys) + r')\b'
-        self._pattern = re.compile(pattern_str, re.IGNORECASE)
+        self._next_refresh = now + self.refresh_seconds
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.warning(f"Failed to refresh dictionary cache: {e}")
+
+    # ── Compaction ───────────────────────────────────────────
+
+    def compact(self):
+        """Fold the journal into the snapshot (atomic renames) and start an empty journal."""
+        with self._file_lock(exclusive=True):
+            merged = self._read_snapshot()
+            _, _, pairs = self._read_journal(0)
+            for eng, vie in pairs:
+                merged.setdefault(eng, vie)
+            self._atomic_write(self.path, json.dumps(merged, ensure_ascii=False, indent=2, sort_keys=True))
+            generation = uuid.uuid4().hex
+            header = _header(generation)
+            self._atomic_write(self.journal_path, header)
+            with self._lock:
+                added = self._merge(merged.items())
+                self._generation, self._journal_offset, self._journal_lines = generation, len(header.encode()), 0
+                self.refreshed += added
+                self.compactions += 1
+        logger.info(f"Dictionary compacted: {len(merged)} pairs in {self.path}")
+
+    def _atomic_write(self, path: Path, content: str):
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    def _compact_in_background(self):
+        try:
+            self.compact()
+        except Exception as e:
+            logger.warning(f"Failed to compact dictionary cache: {e}")
+        finally:
+            with self._lock:
+                self._compacting = False
+
+    # ── Public API ───────────────────────────────────────────
 
     def lookup(self, word: str) -> Optional[str]:
         """Look up a single word in the dictionary."""
+        self._maybe_refresh()
         return self._dict.get(word.lower())
 
     def update_pairs(self, pairs: List[dict]):
@@ -73,48 +286,91 @@ class DictionaryCache:
         Args:
             pairs: List of dicts with keys "foreign_word" and "vietnamese_spelling".
         """
+        candidates = {}
+        for pair in pairs:
+            eng = pair.get("foreign_word", "").lower().strip()
+            vie = pair.get("vietnamese_spelling", "").strip()
+            if eng and vie:
+                candidates.setdefault(eng, vie)
         with self._lock:
-            added = 0
-            for pair in pairs:
-                eng = pair.get("foreign_word", "").lower().strip()
-                vie = pair.get("vietnamese_spelling", "").strip()
-                if eng and vie and eng not in self._dict:
-                    self._dict[eng] = vie
-                    added += 1
-            if added > 0:
-                self._rebuild_pattern()
-                self._save()
-                logger.info(f"Dictionary updated: +{added} new pairs (total: {len(self._dict)})")
+            if all(eng in self._dict for eng in candidates):
+                return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self._file_lock(exclusive=True):
+                # Catch up first: a word another process learned keeps its spelling
+                self._catch_up()
+                with self._lock:
+                    new = [(eng, vie) for eng, vie in candidates.items() if eng not in self._dict]
+                if new:
+                    generation, offset = self._append_journal(new)
+                    with self._lock:
+                        self._generation = generation or self._generation
+                        self._journal_offset = offset
+        except Exception as e:
+            logger.warning(f"Failed to save dictionary cache: {e}")
+            with self._lock:
+                new = [(eng, vie) for eng, vie in candidates.items() if eng not in self._dict]
+        with self._lock:
+            added = self._merge(new)
+            self._journal_lines += len(new)
+            self.appended += len(new)
+            compact = (self.compact_every > 0 and self._journal_lines >= self.compact_every
+                       and not self._compacting)
+            if compact:
+                self._compacting = True
+        if added:
+            logger.info(f"Dictionary updated: +{added} new pairs (total: {len(self._dict)})")
+        if compact:
+            threading.Thread(target=self._compact_in_background, name="dict-compaction", daemon=True).start()
 
     def apply_to_text(self, text: str) -> str:
         """
         Replace known English words in text with Vietnamese phonetic spelling.
 
-        Uses pre-compiled regex pattern for efficient matching.
+        Longest match first (multi-word phrases before their first word).
         Matches are case-insensitive with word boundaries.
         """
-        if not self._dict or not self._pattern:
-            return text
-
-        def replace_match(match):
-            word = match.group(0).lower()
-            return self._dict.get(word, match.group(0))
-
-        return self._pattern.sub(replace_match, text)
+        self._maybe_refresh()
+        return self._matcher.replace(text)
 
     @property
     def size(self) -> int:
         """Number of entries in the dictionary."""
         return len(self._dict)
 
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._dict),
+                "journal_lines": self._journal_lines,
+                "appended": self.appended,
+                "refreshed": self.refreshed,
+                "compactions": self.compactions,
+            }
+
+
+def _header(generation: str) -> str:
+    return json.dumps({"generation": generation}) + "\n"
+
+
+def _generation(header: bytes) -> Optional[str]:
+    try:
+        return json.loads(header)["generation"]
+    except (ValueError, KeyError, TypeError):
+        return None
+
 
 # Module-level singleton — lazy init
 _instance: Optional[DictionaryCache] = None
+_instance_lock = threading.Lock()
 
 
 def get_dictionary_cache() -> DictionaryCache:
     """Get or create the singleton DictionaryCache instance."""
     global _instance
     if _instance is None:
-        _instance = DictionaryCache()
+        with _instance_lock:
+            if _instance is None:
+                _instance = DictionaryCache(LEARNED_DICT_PATH or None)
     return _instance
@@ -0,0 +1,120 @@
+"""
+Persistent cache of LLM extraction results.
+
+extract_acronyms_and_pairs() sends every chunk of every document to the
+LLM, and the only cache LLMNormalizer had (_cache) covered the legacy
+token-batch mode, lived in memory and grew without bound. ExtractionCache
+stores the structured result of each chunk on disk:
+
+  - Keys are the sha256 of the model name, the extraction prompt and
+    response schema, and the chunk text, so changing the model or the
+    prompt never serves answers given to a different question.
+  - Entries expire after a TTL: the model behind LLM_MODEL may be
+    upgraded without a name change, and learned spellings get revisited.
+  - The number of rows is bounded; least-recently-used rows are evicted.
+
+Only complete answers are stored (failed or unparsable chunks are not).
+"""
+
+import datetime as dt
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_extractions (
+    key          TEXT PRIMARY KEY,
+    result       TEXT NOT NULL,
+    created_at   TEXT NOT NULL,
+    last_access  TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_extractions_last_access ON llm_extractions(last_access);
+"""
+
+
+def _now() -> str:
+    return dt.datetime.utcnow().isoformat(timespec="microseconds")
+
+
+class ExtractionCache:
+    """Chunk -> extraction result, in SQLite, with a TTL and an entry bound."""
+
+    def __init__(self, db_path: str, ttl_seconds: float, max_entries: int, namespace: str = ""):
+        """
+        Args:
+            ttl_seconds: Age after which an entry is ignored and dropped.
+            max_entries: Rows kept; least-recently-used rows are evicted beyond it.
+            namespace: Mixed into every key (model name + prompt digest).
+        """
+        self.ttl = dt.timedelta(seconds=ttl_seconds)
+        self.max_entries = max_entries
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.stored = 0
+
+    def _key(self, chunk: str) -> str:
+        return hashlib.sha256(f"{self.namespace}\n{chunk}".encode("utf-8")).hexdigest()
+
+    def get(self, chunk: str) -> Optional[dict]:
+        key = self._key(chunk)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result, created_at FROM llm_extractions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and dt.datetime.fromisoformat(row[1]) < dt.datetime.utcnow() - self.ttl:
+                self._conn.execute("DELETE FROM llm_extractions WHERE key = ?", (key,))
+                self.expired += 1
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE llm_extractions SET last_access = ? WHERE key = ?", (_now(), key))
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, chunk: str, result: dict):
+        now = _now()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_extractions (key, result, created_at, last_access) VALUES (?, ?, ?, ?)",
+                (self._key(chunk), json.dumps(result, ensure_ascii=False), now, now),
+            )
+            self.stored += 1
+            if self.stored % 100 == 0:
+                self._evict()
+
+    def _evict(self):
+        """Drop expired rows, then least-recently-used rows above max_entries. Caller holds the lock."""
+        cutoff = (dt.datetime.utcnow() - self.ttl).isoformat(timespec="microseconds")
+        self._conn.execute("DELETE FROM llm_extractions WHERE created_at < ?", (cutoff,))
+        rows = self._conn.execute("SELECT COUNT(*) FROM llm_extractions").fetchone()[0]
+        if rows > self.max_entries:
+            self._conn.execute(
+                "DELETE FROM llm_extractions WHERE key IN "
+                "(SELECT key FROM llm_extractions ORDER BY last_access LIMIT ?)",
+                (rows - self.max_entries,),
+            )
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM llm_extractions").fetchone()[0]
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / max(self.hits + self.misses, 1),
+                "expired": self.expired,
+                "stored": self.stored,
+                "entries": entries,
+                "max_entries": self.max_entries,
+            }
@@ -0,0 +1,93 @@
+"""
+Longest-match lexicon lookup over word tokens.
+
+mapping_eng() and DictionaryCache.apply_to_text() used to compile every key
+into one r'\b(k1|k2|...)\b' alternation. Python's regex engine tries the
+alternatives one after another at every position, so the cost of a call
+grows with the size of the dictionary, and DictionaryCache recompiled the
+whole pattern on every update_pairs().
+
+LexiconMatcher splits the text into word tokens once and, at each token
+that begins some key, looks up the spans starting there in a dict, longest
+first. Keys may span several words ("new york"); they are matched
+case-insensitively from the start of a word to the end of a word, and the
+separators between their words must match exactly, as with the regex.
+Inserting a key only touches the index entry of its first word, so the
+dictionary can grow without rebuilding anything.
+"""
+
+import re
+from typing import Dict, Iterable, Optional, Tuple
+
+_WORD_RE = re.compile(r"\w+")
+
+
+class LexiconMatcher:
+    """Case-insensitive key -> replacement index with longest-match replace()."""
+
+    def __init__(self, entries: Optional[Dict[str, str]] = None):
+        self._entries: Dict[str, str] = {}
+        # first word of a key -> largest number of words of a key starting with it
+        self._max_words: Dict[str, int] = {}
+        if entries:
+            self.update(entries.items())
+
+    def add(self, key: str, value: str) -> bool:
+        """Insert key (case-insensitive); existing keys are replaced. False if key has no word."""
+        key = key.lower()
+        words = _WORD_RE.findall(key)
+        if not words:
+            return False
+        self._entries[key] = value
+        first = words[0]
+        if len(words) > self._max_words.get(first, 0):
+            self._max_words[first] = len(words)
+        return True
+
+    def update(self, items: Iterable[Tuple[str, str]]):
+        for key, value in items:
+            self.add(key, value)
+
+    def get(self, key: str) -> Optional[str]:
+        return self._entries.get(key.lower())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key.lower() in self._entries
+
+    def replace(self, text: str) -> str:
+        """Replace every key in text with its value, longest match first, left to right."""
+        if not self._entries or not text:
+            return text
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # A few characters change length when lowercased (e.g. "İ");
+            # fall back to lowering each span so offsets stay valid
+            lowered = None
+        spans = [m.span() for m in _WORD_RE.finditer(text)]
+        parts, copied, i = [], 0, 0
+        while i < len(spans):
+            start, end = spans[i]
+            word = text[start:end].lower() if lowered is None else lowered[start:end]
+            max_words = self._max_words.get(word)
+            if max_words is None:
+                i += 1
+                continue
+            for n in range(min(max_words, len(spans) - i), 0, -1):
+                span_end = spans[i + n - 1][1]
+                key = text[start:span_end].lower() if lowered is None else lowered[start:span_end]
+                value = self._entries.get(key)
+                if value is not None:
+                    parts.append(text[copied:start])
+                    parts.append(value)
+                    copied = span_end
+                    i += n
+                    break
+            else:
+                i += 1
+        if not parts:
+            return text
+        parts.append(text[copied:])
+        return "".join(parts)
@@ -10,19 +10,40 @@ which handles abbreviations, foreign words, special symbols, and punctuation
 in a single pass.
 
 Falls back gracefully if the LLM is unavailable.
+
+Requests go through an AsyncLLMTransport (llm_transport.py): a pooled
+asyncio client with bounded concurrency, deadlines and a circuit breaker.
+The methods here stay synchronous for the inference threads; the a*
+variants can be awaited from the transport's event loop.
+
+Extraction chunks without candidate tokens (special_token_detector) are
+not sent at all, and answers are cached on disk per chunk
+(extraction_cache.py, read and written from a worker thread so SQLite
+never blocks the event loop); both count as calls avoided. The remaining chunks
+of concurrent jobs are coalesced into batched requests (ExtractionCoalescer).
 """
 
+import asyncio
+import copy
+import hashlib
 import logging
 import re
-import time
-import concurrent.futures
 import json
+import threading
+from collections import OrderedDict
 from functools import lru_cache
 from typing import List, Tuple, Optional, Dict
 
-import requests
-
-from app.settings import LLM_API_URL, LLM_MODEL, LLM_API_KEY, LLM_TIMEOUT
+from app.settings import (
+    LLM_API_URL, LLM_MODEL, LLM_API_KEY, LLM_TIMEOUT,
+    LLM_DEADLINE, LLM_MAX_CONCURRENCY, LLM_BREAKER_FAILURES, LLM_BREAKER_RESET,
+    LLM_CACHE_PATH, LLM_CACHE_TTL_HOURS, LLM_CACHE_MAX_ENTRIES,
+    LLM_BATCH_WAIT_MS, LLM_BATCH_MAX_ITEMS, LLM_BATCH_MAX_CHARS,
+)
+from app.metrics import LLM_ERRORS, LLM_CALLS_AVOIDED, LLM_BATCH_ITEMS
+from app.normalizer.extraction_cache import ExtractionCache
+from app.normalizer.llm_transport import AsyncLLMTransport, CircuitBreaker, CircuitOpenError
+from app.normalizer.special_token_detector import has_llm_candidates, undiacritized_words
 
 logger = logging.getLogger(__name__)
 
@@ -155,6 +176,202 @@ EXTRACTION_RESPONSE_FORMAT = {
             }
         }
 
+# ── Batched extraction (several chunks per request) ─────────────────────
+
+BATCH_EXTRACTION_SYSTEM_PROMPT = EXTRACTION_SYSTEM_PROMPT + """
+BATCHED INPUT
+The user message is a JSON object {"items": [{"id": "...", "text": "..."}, ...]}. Treat every item as a separate text and perform both operations on each item independently. Return exactly one entry per input item, with the same id, listing only the initialisms and foreign words that occur in that item's text.
+"""
+
+
+def _batch_response_format() -> dict:
+    item = copy.deepcopy(EXTRACTION_RESPONSE_FORMAT["json_schema"]["schema"])
+    item["properties"] = {"id": {"type": "string"}, **item["properties"]}
+    item["required"] = ["id"] + item["required"]
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "batched_acronyms_extraction_and_convert_to_viet_spelling",
+            "strict": True,
+            "schema": {
+                "type": "object",
+                "properties": {"items": {"type": "array", "items": item}},
+                "required": ["items"],
+                "additionalProperties": False,
+            },
+        },
+    }
+
+
+BATCH_EXTRACTION_RESPONSE_FORMAT = _batch_response_format()
+
+# Identifies the question asked in extraction mode; part of every extraction cache key
+EXTRACTION_PROMPT_DIGEST = hashlib.sha256(
+    (EXTRACTION_SYSTEM_PROMPT + json.dumps(EXTRACTION_RESPONSE_FORMAT, sort_keys=True)).encode("utf-8")
+).hexdigest()[:16]
+
+TOKEN_CACHE_SIZE = 10000  # legacy token-batch results kept in memory (LRU)
+
+
+class ExtractionCoalescer:
+    """
+    Groups extraction chunks of concurrent callers into batched requests.
+
+    Many short jobs arriving together used to send one request each, every
+    one repeating the long extraction prompt. A chunk handed to extract()
+    waits up to wait_ms for chunks of other callers; the group (at most
+    max_items chunks / max_chars characters) goes out as one request with
+    an id per chunk, and each caller gets the entry of its own id. A lone
+    chunk is sent as a plain extraction request. Entries the batched answer
+    lacks or garbles (unparsable JSON, unknown ids) fall back to one
+    request per chunk; a transport failure fails every caller of the batch.
+
+    Runs on the transport's event loop.
+    """
+
+    def __init__(self, client: "LLMNormalizer", wait_ms: float, max_items: int, max_chars: int):
+        self.client = client
+        self.wait = wait_ms / 1000.0
+        self.max_items = max_items
+        self.max_chars = max_chars
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._pending_chars = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()  # in-flight batches, referenced until done
+        self.requests = 0
+        self.items = 0
+        self.fallbacks = 0
+
+    async def extract(self, chunk: str) -> Optional[dict]:
+        """Extraction result of chunk; None if the LLM answered with nothing."""
+        if self.wait <= 0 or self.max_items <= 1 or self.client.transport.breaker.state == "open":
+            return await self._extract_one(chunk)  # nothing to wait for (fails fast while open)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((chunk, future))
+        self._pending_chars += len(chunk)
+        if len(self._pending) >= self.max_items or self._pending_chars >= self.max_chars:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.wait, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending, self._pending_chars = self._pending, [], 0
+        if batch:
+            task = asyncio.ensure_future(self._send(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _extract_one(self, chunk: str) -> Optional[dict]:
+        self.requests += 1
+        self.items += 1
+        LLM_BATCH_ITEMS.observe(1)
+        response_text = await self.client._acall_llm(
+            user_prompt=chunk,
+            system_prompt=EXTRACTION_SYSTEM_PROMPT,
+            response_format=EXTRACTION_RESPONSE_FORMAT,
+        )
+        if not response_text or not response_text.strip():
+            return None
+        return json.loads(response_text.strip())
+
+    async def _resolve_one(self, chunk: str, future: asyncio.Future):
+        try:
+            result = await self._extract_one(chunk)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+        else:
+            if not future.done():
+                future.set_result(result)
+
+    async def _send(self, batch: List[Tuple[str, asyncio.Future]]):
+        if len(batch) == 1:
+            await self._resolve_one(*batch[0])
+            return
+        try:
+            results = await self._extract_batch([chunk for chunk, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        missing = []
+        for i, (chunk, future) in enumerate(batch):
+            if i in results:
+                if not future.done():
+                    future.set_result(results[i])
+            else:
+                missing.append((chunk, future))
+        if missing:
+            self.fallbacks += len(missing)
+            logger.warning(f"[LLM Batch] {len(missing)}/{len(batch)} items missing from the batched answer, "
+                           f"asking for them one by one")
+            await asyncio.gather(*(self._resolve_one(chunk, future) for chunk, future in missing))
+
+    async def _extract_batch(self, chunks: List[str]) -> Dict[int, dict]:
+        """
+        One request for all chunks. Returns {index: result} for the entries
+        that came back well-formed; transport errors propagate.
+        """
+        self.requests += 1
+        self.items += len(chunks)
+        LLM_BATCH_ITEMS.observe(len(chunks))
+        user_prompt = json.dumps(
+            {"items": [{"id": str(i), "text": chunk} for i, chunk in enumerate(chunks)]},
+            ensure_ascii=False,
+        )
+        response_text = await self.client._acall_llm(
+            user_prompt=user_prompt,
+            system_prompt=BATCH_EXTRACTION_SYSTEM_PROMPT,
+            response_format=BATCH_EXTRACTION_RESPONSE_FORMAT,
+        )
+        try:
+            items = json.loads(response_text.strip())["items"]
+        except (AttributeError, KeyError, TypeError, ValueError):
+            LLM_ERRORS.inc(kind="parse")
+            return {}
+        results = {}
+        for item in items if isinstance(items, list) else []:
+            if not isinstance(item, dict):
+                continue
+            try:
+                i = int(item.get("id"))
+            except (TypeError, ValueError):
+                continue
+            if 0 <= i < len(chunks) and i not in results:
+                results[i] = self._own_entries(chunks[i], item)
+        if len(results) < len(chunks):
+            LLM_ERRORS.inc(kind="parse")
+        return results
+
+    @staticmethod
+    def _own_entries(chunk: str, item: dict) -> dict:
+        """Keep only the acronyms and words of item that occur in chunk (no cross-item leaks)."""
+        lowered = chunk.lower()
+        acronyms = item.get("acronyms")
+        pairs = item.get("foreign_vietnamese_pairs")
+        return {
+            "acronyms": [a for a in acronyms if isinstance(a, str) and a.strip() and a.strip() in chunk]
+            if isinstance(acronyms, list) else [],
+            "foreign_vietnamese_pairs": [
+                p for p in pairs
+                if isinstance(p, dict) and isinstance(p.get("foreign_word"), str)
+                and p["foreign_word"].strip() and p["foreign_word"].strip().lower() in lowered
+            ] if isinstance(pairs, list) else [],
+        }
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "items": self.items,
+            "items_per_request": self.items / max(self.requests, 1),
+            "fallbacks": self.fallbacks,
+        }
 
 
 class LLMNormalizer:
@@ -173,14 +390,31 @@ class LLMNormalizer:
         api_key: str = LLM_API_KEY,
         timeout: int = LLM_TIMEOUT,
         max_retries: int = 2,
+        deadline: float = LLM_DEADLINE,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        breaker: Optional[CircuitBreaker] = None,
+        extraction_cache: Optional[ExtractionCache] = None,
+        batch_wait_ms: float = LLM_BATCH_WAIT_MS,
+        batch_max_items: int = LLM_BATCH_MAX_ITEMS,
+        batch_max_chars: int = LLM_BATCH_MAX_CHARS,
     ):
         self.api_url = api_url
         self.model = model
         self.api_key = api_key
         self.timeout = timeout
         self.max_retries = max_retries
-        # In-memory cache: token_string -> normalized_string
-        self._cache: dict = {}
+        self.transport = AsyncLLMTransport(
+            api_url, api_key, timeout=timeout, deadline=deadline,
+            max_concurrency=max_concurrency, max_retries=max_retries,
+            breaker=breaker or CircuitBreaker(LLM_BREAKER_FAILURES, LLM_BREAKER_RESET),
+        )
+        # On-disk cache: extraction chunk -> structured result
+        self.extraction_cache = extraction_cache
+        self.calls_avoided: Dict[str, int] = {"no_candidates": 0, "cache": 0}
+        self.coalescer = ExtractionCoalescer(self, batch_wait_ms, batch_max_items, batch_max_chars)
+        # In-memory LRU cache: token_string -> normalized_string
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._cache_lock = threading.Lock()
 
     def _chunk_text(self, text: str, max_chars: int = 2500) -> List[str]:
         """
@@ -227,6 +461,10 @@ class LLMNormalizer:
     # ── Structured extraction (current) ────────────────────────────────
 
     def extract_acronyms_and_pairs(self, text: str, max_chars_per_chunk: int = 2500) -> dict:
+        """Blocking wrapper of aextract_acronyms_and_pairs() for worker threads."""
+        return self.transport.run(self.aextract_acronyms_and_pairs(text, max_chars_per_chunk))
+
+    async def aextract_acronyms_and_pairs(self, text: str, max_chars_per_chunk: int = 2500) -> dict:
         """
         Extract acronyms and foreign-Vietnamese phonetic pairs from text
         using LLM with structured output (response_format).
@@ -239,9 +477,11 @@ class LLMNormalizer:
                 - "acronyms": List[str] — acronyms found in text
                 - "foreign_vietnamese_pairs": List[dict] — each with
                   "foreign_word" and "vietnamese_spelling"
+                - "failed_chunks": int — chunks that got no usable response
             Returns empty result on LLM failure.
         """
         empty_result = {"acronyms": [], "foreign_vietnamese_pairs": []}
+        failed_result = dict(empty_result)  # marks chunks whose request or response failed
 
         if not text or not text.strip():
             return empty_result
@@ -254,32 +494,46 @@ class LLMNormalizer:
         all_pairs_dict = {} # key: foreign_word, value: vietnamese_spelling
 
         # Hàm xử lý cho từng chunk
-        def process_chunk(chunk_text: str) -> dict:
+        async def process_chunk(chunk_text: str) -> dict:
             if not chunk_text.strip():
                 return empty_result
+            if not has_llm_candidates(chunk_text):
+                self._avoided("no_candidates")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"No LLM candidates, skipping chunk; words without diacritics: "
+                                 f"{sorted(set(undiacritized_words(chunk_text)))}")
+                return empty_result
+            # SQLite I/O: off the event loop, which serves every job's requests
+            if self.extraction_cache is not None:
+                cached = await asyncio.to_thread(self.extraction_cache.get, chunk_text)
+                if cached is not None:
+                    self._avoided("cache")
+                    return cached
             try:
-                response_text = self._call_llm(
-                    user_prompt=chunk_text,
-                    system_prompt=EXTRACTION_SYSTEM_PROMPT,
-                    response_format=EXTRACTION_RESPONSE_FORMAT,
-                )
-                if not response_text or not response_text.strip():
+                # Batched with the chunks of concurrent jobs when they arrive together
+                result = await self.coalescer.extract(chunk_text)
+                if result is None:
                     return empty_result
                     
-                result = json.loads(response_text.strip())
                 if not isinstance(result, dict):
-                    return empty_result
+                    LLM_ERRORS.inc(kind="parse")
+                    return failed_result
+                if self.extraction_cache is not None:
+                    await asyncio.to_thread(self.extraction_cache.put, chunk_text, result)
                 return result
+            except CircuitOpenError:
+                return failed_result
+            except json.JSONDecodeError as e:
+                LLM_ERRORS.inc(kind="parse")
+                logger.warning(f"LLM extraction returned invalid JSON for chunk, skipping. Error: {e}")
+                return failed_result
             except Exception as e:
                 logger.warning(f"LLM extraction failed for chunk, skipping. Error: {e}")
-                return empty_result
+                return failed_result
 
-        # 2. Xử lý song song các chunks (Max 5 workers hoặc bằng số lượng chunks để không spam API quá mức)
-        max_workers = min(5, max(1, len(chunks)))
-        logger.info(f"Splitting text into {len(chunks)} chunks, processing with {max_workers} workers.")
-        
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            chunk_results = list(executor.map(process_chunk, chunks))
+        # 2. Xử lý song song các chunks (transport giới hạn số request đồng thời cho mọi job)
+        logger.info(f"Splitting text into {len(chunks)} chunks.")
+        chunk_results = await asyncio.gather(*(process_chunk(chunk) for chunk in chunks))
 
         # 3. Gộp kết quả và khử trùng lặp
         for res in chunk_results:
@@ -308,7 +562,21 @@ class LLMNormalizer:
         
         return {
             "acronyms": final_acronyms,
-            "foreign_vietnamese_pairs": final_pairs
+            "foreign_vietnamese_pairs": final_pairs,
+            "failed_chunks": sum(1 for res in chunk_results if res is failed_result),
+        }
+
+    def _avoided(self, reason: str):
+        self.calls_avoided[reason] += 1
+        LLM_CALLS_AVOIDED.inc(reason=reason)
+
+    def stats(self) -> dict:
+        """Extraction calls avoided, circuit breaker state, coalescing and extraction cache counters."""
+        return {
+            "calls_avoided": dict(self.calls_avoided),
+            "circuit": self.transport.breaker.stats(),
+            "coalescing": self.coalescer.stats(),
+            "extraction_cache": self.extraction_cache.stats() if self.extraction_cache else {"enabled": False},
         }
 
     # ── Full-text normalization (legacy v2) ───────────────────────────────
@@ -366,12 +634,14 @@ class LLMNormalizer:
         # Check cache first — only send uncached tokens to LLM
         results = [None] * len(tokens)
         uncached_indices = []
-        for i, token in enumerate(tokens):
-            cached = self._cache.get(token)
-            if cached is not None:
-                results[i] = cached
-            else:
-                uncached_indices.append(i)
+        with self._cache_lock:
+            for i, token in enumerate(tokens):
+                cached = self._cache.get(token)
+                if cached is not None:
+                    self._cache.move_to_end(token)
+                    results[i] = cached
+                else:
+                    uncached_indices.append(i)
 
         if not uncached_indices:
             return results  # All cached
@@ -393,7 +663,10 @@ class LLMNormalizer:
                 if not normalized.strip() or len(normalized) > len(tokens[orig_idx]) * 10:
                     normalized = tokens[orig_idx]
                 results[orig_idx] = normalized
-                self._cache[tokens[orig_idx]] = normalized
+                with self._cache_lock:
+                    self._cache[tokens[orig_idx]] = normalized
+                    if len(self._cache) > TOKEN_CACHE_SIZE:
+                        self._cache.popitem(last=False)
 
         except Exception as e:
             logger.warning(f"LLM normalization failed, falling back to originals: {e}")
@@ -406,7 +679,12 @@ class LLMNormalizer:
 
     def _call_llm(self, user_prompt: str, system_prompt: str = None,
                   response_format: dict = None) -> str:
-        """Send a request to the LLM API with retry logic.
+        """Blocking wrapper of _acall_llm() for worker threads."""
+        return self.transport.run(self._acall_llm(user_prompt, system_prompt, response_format))
+
+    async def _acall_llm(self, user_prompt: str, system_prompt: str = None,
+                         response_format: dict = None) -> str:
+        """Send a request to the LLM API (retries, deadline and circuit breaker in the transport).
         
         Args:
             user_prompt: The user message content.
@@ -427,33 +705,11 @@ class LLMNormalizer:
         }
         if response_format is not None:
             payload["response_format"] = response_format
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {self.api_key}",
-        }
-
-        last_error = None
-        for attempt in range(self.max_retries + 1):
-            try:
-                resp = requests.post(
-                    self.api_url,
-                    json=payload,
-                    headers=headers,
-                    timeout=self.timeout,
-                )
-                resp.raise_for_status()
-                data = resp.json()
-                content = data["choices"][0]["message"]["content"]
-                logger.debug(f"LLM response: {content}")
-                return content
-            except Exception as e:
-                last_error = e
-                if attempt < self.max_retries:
-                    wait = 0.5 * (2 ** attempt)  # exponential backoff: 0.5s, 1s
-                    logger.warning(f"LLM call attempt {attempt+1} failed: {e}. Retrying in {wait}s...")
-                    time.sleep(wait)
 
-        raise last_error
+        data = await self.transport.post(payload)
+        content = data["choices"][0]["message"]["content"]
+        logger.debug("LLM response: %s", content)
+        return content
 
     def _parse_batch_response(self, response_text: str, expected_count: int) -> dict:
         """
@@ -481,16 +737,26 @@ class LLMNormalizer:
 
     def clear_cache(self):
         """Clear the in-memory normalization cache."""
-        self._cache.clear()
+        with self._cache_lock:
+            self._cache.clear()
 
 
 # Module-level singleton — lazy init
 _llm_normalizer_instance: Optional[LLMNormalizer] = None
+_llm_normalizer_lock = threading.Lock()
 
 
 def get_llm_normalizer() -> LLMNormalizer:
-    """Get or create the singleton LLMNormalizer instance."""
+    """Get or create the singleton LLMNormalizer instance (one connection pool per process)."""
     global _llm_normalizer_instance
     if _llm_normalizer_instance is None:
-        _llm_normalizer_instance = LLMNormalizer()
+        with _llm_normalizer_lock:
+            if _llm_normalizer_instance is None:
+                extraction_cache = None
+                if LLM_CACHE_PATH:
+                    extraction_cache = ExtractionCache(
+                        LLM_CACHE_PATH, LLM_CACHE_TTL_HOURS * 3600, LLM_CACHE_MAX_ENTRIES,
+                        namespace=f"{LLM_MODEL}\n{EXTRACTION_PROMPT_DIGEST}",
+                    )
+                _llm_normalizer_instance = LLMNormalizer(extraction_cache=extraction_cache)
     return _llm_normalizer_instance
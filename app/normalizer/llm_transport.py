@@ -0,0 +1,235 @@
+"""
+Asynchronous, pooled transport for the LLM normalizer.
+
+LLMNormalizer used to send every request with a fresh requests.post() (new
+TCP/TLS connection each time), slept in time.sleep() between retries, and
+extract_acronyms_and_pairs() started a ThreadPoolExecutor per document, so
+concurrent jobs multiplied threads and connections without any global
+limit, and a dead endpoint cost every document the full retry ladder.
+
+AsyncLLMTransport runs all LLM traffic on one event loop:
+
+  - one httpx.AsyncClient with keep-alive connections, shared by every
+    caller;
+  - a semaphore bounding in-flight requests across all jobs;
+  - a deadline per call that covers queueing for a slot, every attempt and
+    the backoff between them;
+  - a CircuitBreaker: after enough consecutive failures the endpoint is
+    not called at all for a while (CircuitOpenError), then one probe
+    request decides whether it is healthy again.
+
+The loop is the engine's (attach_loop() from ZipVoiceEngine.run()); callers
+on worker threads block on run() while the request runs there. Without an
+attached loop (scripts, benchmarks) the transport starts its own loop on a
+daemon thread.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Optional
+
+import httpx
+
+from app.metrics import LLM_REQUESTS, LLM_ERRORS, LLM_CIRCUIT_OPEN
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(RuntimeError):
+    """The endpoint is considered unhealthy; the request was not sent."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a single half-open probe."""
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        """
+        Args:
+            failure_threshold: Consecutive failures that open the circuit.
+            reset_timeout: Seconds to stay open before letting one probe through.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """True if a request may be sent now."""
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = "half_open"
+                self._probing = False
+            if self.state == "half_open" and not self._probing:
+                self._probing = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self.state != "closed":
+                logger.info("[LLM] Endpoint healthy again, closing circuit")
+            self.state = "closed"
+            self.failures = 0
+            self._probing = False
+        LLM_CIRCUIT_OPEN.set(0)
+
+    def release(self):
+        """The half-open probe ended without an outcome (cancelled): let the next request probe."""
+        with self._lock:
+            if self.state == "half_open":
+                self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or (self.state == "closed" and self.failures >= self.failure_threshold):
+                logger.warning(f"[LLM] {self.failures} consecutive failures, skipping the LLM "
+                               f"for {self.reset_timeout:.0f}s")
+                self.state = "open"
+                self.opened_at = time.monotonic()
+                self._probing = False
+        if self.state == "open":
+            LLM_CIRCUIT_OPEN.set(1)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"state": self.state, "failures": self.failures, "rejected": self.rejected}
+
+
+class AsyncLLMTransport:
+    """Chat-completions POSTs over a shared connection pool on one event loop."""
+
+    def __init__(self, api_url: str, api_key: str, timeout: float, deadline: float,
+                 max_concurrency: int, max_retries: int, breaker: CircuitBreaker,
+                 http_transport: Optional[httpx.AsyncBaseTransport] = None):
+        """
+        Args:
+            timeout: Seconds per attempt.
+            deadline: Seconds per call, including waiting for a slot, retries and backoff.
+            max_concurrency: Requests in flight at once (also the pool size).
+            http_transport: httpx transport of the client (default: connection
+                pool over the network; tests pass an httpx.MockTransport).
+        """
+        self.api_url = api_url
+        self.api_key = api_key
+        self.timeout = timeout
+        self.deadline = deadline
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.breaker = breaker
+        self.http_transport = http_transport
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._lock = threading.Lock()
+
+    # ── Event loop ───────────────────────────────────────────────────
+
+    def attach_loop(self, loop: asyncio.AbstractEventLoop):
+        """Run requests on loop (the engine's) from now on."""
+        with self._lock:
+            if loop is self._loop:
+                return
+            old_loop, old_client = self._loop, self._client
+            self._loop, self._client, self._semaphore = loop, None, None
+        if old_client is not None and old_loop.is_running():
+            asyncio.run_coroutine_threadsafe(old_client.aclose(), old_loop)
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None:
+            with self._lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    threading.Thread(target=loop.run_forever, name="llm-transport", daemon=True).start()
+                    self._loop = loop
+        return self._loop
+
+    def run(self, coro):
+        """Run coro on the transport loop and wait for its result (from any other thread)."""
+        loop = self._get_loop()
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            coro.close()
+            raise RuntimeError("blocking LLM call on the transport's event loop; await the coroutine instead")
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+    def _ensure_client(self):
+        """Create the pool and semaphore on the running loop. Called on the transport loop."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=self.max_concurrency,
+                                    max_keepalive_connections=self.max_concurrency),
+                timeout=self.timeout,
+                transport=self.http_transport,
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    # ── Requests ─────────────────────────────────────────────────────
+
+    async def post(self, payload: dict) -> dict:
+        """
+        POST payload to the endpoint and return the decoded JSON response.
+
+        Retries with exponential backoff until the call deadline. Raises
+        CircuitOpenError without sending anything while the circuit is
+        open, and the last error once retries or time run out.
+        """
+        self._ensure_client()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.deadline
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {self.api_key}",
+        }
+        last_error: Optional[BaseException] = None
+        for attempt in range(self.max_retries + 1):
+            if not self.breaker.allow():
+                if last_error is not None:
+                    break  # opened by our own failures; stop retrying
+                LLM_ERRORS.inc(kind="circuit_open")
+                raise CircuitOpenError("LLM circuit is open")
+            probe = self.breaker.state == "half_open"
+            try:
+                async with asyncio.timeout_at(deadline):
+                    async with self._semaphore:
+                        LLM_REQUESTS.inc()
+                        resp = await self._client.post(self.api_url, json=payload, headers=headers)
+                resp.raise_for_status()
+                data = resp.json()
+                self.breaker.record_success()
+                return data
+            except asyncio.CancelledError:
+                if probe:
+                    self.breaker.release()
+                raise
+            except Exception as e:
+                last_error = e
+                LLM_ERRORS.inc(kind="request")
+                self.breaker.record_failure()
+                remaining = deadline - loop.time()
+                if attempt < self.max_retries and remaining > 0:
+                    wait = min(0.5 * (2 ** attempt), remaining)  # exponential backoff: 0.5s, 1s
+                    logger.warning(f"LLM call attempt {attempt+1} failed: {e!r}. Retrying in {wait:.1f}s...")
+                    await asyncio.sleep(wait)
+                if deadline - loop.time() <= 0:
+                    break
+
+        LLM_ERRORS.inc(kind="failed")
+        raise last_error
@@ -9,9 +9,59 @@ from vietnam_number import n2w, n2w_single
 from app.normalizer.cores import *
 
 from app.normalizer.abbre_vn import ALPHABET
+from app.normalizer.abbreviations import AbbreviationMatcher
 from app.normalizer.measure import MEASURE_DICT
 from app.normalizer.verbatim import VERBATIM
-from app.normalizer.units import UNITS_DICT
+from app.normalizer.units import CASE_SENSITIVE_UNITS, UNITS_DICT
+
+
+def _compile_unit_patterns():
+    """
+    Build the two regexes used by norm_unit() from UNITS_DICT.
+
+    Entries containing '/' or starting with '.' (e.g. "/năm", "USD/", "m/s")
+    are compound rate patterns, replaced wherever they appear. Every other
+    entry must follow a number (optionally with a multiplier word) and be
+    followed by a space, punctuation or the end of the text. Alternatives
+    keep the UNITS_DICT order, so the first listed entry wins where several
+    match at the same position. Rate entries that can follow a number
+    ("Mb/s", "km/h") are also tried there, longest first and before the
+    other units, so "100Mb/s" is read with its number instead of "Mb"
+    taking the number and leaving "/s" behind.
+
+    Returns:
+        (rate_pattern, unit_pattern, exact, folded): exact maps rate
+        patterns and case-sensitive units, folded maps casefolded
+        case-insensitive units, both to (UNITS_DICT index, reading).
+    """
+    multipliers = r'(?:chục|trăm|nghìn|ngàn|triệu|tỷ)'
+    punct_class = r'(?:\s|[.,;:)\]\}!?\-"\'…/]|$)'
+
+    exact, folded, rates, units, number_rates = {}, {}, [], [], []
+    for index, (term, norm_term) in enumerate(UNITS_DICT.items()):
+        if '/' in term or term.startswith('.'):
+            exact.setdefault(term, (index, norm_term))
+            rates.append(re.escape(term))
+            if term[0] not in './':
+                number_rates.append(term)
+        elif term in CASE_SENSITIVE_UNITS:
+            # Case-sensitive matching for units where case matters
+            # (e.g., mPa vs MPa, KB vs Mb vs MB)
+            exact.setdefault(term, (index, norm_term))
+            units.append(re.escape(term))
+        else:
+            folded.setdefault(term.casefold(), (index, norm_term))
+            units.append('(?i:' + re.escape(term) + ')')
+
+    rate_pattern = re.compile('|'.join(rates))
+    number_rates = [re.escape(term) for term in sorted(number_rates, key=len, reverse=True)]
+    unit_pattern = re.compile(
+        rf'(?P<num>[+-]?\d+(?:[.,]\d+)*)\s*(?P<mult>{multipliers}\s*)?'
+        rf'(?P<unit>{"|".join(number_rates + units)})(?={punct_class})'
+    )
+    return rate_pattern, unit_pattern, exact, folded
+
+
 class TextNormalizer():
     def __init__(self):
         super().__init__()
@@ -28,13 +78,36 @@ class TextNormalizer():
 
         return output_str
 
+    _MULTI_SPACE_RE = re.compile(' +')
+
     def remove_multi_space(self, input_str):
-        return re.sub(' +', ' ', input_str)
+        return self._MULTI_SPACE_RE.sub(' ', input_str)
+
+    _DIGIT_BOUNDARY_RE = re.compile(r'(\d)(?=[^\d.,h:])|(?<=[^\d.,h:])(\d)')
 
     def separate_numbers_adjacent_chars(self, sentence):
-        separated_sentence = re.sub(r'(\d)(?=[^\d.,h:])|(?<=[^\d.,h:])(\d)', r'\1 \2', sentence)
+        separated_sentence = self._DIGIT_BOUNDARY_RE.sub(r'\1 \2', sentence)
         return separated_sentence
 
+    # Map of known /unit suffixes to Vietnamese
+    _PERCENT_RATE_UNITS = {
+        'năm': 'trên năm',
+        'tháng': 'trên tháng',
+        'ngày': 'trên ngày',
+        'giờ': 'trên giờ',
+        'phút': 'trên phút',
+        'giây': 'trên giây',
+        'tuần': 'trên tuần',
+        'quý': 'trên quý',
+    }
+    # Pattern: NUMBER%/unit (e.g. 8,5%/năm, 10,2%/năm)
+    # NUMBER can be integer or decimal with comma (Vietnamese) or dot
+    _PERCENT_RATE_RE = re.compile(
+        r'(\d+(?:[.,]\d+)?)\s*%\s*/\s*(' + '|'.join(re.escape(u) for u in _PERCENT_RATE_UNITS) + r')'
+        r'(?=[\s.,;:!?\)\]\}]|$)',
+        re.IGNORECASE
+    )
+
     def normalize_percent_unit(self, input_str):
         """
         Normalize NUMBER%/UNIT patterns like '8,5%/năm' → '8,5 phần trăm trên năm'.
@@ -46,34 +119,13 @@ class TextNormalizer():
         
         Also handles compound unit patterns like kWh/kWp/năm.
         """
-        # Map of known /unit suffixes to Vietnamese
-        unit_map = {
-            'năm': 'trên năm',
-            'tháng': 'trên tháng',
-            'ngày': 'trên ngày',
-            'giờ': 'trên giờ',
-            'phút': 'trên phút',
-            'giây': 'trên giây',
-            'tuần': 'trên tuần',
-            'quý': 'trên quý',
-        }
-        unit_alternatives = '|'.join(re.escape(u) for u in unit_map.keys())
-        
-        # Pattern: NUMBER%/unit (e.g. 8,5%/năm, 10,2%/năm)
-        # NUMBER can be integer or decimal with comma (Vietnamese) or dot
-        p = re.compile(
-            r'(\d+(?:[.,]\d+)?)\s*%\s*/\s*(' + unit_alternatives + r')'
-            r'(?=[\s.,;:!?\)\]\}]|$)',
-            re.IGNORECASE
-        )
-        
         def replace_match(m):
             number = m.group(1)
             unit_key = m.group(2)
-            unit_spoken = unit_map.get(unit_key, 'trên ' + unit_key)
+            unit_spoken = self._PERCENT_RATE_UNITS.get(unit_key, 'trên ' + unit_key)
             return number + ' phần trăm ' + unit_spoken
         
-        input_str = p.sub(replace_match, input_str)
+        input_str = self._PERCENT_RATE_RE.sub(replace_match, input_str)
         return input_str
 
     def replace_special_words(self, input_str):
@@ -87,20 +139,26 @@ class TextNormalizer():
         #     input_str = re.sub(pattern, replacement, input_str)
         return input_str
 
+    _ELLIPSIS_RE = re.compile(r'\.{3,}')
+    _EM_DASH_IN_RANGE_RE = re.compile(r'(?<=\d)\s*—\s*(?=\d)')
+    _EN_DASH_IN_RANGE_RE = re.compile(r'(?<=\d)\s*–\s*(?=\d)')
+    _OPEN_PAREN_RE = re.compile(r'\(')
+    _CLOSE_PAREN_RE = re.compile(r'\)')
+
     def remove_special_characters_v1(self, input_str):
         input_str = ' ' + input_str + ' '
         # Convert pause-type punctuation — ellipsis to period, dashes to comma
         input_str = input_str.replace('…', '.')
-        input_str = re.sub(r'\.{3,}', '.', input_str)  # literal ... → .
+        input_str = self._ELLIPSIS_RE.sub('.', input_str)  # literal ... → .
         # Em-dash (—) → comma (pause), but preserve between digits for range detection
-        input_str = re.sub(r'(?<=\d)\s*—\s*(?=\d)', '-', input_str)  # 75—88 → 75-88
+        input_str = self._EM_DASH_IN_RANGE_RE.sub('-', input_str)  # 75—88 → 75-88
         input_str = input_str.replace('—', ',')
         # En-dash (–) → preserve as hyphen between digits for range detection, comma otherwise
-        input_str = re.sub(r'(?<=\d)\s*–\s*(?=\d)', '-', input_str)  # 75–88 → 75-88
+        input_str = self._EN_DASH_IN_RANGE_RE.sub('-', input_str)  # 75–88 → 75-88
         input_str = input_str.replace('–', ',')
         # Parentheses → comma for natural pause
-        input_str = re.sub(r'\(', ', ', input_str)
-        input_str = re.sub(r'\)', ', ', input_str)
+        input_str = self._OPEN_PAREN_RE.sub(', ', input_str)
+        input_str = self._CLOSE_PAREN_RE.sub(', ', input_str)
 #         punct = '! " “ \' ( ) ; [ ] * _ ` { | } ~ … 》 ≧ ≦ –  ‘ ’ · 】 ◇◆ ㅁ • ” `` '' ” ● ︶ ︶ ● † ⬔'.split()
         punct = '" “ \' [ ] * _ ` { ~ } 》 ≧ ≦ ‘ ’ · 】 ◇◆ ㅁ • ” `` '' ” ● ︶ ︶ ● † ⬔'.split()
         for e in punct:
@@ -141,9 +199,15 @@ class TextNormalizer():
         
         return ' '.join(new_text)
 
+    _NON_SPEECH_CHAR_RE = re.compile(r'[^\w\s,.?!;-]')
+
     def remove_special_characters_v2(self, input_str):
         # Preserve - (handled separately by normalize_remaining_dash)
-        return re.sub(r'[^\w\s,.?!;-]', ' ', input_str)
+        return self._NON_SPEECH_CHAR_RE.sub(' ', input_str)
+
+    _WORD_DASH_RE = re.compile(r'(?<=[a-zA-ZÀ-ỹ])\s*-\s*(?=[a-zA-ZÀ-ỹ])')
+    _LONE_DASH_RE = re.compile(r'(?<!\w)-(?!\w)')
+    _SPACED_DASH_RE = re.compile(r'(?<=\s)-(?=\s)')
 
     def normalize_remaining_dash(self, input_str):
         """
@@ -152,37 +216,38 @@ class TextNormalizer():
         This runs AFTER dash_range, date_range, time_range have already handled their cases.
         """
         # Between two words (e.g., "text-to-speech"): replace with space
-        input_str = re.sub(r'(?<=[a-zA-ZÀ-ỹ])\s*-\s*(?=[a-zA-ZÀ-ỹ])', ' ', input_str)
+        input_str = self._WORD_DASH_RE.sub(' ', input_str)
         # Standalone dashes or dashes adjacent to non-word chars: remove
-        input_str = re.sub(r'(?<!\w)-(?!\w)', ' ', input_str)
-        input_str = re.sub(r'(?<=\s)-(?=\s)', ' ', input_str)
+        input_str = self._LONE_DASH_RE.sub(' ', input_str)
+        input_str = self._SPACED_DASH_RE.sub(' ', input_str)
         return input_str
 
+    _EMOJI_RE = re.compile("["
+                        u"\U0001F600-\U0001F64F"  # emoticons
+                        u"\U0001F300-\U0001F5FF"  # symbols & pictographs
+                        u"\U0001F680-\U0001F6FF"  # transport & map symbols
+                        u"\U0001F1E0-\U0001F1FF"  # flags (iOS)
+                        u"\U00002500-\U00002BEF"  # chinese char
+                        u"\U00002702-\U000027B0"
+                        u"\U00002702-\U000027B0"
+                        u"\U000024C2-\U0001F251"
+                        u"\U0001f926-\U0001f937"
+                        u"\U00010000-\U0010ffff"
+                        u"\u2640-\u2642"
+                        u"\u2600-\u2B55"
+                        u"\u200d"
+                        u"\u23cf"
+                        u"\u23e9"
+                        u"\u231a"
+                        u"\ufe0f"  # dingbats
+                        u"\u3030"
+                        "]+", flags=re.UNICODE)
+
     def remove_emoji(self, input_str):
         """
         Remove emoji in text
         """
-        emoji_pattern = re.compile("["
-                                u"\U0001F600-\U0001F64F"  # emoticons
-                                u"\U0001F300-\U0001F5FF"  # symbols & pictographs
-                                u"\U0001F680-\U0001F6FF"  # transport & map symbols
-                                u"\U0001F1E0-\U0001F1FF"  # flags (iOS)
-                                u"\U00002500-\U00002BEF"  # chinese char
-                                u"\U00002702-\U000027B0"
-                                u"\U00002702-\U000027B0"
-                                u"\U000024C2-\U0001F251"
-                                u"\U0001f926-\U0001f937"
-                                u"\U00010000-\U0010ffff"
-                                u"\u2640-\u2642"
-                                u"\u2600-\u2B55"
-                                u"\u200d"
-                                u"\u23cf"
-                                u"\u23e9"
-                                u"\u231a"
-                                u"\ufe0f"  # dingbats
-                                u"\u3030"
-                                "]+", flags=re.UNICODE)
-        return emoji_pattern.sub(r'', input_str)
+        return self._EMOJI_RE.sub(r'', input_str)
     
     # def remove_emoticons(self, input_str):
     #     """
@@ -191,17 +256,18 @@ class TextNormalizer():
     #     emoticon_pattern = re.compile(u'(' + u'|'.join(k for k in EMOTICONS) + u')')
     #     return emoticon_pattern.sub(r'', input_str)
 
+    _EMAIL_RE = re.compile(r'[A-Za-z0-9._%+\-]+@[A-Za-z0-9.\-]+\.[A-Za-z]{2,}')
+    _URL_RE = re.compile(r'(https?|ftp)://\S+|www\.\S+')
+
     def remove_urls(self, input_str):
         """
         Convert URLs and emails to spoken form instead of removing them.
         """
         # Convert emails first (more specific pattern)
-        email_pattern = re.compile(r'[A-Za-z0-9._%+\-]+@[A-Za-z0-9.\-]+\.[A-Za-z]{2,}')
-        input_str = email_pattern.sub(lambda m: self._email_to_speech(m.group()), input_str)
+        input_str = self._EMAIL_RE.sub(lambda m: self._email_to_speech(m.group()), input_str)
         
         # Convert URLs
-        url_pattern = re.compile(r'(https?|ftp)://\S+|www\.\S+')
-        input_str = url_pattern.sub(lambda m: self._url_to_speech(m.group()), input_str)
+        input_str = self._URL_RE.sub(lambda m: self._url_to_speech(m.group()), input_str)
         
         return input_str
     
@@ -221,6 +287,9 @@ class TextNormalizer():
         
         return f' {local_spoken} a còng {domain_spoken} '
     
+    _URL_PROTOCOL_RE = re.compile(r'^(https?|ftp)://')
+    _URL_WWW_RE = re.compile(r'^www\.')
+
     def _url_to_speech(self, url):
         """
         Convert URL to spoken form, including protocol.
@@ -230,15 +299,15 @@ class TextNormalizer():
         
         # Extract and speak protocol letter-by-letter
         protocol_spoken = ''
-        protocol_match = re.match(r'^(https?|ftp)://', url)
+        protocol_match = self._URL_PROTOCOL_RE.match(url)
         if protocol_match:
             proto = protocol_match.group(1).upper()  # HTTPS, HTTP, FTP
             protocol_spoken = spell_out_abbreviation(proto) + ', '
         
         # Remove protocol
-        url_clean = re.sub(r'^(https?|ftp)://', '', url)
+        url_clean = self._URL_PROTOCOL_RE.sub('', url)
         # Remove www.
-        url_clean = re.sub(r'^www\.', '', url_clean)
+        url_clean = self._URL_WWW_RE.sub('', url_clean)
         # Remove trailing slashes and fragments
         url_clean = url_clean.rstrip('/')
         
@@ -263,13 +332,15 @@ class TextNormalizer():
         
         return ' chấm '.join(spoken_parts)
     
+    _TOKEN_GROUP_RE = re.compile(r'[A-Za-z]+|\d+|[^A-Za-z0-9]+')
+
     def _convert_token_to_speech(self, token):
         """
         Convert a single token (no dots/hyphens) to speech.
         Separates letters and numbers: 'user123' -> 'user một hai ba'
         """
         # Split into letter and digit groups
-        groups = re.findall(r'[A-Za-z]+|\d+|[^A-Za-z0-9]+', token)
+        groups = self._TOKEN_GROUP_RE.findall(token)
         result_parts = []
         for group in groups:
             if group.isdigit():
@@ -286,17 +357,38 @@ class TextNormalizer():
                 result_parts.append('phần trăm')
         return ' '.join(result_parts)
     
+    _HTML_TAG_RE = re.compile('<.*?>')
+
     def remove_html(self, input_str):
         """
         Remove html in input_str
         """
-        html_pattern = re.compile('<.*?>')
-        return html_pattern.sub(r'', input_str)
+        return self._HTML_TAG_RE.sub(r'', input_str)
     
     # def norm_vnmese_accent(self, input_str):
     #     output_str = VietnameseTextNormalizer.Normalize(input_str)
     #     return output_str
 
+    # 1. Define the Prefix (Context)
+    # Note: [hH] matches h or H. No pipe needed inside [].
+    # We use (?:...) for non-capturing groups to save memory.
+    _PHONE_PREFIX = r"(?:[hH]otline|[T|t]ổng đài|[Đ|đ]iện thoại|[Ss]ố điện thoại|SDT|SĐT|[zZ]alo|đường dây nóng|[Ll]iên hệ|gọi|call|chi tiết|hỗ trợ|tư vấn|liên lạc|công ty|[bB]án [hH]àng|[đĐ]ặt hàng)"
+
+    # 2. Define the Separator (CRITICAL FIX)
+    # Only allow spaces, colons, or dots immediately after the prefix. 
+    # distinct from the "greedy" (.*) in the original code.
+    _PHONE_SEPARATOR = r"[\s:.]+"
+
+    # 3. Define the Phone Number
+    # Removed \d{3} and \d{4} standalone matches to avoid matching years/distances.
+    # Added logic for standard VN mobile/landlines and extensions.
+    _PHONE_NUMBER = r"(?:\+?\d{8,12}|\d{3,5}\s\d{3,4}\s\d{3,4}|\d{4}\.\d{3}\.\d{3}|\d{3}\.\d{3}\.\d{4}|\d{3}\.\d{4}\.\d{3}|\d{4}\s\d{2}\s\d{2}\s\d{2})"
+
+    # Combine them: Look for Prefix + Separator + Number
+    # We use a compilation flag IgnoreCase to simplify [hH] handling if desired, 
+    # but kept your style for now.
+    _PHONE_RE = re.compile(f"({_PHONE_PREFIX})({_PHONE_SEPARATOR})({_PHONE_NUMBER})")
+
     def normalize_phone_number(self, input_str):
         """
         Normalize phone numbers strictly based on context.
@@ -304,34 +396,12 @@ class TextNormalizer():
         if not input_str:
             return ""
 
-        # 1. Define the Prefix (Context)
-        # Note: [hH] matches h or H. No pipe needed inside [].
-        # We use (?:...) for non-capturing groups to save memory.
-        prefix_pattern = r"(?:[hH]otline|[T|t]ổng đài|[Đ|đ]iện thoại|[Ss]ố điện thoại|SDT|SĐT|[zZ]alo|đường dây nóng|[Ll]iên hệ|gọi|call|chi tiết|hỗ trợ|tư vấn|liên lạc|công ty|[bB]án [hH]àng|[đĐ]ặt hàng)"
-
-        # 2. Define the Separator (CRITICAL FIX)
-        # Only allow spaces, colons, or dots immediately after the prefix. 
-        # distinct from the "greedy" (.*) in the original code.
-        separator_pattern = r"[\s:.]+"
-
-        # 3. Define the Phone Number
-        # Removed \d{3} and \d{4} standalone matches to avoid matching years/distances.
-        # Added logic for standard VN mobile/landlines and extensions.
-        number_pattern = r"(?:\+?\d{8,12}|\d{3,5}\s\d{3,4}\s\d{3,4}|\d{4}\.\d{3}\.\d{3}|\d{3}\.\d{3}\.\d{4}|\d{3}\.\d{4}\.\d{3}|\d{4}\s\d{2}\s\d{2}\s\d{2})"
-
-        # Combine them: Look for Prefix + Separator + Number
-        full_pattern = f"({prefix_pattern})({separator_pattern})({number_pattern})"
-        
-        # We use a compilation flag IgnoreCase to simplify [hH] handling if desired, 
-        # but kept your style for now.
-        regex = re.compile(full_pattern)
-
         # We will build a new string to avoid the 'replace' bug
         result_str = ""
         last_end = 0
 
         # finditer is safer and faster than the while loop approach
-        for match in regex.finditer(input_str):
+        for match in self._PHONE_RE.finditer(input_str):
             # Append text before the match
             result_str += input_str[last_end:match.start()]
             
@@ -354,32 +424,35 @@ class TextNormalizer():
 
         return result_str.strip()
 
+    # Match the symbol when preceded by whitespace, start of string, or non-alphanumeric
+    # and followed by whitespace, punctuation, alphanumeric, or end of string
+    _VERBATIM_RES = [
+        (re.compile(r'(?:(?<=\s)|(?<=^)|(?<=[^\w]))' + re.escape(key.strip()) + r'(?=[\s,.:;!?\)\]\}\w]|$)'),
+         ' ' + value.strip() + ' ')
+        for key, value in VERBATIM.items()
+    ]
+
     def norm_tag_verbatim(self, input_str):
-        import re as _re
-        for key, value in VERBATIM.items():
-            # Escape the key for regex and match it even when adjacent to punctuation
-            escaped_key = _re.escape(key.strip())
-            # Match the symbol when preceded by whitespace, start of string, or non-alphanumeric
-            # and followed by whitespace, punctuation, alphanumeric, or end of string
-            input_str = _re.sub(
-                r'(?:(?<=\s)|(?<=^)|(?<=[^\w]))' + escaped_key + r'(?=[\s,.:;!?\)\]\}\w]|$)',
-                ' ' + value.strip() + ' ',
-                input_str
-            )
+        for pattern, replacement in self._VERBATIM_RES:
+            input_str = pattern.sub(replacement, input_str)
         return input_str.strip()
 
+    _LETTER_DIGIT_RE = re.compile('([a-zA-Z]{1,10}\d{1,10}[a-zA-Z]{1,10}\d{1,10}|\d{1,10}[a-zA-Z]{1,10}\d{1,10}[a-zA-Z]{1,10}|[a-zA-Z]{1,10}\d{1,10}[a-zA-Z]{1,10}|\d{1,10}[a-zA-Z]{1,10}\d{1,10}|[a-zA-Z]{1,10}\d{1,10}|\d{1,10}[a-zA-Z]{1,10})')
+    _DIGITS_RE = re.compile(r'\d+')
+    _LETTERS_RE = re.compile(r'[a-zA-Z]+')
+
     def normalize_AZ09(self, input_str):
         """
         Normalize sequences with forms [A-Z]{1}[0-9]{1,2} or [0-9]{1,2}[A-Z]{1},
         i.e. 'chung cư A10', 'cục phòng chống tội phạm công nghệ cao C50'
         """
         input_str = ' ' + input_str + ' '
-        number_letter = re.findall('([a-zA-Z]{1,10}\d{1,10}[a-zA-Z]{1,10}\d{1,10}|\d{1,10}[a-zA-Z]{1,10}\d{1,10}[a-zA-Z]{1,10}|[a-zA-Z]{1,10}\d{1,10}[a-zA-Z]{1,10}|\d{1,10}[a-zA-Z]{1,10}\d{1,10}|[a-zA-Z]{1,10}\d{1,10}|\d{1,10}[a-zA-Z]{1,10})', input_str)
+        number_letter = self._LETTER_DIGIT_RE.findall(input_str)
         if len(number_letter) > 0:
             for item in number_letter:
                 item_str = item
-                numbers = re.findall(r'\d+', item)
-                characters = re.findall(r'[a-zA-Z]+', item_str)
+                numbers = self._DIGITS_RE.findall(item)
+                characters = self._LETTERS_RE.findall(item_str)
 
                 for character in characters:
                     temp_character_str = ''
@@ -397,11 +470,13 @@ class TextNormalizer():
                     
         return input_str.strip()
 
+    _WHITESPACE_RE = re.compile(r'\s+')
+
     def normalize_date(self, input_str):
         """
         Normalize dates.
         """
-        input_str = re.sub(r'\s+', ' ', input_str)
+        input_str = self._WHITESPACE_RE.sub(' ', input_str)
   
         input_str = self.norm_date_type_0(input_str)
         #print(f'1: {input_str}')
@@ -443,19 +518,21 @@ class TextNormalizer():
 #                 input_str = input_str.replace(date, ' ' + date_str + ' ')
 #         return input_str.strip()
     
+    _DATE_DMY_AFTER_NGAY_RE = re.compile(r'([Nn]gày)\s((0?[1-9]|[12]\d|3[01])\s*[\/.]\s*(0?[1-9]|[1][0-2])\s*[\/.]\s*(\d{4})|(0?[1-9]|[12]\d|3[01])\s*[\-]\s*(0?[1-9]|[1][0-2])\s*[\-]\s*(\d{4}))([\s|.|,|)|;|:])')
+    _DATE_DMY_SPACED_RE = re.compile(r"(0?[1-9]|[12]\d|3[01])\s*[\/.]\s*(0?[1-9]|[1][0-2])\s*[\/.]\s*(\d{4})|(0?[1-9]|[12]\d|3[01])\s*[\-]\s*(0?[1-9]|[1][0-2])\s*[\-]\s*(\d{4})")
+
     def norm_date_type_0(self, input_str):
         input_str = ' ' + input_str + ' '
         # Normalize dd/mm/yy[yy] (dmy) form of dates
         # Note: '8-6-2019' format này để riêng vì tránh cases "từ '8-6/2019' mây thay đổi nhiều"
         # date_dmy_pattern = re.compile(r'([Nn]gày)\s((0?[1-9]|[12]\d|3[01])[\/.](0?[1-9]|[1][0-2])[\/.](\d{4})|(0?[1-9]|[12]\d|3[01])[\-](0?[1-9]|[1][0-2])[\-](\d{4}))([\s|.|,|)|;|:])')
-        date_dmy_pattern = re.compile(r'([Nn]gày)\s((0?[1-9]|[12]\d|3[01])\s*[\/.]\s*(0?[1-9]|[1][0-2])\s*[\/.]\s*(\d{4})|(0?[1-9]|[12]\d|3[01])\s*[\-]\s*(0?[1-9]|[1][0-2])\s*[\-]\s*(\d{4}))([\s|.|,|)|;|:])')        
         temp_str_date_dmy = input_str
         dates_dmy = []
 
-        while(date_dmy_pattern.search(temp_str_date_dmy)):
-            date = date_dmy_pattern.search(temp_str_date_dmy)
+        while(self._DATE_DMY_AFTER_NGAY_RE.search(temp_str_date_dmy)):
+            date = self._DATE_DMY_AFTER_NGAY_RE.search(temp_str_date_dmy)
             term = date.group()
-            x = re.search(r"(0?[1-9]|[12]\d|3[01])\s*[\/.]\s*(0?[1-9]|[1][0-2])\s*[\/.]\s*(\d{4})|(0?[1-9]|[12]\d|3[01])\s*[\-]\s*(0?[1-9]|[1][0-2])\s*[\-]\s*(\d{4})", term)
+            x = self._DATE_DMY_SPACED_RE.search(term)
             dates_dmy.append(x.group())
             temp_str_date_dmy = temp_str_date_dmy[date.span()[1]-1:]
 
@@ -466,17 +543,18 @@ class TextNormalizer():
                 input_str = input_str.replace(date, ' ' + date_str + ' ')
         return input_str.strip()
     
+    _DATE_DMY_RE = re.compile(r'(?<!\d)(?<!\()(0?[1-9]|[12]\d|3[01])([\/.\-])(0?[1-9]|1[0-2])\2(\d{2}|\d{4})(?![\d.])')
+
     def norm_date_type_1(self, input_str):
         input_str = ' ' + input_str + ' '
         
         # Normalize dd/mm/yy[yy] (dmy) form of dates
         # Note: '8-6-2019' format này để riêng vì tránh cases "từ '8-6/2019' mây thay đổi nhiều"
         #date_dmy_pattern = re.compile(r'[\s|(](0?[1-9]|[12]\d|3[01])[\/.](0?[1-9]|[1][0-2])[\/.](\d{4}|\d{2})|\s(0?[1-9]|[12]\d|3[01])[\-](0?[1-9]|[1][0-2])[\-](\d{4}|\d{2})([\s|.|,|)|:|;])')
-        date_dmy_pattern = re.compile(r'(?<!\d)(?<!\()(0?[1-9]|[12]\d|3[01])([\/.\-])(0?[1-9]|1[0-2])\2(\d{2}|\d{4})(?![\d.])')
         temp_str_date_dmy = input_str
         dates_dmy = []
-        while(date_dmy_pattern.search(temp_str_date_dmy)):
-            date = date_dmy_pattern.search(temp_str_date_dmy)
+        while(self._DATE_DMY_RE.search(temp_str_date_dmy)):
+            date = self._DATE_DMY_RE.search(temp_str_date_dmy)
             dates_dmy.append(date.group())
 
             temp_str_date_dmy = temp_str_date_dmy[date.span()[1]-1:]
@@ -489,16 +567,16 @@ class TextNormalizer():
 
         return input_str.strip()
 
+    # Group 1: Prefix (từ, đến, etc.)
+    # Group 2: The full Date string (e.g., 21/11)
+    # Group 5: The suffix/delimiter (comma, space, dot, etc.)
+    _DATE_DM_PREFIXED_RE = re.compile(r'(sau ,|mai ,|qua ,|nay ,|sớm|đến hết|[đ|Đ]ợt|[Pp]hiên|[Nn]gày|[D|d]ịp|[Ss]áng|[Tt]rưa|[Cc]hiều|[Tt]ối|[Đđ]êm|[Mm]ùng|[Hh]ôm|nay|[Ss]áng qua|[Tt]ưa qua|[Cc]hiều qua|[Tt]ối qua|[Đđ]êm qua|[Hh]ôm qua|[Hh]ôm sau|mai|[Vv]ào|[Kk]éo dài tới|[Dd]ự kiến tới|[Đđ]ến|[Tt]ới|[Tt]ừ)\(*\s*((0?[1-9]|[12]\d|3[01])[\/\-.](0?[1-9]|[1][0-2]))([\s|.|,|)|:|;])')
+    _DATE_DM_AND_RE = re.compile('[Nn]gày .+ và (\d{1,2}[\/\-.]\d{1,2})\s')
+
     def norm_date_type_2(self, input_str):
         input_str = ' ' + input_str + ' '
         
-        # 1. Define the Pattern
-        # Group 1: Prefix (từ, đến, etc.)
-        # Group 2: The full Date string (e.g., 21/11)
-        # Group 5: The suffix/delimiter (comma, space, dot, etc.)
-        pattern_str = r'(sau ,|mai ,|qua ,|nay ,|sớm|đến hết|[đ|Đ]ợt|[Pp]hiên|[Nn]gày|[D|d]ịp|[Ss]áng|[Tt]rưa|[Cc]hiều|[Tt]ối|[Đđ]êm|[Mm]ùng|[Hh]ôm|nay|[Ss]áng qua|[Tt]ưa qua|[Cc]hiều qua|[Tt]ối qua|[Đđ]êm qua|[Hh]ôm qua|[Hh]ôm sau|mai|[Vv]ào|[Kk]éo dài tới|[Dd]ự kiến tới|[Đđ]ến|[Tt]ới|[Tt]ừ)\(*\s*((0?[1-9]|[12]\d|3[01])[\/\-.](0?[1-9]|[1][0-2]))([\s|.|,|)|:|;])'
-        date_dm_pattern = re.compile(pattern_str)
-
+        # 1. Pattern: _DATE_DM_PREFIXED_RE
         # 2. Define a replacement callback function
         def replace_match(match):
             prefix = match.group(1)      # e.g., "đến"
@@ -513,10 +591,10 @@ class TextNormalizer():
             return f"{prefix} {date_text}{delimiter}"
 
         # 3. Apply substitution
-        input_str = date_dm_pattern.sub(replace_match, input_str)
+        input_str = self._DATE_DM_PREFIXED_RE.sub(replace_match, input_str)
 
         # 4. Handle the Special "và" cases (Keeping your original logic here roughly)
-        dates_dm_special = re.findall('[Nn]gày .+ và (\d{1,2}[\/\-.]\d{1,2})\s', input_str)
+        dates_dm_special = self._DATE_DM_AND_RE.findall(input_str)
         for date in dates_dm_special:
             date_str = date_dm2words(date)
             # Use simple replace here, or upgrade to regex sub for safety as well
@@ -524,11 +602,14 @@ class TextNormalizer():
 
         return input_str.strip()
 
+    _DATE_DM_NGAY_RE = re.compile(r'[Nn]gày.*\s\(*\s*((0?[1-9]|[12]\d|3[01])\s*\/\s*(0?[1-9]|[1][0-2]))([\s|.|,|)|;|:])')
+    _DATE_DM_SLASH_RE = re.compile(r'\s(0?[1-9]|[12]\d|3[01])\s*\/\s*(0?[1-9]|[1][0-2])')
+
     def norm_date_type_3(self, input_str):
         input_str = ' ' + input_str + ' '
         # Normalize dd/mm form without clear rules
         # Cám ơn cha dành cho Ngày của cha (16/6) tới đây của Hồ Ngọc Hà...
-        p = re.compile(r'[Nn]gày.*\s\(*\s*((0?[1-9]|[12]\d|3[01])\s*\/\s*(0?[1-9]|[1][0-2]))([\s|.|,|)|;|:])')
+        p = self._DATE_DM_NGAY_RE
         l = []
         temp_line = input_str
         while(p.search(temp_line)):
@@ -539,7 +620,7 @@ class TextNormalizer():
         dates_dm_ = []
         if len(l) > 0:
             temp_str = l[0]
-            p = re.compile(r'\s(0?[1-9]|[12]\d|3[01])\s*\/\s*(0?[1-9]|[1][0-2])')
+            p = self._DATE_DM_SLASH_RE
             while(p.search(temp_str)):
                 date = p.search(temp_str)
                 dates_dm_.append(date.group())
@@ -552,17 +633,18 @@ class TextNormalizer():
 
         return input_str.strip()
 
+    _DATE_MY_RE = re.compile(r'\s((0?[1-9]|[1][0-2])[\/\-.](\d{4}))([\s|.|,|)|:|;])')
+
     def norm_date_type_4(self, input_str):
         input_str = ' ' + input_str + ' '
         # Normalize mm/yyyy (my) form of dates
         # @improve:
         # những cases không có [Tt]háng ở trước --> thêm 'tháng' ở date_my2word()
         # trong read.py  nhưng tránh các trường hợp Quý 2/2018, đợt 3/2019, tỷ lệ 1/2000
-        date_my_pattern = re.compile(r'\s((0?[1-9]|[1][0-2])[\/\-.](\d{4}))([\s|.|,|)|:|;])')
         temp_str_date_my = input_str
         dates_my = []
-        while(date_my_pattern.search(temp_str_date_my)):
-            date = date_my_pattern.search(temp_str_date_my)
+        while(self._DATE_MY_RE.search(temp_str_date_my)):
+            date = self._DATE_MY_RE.search(temp_str_date_my)
             dates_my.append(date.group().strip())
             temp_str_date_my = temp_str_date_my[date.span()[1]-1:]
         if len(dates_my) > 0:
@@ -583,13 +665,14 @@ class TextNormalizer():
 
         return input_str.strip()
 
+    _YEAR_RANGE_RE = re.compile(r'\s(\d{4})\s*\-\s*(\d{4})([\s|.|,|)])')
+
     def norm_date_range_type_1(self, input_str):
-        year_range_pattern = re.compile(r'\s(\d{4})\s*\-\s*(\d{4})([\s|.|,|)])')
         temp_str = input_str
         year_range_list = []
 
-        while(year_range_pattern.search(temp_str)):
-            year_range = year_range_pattern.search(temp_str)
+        while(self._YEAR_RANGE_RE.search(temp_str)):
+            year_range = self._YEAR_RANGE_RE.search(temp_str)
             year_range_list.append(year_range.group())
             temp_str = temp_str[year_range.span()[1]-1:]
 
@@ -605,15 +688,16 @@ class TextNormalizer():
 
         return input_str.strip()
 
+    _DATE_RANGE_DMY_RE = re.compile(r'\s((0?[1-9]|[12]\d|3[01])[\/.](0?[1-9]|[1][0-2])[\/.](\d{4})\s*\-\s*(0?[1-9]|[12]\d|3[01])[\/.](0?[1-9]|[1][0-2])[\/.](\d{4}))([\s|.|,|)])')
+
     def norm_date_range_type_2(self, input_str):
         input_str = ' ' + input_str + ' '
         # Normalize dd/mm/yyyy-dd/mm/yyyy forms
-        date_range_dmy_pattern = re.compile(r'\s((0?[1-9]|[12]\d|3[01])[\/.](0?[1-9]|[1][0-2])[\/.](\d{4})\s*\-\s*(0?[1-9]|[12]\d|3[01])[\/.](0?[1-9]|[1][0-2])[\/.](\d{4}))([\s|.|,|)])')
         temp_str = input_str
         date_range_dmy_list = []
         
-        while(date_range_dmy_pattern.search(temp_str)):
-            date_range_dmy = date_range_dmy_pattern.search(temp_str)
+        while(self._DATE_RANGE_DMY_RE.search(temp_str)):
+            date_range_dmy = self._DATE_RANGE_DMY_RE.search(temp_str)
             date_range_dmy_list.append(date_range_dmy.group())
             temp_str = temp_str[date_range_dmy.span()[1]-1:]
 
@@ -627,15 +711,16 @@ class TextNormalizer():
                 
         return input_str.strip()
 
+    _DATE_RANGE_DD_DMY_RE = re.compile(r'\s((0?[1-9]|[12]\d|3[01])\s*\-\s*(0?[1-9]|[12]\d|3[01])[\/.](0?[1-9]|[1][0-2])[\/.](\d{4}))([\s|.|,|)])')
+
     def norm_date_range_type_3(self, input_str):
         input_str = ' ' + input_str + ' '
         # Normalize dd-dd/mm/yyyy forms
-        date_range_dmy1_pattern = re.compile(r'\s((0?[1-9]|[12]\d|3[01])\s*\-\s*(0?[1-9]|[12]\d|3[01])[\/.](0?[1-9]|[1][0-2])[\/.](\d{4}))([\s|.|,|)])')
         temp_str = input_str
         date_range_dmy1_list = []
 
-        while(date_range_dmy1_pattern.search(temp_str)):
-            date_range_dmy1 = date_range_dmy1_pattern.search(temp_str)
+        while(self._DATE_RANGE_DD_DMY_RE.search(temp_str)):
+            date_range_dmy1 = self._DATE_RANGE_DD_DMY_RE.search(temp_str)
             date_range_dmy1_list.append(date_range_dmy1.group())
             temp_str = temp_str[date_range_dmy1.span()[1]-1:]
 
@@ -649,15 +734,16 @@ class TextNormalizer():
 
         return input_str.strip()
 
+    _DATE_RANGE_DM_DMY_RE = re.compile(r'\s((0?[1-9]|[12]\d|3[01])[\/.](0?[1-9]|[1][0-2])\s*\-\s*(0?[1-9]|[12]\d|3[01])[\/.](0?[1-9]|[1][0-2])[\/.](\d{4}))([\s|.|,|)])')
+
     def norm_date_range_type_4(self, input_str):
         input_str = ' ' + input_str + ' '
         # Normalize dd/mm-dd/mm/yyyy forms
-        date_range_dmy2_pattern = re.compile(r'\s((0?[1-9]|[12]\d|3[01])[\/.](0?[1-9]|[1][0-2])\s*\-\s*(0?[1-9]|[12]\d|3[01])[\/.](0?[1-9]|[1][0-2])[\/.](\d{4}))([\s|.|,|)])')
         temp_str = input_str
         date_range_dmy2_list = []
 
-        while(date_range_dmy2_pattern.search(temp_str)):
-            date_range_dmy2 = date_range_dmy2_pattern.search(temp_str)
+        while(self._DATE_RANGE_DM_DMY_RE.search(temp_str)):
+            date_range_dmy2 = self._DATE_RANGE_DM_DMY_RE.search(temp_str)
             date_range_dmy2_list.append(date_range_dmy2.group())
             temp_str = temp_str[date_range_dmy2.span()[1]-1:]
 
@@ -671,15 +757,16 @@ class TextNormalizer():
 
         return input_str.strip()
 
+    _DATE_RANGE_DM_DM_RE = re.compile(r'\s((0?[1-9]|[12]\d|3[01])[\/.](0?[1-9]|[1][0-2])\s*\-\s*(0?[1-9]|[12]\d|3[01])[\/.](0?[1-9]|[1][0-2]))([\s|.|,|)])')
+
     def norm_date_range_type_5(self, input_str):
         input_str = ' ' + input_str + ' '
         # Normalize dd/mm-dd/mm forms: 20/1-18/2
-        date_range_dm1_pattern = re.compile(r'\s((0?[1-9]|[12]\d|3[01])[\/.](0?[1-9]|[1][0-2])\s*\-\s*(0?[1-9]|[12]\d|3[01])[\/.](0?[1-9]|[1][0-2]))([\s|.|,|)])')
         temp_str = input_str
         date_range_dm1_list = []
 
-        while(date_range_dm1_pattern.search(temp_str)):
-            date_range_dm1 = date_range_dm1_pattern.search(temp_str)
+        while(self._DATE_RANGE_DM_DM_RE.search(temp_str)):
+            date_range_dm1 = self._DATE_RANGE_DM_DM_RE.search(temp_str)
             date_range_dm1_list.append(date_range_dm1.group())
             temp_str = temp_str[date_range_dm1.span()[1]-1:]
 
@@ -693,15 +780,16 @@ class TextNormalizer():
 
         return input_str.strip()
 
+    _DATE_RANGE_DD_DM_RE = re.compile(r'\s((0?[1-9]|[12]\d|3[01])\s*\-\s*(0?[1-9]|[12]\d|3[01])[\/.](0?[1-9]|[1][0-2]))([\s|.|,|)])')
+
     def norm_date_range_type_6(self, input_str):
         input_str = ' ' + input_str + ' '
         # Normalize dd-dd/mm forms: 15-18/6, 15 -18/6, 15- 18/6
-        date_range_dm2_pattern = re.compile(r'\s((0?[1-9]|[12]\d|3[01])\s*\-\s*(0?[1-9]|[12]\d|3[01])[\/.](0?[1-9]|[1][0-2]))([\s|.|,|)])')
         temp_str = input_str
         date_range_dm2_list = []
 
-        while(date_range_dm2_pattern.search(temp_str)):
-            date_range_dm2 = date_range_dm2_pattern.search(temp_str)
+        while(self._DATE_RANGE_DD_DM_RE.search(temp_str)):
+            date_range_dm2 = self._DATE_RANGE_DD_DM_RE.search(temp_str)
             date_range_dm2_list.append(date_range_dm2.group())
             temp_str = temp_str[date_range_dm2.span()[1]-1:]
 
@@ -720,30 +808,31 @@ class TextNormalizer():
         input_str = self.norm_tag_roman_num_v2(input_str)
         return input_str.strip()
 
+    # 1. Define Context Keywords
+    # These are the words that MUST precede a Roman numeral to be valid.
+    _ROMAN_KEYWORDS = (
+        r'(thế hệ|số|đại hội|giai đoạn|quý|cấp|quận|kỳ|khóa|quy định|'
+        r'vành đai|vùng|thế kỷ|khu vực|khu|đợt|hạng|báo động|tập|lần|'
+        r'lần thứ|trung ương|tw|chương)'
+    )
+
+    # 2. Define Roman Numeral Pattern
+    # Fix 1: Add (?=[XVIxvi]) to ensure the match contains at least one Roman character (not empty).
+    # Fix 2: We include both upper and lower case in the pattern, but rely on the 'keywords' context to filter out false positives like "tu vi".
+    _ROMAN_CHARS = r'(?=[XVIxvi])(?:X{0,3})(?:IX|IV|V?I{0,3}|ix|iv|v?i{0,3})'
+
+    # 3. Combined Pattern
+    # Structure: (Keyword) + (Space) + (Roman Numeral) + (Word Boundary/Punctuation)
+    # We use \b at the start to ensure we don't match middle of words.
+    # flags=re.IGNORECASE allows "chương" or "Chương" to match.
+    _ROMAN_AFTER_KEYWORD_RE = re.compile(
+        r'\b({})\s+({})(?=[\s\.,\)\/]|$)'.format(_ROMAN_KEYWORDS, _ROMAN_CHARS), re.IGNORECASE)
+
     def norm_tag_roman_num_v2(self, input_str):
         """
         Normalize roman numerals to Vietnamese text.
         Example: "Chương IV" -> "Chương bốn"
         """
-        
-        # 1. Define Context Keywords
-        # These are the words that MUST precede a Roman numeral to be valid.
-        keywords = (
-            r'(thế hệ|số|đại hội|giai đoạn|quý|cấp|quận|kỳ|khóa|quy định|'
-            r'vành đai|vùng|thế kỷ|khu vực|khu|đợt|hạng|báo động|tập|lần|'
-            r'lần thứ|trung ương|tw|chương)'
-        )
-
-        # 2. Define Roman Numeral Pattern
-        # Fix 1: Add (?=[XVIxvi]) to ensure the match contains at least one Roman character (not empty).
-        # Fix 2: We include both upper and lower case in the pattern, but rely on the 'keywords' context to filter out false positives like "tu vi".
-        roman_chars = r'(?=[XVIxvi])(?:X{0,3})(?:IX|IV|V?I{0,3}|ix|iv|v?i{0,3})'
-
-        # 3. Combined Pattern
-        # Structure: (Keyword) + (Space) + (Roman Numeral) + (Word Boundary/Punctuation)
-        # We use \b at the start to ensure we don't match middle of words.
-        pattern = r'\b({})\s+({})(?=[\s\.,\)\/]|$)' .format(keywords, roman_chars)
-
         def replace_func(match):
             prefix = match.group(1) # The keyword (e.g., "Chương")
             roman = match.group(2)  # The numeral (e.g., "IV")
@@ -768,18 +857,18 @@ class TextNormalizer():
                 return match.group(0)
 
         # 4. Perform Substitution
-        # flags=re.IGNORECASE allows "chương" or "Chương" to match.
-        return re.sub(pattern, replace_func, input_str, flags=re.IGNORECASE)
+        return self._ROMAN_AFTER_KEYWORD_RE.sub(replace_func, input_str)
+
+    _ROMAN_NUMERAL_RE = re.compile('(\s(\(\s*X{0,3})(IX|IV|V?I{0,3})|\s(\(\s*x{0,3})(ix|iv|v?i{0,3}))([\s|.|,|)|/])')
 
     def norm_tag_roman_num_v1(self, input_str):
         input_str = ' ' + input_str + ' '
-        roman_numeral_p = re.compile('(\s(\(\s*X{0,3})(IX|IV|V?I{0,3})|\s(\(\s*x{0,3})(ix|iv|v?i{0,3}))([\s|.|,|)|/])')
         temp_str = input_str
         # temp_str = " " + " ".join(word_tokenize(temp_str)) + " "
         roman_numeral_list = []
 
-        while (roman_numeral_p.search(temp_str, re.IGNORECASE)):
-            roman_numeral = roman_numeral_p.search(temp_str)
+        while (self._ROMAN_NUMERAL_RE.search(temp_str, re.IGNORECASE)):
+            roman_numeral = self._ROMAN_NUMERAL_RE.search(temp_str)
             roman_numeral_list.append(roman_numeral.group().strip())
             temp_str = temp_str[roman_numeral.span()[1] - 1:]
 
@@ -801,17 +890,18 @@ class TextNormalizer():
         input_str = self.normalize_time2(input_str)
         return input_str.strip()
 
+    _TIME_RE = re.compile(r'(\d+)(\:|h)(0?[0-9]|[1-5][0-9])(\:|p)([1-5][0-9]|0?[0-9])(\s|s)|(\d+)(\:|h)([1-5][0-9]|0?[0-9])|(\d+)h')
+
     def normalize_time2(self, input_str):
         """
         Normalize time
         """
         input_str = ' ' + input_str + ' '
-        time_patterns = re.compile(r'(\d+)(\:|h)(0?[0-9]|[1-5][0-9])(\:|p)([1-5][0-9]|0?[0-9])(\s|s)|(\d+)(\:|h)([1-5][0-9]|0?[0-9])|(\d+)h')
         temp_str_time = input_str
         times = []
 
-        while(time_patterns.search(temp_str_time)):
-            time = time_patterns.search(temp_str_time)
+        while(self._TIME_RE.search(temp_str_time)):
+            time = self._TIME_RE.search(temp_str_time)
             times.append(time.group())
             temp_str_time = temp_str_time[time.span()[1]:]
 
@@ -823,13 +913,16 @@ class TextNormalizer():
         
         return input_str.strip()
 
+    _TIME_RANGE_RE = re.compile(r'((\d+)(\:|h)(0?[0-9]|[1-5][0-9])(\:|p)([1-5][0-9]|0?[0-9])|(\d+)(\:|h)([1-5][0-9]|0?[0-9])|(\d+)h)\s*-\s*((\d+)(\:|h)(0?[0-9]|[1-5][0-9])(\:|p)([1-5][0-9]|0?[0-9])|(\d+)(\:|h)([1-5][0-9]|0?[0-9])|(\d+)h)')
+    _TIME_PART_RE = re.compile(r'(\d+)(\:|h)(0?[0-9]|[1-5][0-9])(\:|p)([1-5][0-9]|0?[0-9])|(\d+)(\:|h)([1-5][0-9]|0?[0-9])|(\d+)h')
+
     def normalize_time1(self, input_str):
         """
         Normalize time
         """
         input_str = ' ' + input_str + ' '
         # time_patterns = re.compile(r'\b(0?[0-9]|1\d|2[0-4])[:hg](0?[0-9]|[1-5]\d|)\b')
-        time_patterns = re.compile(r'((\d+)(\:|h)(0?[0-9]|[1-5][0-9])(\:|p)([1-5][0-9]|0?[0-9])|(\d+)(\:|h)([1-5][0-9]|0?[0-9])|(\d+)h)\s*-\s*((\d+)(\:|h)(0?[0-9]|[1-5][0-9])(\:|p)([1-5][0-9]|0?[0-9])|(\d+)(\:|h)([1-5][0-9]|0?[0-9])|(\d+)h)')
+        time_patterns = self._TIME_RANGE_RE
         temp_str_time = input_str
         duration_times = []
 
@@ -839,7 +932,7 @@ class TextNormalizer():
             temp_str_time = temp_str_time[time.span()[1]:]
 
         for duration_time in duration_times:
-            time_patterns = re.compile(r'(\d+)(\:|h)(0?[0-9]|[1-5][0-9])(\:|p)([1-5][0-9]|0?[0-9])|(\d+)(\:|h)([1-5][0-9]|0?[0-9])|(\d+)h')
+            time_patterns = self._TIME_PART_RE
             temp_time = duration_time
             times = []
 
@@ -853,9 +946,11 @@ class TextNormalizer():
 
         return input_str.strip()
 
+    _MULTIPLY_RE = re.compile(r'[0-9]*[.,]*[0-9]+\s*x\s*[0-9]*[.,]*[0-9]+\s*x\s*[0-9]*[.,]*[0-9]|[0-9]*[.,]*[0-9]+\s*x\s*[0-9]*[.,]*[0-9]+')
+
     def norm_multiply_number(self, input_str):
         input_str = ' ' + input_str + ' '
-        vi_numbers = re.findall(r'[0-9]*[.,]*[0-9]+\s*x\s*[0-9]*[.,]*[0-9]+\s*x\s*[0-9]*[.,]*[0-9]|[0-9]*[.,]*[0-9]+\s*x\s*[0-9]*[.,]*[0-9]+', input_str)
+        vi_numbers = self._MULTIPLY_RE.findall(input_str)
 
         if len(vi_numbers) > 0:
             for vi_number in vi_numbers:
@@ -864,23 +959,30 @@ class TextNormalizer():
 
         return input_str.strip()
 
-    def normalize_sport_score(self, input_str):
+    _SCORE_RE = re.compile(r'(\s[0-9]+(\-|\:)[0-9]+)')
+
+    _SPORT_NGRAMS = ('tỷ số', 'chiến thắng', 'trận đấu', 'tỉ số', 'bàn thắng', 'trên sân', 'đội bóng', 'thi đấu', 'cầu thủ',\
+                     'vô địch', 'mùa giải', 'đánh bại', 'đối thủ', 'bóng đá', 'gỡ hòa', 'chung kết', 'bán kết', 'ghi bàn', \
+                     'chủ nhà', 'tiền đạo', 'dứt điểm', 'tiền vệ', 'tiền đạo', 'thua', 'bị dẫn')
+
+    def is_sport_context(self, input_str):
+        """True if input_str mentions sport, so that a-b / a:b read as scores."""
+        temp_str = input_str.lower()
+        return any(temp_str.find(item) != -1 for item in self._SPORT_NGRAMS)
+
+    def normalize_sport_score(self, input_str, is_sport=None):
         """
         Normalize sport scores
+        is_sport: overrides is_sport_context(input_str) (sharded
+        normalization passes the answer for the whole document).
         """
+        if is_sport is None:
+            is_sport = self.is_sport_context(input_str)
         input_str = ' ' + input_str + ' '
         temp_str = input_str.lower()
-        scores = re.findall(r'(\s[0-9]+(\-|\:)[0-9]+)', temp_str)
+        scores = self._SCORE_RE.findall(temp_str)
         scores = [score[0] for score in scores]
-        sport_ngrams = ['tỷ số', 'chiến thắng', 'trận đấu', 'tỉ số', 'bàn thắng', 'trên sân', 'đội bóng', 'thi đấu', 'cầu thủ',\
-                        'vô địch', 'mùa giải', 'đánh bại', 'đối thủ', 'bóng đá', 'gỡ hòa', 'chung kết', 'bán kết', 'ghi bàn', \
-                        'chủ nhà', 'tiền đạo', 'dứt điểm', 'tiền vệ', 'tiền đạo', 'thua', 'bị dẫn']
-        is_sport = 0
-        for item in sport_ngrams:
-            if (temp_str.find(item)) != -1:
-                is_sport = 1
-                break
-        if is_sport == 1 and len(scores) > 0:
+        if is_sport and len(scores) > 0:
             for score in scores:
                 if '-' in score:
                     lscore = num2words_fixed(score.split('-')[0])
@@ -903,16 +1005,17 @@ class TextNormalizer():
         input_str = self.normalize_number_plate4(input_str)
         return input_str.strip()
 
+    _PLATE_SERIES_DOT_RE = re.compile(r"([B|b]iển [K|k]iểm [S|s]oát|[B|b]iển [S|s]ố xe|[B|b]iển [S|s]ố)+\s*(.)\s*([0-9]+[a-zA-Z]+[0-9]*)(\s|\-)+[0-9]+\.[0-9]+([\s|.|,|)])")
+
     def normalize_number_plate1(self, input_str):
         """
             Normalize plate
         """
         input_str = ' ' + input_str + ' '
-        p = re.compile(r"([B|b]iển [K|k]iểm [S|s]oát|[B|b]iển [S|s]ố xe|[B|b]iển [S|s]ố)+\s*(.)\s*([0-9]+[a-zA-Z]+[0-9]*)(\s|\-)+[0-9]+\.[0-9]+([\s|.|,|)])")
         temp_str = input_str
         number_plate_list = []
-        while(p.search(temp_str)):
-            number_plate = p.search(temp_str)
+        while(self._PLATE_SERIES_DOT_RE.search(temp_str)):
+            number_plate = self._PLATE_SERIES_DOT_RE.search(temp_str)
             x = number_plate.group()
             number_plate_list.append(x.strip().split("-")[-1] if '-' in x else x.split()[-1])
             temp_str = temp_str[number_plate.span()[1]-1:]
@@ -924,16 +1027,17 @@ class TextNormalizer():
 
         return input_str.strip()
 
+    _PLATE_SERIES_RE = re.compile(r"([B|b]iển [K|k]iểm [S|s]oát|[B|b]iển [S|s]ố xe|[B|b]iển [S|s]ố)+\s*(.)\s*([0-9]+[a-zA-Z]+[0-9]*)+\s*(\-|\.|\s)\s*[0-9]+([\s|.|,|)])")
+
     def normalize_number_plate2(self, input_str):
         """
             Normalize plate
         """
         input_str = ' ' + input_str + ' '
-        p = re.compile(r"([B|b]iển [K|k]iểm [S|s]oát|[B|b]iển [S|s]ố xe|[B|b]iển [S|s]ố)+\s*(.)\s*([0-9]+[a-zA-Z]+[0-9]*)+\s*(\-|\.|\s)\s*[0-9]+([\s|.|,|)])")
         temp_str = input_str
         number_plate_list = []
-        while(p.search(temp_str)):
-            number_plate = p.search(temp_str)
+        while(self._PLATE_SERIES_RE.search(temp_str)):
+            number_plate = self._PLATE_SERIES_RE.search(temp_str)
             x = number_plate.group()
             if '-' in x:
                 number_plate_list.append(x.split("-")[-1])
@@ -950,16 +1054,17 @@ class TextNormalizer():
 
         return input_str.strip()
 
+    _PLATE_LOOSE_DOT_RE = re.compile(r"([B|b]iển [K|k]iểm [S|s]oát|[B|b]iển [S|s]ố xe|[B|b]iển [S|s]ố)+\s*.*\s*([0-9]+[a-zA-Z]+[0-9]*)(\s|\-)+[0-9]+\.[0-9]+([\s|.|,|)])")
+
     def normalize_number_plate3(self, input_str):
         """
             Normalize plate
         """
         input_str = ' ' + input_str + ' '
-        p = re.compile(r"([B|b]iển [K|k]iểm [S|s]oát|[B|b]iển [S|s]ố xe|[B|b]iển [S|s]ố)+\s*.*\s*([0-9]+[a-zA-Z]+[0-9]*)(\s|\-)+[0-9]+\.[0-9]+([\s|.|,|)])")
         temp_str = input_str
         number_plate_list = []
-        while(p.search(temp_str)):
-            number_plate = p.search(temp_str)
+        while(self._PLATE_LOOSE_DOT_RE.search(temp_str)):
+            number_plate = self._PLATE_LOOSE_DOT_RE.search(temp_str)
             x = number_plate.group()
             number_plate_list.append(x.strip().split("-")[-1] if '-' in x else x.split()[-1])
             temp_str = temp_str[number_plate.span()[1]-1:]
@@ -971,16 +1076,17 @@ class TextNormalizer():
 
         return input_str.strip()
 
+    _PLATE_LOOSE_RE = re.compile(r"([B|b]iển [K|k]iểm [S|s]oát|[B|b]iển [S|s]ố xe|[B|b]iển [S|s]ố)+\s*.*\s*([0-9]+[a-zA-Z]+[0-9]*)+\s*(\-|\.|\s)\s*[0-9]+")
+
     def normalize_number_plate4(self, input_str):
         """
             Normalize plate
         """
         input_str = ' ' + input_str + ' '
-        p = re.compile(r"([B|b]iển [K|k]iểm [S|s]oát|[B|b]iển [S|s]ố xe|[B|b]iển [S|s]ố)+\s*.*\s*([0-9]+[a-zA-Z]+[0-9]*)+\s*(\-|\.|\s)\s*[0-9]+")
         temp_str = input_str
         number_plate_list = []
-        while(p.search(temp_str)):
-            number_plate = p.search(temp_str)
+        while(self._PLATE_LOOSE_RE.search(temp_str)):
+            number_plate = self._PLATE_LOOSE_RE.search(temp_str)
             x = number_plate.group()
             if '-' in x:
                 number_plate_list.append(x.split("-")[-1])
@@ -996,14 +1102,15 @@ class TextNormalizer():
 
         return input_str.strip()
 
+    _PLATE_FORMAT_RE = re.compile(r'\b(?:\d{2}[A-Z]{1,2}\d?-?\d{3}\.\d{2}|\d{2}-\d{3}-[A-Z]{2}-\d{2}|[A-Z]{2}-\d{2}-\d{2}|\d{2}-[A-Z]{2}-\d{3}-\d{2})\b')
+
     def normalize_number_plate0(self, input_str):
         """
             Norm several types of Vietnamese license plates including white, red, motor, car,...
             eg: '29LD-888.99' -> '2 9 L D 8 8 8 9 9'
                 '80-NG-167-76' -> '8 0 N G 1 6 7 7 6'
         """
-        plate_pattern = r'\b(?:\d{2}[A-Z]{1,2}\d?-?\d{3}\.\d{2}|\d{2}-\d{3}-[A-Z]{2}-\d{2}|[A-Z]{2}-\d{2}-\d{2}|\d{2}-[A-Z]{2}-\d{3}-\d{2})\b'
-        matches = re.findall(plate_pattern, input_str)
+        matches = self._PLATE_FORMAT_RE.findall(input_str)
         if len(matches) > 0:
             for item in matches:
                 new_item = item.replace('-', '').replace('.', '')
@@ -1011,19 +1118,21 @@ class TextNormalizer():
                 input_str = input_str.replace(item.strip(), new_item.strip())
         return input_str.strip()
 
+    _ID_NUMBER_RE = re.compile(r"([C|c]hứng minh nhân dân|[C|c]hứng minh thư|[M|m]ã thẻ|[S|s]ố thẻ|[S|s]ố tài khoản|[C|c]ăn cước|[C|c]ăn cước công dân|[M|m]ã số thuế|[B|b]iển số|[M|m]ã số|nhân viên|mã)+\s+.{1,20}(\:|là\s*)*\s*(\d{2,20}\b)")
+    _ID_DIGITS_RE = re.compile(r"\d{2,20}\b")
+
     def norm_id_digit(self, input_str):
         """
             Normalize CMT, STK
         """
         input_str = ' ' + input_str + ' '
         # p = re.compile(r"[\d ]{9,20}")
-        p = re.compile(r"([C|c]hứng minh nhân dân|[C|c]hứng minh thư|[M|m]ã thẻ|[S|s]ố thẻ|[S|s]ố tài khoản|[C|c]ăn cước|[C|c]ăn cước công dân|[M|m]ã số thuế|[B|b]iển số|[M|m]ã số|nhân viên|mã)+\s+.{1,20}(\:|là\s*)*\s*(\d{2,20}\b)")  
         temp_str = input_str
         digits_list = []
-        while(p.search(temp_str)):
-            digit = p.search(temp_str)
+        while(self._ID_NUMBER_RE.search(temp_str)):
+            digit = self._ID_NUMBER_RE.search(temp_str)
             term = digit.group()
-            x = re.search(r"\d{2,20}\b",term)
+            x = self._ID_DIGITS_RE.search(term)
             digits_list.append(x.group())
             temp_str = temp_str[digit.span()[1]-1:]
         # digits = re.findall(r"[\d ]{9,20}", input_str)
@@ -1035,14 +1144,15 @@ class TextNormalizer():
 
         return input_str.strip()
 
+    _NEGATIVE_NUMBER_RE = re.compile(r'\s\-([0-9]*,*[0-9]+)\s')
+
     def normalize_negative_number(self, input_str):
         input_str = ' ' + input_str + ' '
-        p = re.compile(r'\s\-([0-9]*,*[0-9]+)\s')
         # p = re.compile(r"(là|kết quả|âm|dưới|lạnh|xuống|nhiệt độ|áp suất)+\s*\:*\-\s*[0-9]*,*[0-9]+")
         temp_str = input_str
         neg_numbers = []
-        while (p.search(temp_str)):
-            numbers = p.search(temp_str)
+        while (self._NEGATIVE_NUMBER_RE.search(temp_str)):
+            numbers = self._NEGATIVE_NUMBER_RE.search(temp_str)
             term = numbers.group()
             neg_numbers.append(term.split("-")[-1])
             temp_str = temp_str[numbers.span()[1] - 1:]
@@ -1062,9 +1172,11 @@ class TextNormalizer():
         return input_str.strip()
 
 
+    _AGE_GROUP_TEAM_RE = re.compile('\sU[\-\.]*[0-9][0-9][\s|.|,|)]')
+
     def norm_soccer(self, input_str):
         # Normalize units of VFF football team: U23, U19, etc
-        matches = re.findall('\sU[\-\.]*[0-9][0-9][\s|.|,|)]', input_str)
+        matches = self._AGE_GROUP_TEAM_RE.findall(input_str)
         if len(matches) > 0:
             for item in matches:
                 item_norm = item.replace('.','').replace('-','').replace(' U', ' U ')
@@ -1072,32 +1184,15 @@ class TextNormalizer():
 
         return input_str.strip()
 
-    def norm_abbre(self, input_str, abbre_dict):
-        temp_str = input_str
-
-        # not remove punctuation
-        words_temp = temp_str.split()
-        for i in range(len(words_temp)):
-            temp_word = words_temp[i]
-            if temp_word[-1] in [',', '.', ')', '}', ']', '!', '?', '/', '-', ':', ';']:
-                temp_word = temp_word[:-1]
-
-            if temp_word in abbre_dict.keys():
-                input_str =  input_str.replace(temp_word, str(abbre_dict[temp_word]).strip().lower())
+    # id(abbre_dict) -> AbbreviationMatcher, built on first use
+    _ABBRE_MATCHERS = {}
 
-        #remove punctuation
-        temp_str = input_str
-        for character in [',', '.', ')', '}', ']', '!', '?', '/', '-']:
-            temp_str = temp_str.replace(character, ' ')
-
-        words_inp = temp_str.split()
-        for i in range(len(words_inp)):
-            temp_word = words_inp[i]
-
-            if temp_word in abbre_dict.keys():
-                input_str =  input_str.replace(temp_word, str(abbre_dict[temp_word]).strip())
-
-        return input_str.strip()
+    def norm_abbre(self, input_str, abbre_dict):
+        matcher = self._ABBRE_MATCHERS.get(id(abbre_dict))
+        if matcher is None or matcher.abbreviations is not abbre_dict:
+            matcher = AbbreviationMatcher(abbre_dict)
+            self._ABBRE_MATCHERS[id(abbre_dict)] = matcher
+        return matcher.expand(input_str).strip()
 
     def norm_tag_fraction(self, input_str):
         input_str = self.norm_tag_fraction1(input_str)
@@ -1107,6 +1202,10 @@ class TextNormalizer():
         input_str = self.norm_tag_fraction5(input_str)
         return input_str.strip()
 
+    _FRACTION_RE = re.compile(r'(?<![a-zA-ZÀ-ỹ])'  # not preceded by a letter (avoids matching after "ngày", etc.)
+            r'(\d{1,3})\s*/\s*(\d{1,3})'
+            r'(?=[\s.,;:!?\)\]\}]|$)')
+
     def norm_tag_fraction5(self, input_str):
         """
         Normalize standalone fractions like 1/2, 3/4, 5/8 that have no special context.
@@ -1117,11 +1216,6 @@ class TextNormalizer():
         input_str = ' ' + input_str + ' '
         # Match standalone number/number patterns not preceded by date-related words
         # Negative lookbehind for date context words
-        p = re.compile(
-            r'(?<![a-zA-ZÀ-ỹ])'  # not preceded by a letter (avoids matching after "ngày", etc.)
-            r'(\d{1,3})\s*/\s*(\d{1,3})'
-            r'(?=[\s.,;:!?\)\]\}]|$)'  # followed by delimiter or end
-        )
         
         def replace_fraction(match):
             numerator = match.group(1)
@@ -1130,21 +1224,22 @@ class TextNormalizer():
             den_str = num2words_fixed(denominator)
             return ' ' + num_str + ' trên ' + den_str + ' '
         
-        input_str = p.sub(replace_fraction, input_str)
+        input_str = self._FRACTION_RE.sub(replace_fraction, input_str)
         return input_str.strip()
 
 
+    _FRACTION_CONTEXT_RE = re.compile(r"(thứ|hơn|gần|:|hạng|được|tới|góp|là|có|còn|lên|bằng|[Cc]hiếm|giảm|tỷ lệ|tỉ lệ|[K|k]hoảng|online)\s[0-9]+\s*\/\s*[0-9]+[\s|.|,|)|;]")
+
     def norm_tag_fraction1(self, input_str):
         """
         Normalize number range.
         ###([0-9]+,[0-9]+\s*\/\s*[0-9]+,[0-9]+|[0-9]+,[0-9]+\s*\/\s*[0-9]+|[0-9]+\s*\/\s*[0-9]+,[0-9]+) regex for 2,1/4
         """
         input_str = ' ' + input_str + ' '
-        p = re.compile(r"(thứ|hơn|gần|:|hạng|được|tới|góp|là|có|còn|lên|bằng|[Cc]hiếm|giảm|tỷ lệ|tỉ lệ|[K|k]hoảng|online)\s[0-9]+\s*\/\s*[0-9]+[\s|.|,|)|;]")
         temp_str = input_str
         ratio_list = []
-        while(p.search(temp_str)):
-            ratio = p.search(temp_str)
+        while(self._FRACTION_CONTEXT_RE.search(temp_str)):
+            ratio = self._FRACTION_CONTEXT_RE.search(temp_str)
             x = ratio.group().replace(' / ', '/').replace(' /', '/').replace('/ ', '/')
             ratio_list.append(x.split()[-1])
             temp_str = temp_str[ratio.span()[1]-1:]
@@ -1165,16 +1260,17 @@ class TextNormalizer():
 
         return input_str.strip()
 
+    _FRACTION_MEASURE_RE = re.compile(r"\s[0-9]+\s*\/\s*[0-9]+\s*(muỗng|thìa|ly|cốc|chén|chai|lọ)")
+
     def norm_tag_fraction2(self, input_str):
         """
         Normalize case 1/3 muỗng
         """
         input_str = ' ' + input_str + ' '
-        p = re.compile(r"\s[0-9]+\s*\/\s*[0-9]+\s*(muỗng|thìa|ly|cốc|chén|chai|lọ)")
         temp_str = input_str
         ratio_list = []
-        while(p.search(temp_str)):
-            ratio = p.search(temp_str)
+        while(self._FRACTION_MEASURE_RE.search(temp_str)):
+            ratio = self._FRACTION_MEASURE_RE.search(temp_str)
             x = ratio.group().replace(' / ', '/').replace(' /', '/').replace('/ ', '/')
             ratio_list.append(x.split()[0])
             temp_str = temp_str[ratio.span()[1]-1:]
@@ -1192,16 +1288,17 @@ class TextNormalizer():
 
         return input_str.strip()
 
+    _DECREE_NUMBER_RE = re.compile(r"([N|n]ghị [Đ|đ]ịnh|[N|n]ghị [Q|q]uyết|[T|t]hông [T|t]ư|[T|t]hông [T|t]ư liên tịch)\s*[0-9]+\s*\/\s*[0-9]+(\/)*[0-9]+")
+
     def norm_tag_fraction3(self, input_str):
         """
         Normalize case Điều 48 Nghị định 110/2013/NĐ-CP
         """
         input_str = ' ' + input_str + ' '
-        p = re.compile(r"([N|n]ghị [Đ|đ]ịnh|[N|n]ghị [Q|q]uyết|[T|t]hông [T|t]ư|[T|t]hông [T|t]ư liên tịch)\s*[0-9]+\s*\/\s*[0-9]+(\/)*[0-9]+")
         temp_str = input_str
         ratio_list = []
-        while(p.search(temp_str)):
-            ratio = p.search(temp_str)
+        while(self._DECREE_NUMBER_RE.search(temp_str)):
+            ratio = self._DECREE_NUMBER_RE.search(temp_str)
             x = ratio.group().replace(' / ', '/').replace(' /', '/').replace('/ ', '/')
             ratio_list.append(x.split()[-1])
             temp_str = temp_str[ratio.span()[1]-1:]
@@ -1216,16 +1313,17 @@ class TextNormalizer():
                 input_str = input_str.replace(ratio, ' ' + ratio_str + ' ')
         return input_str.strip()
 
+    _PER_WORD_RE = re.compile(r"\s[AĂÂÁẮẤÀẰẦẢẲẨÃẴẪẠẶẬĐEÊÉẾÈỀẺỂẼỄẸỆIÍÌỈĨỊOÔƠÓỐỚÒỒỜỎỔỞÕỖỠỌỘỢUƯÚỨÙỪỦỬŨỮỤỰYÝỲỶỸỴA-Zaăâáắấàằầảẳẩãẵẫạặậđeêéếèềẻểẽễẹệiíìỉĩịoôơóốớòồờỏổởõỗỡọộợuưúứùừủửũữụựyýỳỷỹỵa-z]+\/")
+
     def norm_tag_fraction4(self, input_str):
         """
         Normalize case trường hợp/100.000 dân
         """
         input_str = ' ' + input_str + ' '
-        p = re.compile(r"\s[AĂÂÁẮẤÀẰẦẢẲẨÃẴẪẠẶẬĐEÊÉẾÈỀẺỂẼỄẸỆIÍÌỈĨỊOÔƠÓỐỚÒỒỜỎỔỞÕỖỠỌỘỢUƯÚỨÙỪỦỬŨỮỤỰYÝỲỶỸỴA-Zaăâáắấàằầảẳẩãẵẫạặậđeêéếèềẻểẽễẹệiíìỉĩịoôơóốớòồờỏổởõỗỡọộợuưúứùừủửũữụựyýỳỷỹỵa-z]+\/")
         temp_str = input_str
         ratio_list = []
-        while(p.search(temp_str)):
-            ratio = p.search(temp_str)
+        while(self._PER_WORD_RE.search(temp_str)):
+            ratio = self._PER_WORD_RE.search(temp_str)
             x = ratio.group().replace(' / ', '/').replace(' /', '/').replace('/ ', '/')
             ratio_list.append(x.split()[-1])
             temp_str = temp_str[ratio.span()[1]-1:]
@@ -1238,16 +1336,17 @@ class TextNormalizer():
         return input_str.strip()
 
 
+    _ADDRESS_RE = re.compile(r"([N|n]gõ|[N|n]gách|[H|h]ẻm)\s[0-9]+\s*\/\s*[0-9]+(\/)*[0-9]*[\s|.|,|)|;]")
+
     def norm_adress(self, input_str):
         """
         Normalize case ngõ 12/124 
         """
         input_str = ' ' + input_str + ' '
-        p = re.compile(r"([N|n]gõ|[N|n]gách|[H|h]ẻm)\s[0-9]+\s*\/\s*[0-9]+(\/)*[0-9]*[\s|.|,|)|;]")
         temp_str = input_str
         ratio_list = []
-        while(p.search(temp_str)):
-            ratio = p.search(temp_str)
+        while(self._ADDRESS_RE.search(temp_str)):
+            ratio = self._ADDRESS_RE.search(temp_str)
             x = ratio.group().replace(' / ', '/').replace(' /', '/').replace('/ ', '/')
             ratio_list.append(x.split()[-1])
             temp_str = temp_str[ratio.span()[1]-1:]
@@ -1271,6 +1370,8 @@ class TextNormalizer():
 
         return input_str.strip()
 
+    _DOT_DECIMAL_RE = re.compile(r'(?<=\s)(\d+)\.(\d+)(?=[\s.,;:!?\)\]\}]|$)')
+
     def norm_number_type_dot_decimal(self, input_str):
         """
         Normalize international-format decimal numbers using dot as decimal separator.
@@ -1283,7 +1384,6 @@ class TextNormalizer():
         # (VN format: \d{1,3}(?:\.\d{3})+ — groups of exactly 3 digits after dot)
         # This matches: integer_part.decimal_part where decimal_part is NOT exactly 3 digits
         # or where the number has only one dot
-        p = re.compile(r'(?<=\s)(\d+)\.(\d+)(?=[\s.,;:!?\)\]\}]|$)')
         
         def replace_decimal(match):
             integer_part = match.group(1)
@@ -1300,16 +1400,18 @@ class TextNormalizer():
             dec_str = n2w_single(decimal_part)
             return ' ' + int_str + ' chấm ' + dec_str + ' '
         
-        input_str = p.sub(replace_decimal, input_str)
+        input_str = self._DOT_DECIMAL_RE.sub(replace_decimal, input_str)
         return input_str.strip()
 
+    _COMMA_DECIMAL_RE = re.compile(r'\b\d{1,3}(?:\.\d{3})*,\d+\b')
+
     def norm_number_type_0(self, input_str):
         """
         Normalize number
         """
         # Normalize vi-style numbers: '2.300 Euro', '25.320 vé', etc
         input_str = ' ' + input_str + ' '
-        vi_numbers = re.findall(r'\b\d{1,3}(?:\.\d{3})*,\d+\b', input_str)
+        vi_numbers = self._COMMA_DECIMAL_RE.findall(input_str)
         # print(vi_numbers)
         # Sort by length descending to prevent partial replacements
         vi_numbers = sorted(vi_numbers, key=len, reverse=True)
@@ -1329,6 +1431,8 @@ class TextNormalizer():
 
         return input_str.strip()
 
+    _THOUSANDS_RE = re.compile(r'[\s|(](\d{1,3}(?:\.\d{3})+)(?!\d)')
+
     def norm_number_type_1(self, input_str):
         """
         Normalize number
@@ -1338,7 +1442,7 @@ class TextNormalizer():
         input_str = ' ' + input_str + ' '
         # Match VN thousand-separated numbers (e.g. 1.000, 10.000, 1.000.000)
         # (?!\d) ensures we don't partially match 3.14159 as 3.141
-        vi_numbers = re.findall(r'[\s|(](\d{1,3}(?:\.\d{3})+)(?!\d)', input_str)
+        vi_numbers = self._THOUSANDS_RE.findall(input_str)
         # print(vi_numbers)
         # Sort by length descending to prevent partial replacements (e.g. 1.000 inside 1.000.000)
         vi_numbers = sorted(vi_numbers, key=len, reverse=True)
@@ -1361,13 +1465,15 @@ class TextNormalizer():
 
     #     return input_str.strip()
 
+    _COMMA_NUMBER_RE = re.compile(r'[\s|(]([\d]+\,[\d]+\,*[\d]*\,*[\d]*\,*[\d]*)')
+
     def norm_number_type_2(self, input_str):
         """
         Normalize number
         """
         # Normalize vi-style numbers: '2.300 Euro', '25.320 vé', etc
         input_str = ' ' + input_str + ' '
-        vi_numbers = re.findall(r'[\s|(]([\d]+\,[\d]+\,*[\d]*\,*[\d]*\,*[\d]*)', input_str)
+        vi_numbers = self._COMMA_NUMBER_RE.findall(input_str)
         if len(vi_numbers) > 0:
             for vi_number in vi_numbers:
                 if vi_number.count(',') == 1 and int(vi_number.replace(',', '')) % 1000 != 0:
@@ -1380,9 +1486,11 @@ class TextNormalizer():
 
         return input_str.strip()
 
+    _INTEGER_RE = re.compile(r'([\d]+)')
+
     def norm_number_type_3(self, input_str):
         input_str = ' ' + input_str + ' '
-        numbers = re.findall(r'([\d]+)', input_str)
+        numbers = self._INTEGER_RE.findall(input_str)
         numbers = sorted([int(number) for number in numbers], reverse=True)
         numbers = [str(number) for number in numbers]
         if len(numbers) > 0:
@@ -1431,18 +1539,20 @@ class TextNormalizer():
         input_str = self.normalize_number_range2(input_str)
         return input_str.strip()
 
+    _NUMBER_RANGE_CONTEXT_RE = re.compile(r"(hơn|kém|gấp|tăng|tầm|giảm|liệu trình|nhất|tới|có|sau|mức|tuổi|từ|tăng tốc|được|khoảng|trong|vòng|dao động|cấp|tốc độ)(.*)\s+[0-9]*(,|\.)*[0-9]+\s*\-\s*[0-9]*(,|\.)*[0-9]+[\s|.|,|)]")
+    _NUMBER_RANGE_RE = re.compile(r"[0-9]*(,|\.)*[0-9]+\s*\-\s*[0-9]*(,|\.)*[0-9]+[\s|.|,|)]")
+
     def normalize_number_range1(self, input_str):
         """
         Normalize number ranges
         """
         input_str = ' ' + input_str + ' '
-        p = re.compile(r"(hơn|kém|gấp|tăng|tầm|giảm|liệu trình|nhất|tới|có|sau|mức|tuổi|từ|tăng tốc|được|khoảng|trong|vòng|dao động|cấp|tốc độ)(.*)\s+[0-9]*(,|\.)*[0-9]+\s*\-\s*[0-9]*(,|\.)*[0-9]+[\s|.|,|)]")
         temp_str = input_str
         number_range_list = []
-        while(p.search(temp_str)):
-            number_range = p.search(temp_str)
+        while(self._NUMBER_RANGE_CONTEXT_RE.search(temp_str)):
+            number_range = self._NUMBER_RANGE_CONTEXT_RE.search(temp_str)
             term = number_range.group()
-            x = re.search(r"[0-9]*(,|\.)*[0-9]+\s*\-\s*[0-9]*(,|\.)*[0-9]+[\s|.|,|)]", term)
+            x = self._NUMBER_RANGE_RE.search(term)
             number_range_list.append(x.group())
             temp_str = temp_str[number_range.span()[1]-1:]
 
@@ -1479,18 +1589,20 @@ class TextNormalizer():
 
         return input_str.strip()
 
+    _NUMBER_RANGE_UNIT_RE = re.compile(r"\s+[0-9]*,*[0-9]+\s*\-\s*[0-9]*,*[0-9]+\s*(lần|cái|khách|túi|ki lô gam|kg|hôm|ngày|muỗng|thìa|phút|gói|cái|tháng|năm|tiếng|mét|ca|tuổi|phần trăm|ki lô gam|giờ|giây|xen ti mét|mi li mét|độ|lít|tấn|thùng|cái|con|triệu|gam|hàng|m|ki lô mét|h|phòng)")
+    _INT_RANGE_RE = re.compile(r"[0-9]*,*[0-9]+\s*\-\s*[0-9]*,*[0-9]+[\s|.|,|)]")
+
     def normalize_number_range2(self, input_str):
         """
         Normalize number ranges
         """
         input_str = ' ' + input_str + ' '
-        p = re.compile(r"\s+[0-9]*,*[0-9]+\s*\-\s*[0-9]*,*[0-9]+\s*(lần|cái|khách|túi|ki lô gam|kg|hôm|ngày|muỗng|thìa|phút|gói|cái|tháng|năm|tiếng|mét|ca|tuổi|phần trăm|ki lô gam|giờ|giây|xen ti mét|mi li mét|độ|lít|tấn|thùng|cái|con|triệu|gam|hàng|m|ki lô mét|h|phòng)")
         temp_str = input_str
         number_range_list = []
-        while(p.search(temp_str)):
-            number_range = p.search(temp_str)
+        while(self._NUMBER_RANGE_UNIT_RE.search(temp_str)):
+            number_range = self._NUMBER_RANGE_UNIT_RE.search(temp_str)
             term = number_range.group()
-            x = re.search(r"[0-9]*,*[0-9]+\s*\-\s*[0-9]*,*[0-9]+[\s|.|,|)]", term)
+            x = self._INT_RANGE_RE.search(term)
             number_range_list.append(x.group())
             temp_str = temp_str[number_range.span()[1]-1:]
 
@@ -1514,18 +1626,20 @@ class TextNormalizer():
 
         return input_str.strip()
 
+    _RATING_RE = re.compile(r"(đánh giá|rate)\s+[0-9]+[*|⭐|★].")
+    _STAR_RE = re.compile(r"[*|⭐|★]")
+
     def normalize_rate(self, input_str):
         """
         Normalize number ranges
         """
         input_str = ' ' + input_str + ' '
-        p = re.compile(r"(đánh giá|rate)\s+[0-9]+[*|⭐|★].")
         temp_str = input_str
         rate_list = []
-        while(p.search(temp_str)):
-            rate = p.search(temp_str)
+        while(self._RATING_RE.search(temp_str)):
+            rate = self._RATING_RE.search(temp_str)
             term = rate.group()
-            x = re.search(r"[*|⭐|★]", term)
+            x = self._STAR_RE.search(term)
             rate_list.append(x.group())
             temp_str = temp_str[rate.span()[1]-1:]
         
@@ -1544,6 +1658,11 @@ class TextNormalizer():
 
         return input_str.strip()
     
+    _NEWLINE_AFTER_PUNCT_RE = re.compile(r'(?<=[\.\,\?\!\:\;\)\]\}\'"\u2019\u201D])\s*\n+\s*')
+    _NEWLINE_RE = re.compile(r'\s*\n+\s*')
+    _PHAY_RE = re.compile(r'phẩy')
+    _SENTENCE_PUNCT_RE = re.compile(r'(?<!\d)([.,])(?!\d)')
+
     def separate_comma_and_dot_at_the_end(self, input_str):
         """
             Separate comma and dot in sentence but keep number in og
@@ -1551,34 +1670,44 @@ class TextNormalizer():
                 '10.000.000' --> '10.000.000'
         """
         s = input_str.replace('\r\n', '\n').replace('\r', '\n')
-        s = re.sub(r'(?<=[\.\,\?\!\:\;\)\]\}\'"\u2019\u201D])\s*\n+\s*', ' ', s)
-        input_str = re.sub(r'\s*\n+\s*', '. ', s)
+        s = self._NEWLINE_AFTER_PUNCT_RE.sub(' ', s)
+        input_str = self._NEWLINE_RE.sub('. ', s)
         # NOTE: Do NOT replace ':' here — it breaks time (08:05), phone, ratio patterns
         # Colon cleanup is done later via norm_colon_to_period() after time/phone normalization
-        input_str = re.sub(r'phẩy', 'phảy', input_str)
-        separated_sentence = re.sub(r'(?<!\d)([.,])(?!\d)', r'\1 ', input_str)
+        input_str = self._PHAY_RE.sub('phảy', input_str)
+        separated_sentence = self._SENTENCE_PUNCT_RE.sub(r'\1 ', input_str)
         # Loại bỏ các khoảng trắng thừa có thể xảy ra do dấu cách giữa các dấu câu
-        separated_sentence = re.sub(r'\s+', ' ', separated_sentence).strip()
+        separated_sentence = self._WHITESPACE_RE.sub(' ', separated_sentence).strip()
         return separated_sentence
     
+    _COLONS_RE = re.compile(r'[:]+')
+
     def norm_colon_to_period(self, input_str):
         """
         Replace remaining colons with periods.
         Must be called AFTER time, phone, and ratio normalization.
         """
-        input_str = re.sub(r'[:]+', '. ', input_str)
+        input_str = self._COLONS_RE.sub('. ', input_str)
         return input_str
     
-    def norm_ratio(self, input_str):
+    _RATIO_RE = re.compile(r"(\b\d+:\d+\b)")
+
+    def is_ratio_context(self, input_str):
+        """True if input_str talks about a ratio, so that a:b read as one."""
+        return "tỉ lệ" in input_str.lower()
+
+    def norm_ratio(self, input_str, is_ratio=None):
         """
             Norm ratio
             eg: 'Tỉ lệ 1:18' --> 'tỉ lệ 1 18'
+            is_ratio: overrides is_ratio_context(input_str)
         """
         # ratio_pattern = r"([T|t]ỉ lệ|[T|t]ỷ lệ)+\s*\b\d+:\d+\b"
         matches = []
-        ratio_pattern = r"(\b\d+:\d+\b)"
-        if "tỉ lệ" in input_str.lower():
-            matches = re.findall(ratio_pattern, input_str)
+        if is_ratio is None:
+            is_ratio = self.is_ratio_context(input_str)
+        if is_ratio:
+            matches = self._RATIO_RE.findall(input_str)
         if len(matches) > 0:
             # print(matches)
             for item in matches:
@@ -1586,10 +1715,12 @@ class TextNormalizer():
                 input_str = input_str.replace(item.strip(), new_item.strip())
         return input_str.strip()    
     
+    _DATE_DM_TIME_OF_DAY_RE = re.compile(r'([Ss]áng|[Tt]rưa|[Cc]hiều|[Tt]ối|[Ll]ễ|[Tt]ết|[Hh]ôm|[Đđ]ợt)\s*\(*\s*((0?[1-9]|[12]\d|3[01])\s*\/\s*(0?[1-9]|[1][0-2]))([\s|.|,|)|;|:])')
+
     def norm_date_type_5(self, input_str):
         input_str = ' ' + input_str + ' '
         # match datetime like dd/mm which doesnt have prefix "ngày" but "sáng", "trưa", "chiều", "tối" include space character
-        p = re.compile(r'([Ss]áng|[Tt]rưa|[Cc]hiều|[Tt]ối|[Ll]ễ|[Tt]ết|[Hh]ôm|[Đđ]ợt)\s*\(*\s*((0?[1-9]|[12]\d|3[01])\s*\/\s*(0?[1-9]|[1][0-2]))([\s|.|,|)|;|:])')
+        p = self._DATE_DM_TIME_OF_DAY_RE
         l = []
         temp_line = input_str
         while(p.search(temp_line)):
@@ -1600,7 +1731,7 @@ class TextNormalizer():
         dates_dm_ = []
         if len(l) > 0:
             temp_str = l[0]
-            p = re.compile(r'\s(0?[1-9]|[12]\d|3[01])\s*\/\s*(0?[1-9]|[1][0-2])')
+            p = self._DATE_DM_SLASH_RE
             while(p.search(temp_str)):
                 date = p.search(temp_str)
                 dates_dm_.append(date.group())
@@ -1613,10 +1744,13 @@ class TextNormalizer():
 
         return input_str.strip()
     
+    _DATE_DM_PAIR_RE = re.compile(r'(0?[1-9]|[12]\d|3[01])\s*\/\s*(0?[1-9]|1[0-2])\s+(và|đến|)\s+(0?[1-9]|[12]\d|3[01])\s*\/\s*(0?[1-9]|1[0-2])')
+    _DATE_DM_SLASH_OPT_RE = re.compile(r'(\s)?(0?[1-9]|[12]\d|3[01])\s*\/\s*(0?[1-9]|[1][0-2])')
+
     def norm_date_type_6(self, input_str):
         input_str = ' ' + input_str + ' '
         # match case dd/mm like "ngày 31/08 và 1/9"
-        p = re.compile(r'(0?[1-9]|[12]\d|3[01])\s*\/\s*(0?[1-9]|1[0-2])\s+(và|đến|)\s+(0?[1-9]|[12]\d|3[01])\s*\/\s*(0?[1-9]|1[0-2])')
+        p = self._DATE_DM_PAIR_RE
         l = []
         temp_line = input_str
         while(p.search(temp_line)):
@@ -1627,7 +1761,7 @@ class TextNormalizer():
         dates_dm_ = []
         if len(l) > 0:
             temp_str = l[0]
-            p = re.compile(r'(\s)?(0?[1-9]|[12]\d|3[01])\s*\/\s*(0?[1-9]|[1][0-2])')
+            p = self._DATE_DM_SLASH_OPT_RE
             while(p.search(temp_str)):
                 date = p.search(temp_str)
                 dates_dm_.append(date.group())
@@ -1640,13 +1774,14 @@ class TextNormalizer():
 
         return input_str.strip()
     
+    _HOUR_RANGE_RE = re.compile(r'\d+\s*h?\s*-\s*\d+\s*h')
+
     def normalize_time_range(self, input_str):
         # match time range like 9-10h, 9h - 10 h, not include minute and second
-        time_patterns = re.compile(r'\d+\s*h?\s*-\s*\d+\s*h')
         temp_str_time = input_str
         times = []
-        while(time_patterns.search(temp_str_time)):
-            time = time_patterns.search(temp_str_time)
+        while(self._HOUR_RANGE_RE.search(temp_str_time)):
+            time = self._HOUR_RANGE_RE.search(temp_str_time)
             times.append(time.group())
             temp_str_time = temp_str_time[time.span()[1]:]
         for matched_time in times:
@@ -1665,40 +1800,31 @@ class TextNormalizer():
             input_str = input_str.replace(matched_time," " + convert_t1 + " đến " + convert_t2 + " ")
         return input_str
     
-    def norm_unit(self, input_str):
-        from app.normalizer.units import CASE_SENSITIVE_UNITS
-        out = input_str
-        MULTIPLIERS = r'(?:chục|trăm|nghìn|ngàn|triệu|tỷ)'
-        PUNCT_CLASS = r'(?:\s|[.,;:)\]\}!?\-"\'…/]|$)'
-
-        for term, norm_term in UNITS_DICT.items():
-            # Entries containing '/' (e.g., "/năm", "USD/", "kWh/ngày", "m/s")
-            # are compound rate patterns — use simple string replacement
-            # since the number-prefix regex doesn't handle them correctly
-            if '/' in term or term.startswith('.'):
-                out = out.replace(term, norm_term)
-                continue
-
-            term_esc = re.escape(term)  
-            pattern = rf'(?P<num>[+-]?\d+(?:[.,]\d+)*)\s*(?P<mult>{MULTIPLIERS}\s*)?{term_esc}(?={PUNCT_CLASS})'
-            
-            # Case-sensitive matching for units where case matters
-            # (e.g., mPa vs MPa, KB vs Mb vs MB)
-            flags = 0 if term in CASE_SENSITIVE_UNITS else re.IGNORECASE
-            prog = re.compile(pattern, flags)
-
-            def repl(m):
-                num = m.group('num')
-                mult = (m.group('mult') or '').strip()
-                parts = [num]
-                if mult:
-                    parts.append(mult)
-                parts.append(norm_term)
-                return ' '.join(parts)
-
-            out = prog.sub(repl, out)
+    _UNIT_RATE_RE, _UNIT_RE, _UNIT_EXACT, _UNIT_FOLDED = _compile_unit_patterns()
+    _MULTI_WHITESPACE_RE = re.compile(r'\s{2,}')
+
+    def _unit_repl(self, m):
+        num = m.group('num')
+        mult = (m.group('mult') or '').strip()
+        # "kg" and "Kg" can both be listed; the one listed first was tried first
+        unit = m.group('unit')
+        candidates = [self._UNIT_EXACT.get(unit), self._UNIT_FOLDED.get(unit.casefold())]
+        norm_term = min(c for c in candidates if c is not None)[1]
+        parts = [num]
+        if mult:
+            parts.append(mult)
+        parts.append(norm_term)
+        return ' '.join(parts)
 
-        out = re.sub(r'\s{2,}', ' ', out).strip()
+    def norm_unit(self, input_str):
+        # Units are read together with their number first, rate units
+        # ("100Mb/s") included; the compound rate patterns left (e.g. "/năm",
+        # "USD/", "kWh/ngày") are then plain replacements, padded so they never
+        # stick to the word before them. One pass each over the text (see
+        # _compile_unit_patterns).
+        out = self._UNIT_RE.sub(self._unit_repl, input_str)
+        out = self._UNIT_RATE_RE.sub(lambda m: ' ' + self._UNIT_EXACT[m.group()][1], out)
+        out = self._MULTI_WHITESPACE_RE.sub(' ', out).strip()
         return out
     """
     def norm_unit(self,input_str):
@@ -1716,10 +1842,12 @@ class TextNormalizer():
                     # print("input_str:",input_str)
         return input_str
     """
+    _DATE_DM_AFTER_TIME_OF_DAY_RE = re.compile(r'([Ss]áng|[Tt]rưa|[Cc]hiều|[Tt]ối|[Ll]ễ|[Tt]ết|[Hh]ôm|[Đđ]ợt).+?((0?[1-9]|[12]\d|3[01])\s*/\s*(0?[1-9]|1[0-2]))')
+
     def norm_date_type_7(self, input_str):
         input_str = ' ' + input_str + ' '
         #match certain time-related words followed by any character and then followed by a date in the format dd/mm (day/month)
-        p = re.compile(r'([Ss]áng|[Tt]rưa|[Cc]hiều|[Tt]ối|[Ll]ễ|[Tt]ết|[Hh]ôm|[Đđ]ợt).+?((0?[1-9]|[12]\d|3[01])\s*/\s*(0?[1-9]|1[0-2]))')
+        p = self._DATE_DM_AFTER_TIME_OF_DAY_RE
         l = []
         temp_line = input_str
         while(p.search(temp_line)):
@@ -1730,7 +1858,7 @@ class TextNormalizer():
         dates_dm_ = []
         if len(l) > 0:
             temp_str = l[0]
-            p = re.compile(r'\s(0?[1-9]|[12]\d|3[01])\s*\/\s*(0?[1-9]|[1][0-2])')
+            p = self._DATE_DM_SLASH_RE
             while(p.search(temp_str)):
                 date = p.search(temp_str)
                 dates_dm_.append(date.group())
@@ -1743,7 +1871,7 @@ class TextNormalizer():
 
         return input_str.strip()
     
+    _DASH_RANGE_RE = re.compile(r"(\d)\s?([-–—-])\s?(\d)")
+
     def replace_dash_range(self, input_str):
-        dash_chars = r"-–—-"
-        pattern = rf"(\d)\s?([{dash_chars}])\s?(\d)"
-        return re.sub(pattern, r"\1 đến \3", input_str)
\ No newline at end of file
+        return self._DASH_RANGE_RE.sub(r"\1 đến \3", input_str)
\ No newline at end of file
@@ -0,0 +1,325 @@
+"""
+Precompiled Vietnamese normalization pipeline.
+
+normalize_vietnamese_text() used to reread english_word_3_v3.txt and
+spell_out_words.txt on every call, rebuild the English lookup in
+mapping_eng(), and build a fresh TextNormalizer in normalize().
+NormalizationPipeline does all of that once and is shared by every caller
+(the engine builds it at startup).
+
+The loaded pipeline can be pickled to an artifact (NORMALIZER_ARTIFACT) so
+a restart skips reading and parsing the word lists and indexing the
+English dictionary. The artifact records the size and mtime of each source
+file and is rebuilt when they change.
+
+NormalizationPipeline.version hashes everything the output depends on, so
+results cached by it (see sentence_cache.py) are dropped by a deploy or a
+changed word list.
+
+normalize_stream() normalizes a text sentence by sentence on an executor
+and hands out the results in text order as they finish (NormalizedStream),
+so the engine can start synthesizing the first sentences while the rest
+is still being normalized. The stream takes the same document-level
+decisions and makes the same single LLM extraction as normalize(), so
+both give the same text.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import threading
+import time
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from app.normalizer import processing
+from app.normalizer.dictionary_cache import get_dictionary_cache
+from app.normalizer.lexicon import LexiconMatcher
+from app.normalizer.normalizer import TextNormalizer
+from app.normalizer.processing import (
+    DocumentContext,
+    _corrected,
+    _final_stages,
+    _finish_sentences,
+    _stage_sentence,
+    load_dict_english,
+    load_spell_out_words,
+    normalize_vietnamese_text,
+)
+from app.metrics import time_stage
+from app.normalizer.sentence_cache import get_sentence_cache, split_sentences
+from app.normalizer.trace import start_trace
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_VERSION = 2
+
+_DATA_DIR = Path(__file__).parent
+DEFAULT_ENGLISH_DICT = _DATA_DIR / "english_word_3_v3.txt"
+DEFAULT_SPELL_OUT_WORDS = _DATA_DIR / "spell_out_words.txt"
+
+
+def _source_stamp(path: Path) -> Optional[tuple]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_size, st.st_mtime_ns)
+
+
+class NormalizationPipeline:
+    """Word lists, the English lexicon index and the TextNormalizer, loaded once."""
+
+    def __init__(self, english_dict_path: Optional[str] = None, spell_out_path: Optional[str] = None):
+        """
+        Args:
+            english_dict_path: "word|pronunciation" lines for mapping_eng()
+                               (default: english_word_3_v3.txt).
+            spell_out_path: Abbreviations to spell out letter by letter
+                            (default: spell_out_words.txt).
+        """
+        self.english_dict_path = Path(english_dict_path or DEFAULT_ENGLISH_DICT)
+        self.spell_out_path = Path(spell_out_path or DEFAULT_SPELL_OUT_WORDS)
+        self.english_dict: Dict[str, str] = load_dict_english(str(self.english_dict_path))
+        self.spell_out_set = load_spell_out_words(str(self.spell_out_path))
+        self.english_matcher = LexiconMatcher(self.english_dict)
+        self.normalizer = TextNormalizer()
+        self._sources = self._stamp_sources()
+
+    def _stamp_sources(self) -> dict:
+        return {
+            str(self.english_dict_path): _source_stamp(self.english_dict_path),
+            str(self.spell_out_path): _source_stamp(self.spell_out_path),
+        }
+
+    def is_stale(self) -> bool:
+        """True if a source word list changed since this pipeline was built."""
+        return self._stamp_sources() != self._sources
+
+    @property
+    def version(self) -> str:
+        """
+        Hash of the normalizer sources, word lists and output-affecting
+        settings; computed on first use and not pickled.
+        """
+        if getattr(self, "_version", None) is None:
+            from app.settings import USE_LLM_NORMALIZER, USE_DOUBLE_PUNCTUATION, LLM_MODEL
+            h = hashlib.sha256()
+            for path in sorted(_DATA_DIR.glob("*.py")):
+                h.update(path.name.encode("utf-8"))
+                h.update(path.read_bytes())
+            h.update(json.dumps([
+                sorted(self.english_dict.items()),
+                sorted(self.spell_out_set),
+                USE_LLM_NORMALIZER and LLM_MODEL,
+                USE_DOUBLE_PUNCTUATION,
+            ], ensure_ascii=False).encode("utf-8"))
+            self._version = h.hexdigest()
+        return self._version
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state.pop("_version", None)
+        return state
+
+    def normalize(self, text: str) -> str:
+        return normalize_vietnamese_text(text, pipeline=self, sentence_cache=get_sentence_cache())
+
+    def normalize_stream(self, text: str, executor: Executor) -> "NormalizedStream":
+        """Start normalizing the sentences of text (see split_sentences) on executor; iterate the result for blocks."""
+        return NormalizedStream(self, text, executor)
+
+    # ── Pickled artifact ─────────────────────────────────────────────
+
+    def save(self, path: str):
+        """Write this pipeline to path (atomically)."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = f"{path}.part"
+        with open(tmp, "wb") as f:
+            pickle.dump((ARTIFACT_VERSION, self), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["NormalizationPipeline"]:
+        """Read an artifact written by save(); None if it is missing, unreadable or stale."""
+        try:
+            with open(path, "rb") as f:
+                version, pipeline = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"[Normalizer] Ignoring unreadable artifact {path}: {e}")
+            return None
+        if version != ARTIFACT_VERSION or not isinstance(pipeline, cls) or pipeline.is_stale():
+            logger.info(f"[Normalizer] Artifact {path} is out of date, rebuilding")
+            return None
+        return pipeline
+
+    @classmethod
+    def from_artifact(cls, path: str, **kwargs) -> "NormalizationPipeline":
+        """Load path if it is up to date, otherwise build the pipeline and write path."""
+        pipeline = cls.load(path)
+        if pipeline is not None:
+            logger.info(f"[Normalizer] Loaded compiled pipeline from {path}")
+            return pipeline
+        pipeline = cls(**kwargs)
+        try:
+            pipeline.save(path)
+        except OSError as e:
+            logger.warning(f"[Normalizer] Could not write artifact {path}: {e}")
+        return pipeline
+
+
+class NormalizedStream:
+    """
+    Sentences of one text being normalized on an executor.
+
+    Like normalize() with the sentence cache (_normalize_sentences), the
+    sentences keep their line breaks as sentence ends, every sentence is
+    normalized with the DocumentContext decisions guessed on the whole
+    text, and cached sentences are reused. Without the LLM stage
+    a sentence is finished on its own. With it, one more task waits for the
+    uncached sentences to come through the rule-based stages, corrects the
+    decisions if a sentence found otherwise, and makes a single extraction
+    over all of them; leading cached sentences can be handed out before it.
+
+    Iterating yields blocks of normalized text in text order: each block
+    waits for the next sentence, then takes every following sentence that
+    is already done, so a consumer that falls behind gets larger blocks.
+    Sentences that normalize to nothing are dropped. Unfinished sentences
+    are cancelled when iteration stops early or cancel() is called.
+    """
+
+    def __init__(self, pipeline: NormalizationPipeline, text: str, executor: Executor):
+        self.pipeline = pipeline
+        self.sentences = split_sentences(text, keep_breaks=True)
+        self.decisions = DocumentContext.guess(pipeline.normalizer, text)
+        self.normalized: List[str] = []  # of the sentences handed out so far
+        self.block_sentences = 0         # sentences in the last block
+        self.wait_seconds = 0.0          # time the consumer spent blocked on normalization
+        self._blocks: List[str] = []
+        self._llm = processing.USE_LLM_NORMALIZER
+        self._sentence_cache = get_sentence_cache()
+        self._dict_cache = get_dictionary_cache()
+        self._futures = [executor.submit(self._sentence, s) for s in self.sentences]
+        # Submitted after the sentences, so it never holds a worker they are queued for
+        self._document = executor.submit(self._finish_document) if self._llm else None
+
+    def __len__(self) -> int:
+        return len(self.sentences)
+
+    def _version(self, decisions: Dict[str, bool]) -> str:
+        return f"{self.pipeline.version}|{DocumentContext.key(decisions)}"
+
+    def _sentence(self, sentence: str):
+        """
+        (text, seen): the cached text (seen None), or the sentence through
+        the rule-based stages, and finished unless the LLM stage is on.
+        """
+        version = self._version(self.decisions)
+        if self._sentence_cache is not None:
+            cached = self._sentence_cache.get(version, sentence)
+            if cached is not None:
+                return cached, None
+        with start_trace(sentence):
+            text, seen = _stage_sentence(sentence, self.pipeline, self._dict_cache, self.decisions)
+            if self._llm:
+                return text, seen
+            text = _finish_sentences({sentence: text}, self.pipeline, self._dict_cache)[0][sentence]
+        if _corrected(self.decisions, [seen]) != self.decisions:
+            # normalize() would start over with the decision; blocks before this one may be synthesized already
+            logger.warning(f"[Normalizer] Stream sentence took decisions {seen} the document guess "
+                           f"{self.decisions} missed")
+        elif self._sentence_cache is not None:
+            self._sentence_cache.put(version, sentence, text)
+        return text, seen
+
+    def _finish_document(self) -> Dict[str, str]:
+        """Sentence -> text for the uncached sentences, with one LLM extraction over all of them."""
+        staged, seen = {}, []
+        for sentence, future in zip(self.sentences, self._futures):
+            text, found = future.result()
+            if found is not None and sentence not in staged:
+                staged[sentence] = text
+                seen.append(found)
+        if not staged:
+            return {}
+        decisions = _corrected(self.decisions, seen)
+        if decisions != self.decisions:
+            # An earlier stage added the words a decision looks for: stage them again with it
+            staged = {s: _stage_sentence(s, self.pipeline, self._dict_cache, decisions)[0] for s in staged}
+        with start_trace(" ".join(staged.values())):
+            finished, complete = _finish_sentences(staged, self.pipeline, self._dict_cache)
+        if complete and self._sentence_cache is not None:
+            version = self._version(decisions)
+            for sentence, text in finished.items():
+                self._sentence_cache.put(version, sentence, text)
+        return finished
+
+    def _done(self, i: int) -> bool:
+        future = self._futures[i]
+        if not future.done():
+            return False
+        if self._document is not None and future.result()[1] is not None:
+            return self._document.done()
+        return True
+
+    def _result(self, i: int) -> str:
+        text, seen = self._futures[i].result()
+        if self._document is not None and seen is not None:
+            return self._document.result()[self.sentences[i]]
+        return text
+
+    def __iter__(self) -> Iterator[str]:
+        try:
+            while len(self.normalized) < len(self._futures):
+                start = time.perf_counter()
+                with time_stage("normalization_wait"):
+                    block = [self._result(len(self.normalized))]
+                self.wait_seconds += time.perf_counter() - start
+                while len(self.normalized) + len(block) < len(self._futures) \
+                        and self._done(len(self.normalized) + len(block)):
+                    block.append(self._result(len(self.normalized) + len(block)))
+                self.normalized.extend(block)
+                self.block_sentences = len(block)
+                # Steps 8-9 of normalize_vietnamese_text(), per block
+                previous = self._blocks[-1] if self._blocks else ""
+                text = _final_stages(" ".join(b for b in block if b), previous)
+                if text:
+                    self._blocks.append(text)
+                    yield text
+        finally:
+            self.cancel()
+
+    def cancel(self):
+        for future in self._futures:
+            future.cancel()
+        if self._document is not None:
+            self._document.cancel()
+
+    @property
+    def text(self) -> str:
+        """The normalized text handed out so far (all of it once iteration is done)."""
+        return " ".join(self._blocks)
+
+
+# Module-level singleton — lazy init
+_instance: Optional[NormalizationPipeline] = None
+_instance_lock = threading.Lock()
+
+
+def get_normalization_pipeline() -> NormalizationPipeline:
+    """Get or create the shared NormalizationPipeline."""
+    global _instance
+    if _instance is None:
+        with _instance_lock:
+            if _instance is None:
+                from app.settings import NORMALIZER_ARTIFACT
+                if NORMALIZER_ARTIFACT:
+                    _instance = NormalizationPipeline.from_artifact(NORMALIZER_ARTIFACT)
+                else:
+                    _instance = NormalizationPipeline()
+    return _instance
@@ -1,41 +1,76 @@
 import re
 from nltk import sent_tokenize
-from pathlib import Path
 from app.normalizer.normalizer import TextNormalizer
 from app.normalizer.abbre import ABBRE
 from app.normalizer.english_letters import spell_out_abbreviation, spell_out_abbreviation_split
+from app.normalizer.lexicon import LexiconMatcher
+from app.normalizer.sentence_cache import split_sentences
 import logging
-from datetime import datetime
 
 from app.settings import USE_LLM_NORMALIZER, USE_DOUBLE_PUNCTUATION
-
-def setup_logging():
-    """Setup logging configuration for normalization monitoring"""
-    # Create logs directory if it doesn't exist
-    log_dir = Path("logs")
-    log_dir.mkdir(exist_ok=True)
-    
-    # Create log filename with timestamp
-    log_filename = log_dir / f"normalization_{datetime.now().strftime('%Y%m%d')}.log"
-    
-    # Configure logging
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_filename, encoding='utf-8'),
-            logging.StreamHandler()  # Also log to console
-        ]
-    )
-    
-    return logging.getLogger(__name__)
+from app.metrics import time_stage
+from app.normalizer.trace import setup_logging, start_trace, trace_fields, trace_stage, trace_text
 
 # Initialize logger
-logger = setup_logging()
+setup_logging()
+logger = logging.getLogger(__name__)
+
+
+class DocumentContext:
+    """
+    Decisions normalize() takes on the whole text instead of at the match:
+    norm_ratio reads every a:b as a ratio once "tỉ lệ" occurs anywhere, and
+    normalize_sport_score reads every a-b / a:b as a score once a sport word
+    does. A shard of a document normalized on its own would decide on its
+    own sentences only; the sharded path passes the document's decisions in
+    ``forced`` and gets back in ``seen`` what the shard itself found.
+    """
+
+    STAGES = ("ratio", "sport")
+
+    def __init__(self, forced=None):
+        self.forced = dict(forced or {})
+        self.seen = {}
+
+    @staticmethod
+    def detect(normalizer, text):
+        """The decisions as the stages would take them on text as it is."""
+        return {"ratio": normalizer.is_ratio_context(text), "sport": normalizer.is_sport_context(text)}
+
+    @staticmethod
+    def guess(normalizer, text):
+        """
+        The decisions for the whole of text, taken before normalizing it:
+        detect() after abbreviation expansion, the earlier stage that adds
+        the words they look for ("VĐQG"). Callers check the guess against
+        what the pieces report in ``seen``.
+        """
+        return DocumentContext.detect(normalizer, normalizer.norm_abbre(text, ABBRE))
+
+    @staticmethod
+    def key(decisions):
+        """decisions as a string, for cache keys of results that depend on them."""
+        return ",".join(f"{stage}={int(bool(decisions[stage]))}" for stage in DocumentContext.STAGES)
 
+    def decide(self, stage, detected):
+        self.seen[stage] = detected
+        return self.forced.get(stage, detected)
 
-def normalize(text):
-    normalizer = TextNormalizer()
+
+def _decide(context, stage, detect, text):
+    """Stage override for normalize(): None lets the stage decide on text."""
+    if context is None:
+        return None
+    return context.decide(stage, detect(text))
+
+
+def normalize(text, normalizer=None, context=None):
+    """
+    Rule-based normalization. Pass a TextNormalizer to reuse one across calls
+    and a DocumentContext when text is a shard of a larger document.
+    """
+    if normalizer is None:
+        normalizer = TextNormalizer()
     text = normalizer.norm_abbre(text, ABBRE)
     #print(f'abbre: {text}')
     # Remove URLs/emails BEFORE any punctuation processing (Bug 7,8)
@@ -57,7 +92,7 @@ def normalize(text):
     #print(f'2: {text}')
     text = normalizer.normalize_number_plate(text)
     # print(f'3: {text}')
-    text = normalizer.norm_ratio(text)
+    text = normalizer.norm_ratio(text, _decide(context, "ratio", normalizer.is_ratio_context, text))
     # text = normalizer.norm_punct(text)
     # text = normalizer.separate_numbers_adjacent_chars(text)
     #print(f'4: {text}')
@@ -73,7 +108,7 @@ def normalize(text):
     #print(f'9: {text}')
     text = normalizer.norm_multiply_number(text)
     #print(f'10: {text}')
-    text = normalizer.normalize_sport_score(text)
+    text = normalizer.normalize_sport_score(text, _decide(context, "sport", normalizer.is_sport_context, text))
     #print(f'11: {text}')
     text = normalizer.normalize_date_range(text)
     #print(f'12: {text}')
@@ -191,37 +226,24 @@ def load_spell_out_words(path):
         return set()
 
 
-def mapping_eng(text, my_dict):
+def mapping_eng(text, my_dict, matcher=None):
     """Replace English words with Vietnamese phonetic pronunciations.
     
     Unlike the previous version, this does NOT wrap replacements in 【】 brackets.
     Words from english_word_3_v3.txt are read at normal TTS speed, not slow bracket speed.
+
+    matcher is a LexiconMatcher over my_dict; building it is the expensive
+    part for a large dictionary, so callers should build it once.
     """
     if not text or not my_dict:
         return text
 
-    # 1. Sort keys by length (Longest first).
-    # This ensures "word sequence" is prioritized over "word".
-    # e.g., if dict has 'new york' and 'new', we want to match 'new york' first.
-    sorted_keys = sorted(my_dict.keys(), key=len, reverse=True)
+    if matcher is None:
+        matcher = LexiconMatcher(my_dict)
 
-    # 2. Escape keys to prevent regex errors (e.g., if a key is "c++")
-    escaped_keys = [re.escape(k) for k in sorted_keys]
-
-    # 3. Create a master pattern using OR (|).
-    # \b matches a word boundary (start/end of word). 
-    # This prevents matching 'c' inside 'Cách'.
-    pattern_str = r'\b(' + '|'.join(escaped_keys) + r')\b'
-    pattern = re.compile(pattern_str, re.IGNORECASE)
-
-    # 4. Define the replacement logic — plain text replacement (no brackets)
-    def replace_match(match):
-        word = match.group(0)
-        replacement = my_dict.get(word.lower(), word)
-        return replacement
-
-    # 5. Perform the substitution
-    return pattern.sub(replace_match, text)
+    # Longest key first (e.g. 'new york' before 'new'), whole words only,
+    # so 'c' is never matched inside 'Cách'; plain text replacement (no brackets)
+    return matcher.replace(text)
 
 
 def normalize_sentence_case(text):
@@ -421,9 +443,142 @@ def wrap_hardcoded_transliterations(text):
     return text
 
 
-def normalize_vietnamese_text(text):
+def _rule_based_stages(text, pipeline, dict_cache):
+    """Steps 1-4 of normalize_vietnamese_text(): the local, rule-based part."""
+    from app.normalizer.sharding import get_sharded_normalizer
+
+    sharded = get_sharded_normalizer()
+    with trace_stage("rule_based"):
+        if sharded is not None:
+            # Steps 1-2 in sentence shards on worker processes for long documents
+            text = sharded.normalize(text, pipeline.normalizer)
+        else:
+            # Step 1: Rule-based normalize (existing pipeline)
+            text = normalize(text, pipeline.normalizer)
+
+            # Step 2: Post-processing cleanup
+            text = post_processing(text)
+    trace_text("Rule-based", text)
+
+    # Step 3: Apply English word pronunciations (NO brackets — normal speed)
+    # Words from english_word_3_v3.txt are replaced inline without 【】 wrapping.
+    with trace_stage("mapping_eng"):
+        text = mapping_eng(text, pipeline.english_dict, pipeline.english_matcher)
+    trace_text("Mapping Eng", text)
+
+    # Step 4: Dictionary cache lookup — replace known English words from previous runs
+    with trace_stage("dict_cache"):
+        text = dict_cache.apply_to_text(text)
+    trace_text("Dict Cache", text)
+    return text
+
+
+def _llm_extract(text, dict_cache):
+    """
+    Step 5 (and 5a) of normalize_vietnamese_text(): ask the LLM for the
+    acronyms and foreign-word pairs of text and learn the pairs.
+
+    Returns:
+        (acronyms, pairs, complete); complete is False if part of the text
+        could not be processed, so results built from it should not be cached.
+    """
+    from app.normalizer.llm_client import get_llm_normalizer
+
+    llm = get_llm_normalizer()
+    with time_stage("llm_extraction"), trace_stage("llm_extraction"):
+        extraction = llm.extract_acronyms_and_pairs(text)
+    
+    acronyms = extraction.get("acronyms", [])
+    pairs = extraction.get("foreign_vietnamese_pairs", [])
+    
+    trace_fields(acronyms=len(acronyms), pairs=len(pairs), dict_pairs=dict_cache.size)
+    
+    # Step 5a: Update dictionary cache with new pairs
+    if pairs:
+        dict_cache.update_pairs(pairs)
+    return acronyms, pairs, not extraction.get("failed_chunks")
+
+
+def _apply_llm_extraction(text, acronyms, pairs):
+    """Steps 5b and 5c of normalize_vietnamese_text()."""
+    from app.normalizer.english_letters import spell_out_abbreviation
+
+    # Step 5b: Replace foreign words in text per LLM pairs
+    for pair in pairs:
+        eng = pair.get("foreign_word", "")
+        vie = pair.get("vietnamese_spelling", "")
+        if eng and vie:
+            text = re.sub(
+                r'\b' + re.escape(eng) + r'\b',
+                vie,
+                text,
+                flags=re.IGNORECASE
+            )
+    trace_text("LLM Pairs", text)
+    
+    # Step 5c: Process acronyms — wrap in 【bracketed pronunciation】 with trailing comma
+    comma = ',,' if USE_DOUBLE_PUNCTUATION else ','
+    for acronym in acronyms:
+        pronunciation = spell_out_abbreviation(acronym)
+        if pronunciation:
+            # Trailing comma ensures TTS pause after acronym
+            bracket_text = f'【{pronunciation}】{comma}'
+            # Replace exact acronym (case-sensitive, word boundary)
+            text = re.sub(
+                r'\b' + re.escape(acronym) + r'\b',
+                bracket_text,
+                text
+            )
+            logger.debug("[LLM Acronym] '%s' → '%s'", acronym, bracket_text)
+    trace_text("LLM Acronyms", text)
+    return text
+
+
+def _spell_out_stages(text, pipeline):
+    """Steps 6-7 of normalize_vietnamese_text()."""
+    # Step 6: Process remaining {{SPELL}} markers and spell_out_set fallback → 【bracketed pronunciation】
+    with trace_stage("spell_out"):
+        text = process_spell_out_markers(text, pipeline.spell_out_set)
+    trace_text("Spell-out", text)
+
+    # Step 7: Double punctuation (experimental)
+    # , → ,,   . → ..
+    if USE_DOUBLE_PUNCTUATION:
+        text = apply_double_punctuation(text)
+    return text
+
+
+def _final_stages(text, previous=""):
+    """
+    Steps 8-9 of normalize_vietnamese_text(). previous is the normalized
+    text that text follows (a later block of a NormalizedStream): text
+    then only starts a sentence if previous ends one.
+    """
+    with trace_stage("final"):
+        # Step 8: Final punctuation cleanup
+        text = fix_punctuation_spacing(text, preserve_doubles=USE_DOUBLE_PUNCTUATION)
+
+        # Step 9: Sentence case
+        if previous and text:
+            text = normalize_sentence_case(f"{previous[-1]} {text}")[2:]
+        else:
+            text = normalize_sentence_case(text)
+    trace_text("FINAL OUTPUT", text)
+    trace_fields(chars_out=len(text))
+    return text
+
+
+def normalize_vietnamese_text(text, pipeline=None, sentence_cache=None):
     """
     Main entry point for normalizing Vietnamese text for TTS.
+
+    Dictionaries, the mapping_eng matcher and the TextNormalizer come from
+    pipeline (a NormalizationPipeline), by default the shared one from
+    get_normalization_pipeline(), so nothing is reloaded per call.
+
+    With a sentence_cache (SentenceCache) the text is split into sentences
+    and only the sentences missing from the cache go through steps 1-7;
+    see _normalize_sentences().
     
     Pipeline:
         Step 1: Rule-based normalize (dates, numbers, phones, abbreviations, etc.)
@@ -440,94 +595,110 @@ def normalize_vietnamese_text(text):
         Step 8: Final punctuation cleanup
         Step 9: Sentence case normalization
     """
-    logger.info(f"ORIGINAL INPUT: '{text}'")
-    # Get the directory containing this file
-    current_file_dir = Path(__file__).parent
-    
-    # Load English pronunciation dictionary
-    dict = load_dict_english(str(current_file_dir / "english_word_3_v3.txt"))
-    
-    # Load spell-out abbreviation word list (supplementary file)
-    spell_out_set = load_spell_out_words(str(current_file_dir / "spell_out_words.txt"))
-    
-    # Step 1: Rule-based normalize (existing pipeline)
-    text = normalize(text)
-    
-    # Step 2: Post-processing cleanup
-    text = post_processing(text)
-    logger.info(f"[Rule-based] Result: '{text}'")
+    if pipeline is None:
+        from app.normalizer.pipeline import get_normalization_pipeline
+        pipeline = get_normalization_pipeline()
 
-    # Step 3: Apply English word pronunciations (NO brackets — normal speed)
-    # Words from english_word_3_v3.txt are replaced inline without 【】 wrapping.
-    text = mapping_eng(text, dict)
-    logger.info(f"[Mapping Eng] Result: '{text}'")
-
-    # Step 4: Dictionary cache lookup — replace known English words from previous runs
     from app.normalizer.dictionary_cache import get_dictionary_cache
     dict_cache = get_dictionary_cache()
-    text = dict_cache.apply_to_text(text)
-    logger.info(f"[Dict Cache] Result (LLM input, {dict_cache.size} cached pairs): '{text}'")
 
-    # Step 5: LLM structured extraction
-    if USE_LLM_NORMALIZER:
-        from app.normalizer.llm_client import get_llm_normalizer
-        from app.normalizer.english_letters import spell_out_abbreviation
-        
-        llm = get_llm_normalizer()
-        extraction = llm.extract_acronyms_and_pairs(text)
-        
-        acronyms = extraction.get("acronyms", [])
-        pairs = extraction.get("foreign_vietnamese_pairs", [])
-        
-        logger.info(f"[LLM Extract] acronyms={acronyms}, pairs={len(pairs)} items")
-        
-        # Step 5a: Update dictionary cache with new pairs
-        if pairs:
-            dict_cache.update_pairs(pairs)
-        
-        # Step 5b: Replace foreign words in text per LLM pairs
-        for pair in pairs:
-            eng = pair.get("foreign_word", "")
-            vie = pair.get("vietnamese_spelling", "")
-            if eng and vie:
-                text = re.sub(
-                    r'\b' + re.escape(eng) + r'\b',
-                    vie,
-                    text,
-                    flags=re.IGNORECASE
-                )
-        logger.info(f"[LLM Pairs] After word replacement: '{text}'")
-        
-        # Step 5c: Process acronyms — wrap in 【bracketed pronunciation】 with trailing comma
-        comma = ',,' if USE_DOUBLE_PUNCTUATION else ','
-        for acronym in acronyms:
-            pronunciation = spell_out_abbreviation(acronym)
-            if pronunciation:
-                # Trailing comma ensures TTS pause after acronym
-                bracket_text = f'【{pronunciation}】{comma}'
-                # Replace exact acronym (case-sensitive, word boundary)
-                text = re.sub(
-                    r'\b' + re.escape(acronym) + r'\b',
-                    bracket_text,
-                    text
-                )
-                logger.debug(f"[LLM Acronym] '{acronym}' → '{bracket_text}'")
-        logger.info(f"[LLM Acronyms] After acronym processing: '{text}'")
+    with start_trace(text):
+        trace_text("ORIGINAL INPUT", text)
+        if sentence_cache is not None:
+            text = _normalize_sentences(text, pipeline, sentence_cache, dict_cache)
+            return _final_stages(text)
 
-    # Step 6: Process remaining {{SPELL}} markers and spell_out_set fallback → 【bracketed pronunciation】
-    text = process_spell_out_markers(text, spell_out_set)
-    logger.info(f"[Spell-out] Result: '{text}'")
+        text = _rule_based_stages(text, pipeline, dict_cache)
+        if USE_LLM_NORMALIZER:
+            acronyms, pairs, _ = _llm_extract(text, dict_cache)
+            with trace_stage("llm_apply"):
+                text = _apply_llm_extraction(text, acronyms, pairs)
+        text = _spell_out_stages(text, pipeline)
+        return _final_stages(text)
 
-    # Step 7: Double punctuation (experimental)
-    # , → ,,   . → ..
-    if USE_DOUBLE_PUNCTUATION:
-        text = apply_double_punctuation(text)
 
-    # Step 8: Final punctuation cleanup
-    text = fix_punctuation_spacing(text, preserve_doubles=USE_DOUBLE_PUNCTUATION)
+def _stage_sentence(sentence, pipeline, dict_cache, decisions):
+    """
+    Steps 1-4 of normalize_vietnamese_text() on one sentence of a document,
+    with the document's DocumentContext decisions.
 
-    # Step 9: Sentence case
-    text = normalize_sentence_case(text)
-    logger.info(f"FINAL OUTPUT: '{text}'")
-    
-    return text
\ No newline at end of file
+    Returns:
+        (text, seen): seen are the decisions the sentence took on its own.
+    """
+    context = DocumentContext(decisions)
+    with trace_stage("rule_based"):
+        text = post_processing(normalize(sentence, pipeline.normalizer, context))
+    with trace_stage("mapping_eng"):
+        text = mapping_eng(text, pipeline.english_dict, pipeline.english_matcher)
+    with trace_stage("dict_cache"):
+        text = dict_cache.apply_to_text(text)
+    return text, context.seen
+
+
+def _corrected(decisions, seen):
+    """decisions with the stages some sentence found that the guess missed switched on."""
+    return {stage: decisions[stage] or any(s.get(stage) for s in seen) for stage in DocumentContext.STAGES}
+
+
+def _finish_sentences(staged, pipeline, dict_cache):
+    """
+    Steps 5-7 of normalize_vietnamese_text() for sentences done with steps
+    1-4 (sentence -> text): a single LLM extraction over all of them
+    together (one round trip per document), whose pairs and acronyms are
+    applied to each sentence.
+
+    Returns:
+        (results, complete): sentence -> text, and whether the extraction
+        covered all of it (only then may the results be cached).
+    """
+    acronyms, pairs, complete = [], [], True
+    if USE_LLM_NORMALIZER and staged:
+        acronyms, pairs, complete = _llm_extract(" ".join(staged.values()), dict_cache)
+    results = {}
+    for s, text in staged.items():
+        if USE_LLM_NORMALIZER:
+            with trace_stage("llm_apply"):
+                text = _apply_llm_extraction(text, acronyms, pairs)
+        results[s] = _spell_out_stages(text, pipeline)
+    return results, complete
+
+
+def _normalize_sentences(text, pipeline, sentence_cache, dict_cache):
+    """
+    Steps 1-7 sentence by sentence, through sentence_cache.
+
+    Every sentence is normalized with the decisions DocumentContext takes on
+    the whole document (guessed on the text, corrected if a sentence finds
+    otherwise), which are part of the cache key: a sentence reads "3-1" as a
+    score only in a document about sport. Cached sentences are reused as
+    they are, the missing ones go through steps 1-4 one by one and then
+    _finish_sentences(). Sentences are only stored when the extraction
+    covered the whole text. A line break between sentences reaches them as
+    the "." normalize() reads it as (split_sentences(keep_breaks=True)).
+    Steps 8-9 run on the joined result, as they would on the whole document.
+    """
+    sentences = split_sentences(text, keep_breaks=True)
+    decisions = DocumentContext.guess(pipeline.normalizer, text)
+    for _ in range(2):
+        version = f"{pipeline.version}|{DocumentContext.key(decisions)}"
+        results = {s: sentence_cache.get(version, s) for s in dict.fromkeys(sentences)}
+        missing = [s for s, normalized in results.items() if normalized is None]
+        staged, seen = {}, []
+        for s in missing:
+            staged[s], found = _stage_sentence(s, pipeline, dict_cache, decisions)
+            seen.append(found)
+        corrected = _corrected(decisions, seen)
+        if corrected == decisions:
+            break
+        # An earlier stage added the words a decision looks for: start over with it
+        decisions = corrected
+    trace_fields(sentences=len(sentences), cached=len(sentences) - len(missing))
+
+    if missing:
+        finished, complete = _finish_sentences(staged, pipeline, dict_cache)
+        for s, normalized in finished.items():
+            results[s] = normalized
+            if complete:
+                sentence_cache.put(version, s, normalized)
+
+    return " ".join(results[s] for s in sentences)
@@ -0,0 +1,224 @@
+"""
+Sentence-level memo of the normalization pipeline.
+
+Traffic repeats the same sentences across requests (greetings, disclaimers,
+headlines quoted in several articles), but normalize_vietnamese_text() used
+to run every document through the rule-based normalizer and the LLM round
+trip from scratch. With a SentenceCache the document is split into
+sentences, and only the sentences not seen before go through the
+normalization stages; the others are taken from the cache.
+
+  - Entries map a raw sentence to its normalized form, keyed by a version
+    hash of everything the result depends on (normalizer sources, word
+    lists, settings; see NormalizationPipeline.version), so a deploy or a
+    new word list never serves stale readings. The caller adds the
+    document-wide decisions the sentence was normalized with
+    (DocumentContext) to the version.
+  - The in-memory level is an LRU bounded by entry count.
+  - Optionally entries are also written to SQLite (SENTENCE_CACHE_PATH) so
+    they survive restarts; memory misses fall back to it. Its rows are
+    bounded separately and evicted least-recently-used first.
+"""
+
+import datetime as dt
+import hashlib
+import logging
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS normalized_sentences (
+    key          TEXT PRIMARY KEY,
+    normalized   TEXT NOT NULL,
+    last_access  TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_normalized_sentences_last_access ON normalized_sentences(last_access);
+"""
+
+# A sentence ends at . ! ? or … (plus closing quotes/brackets) followed by
+# whitespace, when the next sentence starts with an uppercase letter, a
+# digit or an opening quote/bracket; line breaks always end a sentence.
+_BOUNDARY_RE = re.compile(r'[.!?…]+["\'”’)\]]*\s+|\s*\n\s*')
+_OPENERS = '"\'“‘(['
+
+
+def starts_sentence(text: str, pos: int) -> bool:
+    """True if the character at pos can start a sentence after . ! ? (uppercase, digit, opening quote/bracket)."""
+    return pos < len(text) and (text[pos].isupper() or text[pos].isdigit() or text[pos] in _OPENERS)
+
+
+def sentence_spans(text: str) -> List[Tuple[int, int]]:
+    """
+    (start, end) of every sentence of text. A span runs up to the start of
+    the next one, separator included, so consecutive spans cut text
+    without losing anything from the first sentence on.
+    """
+    spans, start = [], 0
+    for m in _BOUNDARY_RE.finditer(text):
+        end = m.end()
+        if "\n" not in m.group() and end < len(text) and not starts_sentence(text, end):
+            continue
+        if text[start:end].strip():
+            spans.append((start, end))
+        elif spans:
+            spans[-1] = (spans[-1][0], end)
+        start = end
+    if text[start:].strip():
+        spans.append((start, len(text)))
+    elif spans:
+        spans[-1] = (spans[-1][0], len(text))
+    return spans
+
+
+# normalize() reads a line break as ". " unless it follows one of these
+# (TextNormalizer.separate_comma_and_dot_at_the_end)
+_BREAK_PUNCT = ".,?!:;)]}'\"’”"
+
+
+def end_break(piece: str) -> str:
+    """
+    piece (a sentence or run of sentences followed by more text) stripped,
+    with the "." normalize() reads a line break after it as when its
+    separator has one and it does not already end with punctuation.
+    """
+    stripped = piece.strip()
+    if "\n" in piece[len(piece.rstrip()):] and stripped[-1] not in _BREAK_PUNCT:
+        stripped += "."
+    return stripped
+
+
+def split_sentences(text: str, keep_breaks: bool = False) -> List[str]:
+    """
+    Split text into sentences, each stripped; empty pieces are dropped.
+    With keep_breaks a sentence ended by a line break (not the last one)
+    gets the "." that normalize() would read the break as (end_break()),
+    for callers that normalize the sentences one by one and join them
+    with spaces.
+    """
+    spans = sentence_spans(text)
+    return [
+        end_break(text[start:end]) if keep_breaks and i + 1 < len(spans) else text[start:end].strip()
+        for i, (start, end) in enumerate(spans)
+    ]
+
+
+def _key(version: str, sentence: str) -> str:
+    return hashlib.sha256(f"{version}\n{sentence}".encode("utf-8")).hexdigest()
+
+
+class SentenceCache:
+    """Raw sentence -> normalized sentence LRU, optionally backed by SQLite."""
+
+    def __init__(self, max_entries: int, db_path: Optional[str] = None, max_db_entries: int = 0):
+        """
+        Args:
+            max_entries: Sentences kept in memory.
+            db_path: SQLite file to persist entries in (None: memory only).
+            max_db_entries: Rows kept in db_path (0: 10 x max_entries).
+        """
+        self.max_entries = max_entries
+        self.max_db_entries = max_db_entries or 10 * max_entries
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        if db_path:
+            self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+        self.hits = 0
+        self.db_hits = 0
+        self.misses = 0
+        self.stored = 0
+
+    def get(self, version: str, sentence: str) -> Optional[str]:
+        """Normalized form of sentence under version, or None."""
+        key = _key(version, sentence)
+        with self._lock:
+            normalized = self._memory.get(key)
+            if normalized is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return normalized
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT normalized FROM normalized_sentences WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE normalized_sentences SET last_access = ? WHERE key = ?",
+                        (dt.datetime.utcnow().isoformat(timespec="microseconds"), key),
+                    )
+                    self._remember(key, row[0])
+                    self.hits += 1
+                    self.db_hits += 1
+                    return row[0]
+            self.misses += 1
+        return None
+
+    def put(self, version: str, sentence: str, normalized: str):
+        key = _key(version, sentence)
+        with self._lock:
+            self._remember(key, normalized)
+            self.stored += 1
+            if self._conn is not None:
+                try:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO normalized_sentences (key, normalized, last_access) VALUES (?, ?, ?)",
+                        (key, normalized, dt.datetime.utcnow().isoformat(timespec="microseconds")),
+                    )
+                    if self.stored % 1000 == 0:
+                        self._evict_db()
+                except sqlite3.Error as e:
+                    logger.warning(f"[Sentence Cache] Could not persist entry: {e}")
+
+    def _remember(self, key: str, normalized: str):
+        """Insert into the memory LRU. Caller holds the lock."""
+        self._memory[key] = normalized
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _evict_db(self):
+        """Drop least-recently-used rows above max_db_entries. Caller holds the lock."""
+        rows = self._conn.execute("SELECT COUNT(*) FROM normalized_sentences").fetchone()[0]
+        if rows > self.max_db_entries:
+            self._conn.execute(
+                "DELETE FROM normalized_sentences WHERE key IN "
+                "(SELECT key FROM normalized_sentences ORDER BY last_access LIMIT ?)",
+                (rows - self.max_db_entries,),
+            )
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "db_hits": self.db_hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / max(self.hits + self.misses, 1),
+                "stored": self.stored,
+                "entries": len(self._memory),
+                "max_entries": self.max_entries,
+            }
+
+
+# Module-level singleton — lazy init
+_instance: Optional[SentenceCache] = None
+_instance_lock = threading.Lock()
+
+
+def get_sentence_cache() -> Optional[SentenceCache]:
+    """Get or create the shared SentenceCache; None when SENTENCE_CACHE is off."""
+    global _instance
+    from app.settings import SENTENCE_CACHE, SENTENCE_CACHE_SIZE, SENTENCE_CACHE_PATH
+    if not SENTENCE_CACHE:
+        return None
+    if _instance is None:
+        with _instance_lock:
+            if _instance is None:
+                _instance = SentenceCache(SENTENCE_CACHE_SIZE, SENTENCE_CACHE_PATH or None)
+    return _instance
@@ -0,0 +1,158 @@
+"""
+Sentence-sharded rule-based normalization for long documents.
+
+normalize() runs some 30 regex stages over the whole text in one thread,
+and many of them replace every match across the whole string, so its cost
+grows faster than the text: a 1600-sentence article spent ~12 s there
+before synthesis could start. ShardedNormalizer cuts a long document at
+sentence boundaries (sentence_spans) into shards of about
+NORMALIZE_SHARD_CHARS characters, normalizes them in a pool of worker
+processes and joins the results in order.
+
+Sentence boundaries alone are not safe cut points for this normalizer:
+norm_ratio and normalize_sport_score decide on the whole text whether a:b
+is a ratio and a-b a score (see DocumentContext), so a shard normalized on
+its own would read "19:00" or "2019-2023" differently from the same
+sentence inside the document. Every shard is therefore given the
+document's decisions, guessed on the raw text. Each shard reports what it
+found itself at those stages; if together they disagree with the guess (an
+earlier stage added or removed the words the check looks for), the shards
+are normalized again with the decisions they found. The joined result is
+the text post_processing(normalize(text)) gives for the whole document.
+"""
+
+import logging
+import multiprocessing as mp
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from app.metrics import SHARDED_NORMALIZATIONS
+from app.normalizer.normalizer import TextNormalizer
+from app.normalizer.processing import DocumentContext, normalize, post_processing
+from app.normalizer.sentence_cache import end_break, sentence_spans, starts_sentence
+
+logger = logging.getLogger(__name__)
+
+# Per-process TextNormalizer of a worker, set by _init_worker()
+_worker_normalizer: Optional[TextNormalizer] = None
+
+
+def _init_worker():
+    """ProcessPoolExecutor initializer. TextNormalizer holds no state, so each worker builds its own."""
+    global _worker_normalizer
+    _worker_normalizer = TextNormalizer()
+
+
+def _normalize_shard(text: str, forced: Dict[str, bool]) -> Tuple[str, Dict[str, bool]]:
+    context = DocumentContext(forced)
+    return normalize(text, _worker_normalizer, context), context.seen
+
+
+def make_shards(text: str, shard_chars: int) -> List[str]:
+    """
+    Cut text at sentence boundaries into shards of at least shard_chars
+    characters (the last may be shorter). Shards are slices of text, so the
+    separators inside them are kept; a line break at the end of a shard
+    becomes the "." normalize() reads it as (end_break()). Shards are only
+    cut before a sentence that starts like one (a line break followed by a
+    lowercase word is not a safe cut: "example.com." at the very end of a
+    text normalizes differently).
+    """
+    spans, shards, start = sentence_spans(text), [], None
+    for i, (span_start, span_end) in enumerate(spans):
+        if start is None:
+            start = span_start
+        if i + 1 == len(spans) or span_end - start >= shard_chars and starts_sentence(text, span_end):
+            piece = text[start:span_end]
+            shards.append(end_break(piece) if i + 1 < len(spans) else piece.strip())
+            start = None
+    return shards
+
+
+def _found(results: list) -> Dict[str, bool]:
+    return {stage: any(seen[stage] for _, seen in results) for stage in DocumentContext.STAGES}
+
+
+class ShardedNormalizer:
+    """Steps 1-2 of normalize_vietnamese_text() for long documents, in worker processes."""
+
+    def __init__(self, workers: int, shard_chars: int = 2000, min_chars: int = 10000):
+        """
+        Args:
+            workers: Worker processes (started on first use).
+            shard_chars: Characters per shard, rounded up to whole sentences.
+            min_chars: Shorter texts are normalized in one piece in the caller.
+        """
+        self.workers = workers
+        self.shard_chars = shard_chars
+        self.min_chars = min_chars
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=mp.get_context("spawn"),
+                        initializer=_init_worker,
+                    )
+        return self._executor
+
+    def _run(self, shards: List[str], forced: Dict[str, bool]) -> list:
+        return list(self._pool().map(_normalize_shard, shards, [forced] * len(shards)))
+
+    def normalize(self, text: str, normalizer: TextNormalizer) -> str:
+        """post_processing(normalize(text, normalizer)), sharded if text is long enough."""
+        shards = make_shards(text, self.shard_chars) if len(text) >= self.min_chars else []
+        if len(shards) < 2:
+            return post_processing(normalize(text, normalizer))
+
+        forced = DocumentContext.detect(normalizer, text)
+        try:
+            results = self._run(shards, forced)
+            if _found(results) != forced:
+                forced = _found(results)
+                results = self._run(shards, forced)
+                outcome = "rerun"
+            else:
+                outcome = "sharded"
+        except Exception as e:
+            logger.warning(f"[Normalizer] Sharded normalization failed, normalizing in one piece: {e}")
+            self._reset()
+            results = None
+        if results is None or _found(results) != forced:
+            SHARDED_NORMALIZATIONS.inc(outcome="serial")
+            return post_processing(normalize(text, normalizer))
+        SHARDED_NORMALIZATIONS.inc(outcome=outcome)
+        return post_processing(" ".join(normalized for normalized, _ in results))
+
+    def _reset(self):
+        """Drop a broken pool; the next document starts a new one."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        self._reset()
+
+
+# Module-level singleton — lazy init
+_instance: Optional[ShardedNormalizer] = None
+_instance_lock = threading.Lock()
+
+
+def get_sharded_normalizer() -> Optional[ShardedNormalizer]:
+    """Get or create the shared ShardedNormalizer; None when NORMALIZE_SHARD_WORKERS is 0."""
+    global _instance
+    from app.settings import NORMALIZE_SHARD_WORKERS, NORMALIZE_SHARD_CHARS, NORMALIZE_SHARD_MIN_CHARS
+    if NORMALIZE_SHARD_WORKERS <= 0:
+        return None
+    if _instance is None:
+        with _instance_lock:
+            if _instance is None:
+                _instance = ShardedNormalizer(NORMALIZE_SHARD_WORKERS, NORMALIZE_SHARD_CHARS, NORMALIZE_SHARD_MIN_CHARS)
+    return _instance
@@ -9,9 +9,19 @@ normalization. These include:
   - Mixed alphanumeric codes (802.11ax, 5G, Wi-Fi 6E, ...)
   - Residual single special characters (@, #, $, &, ...)
   - Short foreign-language words that survived rule-based processing
+
+has_llm_candidates() is the cheap pre-check of the extraction stage: a
+text with no special token and no word that could not be a Vietnamese
+syllable has nothing for the LLM to extract, so the call is skipped.
+The shape of a word is not enough for names: "Tom", "Ben" or "Anna" fold
+to valid syllables, so a capitalized word without diacritics inside a
+sentence is a candidate too, unless it follows another capitalized word
+("Việt Nam", "Thái Lan"): Vietnamese names mostly carry diacritics, and a
+lone "Nam" or "Lan" costs an LLM call.
 """
 
 import re
+import unicodedata
 from dataclasses import dataclass
 from typing import List, Tuple
 
@@ -141,3 +151,68 @@ def detect_special_tokens(text: str) -> List[SpecialToken]:
         tok.text = text[tok.start:tok.end]
 
     return merged
+
+
+# 6. Foreign words: letters-only words that cannot be a Vietnamese syllable
+#    once diacritics are removed (onset + up to three vowels + coda).
+#    Matches: server, Docker, online, Jakarta; not: nguyễn, khuya, nghiêng
+_LETTER_WORD_RE = re.compile(r'[^\W\d_]+')
+_VIETNAMESE_SYLLABLE_RE = re.compile(
+    r'(?:ngh|ng|gh|gi|kh|nh|ph|th|tr|ch|qu|[bcdghklmnprstvx])?'
+    r'[aeiouy]{1,3}'
+    r'(?:ng|nh|ch|[cmnpt])?'
+)
+
+
+def _fold(word: str) -> str:
+    """Lowercase and strip Vietnamese diacritics (đ -> d)."""
+    word = unicodedata.normalize("NFD", word.lower().replace("đ", "d"))
+    return "".join(ch for ch in word if not unicodedata.combining(ch))
+
+
+def is_vietnamese_syllable(word: str) -> bool:
+    return _VIETNAMESE_SYLLABLE_RE.fullmatch(_fold(word)) is not None
+
+
+def detect_foreign_words(text: str) -> List[SpecialToken]:
+    """Words of text that cannot be Vietnamese syllables, in order."""
+    return [
+        SpecialToken(text=m.group(), start=m.start(), end=m.end())
+        for m in _LETTER_WORD_RE.finditer(text)
+        if not is_vietnamese_syllable(m.group())
+    ]
+
+
+# Characters that may sit between the end of a sentence and its first word
+_SENTENCE_OPENERS = " \t\"'“‘«([-–—"
+_SENTENCE_ENDS = ".!?…:;\n"
+
+
+def _starts_sentence(text: str, start: int) -> bool:
+    before = text[max(0, start - 32):start].rstrip(_SENTENCE_OPENERS)
+    return not before or before[-1] in _SENTENCE_ENDS
+
+
+_PREVIOUS_WORD_RE = re.compile(r'([^\W\d_]+)\s+$')
+
+
+def _is_foreign_name(text: str, m: "re.Match") -> bool:
+    """Capitalized word without diacritics inside a sentence, not in a longer name ("ông Tom")."""
+    word = m.group()
+    if not (len(word) > 1 and word.isascii() and word[0].isupper()) or _starts_sentence(text, m.start()):
+        return False
+    previous = _PREVIOUS_WORD_RE.search(text, max(0, m.start() - 32), m.start())
+    return previous is None or not previous.group(1)[0].isupper()
+
+
+def undiacritized_words(text: str) -> List[str]:
+    """Words of text written without diacritics: Vietnamese or foreign, the shape cannot tell."""
+    return [m.group() for m in _LETTER_WORD_RE.finditer(text) if m.group().isascii()]
+
+
+def has_llm_candidates(text: str) -> bool:
+    """True if text has a special token or a foreign word the LLM stage could act on."""
+    for m in _LETTER_WORD_RE.finditer(text):
+        if not is_vietnamese_syllable(m.group()) or _is_foreign_name(text, m):
+            return True
+    return bool(detect_special_tokens(text))
@@ -0,0 +1,159 @@
+"""
+Low-overhead logging for the normalization path.
+
+processing.py used to configure the root logger at import time with a
+FileHandler that every logging call wrote through synchronously, and
+normalize_vietnamese_text() logged the whole document after nearly every
+stage (ORIGINAL INPUT, Rule-based, Mapping Eng, Dict Cache, LLM Pairs,
+FINAL OUTPUT...). For long inputs that formatted and wrote megabytes per
+request on the request's thread. Now:
+
+  - Records go through a QueueHandler; a QueueListener thread does the
+    file and console writes, so a logging call only enqueues a record.
+  - Each normalize_vietnamese_text() call logs a single summary line with
+    the time spent per stage and a few counts (NormalizationTrace), with
+    the same values as a dict in the record's ``normalization`` attribute
+    for structured handlers.
+  - Full-text traces after each stage are only written for a sample of
+    the calls (NORMALIZE_TRACE_SAMPLE; every call when the
+    app.normalizer.trace logger is at DEBUG), and cut to
+    NORMALIZE_TRACE_MAX_CHARS characters.
+
+Stages record into the trace of the current call through trace_stage(),
+trace_text() and trace_fields(), which do nothing outside of a call.
+"""
+
+import atexit
+import logging
+import queue
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+from typing import Dict, Optional
+
+from app.settings import NORMALIZE_LOG_DIR, NORMALIZE_TRACE_MAX_CHARS, NORMALIZE_TRACE_SAMPLE
+
+logger = logging.getLogger(__name__)
+
+_LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+_listener: Optional[QueueListener] = None
+
+
+def setup_logging(log_dir: str = NORMALIZE_LOG_DIR):
+    """
+    Log to the console and to log_dir/normalization_YYYYMMDD.log ("" for
+    the console only) through a queue. Like logging.basicConfig(), does
+    nothing if the root logger already has handlers.
+    """
+    global _listener
+    root = logging.getLogger()
+    if root.handlers:
+        return
+    handlers = [logging.StreamHandler()]
+    if log_dir:
+        Path(log_dir).mkdir(parents=True, exist_ok=True)
+        log_filename = Path(log_dir) / f"normalization_{datetime.now().strftime('%Y%m%d')}.log"
+        handlers.append(logging.FileHandler(log_filename, encoding="utf-8"))
+    formatter = logging.Formatter(_LOG_FORMAT)
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    records = queue.SimpleQueue()
+    _listener = QueueListener(records, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+    root.addHandler(QueueHandler(records))
+    root.setLevel(logging.INFO)
+
+
+def stop_logging():
+    """Write out what is still queued and stop the listener thread of setup_logging()."""
+    global _listener
+    listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+
+
+def truncate(text: str, max_chars: Optional[int] = None) -> str:
+    """text cut to max_chars (default NORMALIZE_TRACE_MAX_CHARS) characters, 0 = no limit."""
+    if max_chars is None:
+        max_chars = NORMALIZE_TRACE_MAX_CHARS
+    if max_chars <= 0 or len(text) <= max_chars:
+        return text
+    return f"{text[:max_chars]}... (+{len(text) - max_chars} chars)"
+
+
+class NormalizationTrace:
+    """Stage timings and counts of one normalize_vietnamese_text() call."""
+
+    def __init__(self, sampled: bool):
+        self.sampled = sampled              # write full-text traces
+        self.stages: Dict[str, float] = {}  # stage -> seconds, summed over sentences
+        self.fields: Dict[str, object] = {}
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+    def text(self, label: str, text: str):
+        if self.sampled:
+            logger.info("[%s] '%s'", label, truncate(text))
+
+    def summary(self) -> dict:
+        summary = dict(self.fields)
+        summary.update((f"{name}_ms", round(seconds * 1000, 2)) for name, seconds in self.stages.items())
+        summary["total_ms"] = round((time.perf_counter() - self._start) * 1000, 2)
+        return summary
+
+    def finish(self):
+        if logger.isEnabledFor(logging.INFO):
+            summary = self.summary()
+            logger.info("[Normalize] %s", " ".join(f"{k}={v}" for k, v in summary.items()),
+                        extra={"normalization": summary})
+
+
+_current: ContextVar[Optional[NormalizationTrace]] = ContextVar("normalization_trace", default=None)
+
+
+@contextmanager
+def start_trace(text: str):
+    """Trace one normalize_vietnamese_text() call on text; logs the summary when it returns."""
+    sampled = logger.isEnabledFor(logging.DEBUG) or random.random() < NORMALIZE_TRACE_SAMPLE
+    trace = NormalizationTrace(sampled)
+    trace.fields["chars_in"] = len(text)
+    token = _current.set(trace)
+    try:
+        yield trace
+    finally:
+        _current.reset(token)
+    trace.finish()
+
+
+@contextmanager
+def trace_stage(name: str):
+    trace = _current.get()
+    if trace is None:
+        yield
+        return
+    with trace.stage(name):
+        yield
+
+
+def trace_text(label: str, text: str):
+    trace = _current.get()
+    if trace is not None:
+        trace.text(label, text)
+
+
+def trace_fields(**fields):
+    trace = _current.get()
+    if trace is not None:
+        trace.fields.update(fields)
@@ -1,10 +1,13 @@
 import os
 import json # Added import
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional # Added Optional
+from typing import TYPE_CHECKING, Dict, List, Optional # Added Optional
 
 import torch
 
+if TYPE_CHECKING:
+    from .cached_inference import PromptTokens
+
 from .settings import VOICES_DIR
 
 @dataclass
@@ -22,6 +25,8 @@ class Voice:
     cached_wav_tensor: Optional[torch.Tensor] = field(default=None, repr=False)
     cached_prompt_rms: Optional[float] = field(default=None, repr=False)
     cached_prompt_features: Optional[torch.Tensor] = field(default=None, repr=False)
+    # app.cached_inference.PromptTokens: the punctuated, tokenized prompt text.
+    cached_prompt_tokens: Optional["PromptTokens"] = field(default=None, repr=False)
 
 class VoiceRegistry:
     def __init__(self, root: str = VOICES_DIR):
@@ -0,0 +1,196 @@
+"""
+Content-addressed cache of finished synthesis results.
+
+Many requests repeat exactly (same text, voice and parameters), and each of
+them used to go through normalization, LLM extraction, sampling, vocoding
+and encoding again. ResultCache remembers finished audio files:
+
+  - Blobs are stored by the sha256 of their bytes under
+    RESULTS_DIR/cas/<2 hex>/<digest>.<ext>, so identical audio reached
+    through different keys is stored once.
+  - Request keys (a hash over text + voice + parameters, see make_key) map
+    to blob digests. The engine registers two keys per job: one over the
+    raw text, checked in submit() before anything runs, and one over the
+    normalized text, checked after normalization.
+  - A hit is materialized as {job_id}.<ext> by hard-linking the blob (copy
+    if the filesystem refuses), so pruning job files never touches the
+    cache and evicting a blob never breaks a finished job.
+  - Total blob size is bounded; least-recently-used blobs are evicted.
+
+The index lives in SQLite next to the job store so it survives restarts.
+"""
+
+import datetime as dt
+import hashlib
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import threading
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS result_blobs (
+    digest       TEXT PRIMARY KEY,
+    ext          TEXT NOT NULL,
+    size         INTEGER NOT NULL,
+    last_access  TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_result_blobs_last_access ON result_blobs(last_access);
+CREATE TABLE IF NOT EXISTS result_keys (
+    key     TEXT PRIMARY KEY,
+    digest  TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_result_keys_digest ON result_keys(digest);
+"""
+
+
+def make_key(**parts) -> str:
+    """Stable sha256 over the given request parts (order-independent)."""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _file_digest(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _link_or_copy(src: str, dst: str):
+    tmp = f"{dst}.part"
+    try:
+        os.link(src, tmp)
+    except OSError:
+        shutil.copyfile(src, tmp)
+    os.replace(tmp, dst)
+
+
+class ResultCache:
+    """Size-bounded, content-addressed LRU cache of result files."""
+
+    def __init__(self, results_dir: str, db_path: str, max_bytes: int):
+        self.root = os.path.join(results_dir, "cas")
+        self.max_bytes = max_bytes
+        os.makedirs(self.root, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self.hits: Dict[str, int] = {"submit": 0, "normalized": 0}
+        self.misses = 0
+        self.stored = 0
+        self.evicted = 0
+
+    def _blob_path(self, digest: str, ext: str) -> str:
+        return os.path.join(self.root, digest[:2], f"{digest}.{ext}")
+
+    def materialize(self, key: str, dest_base: str, stage: str = "submit") -> Optional[str]:
+        """
+        On a hit, link the cached result to dest_base + ".<ext>".
+
+        Returns the created path, or None on a miss. stage labels the hit
+        counter ("submit" or "normalized").
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT b.digest, b.ext FROM result_keys k JOIN result_blobs b ON b.digest = k.digest "
+                "WHERE k.key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            digest, ext = row
+            blob = self._blob_path(digest, ext)
+            if not os.path.exists(blob):
+                # Blob removed behind our back; forget it
+                self._conn.execute("DELETE FROM result_keys WHERE digest = ?", (digest,))
+                self._conn.execute("DELETE FROM result_blobs WHERE digest = ?", (digest,))
+                return None
+            self._conn.execute(
+                "UPDATE result_blobs SET last_access = ? WHERE digest = ?",
+                (dt.datetime.utcnow().isoformat(timespec="microseconds"), digest),
+            )
+            dest = f"{dest_base}.{ext}"
+            _link_or_copy(blob, dest)
+            self.hits[stage] = self.hits.get(stage, 0) + 1
+        return dest
+
+    def record_miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def put(self, keys: Iterable[str], path: str) -> Optional[str]:
+        """
+        Add a finished result file under the given request keys.
+
+        The file is hashed and linked into the store; the original stays
+        where it is. Returns the blob digest.
+        """
+        keys = [k for k in keys if k]
+        ext = os.path.splitext(path)[1].lstrip(".")
+        if not keys or not ext or not os.path.exists(path):
+            return None
+        digest = _file_digest(path)
+        blob = self._blob_path(digest, ext)
+        with self._lock:
+            if not os.path.exists(blob):
+                os.makedirs(os.path.dirname(blob), exist_ok=True)
+                _link_or_copy(path, blob)
+                self.stored += 1
+            now = dt.datetime.utcnow().isoformat(timespec="microseconds")
+            self._conn.execute("BEGIN")
+            self._conn.execute(
+                "INSERT OR REPLACE INTO result_blobs (digest, ext, size, last_access) VALUES (?, ?, ?, ?)",
+                (digest, ext, os.path.getsize(blob), now),
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO result_keys (key, digest) VALUES (?, ?)",
+                [(k, digest) for k in keys],
+            )
+            self._conn.execute("COMMIT")
+            self._evict()
+        return digest
+
+    def _evict(self):
+        """Drop least-recently-used blobs until under max_bytes. Caller holds the lock."""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM result_blobs").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for digest, ext, size in self._conn.execute(
+            "SELECT digest, ext, size FROM result_blobs ORDER BY last_access"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(self._blob_path(digest, ext))
+            except OSError:
+                pass
+            self._conn.execute("DELETE FROM result_keys WHERE digest = ?", (digest,))
+            self._conn.execute("DELETE FROM result_blobs WHERE digest = ?", (digest,))
+            total -= size
+            self.evicted += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM result_blobs"
+            ).fetchone()
+            keys = self._conn.execute("SELECT COUNT(*) FROM result_keys").fetchone()[0]
+            hits = sum(self.hits.values())
+            return {
+                "hits": dict(self.hits),
+                "misses": self.misses,
+                "hit_rate": hits / max(hits + self.misses, 1),
+                "stored": self.stored,
+                "evicted": self.evicted,
+                "blobs": entries,
+                "keys": keys,
+                "bytes": size,
+                "max_bytes": self.max_bytes,
+            }
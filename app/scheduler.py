@@ -0,0 +1,179 @@
+"""
+Cost-aware admission scheduler for TTS jobs.
+
+The engine used to admit jobs FIFO through asyncio.Semaphore(MAX_CONCURRENT),
+so a single 20-minute article could hold a slot while hundreds of one-line
+requests queued behind it. JobScheduler hands out the same number of slots
+but chooses which waiting job gets the next one:
+
+  1. Priority class ("high" > "normal" > "low"), from TTSJobCreate.priority.
+  2. Aging: every `aging_seconds` a job has waited promotes it one class,
+     so low-priority and expensive jobs cannot starve.
+  3. Shortest expected job first within the (aged) class, using
+     estimate_job_cost(); ties go to the job that arrived first.
+
+Running jobs can be preempted: between ODE steps the inference thread asks
+should_yield(), and if a more urgent job is waiting with no free slot it
+hands its slot over through yield_slot() and waits to be re-admitted. The
+yielded job keeps its original class and arrival time, so aging still
+counts the time it has been in the system.
+
+Everything except should_yield() runs on the engine's event loop; no
+locking is needed.
+"""
+
+import asyncio
+import math
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+PRIORITY_CLASSES = {"high": 0, "normal": 1, "low": 2}
+DEFAULT_PRIORITY = "normal"
+
+# Rough espeak token count per character of Vietnamese text (letters,
+# diacritics and punctuation all produce tokens; spaces mostly do not).
+TOKENS_PER_CHAR = 0.9
+# Tokens in one spelled-out acronym segment, e.g. 【ây ai】
+TOKENS_PER_BRACKET = 8
+
+_ACRONYM_RE = re.compile(r"\b[A-ZĐ][A-ZĐ0-9&]{1,}\b")
+_BRACKET_RE = re.compile(r"【[^】]{1,50}】")
+
+
+def estimate_job_cost(
+    text: str,
+    num_step: int,
+    bracket_num_step: int,
+    bracket_speed: float,
+) -> float:
+    """
+    Estimate the sampling work of a job before it is normalized.
+
+    Cost is in token-steps: (estimated tokens) × (ODE steps), with each
+    acronym counted as a bracket segment synthesized at bracket_num_step
+    and slowed down by bracket_speed. Only the ordering of costs matters.
+    """
+    n_brackets = len(_ACRONYM_RE.findall(text)) + len(_BRACKET_RE.findall(text))
+    n_tokens = len(text) * TOKENS_PER_CHAR
+    normal = n_tokens * num_step
+    bracket = n_brackets * TOKENS_PER_BRACKET * bracket_num_step / max(bracket_speed, 0.1)
+    return normal + bracket
+
+
+@dataclass
+class _Waiter:
+    job_id: str
+    rank: int
+    cost: float
+    enqueued_at: float = field(default_factory=time.monotonic)
+    future: Optional[asyncio.Future] = None
+
+
+class JobScheduler:
+    """Hands out `slots` concurrent execution slots by priority, age and cost."""
+
+    def __init__(self, slots: int, aging_seconds: float = 30.0):
+        self.slots = slots
+        self.aging_seconds = aging_seconds
+        self._running: Dict[str, _Waiter] = {}
+        self._waiting: Dict[str, _Waiter] = {}
+        self.preemptions = 0
+
+    @staticmethod
+    def priority_rank(priority: Optional[str]) -> int:
+        return PRIORITY_CLASSES.get(priority or DEFAULT_PRIORITY, PRIORITY_CLASSES[DEFAULT_PRIORITY])
+
+    async def acquire(self, job_id: str, priority: Optional[str], cost: float) -> Optional[float]:
+        """
+        Wait for a slot.
+
+        Returns the seconds spent waiting, or None if the job was removed
+        (cancelled) before it got a slot. A caller that gets a float must
+        call release(job_id) when done.
+        """
+        waiter = _Waiter(job_id, self.priority_rank(priority), cost)
+        if not await self._wait(waiter):
+            return None
+        return time.monotonic() - waiter.enqueued_at
+
+    async def _wait(self, waiter: _Waiter) -> bool:
+        waiter.future = asyncio.get_running_loop().create_future()
+        self._waiting[waiter.job_id] = waiter
+        self._dispatch()
+        try:
+            return await waiter.future
+        except asyncio.CancelledError:
+            self._waiting.pop(waiter.job_id, None)
+            if waiter.future.done() and not waiter.future.cancelled() and waiter.future.result():
+                self.release(waiter.job_id)  # slot was granted just before we were cancelled
+            raise
+
+    def release(self, job_id: str):
+        self._running.pop(job_id, None)
+        self._dispatch()
+
+    def should_yield(self, job_id: str) -> bool:
+        """
+        True if running job_id should hand its slot to a more urgent waiter.
+
+        Called from inference threads, so it only reads snapshots.
+        """
+        me = self._running.get(job_id)
+        waiting = list(self._waiting.values())
+        if me is None or not waiting or len(self._running) < self.slots:
+            return False
+        now = time.monotonic()
+        best = min(self._effective_key(w, now)[0] for w in waiting)
+        return best < self._effective_key(me, now)[0]
+
+    async def yield_slot(self, job_id: str) -> bool:
+        """
+        Give up job_id's slot and wait to get one back.
+
+        Returns False if the job was removed (cancelled) while waiting.
+        """
+        waiter = self._running.pop(job_id, None)
+        if waiter is None:
+            return True
+        self.preemptions += 1
+        return await self._wait(waiter)
+
+    def remove(self, job_id: str) -> bool:
+        """Drop a waiting job; its acquire() returns None."""
+        waiter = self._waiting.pop(job_id, None)
+        if waiter is None:
+            return False
+        if not waiter.future.done():
+            waiter.future.set_result(False)
+        return True
+
+    def _effective_key(self, waiter: _Waiter, now: float):
+        waited = now - waiter.enqueued_at
+        aged_rank = waiter.rank - math.floor(waited / self.aging_seconds) if self.aging_seconds > 0 else waiter.rank
+        return (aged_rank, waiter.cost, waiter.enqueued_at)
+
+    def _dispatch(self):
+        now = time.monotonic()
+        while len(self._running) < self.slots and self._waiting:
+            best = min(self._waiting.values(), key=lambda w: self._effective_key(w, now))
+            del self._waiting[best.job_id]
+            self._running[best.job_id] = best
+            best.future.set_result(True)
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        by_class = {name: 0 for name in PRIORITY_CLASSES}
+        rank_to_name = {v: k for k, v in PRIORITY_CLASSES.items()}
+        for w in self._waiting.values():
+            by_class[rank_to_name[w.rank]] += 1
+        oldest = max((now - w.enqueued_at for w in self._waiting.values()), default=0.0)
+        return {
+            "slots": self.slots,
+            "running": len(self._running),
+            "waiting": len(self._waiting),
+            "waiting_by_priority": by_class,
+            "oldest_wait_seconds": oldest,
+            "preemptions": self.preemptions,
+        }
@@ -9,6 +9,7 @@ class TTSJobCreate(BaseModel):
     num_step: Optional[int] = 32
     guidance_scale: Optional[float] = 1.0
     audio_type: Optional[str] = Field("mp3", description="Audio format: 'wav' or 'mp3'")
+    priority: Optional[str] = Field("normal", description="Scheduling class: 'high', 'normal' or 'low'")
 
 class JobCreateResponse(BaseModel):
     job_id: str
@@ -22,4 +23,6 @@ class JobStatusResponse(BaseModel):
     file_path: Optional[str] = None
     audio_url: Optional[str] = None
     error: Optional[str] = None
-    conversion_time: Optional[float] = Field(None, description="Time taken for conversion in seconds")
\ No newline at end of file
+    conversion_time: Optional[float] = Field(None, description="Time taken for conversion in seconds")
+    priority: Optional[str] = None
+    queue_wait: Optional[float] = Field(None, description="Seconds the job waited for an execution slot")
\ No newline at end of file
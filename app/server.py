@@ -1,13 +1,17 @@
 import os, asyncio
 from fastapi import FastAPI, HTTPException, status, Query, Path
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse, PlainTextResponse
 from sse_starlette.sse import EventSourceResponse
 
-from .settings import RESULTS_DIR
+from .settings import RESULTS_DIR, USE_LLM_NORMALIZER
 from .registry import VoiceRegistry
 from .engine import ZipVoiceEngine
+from .normalizer.dictionary_cache import get_dictionary_cache
+from .normalizer.llm_client import get_llm_normalizer
 from .schemas import TTSJobCreate, JobCreateResponse, JobStatusResponse
+from .scheduler import PRIORITY_CLASSES, DEFAULT_PRIORITY
+from . import metrics
 
 app = FastAPI(title="ZipVoice TTS (local-only, JSON API)")
 
@@ -35,9 +39,38 @@ app.mount("/files", StaticFiles(directory=RESULTS_DIR), name="files")
 def list_voices():
     return {"voices": registry.list()}
 
+@app.get("/v1/cache/stats")
+def cache_stats():
+    """Hit/miss counters and sizes of the result, chunk and phoneme caches, LLM calls avoided, learned pairs."""
+    return {
+        "result_cache": engine.result_cache.stats() if engine.result_cache else {"enabled": False},
+        "chunk_cache": engine.chunk_cache.stats() if engine.chunk_cache else {"enabled": False},
+        "llm": get_llm_normalizer().stats() if USE_LLM_NORMALIZER else {"enabled": False},
+        "learned_dict": get_dictionary_cache().stats(),
+        "phonemes": engine.tokenizer.phoneme_cache.stats()
+                    if getattr(engine.tokenizer, "phoneme_cache", None) else {"enabled": False},
+    }
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Prometheus text exposition of queue, stage latency, RTF, cache and LLM metrics."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/v1/queue")
+def queue_stats():
+    """Execution slots in use and jobs waiting for one, per priority class."""
+    return engine.scheduler.stats()
+
+def _check_priority(priority):
+    priority = priority or DEFAULT_PRIORITY
+    if priority not in PRIORITY_CLASSES:
+        raise HTTPException(400, f"priority must be one of {', '.join(PRIORITY_CLASSES)}")
+    return priority
+
 @app.post("/v1/tts/jobs", response_model=JobCreateResponse, status_code=status.HTTP_202_ACCEPTED)
 async def create_job(req: TTSJobCreate):
     # (Existing code...)
+    priority = _check_priority(req.priority)
     try:
         registry.get(req.voice_id)
     except KeyError as e:
@@ -51,6 +84,7 @@ async def create_job(req: TTSJobCreate):
         num_step=req.num_step,
         guidance_scale=req.guidance_scale,
         audio_type=req.audio_type,
+        priority=priority,
     )
     return JobCreateResponse(
         job_id=job_id,
@@ -58,6 +92,46 @@ async def create_job(req: TTSJobCreate):
         audio_url=f"/v1/jobs/{job_id}/audio",
     )
 
+@app.post("/v1/tts/stream")
+async def stream_tts(req: TTSJobCreate,
+                     format: str = Query("wav", description="'wav' (streaming WAV header + PCM16) or 'pcm' (raw PCM16)")):
+    """
+    Synthesize text and stream audio while it is being generated.
+
+    Chunks are generated in text order and sent as soon as each one is
+    vocoded, so playback can start after roughly one chunk instead of the
+    whole text. The job id is returned in the X-Job-Id header; the job can
+    be cancelled and its audio fetched afterwards like a queued job.
+    """
+    if format not in ("wav", "pcm"):
+        raise HTTPException(400, "format must be 'wav' or 'pcm'")
+    priority = _check_priority(req.priority)
+    try:
+        voice = registry.get(req.voice_id)
+    except KeyError as e:
+        raise HTTPException(404, str(e))
+    if voice.cached_wav_tensor is None or voice.cached_prompt_features is None:
+        raise HTTPException(409, f"Voice '{req.voice_id}' is not cached; streaming is unavailable")
+
+    job = engine.create_stream_job(
+        text=req.text,
+        voice_id=req.voice_id,
+        speed=req.speed,
+        num_step=req.num_step,
+        guidance_scale=req.guidance_scale,
+        priority=priority,
+    )
+    media_type = "audio/wav" if format == "wav" else f"audio/L16;rate={engine.sampling_rate};channels=1"
+    return StreamingResponse(
+        engine.stream_audio(job, fmt=format),
+        media_type=media_type,
+        headers={
+            "X-Job-Id": job.id,
+            "X-Sample-Rate": str(engine.sampling_rate),
+            "Cache-Control": "no-store",
+        },
+    )
+
 @app.get("/v1/jobs/{job_id}", response_model=JobStatusResponse)
 async def job_status(job_id: str):
     # (Existing code...)
@@ -65,7 +139,8 @@ async def job_status(job_id: str):
     if not j:
         raise HTTPException(404, "job not found")
         
-    resp = JobStatusResponse(job_id=j.id, status=j.status, progress=j.progress)
+    resp = JobStatusResponse(job_id=j.id, status=j.status, progress=j.progress,
+                             priority=j.priority, queue_wait=j.queue_wait)
     
     if j.status in ["done", "error", "cancelled"] and j.finished_at and j.created_at:
         conversion_time = (j.finished_at - j.created_at).total_seconds()
@@ -2,6 +2,7 @@ import os
 
 RESULTS_DIR      = os.getenv("RESULTS_DIR", "results")
 VOICES_DIR       = os.getenv("VOICES_DIR", "voices")
+JOBS_DB_PATH     = os.getenv("JOBS_DB_PATH", "jobs.db")    # SQLite job store; keep it out of RESULTS_DIR (served under /files)
 
 # Model settings
 MODEL_NAME       = os.getenv("MODEL_NAME", "zipvoice")  
@@ -12,8 +13,23 @@ VOCOS_LOCAL_DIR  = os.getenv("VOCOS_LOCAL_DIR", None)      # set for offline voc
 DEVICE           = os.getenv("DEVICE", "cuda")
 TOKENIZER        = os.getenv("TOKENIZER", "espeak")
 LANG_TOKENIZER   = os.getenv("LANG_TOKENIZER", "vi")
+PHONEME_CACHE_SIZE = int(os.getenv("PHONEME_CACHE_SIZE", "10000"))  # texts whose espeak phonemes are kept (LRU), 0 = off
 MAX_DURATION     = float(os.getenv("MAX_DURATION", "100"))  # per internal batch cap (sec)
 MAX_CONCURRENT   = int(os.getenv("MAX_CONCURRENT", "5"))
+DYNAMIC_BATCHING = os.getenv("DYNAMIC_BATCHING", "true").lower() == "true"  # pack chunks of concurrent jobs into shared model.sample calls
+BATCH_WAIT_MS    = float(os.getenv("BATCH_WAIT_MS", "10"))   # how long a chunk may wait for chunks of other jobs
+ENCODER_WORKERS  = int(os.getenv("ENCODER_WORKERS", "2"))   # threads encoding finished jobs to wav/mp3
+MP3_BITRATE_KBPS = int(os.getenv("MP3_BITRATE_KBPS", "64"))
+RESULT_CACHE     = os.getenv("RESULT_CACHE", "true").lower() == "true"     # reuse finished audio for identical requests
+RESULT_CACHE_MAX_MB = float(os.getenv("RESULT_CACHE_MAX_MB", "2048"))     # LRU-evicted above this size
+CHUNK_CACHE      = os.getenv("CHUNK_CACHE", "true").lower() == "true"      # reuse vocoded chunks across jobs
+CHUNK_CACHE_MEMORY_MB = float(os.getenv("CHUNK_CACHE_MEMORY_MB", "256"))
+CHUNK_CACHE_DISK_MB   = float(os.getenv("CHUNK_CACHE_DISK_MB", "2048"))   # 0 disables spilling to disk
+CHUNK_CACHE_DIR  = os.getenv("CHUNK_CACHE_DIR", "chunk_cache")
+SCHEDULER_AGING_SECONDS = float(os.getenv("SCHEDULER_AGING_SECONDS", "30"))  # waiting this long promotes a job one priority class
+CPU_WORKERS      = int(os.getenv("CPU_WORKERS", "0"))         # >0 on CPU-only nodes: synthesize in this many processes
+CPU_WORKER_THREADS = int(os.getenv("CPU_WORKER_THREADS", "0"))  # intra-op threads per worker, 0 = cores / CPU_WORKERS
+CPU_WORKER_WEIGHTS_DIR = os.getenv("CPU_WORKER_WEIGHTS_DIR", "")  # shared weight files, default /dev/shm
 USE_MULTIPLE_MODELS=True
 
 # LLM Normalizer
@@ -21,7 +37,32 @@ LLM_API_URL      = os.getenv("LLM_API_URL", "http://x.x.x.x:x/v1/chat/completion
 LLM_MODEL        = os.getenv("LLM_MODEL", "llm-model")
 LLM_API_KEY      = os.getenv("LLM_API_KEY", "dummy")
 LLM_TIMEOUT      = int(os.getenv("LLM_TIMEOUT", "10"))         # seconds per request
+LLM_DEADLINE     = float(os.getenv("LLM_DEADLINE", "20"))     # seconds per call, including queueing, retries and backoff
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))  # LLM requests in flight across all jobs (= pooled connections)
+LLM_BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", "5"))  # consecutive failures that open the circuit
+LLM_BREAKER_RESET = float(os.getenv("LLM_BREAKER_RESET", "30"))     # seconds the LLM stage is skipped before a probe request
+LLM_BATCH_WAIT_MS = float(os.getenv("LLM_BATCH_WAIT_MS", "5"))    # how long an extraction chunk waits for chunks of other jobs, 0 = no coalescing
+LLM_BATCH_MAX_ITEMS = int(os.getenv("LLM_BATCH_MAX_ITEMS", "16"))  # chunks per coalesced request
+LLM_BATCH_MAX_CHARS = int(os.getenv("LLM_BATCH_MAX_CHARS", "8000"))  # text per coalesced request
 USE_LLM_NORMALIZER = os.getenv("USE_LLM_NORMALIZER", "true").lower() == "true"
+LLM_CACHE_PATH   = os.getenv("LLM_CACHE_PATH", "llm_cache.db")      # SQLite cache of LLM extraction results per chunk, "" = off
+LLM_CACHE_TTL_HOURS = float(os.getenv("LLM_CACHE_TTL_HOURS", "720"))  # cached extractions older than this are asked again
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "200000"))  # LRU-evicted above this many chunks
+NORMALIZER_ARTIFACT = os.getenv("NORMALIZER_ARTIFACT", "")    # pickled NormalizationPipeline, rebuilt when the word lists change
+OVERLAP_NORMALIZATION = os.getenv("OVERLAP_NORMALIZATION", "true").lower() == "true"  # synthesize the first sentences while the rest is normalized
+NORMALIZE_WORKERS = int(os.getenv("NORMALIZE_WORKERS", "4"))          # threads normalizing sentences of running jobs
+NORMALIZE_SHARD_WORKERS = int(os.getenv("NORMALIZE_SHARD_WORKERS", "0"))      # processes normalizing long documents in sentence shards, 0 = off
+NORMALIZE_SHARD_CHARS = int(os.getenv("NORMALIZE_SHARD_CHARS", "2000"))         # characters per shard
+NORMALIZE_SHARD_MIN_CHARS = int(os.getenv("NORMALIZE_SHARD_MIN_CHARS", "10000"))  # shorter documents are normalized in one piece
+NORMALIZE_LOG_DIR = os.getenv("NORMALIZE_LOG_DIR", "logs")                   # daily normalization_YYYYMMDD.log, "" = console only
+NORMALIZE_TRACE_SAMPLE = float(os.getenv("NORMALIZE_TRACE_SAMPLE", "0.01"))  # share of requests logging the text after every stage
+NORMALIZE_TRACE_MAX_CHARS = int(os.getenv("NORMALIZE_TRACE_MAX_CHARS", "500"))  # traced texts are cut to this length, 0 = no limit
+SENTENCE_CACHE   = os.getenv("SENTENCE_CACHE", "true").lower() == "true"   # normalize only sentences not seen before
+SENTENCE_CACHE_SIZE = int(os.getenv("SENTENCE_CACHE_SIZE", "50000"))     # sentences kept in memory (LRU)
+SENTENCE_CACHE_PATH = os.getenv("SENTENCE_CACHE_PATH", "")              # SQLite file to persist the cache in, "" = memory only
+LEARNED_DICT_PATH = os.getenv("LEARNED_DICT_PATH", "")                  # learned LLM pairs (snapshot + .journal), "" = app/normalizer/learned_dict.json
+DICT_REFRESH_SECONDS = float(os.getenv("DICT_REFRESH_SECONDS", "2"))     # how often lookups pick up pairs learned by other workers
+DICT_COMPACT_EVERY = int(os.getenv("DICT_COMPACT_EVERY", "1000"))        # journal lines folded into the snapshot in the background, 0 = never
 
 # Bracket inference params (for <X> letter segments)
 BRACKET_SPEED    = float(os.getenv("BRACKET_SPEED", "0.4"))
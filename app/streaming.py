@@ -0,0 +1,123 @@
+"""
+Helpers for progressive (streaming) audio output.
+
+The file-based paths build the whole waveform, cross-fade all chunks with
+cross_fade_concat() and trim the edges with remove_silence() before anything
+is written. For streaming we want to send audio as soon as each chunk is
+vocoded, so this module provides:
+
+  - StreamingCrossFader: incremental equivalent of cross_fade_concat(). It
+    only holds back the last fade_samples of audio, which are still needed
+    to cross-fade with the next chunk.
+  - trim_leading_silence / trim_trailing_silence: the two halves of
+    remove_silence_edges(), applied to the first and last chunk.
+  - wav_stream_header / to_pcm16: framing for a chunked HTTP response.
+"""
+
+import struct
+from typing import Optional
+
+import numpy as np
+import torch
+from pydub.silence import detect_leading_silence
+
+from zipvoice.utils.infer import tensor_to_audiosegment
+
+# Same thresholds as zipvoice.utils.infer.remove_silence_edges()
+EDGE_KEEP_SILENCE_MS = 100
+EDGE_SILENCE_THRESH_DB = -50
+
+
+class StreamingCrossFader:
+    """
+    Incremental cross-fade concatenation.
+
+    Feeding chunks through push() and finally calling flush() yields
+    exactly the samples cross_fade_concat(chunks, fade_duration) would
+    return, but each chunk is released as soon as the next one is not
+    needed to finish it.
+    """
+
+    def __init__(self, fade_duration: float = 0.1, sample_rate: int = 24000):
+        self.fade_samples = int(fade_duration * sample_rate)
+        self._tail: Optional[torch.Tensor] = None  # (C, <= fade_samples)
+
+    def push(self, chunk: torch.Tensor) -> torch.Tensor:
+        """
+        Add the next chunk (C, T) and return the audio that is now final.
+
+        The returned tensor may be empty (C, 0) for very short chunks.
+        """
+        if self._tail is None:
+            merged = chunk
+        elif self.fade_samples <= 0:
+            merged = torch.cat([self._tail, chunk], dim=-1)
+        else:
+            # _tail holds min(fade_samples, len(final)) samples, so this is
+            # the same k as cross_fade_concat() computes on the full audio.
+            k = min(self.fade_samples, self._tail.shape[-1], chunk.shape[-1])
+            if k <= 0:
+                merged = torch.cat([self._tail, chunk], dim=-1)
+            else:
+                fade = torch.linspace(1, 0, k, device=chunk.device)[None]
+                merged = torch.cat(
+                    [
+                        self._tail[..., :-k],
+                        self._tail[..., -k:] * fade + chunk[..., :k] * (1 - fade),
+                        chunk[..., k:],
+                    ],
+                    dim=-1,
+                )
+
+        hold = min(max(self.fade_samples, 0), merged.shape[-1])
+        ready_len = merged.shape[-1] - hold
+        self._tail = merged[..., ready_len:]
+        return merged[..., :ready_len]
+
+    def flush(self) -> Optional[torch.Tensor]:
+        """Return the held-back tail after the last chunk, if any."""
+        tail, self._tail = self._tail, None
+        return tail
+
+
+def trim_leading_silence(wav: torch.Tensor, sampling_rate: int) -> torch.Tensor:
+    """Trim leading silence longer than EDGE_KEEP_SILENCE_MS from (C, T) audio."""
+    aseg = tensor_to_audiosegment(wav, sampling_rate)
+    trim_ms = detect_leading_silence(aseg, silence_threshold=EDGE_SILENCE_THRESH_DB)
+    trim_ms = max(0, trim_ms - EDGE_KEEP_SILENCE_MS)
+    # Slice the tensor by samples: slicing the AudioSegment (in whole ms)
+    # would also drop the fractional millisecond at the end.
+    return wav[..., trim_ms * sampling_rate // 1000:]
+
+
+def trim_trailing_silence(wav: torch.Tensor, sampling_rate: int) -> torch.Tensor:
+    """Trim trailing silence longer than EDGE_KEEP_SILENCE_MS from (C, T) audio."""
+    aseg = tensor_to_audiosegment(wav, sampling_rate).reverse()
+    trim_ms = detect_leading_silence(aseg, silence_threshold=EDGE_SILENCE_THRESH_DB)
+    trim_ms = max(0, trim_ms - EDGE_KEEP_SILENCE_MS)
+    return wav[..., : wav.shape[-1] - trim_ms * sampling_rate // 1000]
+
+
+def to_pcm16(wav: torch.Tensor) -> bytes:
+    """Convert (C, T) float audio in [-1, 1] to interleaved little-endian PCM16."""
+    audio_np = wav.detach().cpu().numpy()
+    if audio_np.ndim == 1:
+        audio_np = audio_np[np.newaxis, :]
+    audio_np = (audio_np * 32768.0).clip(-32768, 32767).astype("<i2")
+    return audio_np.T.tobytes()
+
+
+def wav_stream_header(sampling_rate: int, channels: int = 1) -> bytes:
+    """
+    RIFF/WAVE header for a PCM16 stream of unknown length.
+
+    Sizes are set to 0xFFFFFFFF, which browsers, ffmpeg and most players
+    accept as "read until end of stream".
+    """
+    byte_rate = sampling_rate * channels * 2
+    return (
+        b"RIFF" + struct.pack("<I", 0xFFFFFFFF) + b"WAVE"
+        + b"fmt " + struct.pack("<IHHIIHH", 16, 1, channels, sampling_rate,
+                                byte_rate, channels * 2, 16)
+        + b"data" + struct.pack("<I", 0xFFFFFFFF)
+    )
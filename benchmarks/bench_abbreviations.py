@@ -0,0 +1,119 @@
+"""
+Benchmark and regression check: norm_abbre, str.replace() loop vs trie matcher.
+
+  legacy   the previous norm_abbre: split the text into words twice and run
+           input_str.replace() over the whole text for every word in ABBRE.
+  trie     AbbreviationMatcher, one left-to-right scan (current norm_abbre).
+
+First both are run over benchmarks/data/abbreviation_cases.tsv. The trie
+matcher must reproduce every expected output (the script exits with status
+1 otherwise); cases the legacy implementation gets wrong are listed for
+reference. Then both are timed on documents made of 1, 10 and 100 texts
+(the corpus and the case inputs), where the legacy cost grows with
+(words x length).
+
+Usage (from the repo root):
+    python -m benchmarks.bench_abbreviations
+    python -m benchmarks.bench_abbreviations --sizes 1 50 200 --repeat 5
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from app.normalizer.abbre import ABBRE
+from app.normalizer.normalizer import TextNormalizer
+
+DATA_DIR = Path(__file__).parent / "data"
+DEFAULT_CASES = DATA_DIR / "abbreviation_cases.tsv"
+DEFAULT_CORPUS = DATA_DIR / "normalization_corpus.txt"
+
+
+def legacy_norm_abbre(input_str, abbre_dict):
+    """TextNormalizer.norm_abbre before the trie matcher, kept for comparison."""
+    temp_str = input_str
+
+    # not remove punctuation
+    words_temp = temp_str.split()
+    for i in range(len(words_temp)):
+        temp_word = words_temp[i]
+        if temp_word[-1] in [',', '.', ')', '}', ']', '!', '?', '/', '-', ':', ';']:
+            temp_word = temp_word[:-1]
+
+        if temp_word in abbre_dict.keys():
+            input_str = input_str.replace(temp_word, str(abbre_dict[temp_word]).strip().lower())
+
+    #remove punctuation
+    temp_str = input_str
+    for character in [',', '.', ')', '}', ']', '!', '?', '/', '-']:
+        temp_str = temp_str.replace(character, ' ')
+
+    words_inp = temp_str.split()
+    for i in range(len(words_inp)):
+        temp_word = words_inp[i]
+
+        if temp_word in abbre_dict.keys():
+            input_str = input_str.replace(temp_word, str(abbre_dict[temp_word]).strip())
+
+    return input_str.strip()
+
+
+def load_cases(path) -> list:
+    with open(path, encoding="utf-8") as f:
+        return [tuple(line.rstrip("\n").split("\t")) for line in f if line.strip() and not line.startswith("#")]
+
+
+def load_corpus(path) -> list:
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+
+def check(cases, normalizer) -> int:
+    failures = 0
+    for text, expected in cases:
+        got = normalizer.norm_abbre(text, ABBRE)
+        if got != expected:
+            failures += 1
+            print(f"FAIL  {text}\n      expected: {expected}\n      got:      {got}")
+        legacy = legacy_norm_abbre(text, ABBRE)
+        if legacy != expected:
+            print(f"legacy differs: {text}\n      legacy: {legacy}")
+    print(f"{len(cases)} cases, {failures} failures")
+    return failures
+
+
+def best_time(fn, text, repeat) -> float:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(text, ABBRE)
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cases", default=str(DEFAULT_CASES), help="input<TAB>expected lines")
+    parser.add_argument("--corpus", default=str(DEFAULT_CORPUS), help="one input text per line")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100], help="corpus texts per document")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per document, best is reported")
+    args = parser.parse_args()
+
+    normalizer = TextNormalizer()
+    cases = load_cases(args.cases)
+    failures = check(cases, normalizer)
+
+    corpus = load_corpus(args.corpus) + [text for text, _ in cases]
+    for size in args.sizes:
+        doc = " ".join(corpus[i % len(corpus)] for i in range(size))
+        legacy = best_time(legacy_norm_abbre, doc, args.repeat)
+        trie = best_time(normalizer.norm_abbre, doc, args.repeat)
+        print(f"{size:5d} texts ({len(doc):7d} chars): legacy {legacy * 1000:9.2f} ms  "
+              f"trie {trie * 1000:7.2f} ms  ({legacy / trie:6.1f}x)")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
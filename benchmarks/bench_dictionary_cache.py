@@ -0,0 +1,139 @@
+"""
+Benchmark and check: journaled DictionaryCache persistence.
+
+  legacy   update_pairs() before the journal: the whole dictionary dumped
+           (sorted, indented) over learned_dict.json on every update.
+  journal  DictionaryCache: one appended line per new pair, compaction in
+           a background thread every --compact-every lines.
+
+Both start from a dictionary of --size pairs and learn --updates new
+pairs one update at a time (one LLM-enriched request each); the script
+reports the time per update.
+
+It then checks the multi-process behaviour: --workers processes learn
+pairs concurrently into one dictionary (some words learned by several of
+them with different spellings) with a small compaction threshold. Every
+worker must end up with every pair and all of them, as well as a fresh
+reader, must agree on the same spelling for each word. Finally a torn
+journal line (a writer killed mid-append) must be skipped without losing
+the pairs appended after it. The script exits with status 1 if a check
+fails.
+
+Usage (from the repo root):
+    python -m benchmarks.bench_dictionary_cache
+    python -m benchmarks.bench_dictionary_cache --size 100000 --workers 8
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+from app.normalizer.dictionary_cache import DictionaryCache
+
+
+def legacy_update(path: str, table: dict, pairs: list):
+    """update_pairs() persistence before the journal, kept for comparison."""
+    for pair in pairs:
+        table.setdefault(pair["foreign_word"], pair["vietnamese_spelling"])
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(table, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+
+def pair(word: str, spelling: str) -> dict:
+    return {"foreign_word": word, "vietnamese_spelling": spelling}
+
+
+def worker(path: str, index: int, count: int, compact_every: int, barrier, queue):
+    logging.getLogger("app.normalizer").setLevel(logging.WARNING)
+    cache = DictionaryCache(path, refresh_seconds=0, compact_every=compact_every)
+    barrier.wait()
+    for i in range(count):
+        cache.update_pairs([pair(f"worker{index}word{i}", f"uơ cơ {index} {i}"),
+                            pair(f"shared{i}", f"sơ {index}")])  # contested: first writer wins
+        cache.lookup("warmup")  # picks up other workers' pairs
+    barrier.wait()  # everyone has written
+    cache.refresh()
+    queue.put(dict(cache._dict))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=20000, help="pairs already in the dictionary")
+    parser.add_argument("--updates", type=int, default=200, help="updates with one new pair each")
+    parser.add_argument("--compact-every", type=int, default=1000, help="journal lines per compaction")
+    parser.add_argument("--workers", type=int, default=4, help="processes sharing one dictionary")
+    parser.add_argument("--pairs", type=int, default=300, help="pairs each worker learns")
+    args = parser.parse_args()
+
+    logging.getLogger("app.normalizer").setLevel(logging.WARNING)
+    initial = {f"word{i}": f"uơ {i}" for i in range(args.size)}
+    updates = [[pair(f"new{i}", f"niu {i}")] for i in range(args.updates)]
+    failures = 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "legacy.json")
+        table = dict(initial)
+        t0 = time.perf_counter()
+        for batch in updates:
+            legacy_update(path, table, batch)
+        legacy = (time.perf_counter() - t0) / len(updates)
+
+        path = os.path.join(tmp, "learned_dict.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(initial, f, ensure_ascii=False)
+        cache = DictionaryCache(path, compact_every=args.compact_every)
+        t0 = time.perf_counter()
+        for batch in updates:
+            cache.update_pairs(batch)
+        journal = (time.perf_counter() - t0) / len(updates)
+        print(f"{args.size} pairs, {args.updates} updates")
+        print(f"legacy   {legacy * 1000:8.3f} ms/update")
+        print(f"journal  {journal * 1000:8.3f} ms/update  {cache.stats()}")
+        if DictionaryCache(path).size != args.size + args.updates:
+            print("FAIL  reloaded dictionary is missing pairs")
+            failures += 1
+
+        # Several processes learning into one dictionary
+        path = os.path.join(tmp, "shared.json")
+        ctx = multiprocessing.get_context("spawn")
+        barrier, queue = ctx.Barrier(args.workers), ctx.Queue()
+        procs = [ctx.Process(target=worker, args=(path, i, args.pairs, 97, barrier, queue))
+                 for i in range(args.workers)]
+        t0 = time.perf_counter()
+        for p in procs:
+            p.start()
+        views = [queue.get() for _ in procs]
+        for p in procs:
+            p.join()
+        elapsed = time.perf_counter() - t0
+        fresh = dict(DictionaryCache(path)._dict)
+        expected = args.workers * args.pairs + args.pairs
+        consistent = all(view == fresh for view in views)
+        print(f"{args.workers} workers x {args.pairs * 2} pairs in {elapsed:.2f} s: "
+              f"{len(fresh)} distinct words (expected {expected}), workers agree: {consistent}")
+        if len(fresh) != expected or not consistent:
+            print("FAIL  workers lost pairs or disagree on spellings")
+            failures += 1
+
+        # Writer killed mid-append
+        path = os.path.join(tmp, "torn.json")
+        DictionaryCache(path, compact_every=0).update_pairs([pair("before", "bi pho")])
+        with open(path + ".journal", "a", encoding="utf-8") as f:
+            f.write('{"eng": "torn", "vi')
+        DictionaryCache(path, compact_every=0).update_pairs([pair("after", "áp tơ")])
+        survived = DictionaryCache(path, compact_every=0)
+        print(f"torn journal line: reloaded {sorted(survived._dict)}")
+        if sorted(survived._dict) != ["after", "before"]:
+            print("FAIL  torn journal line not skipped")
+            failures += 1
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
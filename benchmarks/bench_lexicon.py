@@ -0,0 +1,121 @@
+"""
+Benchmark: English lexicon replacement, regex alternation vs LexiconMatcher.
+
+  regex    one r'\\b(k1|k2|...)\\b' IGNORECASE alternation over all keys,
+           longest first, as mapping_eng() and DictionaryCache used to build;
+           DictionaryCache recompiled it on every update_pairs().
+  matcher  LexiconMatcher: word tokens + dict lookups, incremental add().
+
+For each dictionary size it reports the build time, the time per text and
+the time to learn pairs one update at a time (regex: recompile after each,
+matcher: add()), and checks that both produce the same output. Dictionaries
+are generated: made-up lowercase words plus some two- and three-word
+phrases built from them; the corpus texts get a few of the words mixed in.
+
+Usage (from the repo root):
+    python -m benchmarks.bench_lexicon
+    python -m benchmarks.bench_lexicon --sizes 1000 20000 50000 --updates 50
+"""
+
+import argparse
+import random
+import re
+import string
+import time
+from pathlib import Path
+
+from app.normalizer.lexicon import LexiconMatcher
+
+DEFAULT_CORPUS = Path(__file__).parent / "data" / "normalization_corpus.txt"
+
+
+def compile_alternation(entries):
+    """The pattern mapping_eng() and DictionaryCache used before LexiconMatcher."""
+    sorted_keys = sorted(entries, key=len, reverse=True)
+    return re.compile(r'\b(' + '|'.join(re.escape(k) for k in sorted_keys) + r')\b', re.IGNORECASE)
+
+
+def regex_replace(pattern, entries, text):
+    return pattern.sub(lambda m: entries.get(m.group(0).lower(), m.group(0)), text)
+
+
+def make_entries(n, rng):
+    words = set()
+    while len(words) < n:
+        words.add("".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 10))))
+    words = sorted(words)
+    entries = {w: f"{w[:3]} {w[3:]}" for w in words}
+    for _ in range(n // 10):
+        phrase = " ".join(rng.sample(words, rng.randint(2, 3)))
+        entries[phrase] = phrase.upper()
+    return entries
+
+
+def make_texts(corpus, entries, rng):
+    keys = list(entries)
+    texts = []
+    for text in corpus:
+        words = text.split()
+        for _ in range(3):
+            key = rng.choice(keys)
+            words.insert(rng.randrange(len(words) + 1), key.title() if rng.random() < 0.3 else key)
+        texts.append(" ".join(words))
+    return texts
+
+
+def per_text(fn, texts, repeat):
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            fn(text)
+    return (time.perf_counter() - t0) / (repeat * len(texts))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default=str(DEFAULT_CORPUS), help="one input text per line")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 30000], help="dictionary sizes")
+    parser.add_argument("--updates", type=int, default=20, help="single-pair updates to time")
+    parser.add_argument("--repeat", type=int, default=3, help="passes over the corpus")
+    args = parser.parse_args()
+
+    with open(args.corpus, encoding="utf-8") as f:
+        corpus = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+    for size in args.sizes:
+        rng = random.Random(size)
+        entries = make_entries(size, rng)
+        texts = make_texts(corpus, entries, rng)
+
+        t0 = time.perf_counter()
+        pattern = compile_alternation(entries)
+        regex_build = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        matcher = LexiconMatcher(entries)
+        matcher_build = time.perf_counter() - t0
+
+        regex_call = per_text(lambda t: regex_replace(pattern, entries, t), texts, args.repeat)
+        matcher_call = per_text(matcher.replace, texts, args.repeat)
+        mismatches = sum(regex_replace(pattern, entries, t) != matcher.replace(t) for t in texts)
+
+        new_pairs = {k: v for k, v in make_entries(args.updates, random.Random(f"updates-{size}")).items()
+                     if k not in entries}
+        grown = dict(entries)
+        t0 = time.perf_counter()
+        for key, value in new_pairs.items():
+            grown[key] = value
+            compile_alternation(grown)
+        regex_update = (time.perf_counter() - t0) / len(new_pairs)
+        t0 = time.perf_counter()
+        for key, value in new_pairs.items():
+            matcher.add(key, value)
+        matcher_update = (time.perf_counter() - t0) / len(new_pairs)
+
+        print(f"{len(entries):6d} entries: build  regex {regex_build * 1000:9.1f} ms  matcher {matcher_build * 1000:7.1f} ms")
+        print(f"{'':15s} text   regex {regex_call * 1000:9.2f} ms  matcher {matcher_call * 1000:7.2f} ms  "
+              f"({regex_call / matcher_call:.0f}x), output mismatches: {mismatches}/{len(texts)}")
+        print(f"{'':15s} update regex {regex_update * 1000:9.1f} ms  matcher {matcher_update * 1e6:7.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Benchmark and check: LLM extraction client against a local stand-in server.
+
+  legacy  the previous client: requests.post() per call (new connection),
+          time.sleep() backoff, a ThreadPoolExecutor per document.
+  async   LLMNormalizer on AsyncLLMTransport: shared keep-alive pool,
+          bounded concurrency, deadlines, circuit breaker.
+
+Both extract from the same documents with --jobs threads calling at once
+(as concurrent synthesis jobs do) against benchmarks/fake_llm_server.py.
+Only corpus texts that pass the candidate pre-check are used, so every
+document is sent by both clients (see bench_llm_extraction for the calls
+the pre-check and the extraction cache avoid), and coalescing is off
+(see bench_llm_coalescing).
+
+The script checks that both return the same acronyms and pairs, reports
+throughput and the TCP connections the server accepted, then stops
+answering (every request fails) and measures how long a document takes
+once the circuit breaker has opened. It exits with status 1 if the
+results differ or the breaker does not open.
+
+Usage (from the repo root):
+    python -m benchmarks.bench_llm_client
+    python -m benchmarks.bench_llm_client --docs 400 --jobs 16 --latency 0.1
+"""
+
+import argparse
+import concurrent.futures
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+import requests
+
+from app.normalizer.llm_client import EXTRACTION_RESPONSE_FORMAT, EXTRACTION_SYSTEM_PROMPT, LLMNormalizer
+from app.normalizer.llm_transport import CircuitBreaker
+from app.normalizer.special_token_detector import has_llm_candidates
+from benchmarks.fake_llm_server import start_server
+
+DEFAULT_CORPUS = Path(__file__).parent / "data" / "normalization_corpus.txt"
+
+
+def legacy_extract(url: str, text: str, max_retries: int = 2, timeout: float = 10) -> dict:
+    """extract_acronyms_and_pairs() before the async transport (single chunk), kept for comparison."""
+    payload = {
+        "model": "llm-model",
+        "messages": [
+            {"role": "system", "content": EXTRACTION_SYSTEM_PROMPT},
+            {"role": "user", "content": text},
+        ],
+        "max_tokens": 4096,
+        "temperature": 0.0,
+        "response_format": EXTRACTION_RESPONSE_FORMAT,
+    }
+
+    def call():
+        last_error = None
+        for attempt in range(max_retries + 1):
+            try:
+                resp = requests.post(url, json=payload, timeout=timeout)
+                resp.raise_for_status()
+                return resp.json()["choices"][0]["message"]["content"]
+            except Exception as e:
+                last_error = e
+                if attempt < max_retries:
+                    time.sleep(0.5 * (2 ** attempt))
+        raise last_error
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        try:
+            return json.loads(executor.submit(call).result())
+        except Exception:
+            return {"acronyms": [], "foreign_vietnamese_pairs": []}
+
+
+def canonical(result: dict) -> tuple:
+    pairs = {(p["foreign_word"], p["vietnamese_spelling"]) for p in result.get("foreign_vietnamese_pairs", [])}
+    return tuple(sorted(result.get("acronyms", []))), tuple(sorted(pairs))
+
+
+def run_jobs(fn, docs, jobs) -> tuple:
+    t0 = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as pool:
+        results = list(pool.map(fn, docs))
+    return time.perf_counter() - t0, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default=str(DEFAULT_CORPUS), help="one input text per line")
+    parser.add_argument("--docs", type=int, default=200, help="documents to extract from")
+    parser.add_argument("--jobs", type=int, default=8, help="concurrent callers")
+    parser.add_argument("--latency", type=float, default=0.05, help="server seconds per response")
+    parser.add_argument("--concurrency", type=int, default=8, help="LLM_MAX_CONCURRENCY of the async client")
+    args = parser.parse_args()
+
+    logging.getLogger("app.normalizer").setLevel(logging.ERROR)
+    with open(args.corpus, encoding="utf-8") as f:
+        corpus = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    corpus = [text for text in corpus if has_llm_candidates(text)]
+    docs = [corpus[i % len(corpus)] for i in range(args.docs)]
+    failures = 0
+
+    server, url = start_server(latency=args.latency)
+    legacy_time, legacy_out = run_jobs(lambda d: legacy_extract(url, d), docs, args.jobs)
+    legacy_conns = server.connections
+    server.connections = 0
+
+    client = LLMNormalizer(api_url=url, max_concurrency=args.concurrency, batch_wait_ms=0,
+                           breaker=CircuitBreaker(failure_threshold=5, reset_timeout=30))
+    async_time, async_out = run_jobs(client.extract_acronyms_and_pairs, docs, args.jobs)
+    async_conns = server.connections
+
+    mismatches = sum(canonical(a) != canonical(b) for a, b in zip(legacy_out, async_out))
+    failures += mismatches
+    print(f"{len(docs)} documents, {args.jobs} concurrent callers, {args.latency * 1000:.0f} ms server latency")
+    print(f"legacy  {len(docs) / legacy_time:7.1f} docs/s  {legacy_conns:5d} connections")
+    print(f"async   {len(docs) / async_time:7.1f} docs/s  {async_conns:5d} connections  "
+          f"(max {args.concurrency} in flight), result mismatches: {mismatches}")
+
+    # Endpoint goes bad: every request fails
+    server.fail_rate = 1.0
+    t0 = time.perf_counter()
+    legacy_extract(url, docs[0])
+    legacy_fail = time.perf_counter() - t0
+    for doc in docs[:5]:
+        client.extract_acronyms_and_pairs(doc)  # trips the breaker
+    t0 = time.perf_counter()
+    result = client.extract_acronyms_and_pairs(docs[0])
+    async_fail = time.perf_counter() - t0
+    breaker = client.transport.breaker.stats()
+    print(f"failing endpoint: legacy {legacy_fail * 1000:7.1f} ms/doc, async with open circuit "
+          f"{async_fail * 1000:7.1f} ms/doc, breaker {breaker}")
+    if breaker["state"] != "open" or not result.get("failed_chunks"):
+        print("FAIL  circuit breaker did not open / skipped document not reported as failed")
+        failures += 1
+
+    server.shutdown()
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
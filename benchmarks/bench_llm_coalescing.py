@@ -0,0 +1,107 @@
+"""
+Benchmark and check: coalescing extraction chunks of concurrent jobs.
+
+  single     LLM_BATCH_WAIT_MS=0: every chunk is its own request.
+  coalesced  chunks arriving within --wait-ms of each other share one
+             batched request (ExtractionCoalescer).
+  fallback   coalesced, but the server answers batched requests with
+             broken JSON, so every item is asked again on its own.
+
+--jobs threads each extract one short document at the same moment (a
+burst of notification-sized jobs), --bursts times, against
+benchmarks/fake_llm_server.py. For each mode it reports the requests the
+server received, items per request and the per-document latency; all
+modes must return the same acronyms and pairs as single (exit status 1
+otherwise). Only corpus texts that pass the candidate pre-check are used.
+
+Usage (from the repo root):
+    python -m benchmarks.bench_llm_coalescing
+    python -m benchmarks.bench_llm_coalescing --jobs 32 --bursts 20 --latency 0.2
+"""
+
+import argparse
+import logging
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+from app.normalizer.llm_client import LLMNormalizer
+from app.normalizer.special_token_detector import has_llm_candidates
+from benchmarks.bench_llm_client import canonical
+from benchmarks.fake_llm_server import start_server
+
+DEFAULT_CORPUS = Path(__file__).parent / "data" / "normalization_corpus.txt"
+
+
+def run_bursts(client, docs, jobs, bursts) -> tuple:
+    results, latencies = [None] * len(docs), []
+    lock = threading.Lock()
+
+    def job(i, barrier):
+        barrier.wait()
+        t0 = time.perf_counter()
+        results[i] = client.extract_acronyms_and_pairs(docs[i])
+        with lock:
+            latencies.append(time.perf_counter() - t0)
+
+    for b in range(bursts):
+        barrier = threading.Barrier(jobs)
+        threads = [threading.Thread(target=job, args=(b * jobs + j, barrier)) for j in range(jobs)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    return results, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default=str(DEFAULT_CORPUS), help="one input text per line")
+    parser.add_argument("--jobs", type=int, default=16, help="jobs per burst")
+    parser.add_argument("--bursts", type=int, default=10, help="bursts to run")
+    parser.add_argument("--latency", type=float, default=0.1, help="server seconds per response")
+    parser.add_argument("--wait-ms", type=float, default=5, help="LLM_BATCH_WAIT_MS when coalescing")
+    parser.add_argument("--max-items", type=int, default=16, help="LLM_BATCH_MAX_ITEMS when coalescing")
+    args = parser.parse_args()
+
+    logging.getLogger("app.normalizer").setLevel(logging.ERROR)
+    with open(args.corpus, encoding="utf-8") as f:
+        corpus = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    corpus = [text for text in corpus if has_llm_candidates(text)]
+    docs = [corpus[i % len(corpus)] for i in range(args.jobs * args.bursts)]
+    server, url = start_server(latency=args.latency)
+    print(f"{args.bursts} bursts x {args.jobs} jobs, {args.latency * 1000:.0f} ms server latency")
+
+    modes = [
+        ("single", dict(batch_wait_ms=0), False),
+        ("coalesced", dict(batch_wait_ms=args.wait_ms, batch_max_items=args.max_items), False),
+        ("fallback", dict(batch_wait_ms=args.wait_ms, batch_max_items=args.max_items), True),
+    ]
+    failures, reference = 0, None
+    for name, kwargs, bad_batch in modes:
+        server.bad_batch = bad_batch
+        sent = server.requests
+        client = LLMNormalizer(api_url=url, max_concurrency=args.jobs, **kwargs)
+        results, latencies = run_bursts(client, docs, args.jobs, args.bursts)
+        sent = server.requests - sent
+        latencies.sort()
+        print(f"{name:9s} {sent:5d} requests  {len(docs) / sent:5.1f} docs/request  "
+              f"latency p50 {statistics.median(latencies) * 1000:7.1f} ms  "
+              f"p95 {latencies[int(0.95 * (len(latencies) - 1))] * 1000:7.1f} ms  "
+              f"fallbacks {client.coalescer.fallbacks}")
+        if reference is None:
+            reference = [canonical(r) for r in results]
+            continue
+        mismatches = sum(canonical(r) != ref for r, ref in zip(results, reference))
+        if mismatches:
+            print(f"FAIL  {name}: {mismatches} documents differ from single requests")
+            failures += 1
+
+    server.shutdown()
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
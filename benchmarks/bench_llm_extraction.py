@@ -0,0 +1,102 @@
+"""
+Benchmark and check: LLM extraction calls avoided by the candidate pre-check
+and the on-disk extraction cache.
+
+The corpus texts go through the rule-based part of the pipeline (the text
+the LLM stage would see), then through extract_acronyms_and_pairs()
+against benchmarks/fake_llm_server.py, --passes times over the same
+ExtractionCache (a temporary SQLite file):
+
+  pass 1  cold cache: texts without candidate tokens are not sent.
+  pass 2+ warm cache: nothing should be sent at all.
+
+For each pass it reports the requests the server received, the calls
+avoided per reason and the time. The script exits with status 1 if a warm
+pass sends requests or returns results different from the cold pass, or
+if a cache with a zero TTL serves anything.
+
+Usage (from the repo root):
+    python -m benchmarks.bench_llm_extraction
+    python -m benchmarks.bench_llm_extraction --latency 0.2 --passes 3
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("USE_LLM_NORMALIZER", "false")  # the pipeline itself must not call the LLM
+
+from app.normalizer.extraction_cache import ExtractionCache  # noqa: E402
+from app.normalizer.llm_client import LLMNormalizer  # noqa: E402
+from app.normalizer.pipeline import NormalizationPipeline  # noqa: E402
+from app.normalizer.processing import mapping_eng, normalize, post_processing  # noqa: E402
+from benchmarks.fake_llm_server import start_server  # noqa: E402
+
+DEFAULT_CORPUS = Path(__file__).parent / "data" / "normalization_corpus.txt"
+
+
+def llm_inputs(corpus, pipeline) -> list:
+    texts = []
+    for text in corpus:
+        text = post_processing(normalize(text, pipeline.normalizer))
+        texts.append(mapping_eng(text, pipeline.english_dict, pipeline.english_matcher))
+    return texts
+
+
+def run_pass(client, server, texts) -> tuple:
+    sent, avoided = server.requests, dict(client.calls_avoided)
+    t0 = time.perf_counter()
+    results = [client.extract_acronyms_and_pairs(t) for t in texts]
+    elapsed = time.perf_counter() - t0
+    avoided = {k: v - avoided[k] for k, v in client.calls_avoided.items()}
+    return results, server.requests - sent, avoided, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default=str(DEFAULT_CORPUS), help="one input text per line")
+    parser.add_argument("--latency", type=float, default=0.05, help="server seconds per response")
+    parser.add_argument("--passes", type=int, default=2, help="passes over the corpus")
+    args = parser.parse_args()
+
+    logging.getLogger("app.normalizer").setLevel(logging.WARNING)
+    logging.getLogger().setLevel(logging.WARNING)
+    with open(args.corpus, encoding="utf-8") as f:
+        corpus = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    texts = llm_inputs(corpus, NormalizationPipeline())
+    server, url = start_server(latency=args.latency)
+    failures = 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ExtractionCache(os.path.join(tmp, "llm_cache.db"), ttl_seconds=3600, max_entries=10000)
+        client = LLMNormalizer(api_url=url, extraction_cache=cache)
+        print(f"{len(texts)} texts, {args.latency * 1000:.0f} ms server latency")
+        first = None
+        for n in range(1, args.passes + 1):
+            results, sent, avoided, elapsed = run_pass(client, server, texts)
+            print(f"pass {n}: {sent:4d} requests sent, avoided {avoided}, {elapsed:6.2f} s")
+            if first is None:
+                first = results
+                continue
+            if sent or results != first:
+                print(f"FAIL  warm pass {n} sent {sent} requests / returned different results")
+                failures += 1
+
+        expired = LLMNormalizer(api_url=url, extraction_cache=ExtractionCache(
+            os.path.join(tmp, "llm_cache.db"), ttl_seconds=0, max_entries=10000))
+        _, sent, avoided, _ = run_pass(expired, server, texts)
+        print(f"ttl 0 : {sent:4d} requests sent, avoided {avoided}")
+        if avoided["cache"]:
+            print("FAIL  expired entries were served")
+            failures += 1
+
+    server.shutdown()
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
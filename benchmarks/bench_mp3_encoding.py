@@ -0,0 +1,97 @@
+"""
+Benchmark: MP3 finalization of a job, subprocess vs in-process encoder.
+
+  legacy   torchaudio.save(wav) -> `ffmpeg -i x.wav x.mp3` -> os.remove(wav),
+           all on the calling (inference) thread, as _execute_sync used to.
+  encoder  app.encoder.AudioEncoder.submit(); the calling thread only pays
+           for the hand-off, encoding runs on the pool.
+
+For each mode it reports how long the inference thread is blocked per job
+and the wall time until all files are written.
+
+Usage (from the repo root):
+    python -m benchmarks.bench_mp3_encoding --seconds 30 --jobs 20 --workers 2
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import tempfile
+import time
+
+import torch
+import torchaudio
+
+from app.encoder import AudioEncoder
+
+
+def synth_audio(seconds: float, sampling_rate: int) -> torch.Tensor:
+    """Speech-like test signal: a few harmonics under a syllable-rate envelope plus noise."""
+    torch.manual_seed(0)
+    t = torch.arange(int(seconds * sampling_rate)) / sampling_rate
+    f0 = 140 + 30 * torch.sin(2 * torch.pi * 0.7 * t)
+    phase = 2 * torch.pi * torch.cumsum(f0, 0) / sampling_rate
+    voiced = sum(torch.sin(k * phase) / k for k in range(1, 6))
+    envelope = (torch.sin(2 * torch.pi * 4 * t).clamp(min=0)) ** 0.5
+    wav = 0.2 * voiced * envelope + 0.01 * torch.randn_like(t)
+    return wav.clamp(-1, 1)[None]
+
+
+def run_legacy(wav, sampling_rate, out_dir, jobs):
+    blocked = []
+    start = time.perf_counter()
+    for i in range(jobs):
+        t0 = time.perf_counter()
+        wav_path = os.path.join(out_dir, f"legacy_{i}.wav")
+        mp3_path = wav_path.replace(".wav", ".mp3")
+        torchaudio.save(wav_path, wav, sample_rate=sampling_rate)
+        cmd = ["ffmpeg", "-y", "-i", wav_path, "-c:a", "libmp3lame", "-b:a", "64k", mp3_path]
+        subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        os.remove(wav_path)
+        blocked.append(time.perf_counter() - t0)
+    return blocked, time.perf_counter() - start
+
+
+def run_encoder(wav, sampling_rate, out_dir, jobs, workers):
+    encoder = AudioEncoder(max_workers=workers)
+    # Warm up so one-off library loading is not counted against the first job
+    encoder.submit(wav[:, :sampling_rate], sampling_rate, os.path.join(out_dir, "warmup.mp3")).result()
+
+    blocked, futures = [], []
+    start = time.perf_counter()
+    for i in range(jobs):
+        t0 = time.perf_counter()
+        futures.append(encoder.submit(wav, sampling_rate, os.path.join(out_dir, f"enc_{i}.mp3")))
+        blocked.append(time.perf_counter() - t0)
+    for f in futures:
+        f.result()
+    wall = time.perf_counter() - start
+    encoder.close()
+    return blocked, wall
+
+
+def report(name, blocked, wall, jobs, seconds):
+    print(f"{name:8s} blocked/job: mean {statistics.mean(blocked) * 1000:8.1f} ms  "
+          f"p95 {sorted(blocked)[int(0.95 * (len(blocked) - 1))] * 1000:8.1f} ms  |  "
+          f"wall {wall:6.2f} s  ({jobs * seconds / wall:6.1f} audio-s/s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=30.0, help="audio length per job")
+    parser.add_argument("--jobs", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=2, help="AudioEncoder pool size")
+    parser.add_argument("--sampling-rate", type=int, default=24000)
+    args = parser.parse_args()
+
+    wav = synth_audio(args.seconds, args.sampling_rate)
+    with tempfile.TemporaryDirectory() as out_dir:
+        blocked, wall = run_legacy(wav, args.sampling_rate, out_dir, args.jobs)
+        report("legacy", blocked, wall, args.jobs, args.seconds)
+        blocked, wall = run_encoder(wav, args.sampling_rate, out_dir, args.jobs, args.workers)
+        report("encoder", blocked, wall, args.jobs, args.seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Benchmark: normalize_vietnamese_text, per-call loading vs a shared pipeline.
+
+  legacy    a fresh NormalizationPipeline per call: reread both word lists,
+            rebuild the mapping_eng index, new TextNormalizer, as
+            normalize_vietnamese_text used to do on every request.
+  pipeline  one NormalizationPipeline built up front and reused.
+
+It also reports the startup cost of building the pipeline from the word
+lists vs loading a pickled artifact, and checks that both modes produce
+identical output. The LLM step is disabled (USE_LLM_NORMALIZER=false) so
+only local work is measured.
+
+Usage (from the repo root):
+    python -m benchmarks.bench_normalization --repeat 5
+    python -m benchmarks.bench_normalization --english-dict /path/to/english_word_3_v3.txt
+    python -m benchmarks.bench_normalization --synthetic-dict 20000
+
+The english_word_3_v3.txt in the repository may be empty; --synthetic-dict N
+generates an N-entry list of made-up words to stand in for the real one.
+"""
+
+import argparse
+import logging
+import os
+import random
+import statistics
+import string
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("USE_LLM_NORMALIZER", "false")
+
+from app.normalizer.pipeline import NormalizationPipeline  # noqa: E402
+
+DEFAULT_CORPUS = Path(__file__).parent / "data" / "normalization_corpus.txt"
+
+
+def load_corpus(path) -> list:
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+
+def write_synthetic_dict(path, n):
+    rng = random.Random(0)
+    words = set()
+    while len(words) < n:
+        words.add("".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 12))))
+    with open(path, "w", encoding="utf-8") as f:
+        for word in sorted(words):
+            f.write(f"{word}|{word[:4]} {word[4:]}\n")
+
+
+def run_legacy(corpus, repeat, kwargs):
+    times, outputs = [], []
+    for _ in range(repeat):
+        for text in corpus:
+            t0 = time.perf_counter()
+            outputs.append(NormalizationPipeline(**kwargs).normalize(text))
+            times.append(time.perf_counter() - t0)
+    return times, outputs
+
+
+def run_pipeline(corpus, repeat, pipeline):
+    times, outputs = [], []
+    for _ in range(repeat):
+        for text in corpus:
+            t0 = time.perf_counter()
+            outputs.append(pipeline.normalize(text))
+            times.append(time.perf_counter() - t0)
+    return times, outputs
+
+
+def report(name, times):
+    print(f"{name:8s} per text: mean {statistics.mean(times) * 1000:8.2f} ms  "
+          f"p50 {statistics.median(times) * 1000:8.2f} ms  "
+          f"p95 {sorted(times)[int(0.95 * (len(times) - 1))] * 1000:8.2f} ms  |  "
+          f"total {sum(times):6.2f} s  ({len(times) / sum(times):7.1f} texts/s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default=str(DEFAULT_CORPUS), help="one input text per line")
+    parser.add_argument("--repeat", type=int, default=3, help="passes over the corpus")
+    parser.add_argument("--english-dict", default=None, help="word|pronunciation list for mapping_eng")
+    parser.add_argument("--spell-out", default=None, help="spell-out abbreviation list")
+    parser.add_argument("--synthetic-dict", type=int, default=0, help="use N generated English entries")
+    args = parser.parse_args()
+
+    # Per-call INFO logging would dominate the timings
+    logging.getLogger("app.normalizer").setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.synthetic_dict:
+            args.english_dict = os.path.join(tmp, "english_synthetic.txt")
+            write_synthetic_dict(args.english_dict, args.synthetic_dict)
+        run(args, tmp)
+
+
+def run(args, tmp):
+    corpus = load_corpus(args.corpus)
+    kwargs = dict(english_dict_path=args.english_dict, spell_out_path=args.spell_out)
+
+    t0 = time.perf_counter()
+    pipeline = NormalizationPipeline(**kwargs)
+    build = time.perf_counter() - t0
+    artifact = os.path.join(tmp, "normalizer.pkl")
+    pipeline.save(artifact)
+    t0 = time.perf_counter()
+    NormalizationPipeline.load(artifact)
+    load = time.perf_counter() - t0
+    print(f"startup: build {build * 1000:.1f} ms, load artifact {load * 1000:.1f} ms "
+          f"({len(pipeline.english_dict)} English entries, {len(pipeline.spell_out_set)} spell-out words)")
+    print(f"corpus: {len(corpus)} texts x {args.repeat}")
+
+    pipeline.normalize(corpus[0])  # warm up lazily imported modules
+    legacy_times, legacy_out = run_legacy(corpus, args.repeat, kwargs)
+    report("legacy", legacy_times)
+    pipeline_times, pipeline_out = run_pipeline(corpus, args.repeat, pipeline)
+    report("pipeline", pipeline_times)
+
+    mismatches = sum(a != b for a, b in zip(legacy_out, pipeline_out))
+    print(f"speedup: {sum(legacy_times) / sum(pipeline_times):.2f}x, output mismatches: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
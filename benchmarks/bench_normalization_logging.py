@@ -0,0 +1,139 @@
+"""
+Benchmark and check: logging overhead of normalize_vietnamese_text().
+
+  off      logging disabled, the floor.
+  legacy   logging before trace.py: a synchronous FileHandler on the root
+           logger and the full text logged after every stage.
+  queued   QueueHandler + QueueListener, full untruncated text after every
+           stage (NORMALIZE_TRACE_SAMPLE=1, NORMALIZE_TRACE_MAX_CHARS=0).
+  default  QueueHandler, one summary line per call, full-text traces for
+           --sample of the calls, cut to --max-chars.
+
+Each mode normalizes the same documents (--sentences corpus texts each,
+rule-based stages only) with --jobs threads and reports the time per
+document, the time the callers spent inside logging handlers (formatting
+and writing, or enqueueing), and the bytes written to the log file.
+It exits with status 1 if the default mode leaves a call without its
+summary line (with the per-stage timings) in the log.
+
+Usage (from the repo root):
+    python -m benchmarks.bench_normalization_logging
+    python -m benchmarks.bench_normalization_logging --docs 100 --sentences 300 --jobs 8
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+from queue import SimpleQueue
+
+os.environ["USE_LLM_NORMALIZER"] = "false"
+
+from app.normalizer import trace  # noqa: E402
+from app.normalizer.pipeline import NormalizationPipeline  # noqa: E402
+from app.normalizer.processing import normalize_vietnamese_text  # noqa: E402
+
+DEFAULT_CORPUS = Path(__file__).parent / "data" / "normalization_corpus.txt"
+
+
+def make_docs(path, docs, sentences, seed=0) -> list:
+    with open(path, encoding="utf-8") as f:
+        corpus = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(corpus) for _ in range(sentences)) for _ in range(docs)]
+
+
+class TimedHandler(logging.Handler):
+    """Forwards to handler and adds up the time callers spend in it."""
+
+    def __init__(self, handler: logging.Handler):
+        super().__init__()
+        self.handler = handler
+        self.seconds = 0.0
+
+    def handle(self, record) -> bool:
+        start = time.perf_counter()
+        try:
+            return self.handler.handle(record)
+        finally:
+            with self.lock:
+                self.seconds += time.perf_counter() - start
+
+    def close(self):
+        self.handler.close()
+        super().close()
+
+
+def configure(mode: str, log_path: str, sample: float, max_chars: int):
+    """Point the root logger at log_path the way mode logs; returns (root handler, listener to stop or None)."""
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+    logging.disable(logging.CRITICAL if mode == "off" else logging.NOTSET)
+    handler = logging.FileHandler(log_path, encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
+    trace.NORMALIZE_TRACE_SAMPLE, trace.NORMALIZE_TRACE_MAX_CHARS = (sample, max_chars) if mode == "default" else (1.0, 0)
+    if mode in ("off", "legacy"):
+        root.addHandler(TimedHandler(handler))
+        return root.handlers[0], None
+    records = SimpleQueue()
+    listener = QueueListener(records, handler)
+    listener.start()
+    root.addHandler(TimedHandler(QueueHandler(records)))
+    return root.handlers[0], listener
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default=str(DEFAULT_CORPUS), help="one input text per line")
+    parser.add_argument("--docs", type=int, default=40, help="documents per mode")
+    parser.add_argument("--sentences", type=int, default=100, help="corpus texts per document")
+    parser.add_argument("--jobs", type=int, default=4, help="concurrent callers")
+    parser.add_argument("--sample", type=float, default=0.01, help="NORMALIZE_TRACE_SAMPLE of the default mode")
+    parser.add_argument("--max-chars", type=int, default=500, help="NORMALIZE_TRACE_MAX_CHARS of the default mode")
+    args = parser.parse_args()
+
+    trace.stop_logging()
+    logging.getLogger().setLevel(logging.INFO)
+    pipeline = NormalizationPipeline()
+    docs = make_docs(args.corpus, args.docs, args.sentences)
+    failures = 0
+    print(f"{args.docs} documents x {args.sentences} sentences, {args.jobs} concurrent callers")
+
+    with tempfile.TemporaryDirectory() as tmp, ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        logging.disable(logging.CRITICAL)
+        list(pool.map(lambda doc: normalize_vietnamese_text(doc, pipeline), docs[:args.jobs]))  # warm up
+        for mode in ("off", "legacy", "queued", "default"):
+            log_path = os.path.join(tmp, f"{mode}.log")
+            timed, listener = configure(mode, log_path, args.sample, args.max_chars)
+            t0 = time.perf_counter()
+            list(pool.map(lambda doc: normalize_vietnamese_text(doc, pipeline), docs))
+            elapsed = (time.perf_counter() - t0) / len(docs)
+            if listener is not None:
+                listener.stop()
+            timed.close()
+            size = os.path.getsize(log_path)
+            print(f"{mode:8s} {elapsed * 1000:8.1f} ms/doc  in handlers {timed.seconds / len(docs) * 1000:7.3f} ms/doc  "
+                  f"log {size / len(docs) / 1024:8.1f} KiB/doc")
+            if mode == "default":
+                with open(log_path, encoding="utf-8") as f:
+                    summaries = [line for line in f if "[Normalize]" in line and "rule_based_ms=" in line]
+                if len(summaries) != len(docs):
+                    print(f"FAIL  {len(summaries)} summary lines for {len(docs)} calls")
+                    failures += 1
+                else:
+                    print(f"         e.g. {summaries[0].split(' - ', 2)[2].strip()}")
+
+    logging.disable(logging.NOTSET)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
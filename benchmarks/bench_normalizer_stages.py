@@ -0,0 +1,216 @@
+"""
+Benchmark: per-stage profile of the local normalization stages.
+
+Every TextNormalizer method that normalize() calls is timed on its own
+(the list is read from normalize()'s source, so it follows the code), and
+so are normalize() as a whole, post_processing, mapping_eng,
+DictionaryCache.apply_to_text and process_spell_out_markers, over the
+corpus texts (dates, times, phones, units, plates, abbreviations, URLs,
+mixed English). Calls a stage makes to another timed stage count towards
+the outer one only.
+
+For each stage it reports the calls per text, the characters it was given
+per second and the p50 / p99 time of a call, stages sorted by their share
+of the time. The English word list in the repository may be empty;
+--synthetic-dict N fills both it and the learned dictionary with N made-up
+words (plus the English words of the corpus) so mapping_eng and
+apply_to_text do real work. The script checks that the instrumented
+stages produce the same text as _rule_based_stages() (exit status 1
+otherwise).
+
+Baselines: --save writes the profile to --baseline. Without --save, a run
+with an existing --baseline compares each stage's best time per pass to
+it and exits with status 1 if one got slower by more than --threshold
+(and by more than --min-ms, which keeps microsecond stages from tripping
+on noise). Timings depend on the machine, so baselines are not checked in.
+
+Usage (from the repo root):
+    python -m benchmarks.bench_normalizer_stages --save
+    python -m benchmarks.bench_normalizer_stages --threshold 0.2
+    python -m benchmarks.bench_normalizer_stages --repeat 10 --synthetic-dict 50000
+"""
+
+import argparse
+import inspect
+import json
+import logging
+import os
+import platform
+import re
+import sys
+import tempfile
+import threading
+import time
+from functools import wraps
+from pathlib import Path
+
+os.environ["USE_LLM_NORMALIZER"] = "false"
+
+from app.normalizer.dictionary_cache import DictionaryCache  # noqa: E402
+from app.normalizer.normalizer import TextNormalizer  # noqa: E402
+from app.normalizer.pipeline import NormalizationPipeline  # noqa: E402
+from app.normalizer.processing import (  # noqa: E402
+    _rule_based_stages, mapping_eng, normalize, post_processing, process_spell_out_markers,
+)
+from benchmarks.bench_normalization import load_corpus, write_synthetic_dict  # noqa: E402
+
+DEFAULT_CORPUS = Path(__file__).parent / "data" / "normalization_corpus.txt"
+DEFAULT_BASELINE = Path(__file__).parent / "data" / "normalizer_stages_baseline.json"
+
+
+class StageTimer:
+    """Per-stage call times and input sizes; nested timed calls count towards the outermost."""
+
+    def __init__(self):
+        self.calls = {}  # stage -> [(seconds, input chars)]
+        self._local = threading.local()
+
+    def wrap(self, name, fn):
+        @wraps(fn)
+        def timed(text, *args, **kwargs):
+            if getattr(self._local, "busy", False):
+                return fn(text, *args, **kwargs)
+            self._local.busy = True
+            start = time.perf_counter()
+            try:
+                return fn(text, *args, **kwargs)
+            finally:
+                self.calls.setdefault(name, []).append((time.perf_counter() - start, len(text)))
+                self._local.busy = False
+        return timed
+
+    def time(self, name, fn, text, *args):
+        start = time.perf_counter()
+        result = fn(text, *args)
+        self.calls.setdefault(name, []).append((time.perf_counter() - start, len(text)))
+        return result
+
+
+def normalizer_stages() -> list:
+    """TextNormalizer methods normalize() calls, in order."""
+    code = [line for line in inspect.getsource(normalize).splitlines() if not line.lstrip().startswith("#")]
+    return list(dict.fromkeys(re.findall(r"normalizer\.(\w+)\(", "\n".join(code))))
+
+
+def instrument(normalizer, timer: StageTimer):
+    for name in normalizer_stages():
+        setattr(normalizer, name, timer.wrap(name, getattr(normalizer, name)))
+
+
+def run_pass(corpus, pipeline, dict_cache, timer) -> list:
+    outputs = []
+    for text in corpus:
+        text = timer.time("normalize", normalize, text, pipeline.normalizer)
+        text = timer.time("post_processing", post_processing, text)
+        text = timer.time("mapping_eng", mapping_eng, text, pipeline.english_dict, pipeline.english_matcher)
+        text = timer.time("dict_cache.apply_to_text", dict_cache.apply_to_text, text)
+        outputs.append(text)
+        timer.time("process_spell_out_markers", process_spell_out_markers, text, pipeline.spell_out_set)
+    return outputs
+
+
+def percentile(values, q) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def profile(passes: list, texts: int) -> dict:
+    """Stage -> summary over all passes; best_ms is the fastest pass's total."""
+    result = {}
+    for name in passes[0]:
+        calls = [call for timer_calls in passes for call in timer_calls[name]]
+        seconds = [s for s, _ in calls]
+        result[name] = {
+            "calls_per_text": round(len(calls) / len(passes) / texts, 2),
+            "chars_per_sec": round(sum(c for _, c in calls) / max(sum(seconds), 1e-9)),
+            "p50_us": round(percentile(seconds, 0.50) * 1e6, 1),
+            "p99_us": round(percentile(seconds, 0.99) * 1e6, 1),
+            "best_ms": round(min(sum(s for s, _ in timer_calls[name]) for timer_calls in passes) * 1000, 3),
+        }
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default=str(DEFAULT_CORPUS), help="one input text per line")
+    parser.add_argument("--repeat", type=int, default=5, help="passes over the corpus")
+    parser.add_argument("--synthetic-dict", type=int, default=20000, help="made-up English words, 0 = repository lists")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="JSON profile to save / compare against")
+    parser.add_argument("--save", action="store_true", help="write this run to --baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown per stage (0.25 = 25%%)")
+    parser.add_argument("--min-ms", type=float, default=0.5, help="ignore slowdowns smaller than this per pass")
+    args = parser.parse_args()
+
+    logging.getLogger("app.normalizer").setLevel(logging.WARNING)
+    logging.getLogger().setLevel(logging.WARNING)
+    corpus = load_corpus(args.corpus)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        english_dict, dict_cache = None, DictionaryCache(os.path.join(tmp, "learned_dict.json"), compact_every=0)
+        if args.synthetic_dict:
+            english_dict = os.path.join(tmp, "english_synthetic.txt")
+            write_synthetic_dict(english_dict, args.synthetic_dict)
+            words = sorted({w for text in corpus for w in re.findall(r"\b[A-Za-z]{3,}\b", text)})
+            with open(english_dict, encoding="utf-8") as f:
+                pairs = [line.rstrip("\n").split("|") for line in f]
+            with open(english_dict, "a", encoding="utf-8") as f:
+                f.writelines(f"{w.lower()}|{w.lower()} ơ\n" for w in words)
+            dict_cache.update_pairs([{"foreign_word": eng, "vietnamese_spelling": vie}
+                                     for eng, vie in pairs + [(w, f"{w.lower()} ơ") for w in words]])
+        pipeline = NormalizationPipeline(english_dict_path=english_dict)
+        expected = [_rule_based_stages(text, pipeline, dict_cache) for text in corpus]  # also warms up
+
+        stages = normalizer_stages()
+        passes, failures = [], 0
+        for _ in range(args.repeat):
+            timer = StageTimer()
+            pipeline.normalizer = TextNormalizer()
+            instrument(pipeline.normalizer, timer)
+            outputs = run_pass(corpus, pipeline, dict_cache, timer)
+            passes.append(timer.calls)
+        if outputs != expected:
+            print(f"FAIL  instrumented stages differ from _rule_based_stages() in "
+                  f"{sum(a != b for a, b in zip(outputs, expected))} texts")
+            failures += 1
+
+    result = profile(passes, len(corpus))
+    total = result["normalize"]["best_ms"] or 1e-9
+    print(f"{len(corpus)} texts x {args.repeat} passes, {len(pipeline.english_dict)} English entries, "
+          f"{dict_cache.size} learned pairs")
+    print(f"{'stage':32s} {'calls/text':>10s} {'chars/s':>12s} {'p50 us':>9s} {'p99 us':>9s} "
+          f"{'best ms':>9s} {'of normalize':>12s}")
+    order = sorted(result, key=lambda name: (name not in stages, -result[name]["best_ms"]))
+    for name in order:
+        s = result[name]
+        share = f"{s['best_ms'] / total * 100:11.1f}%" if name in stages else ""
+        print(f"{name:32s} {s['calls_per_text']:10.2f} {s['chars_per_sec']:12,d} {s['p50_us']:9.1f} "
+              f"{s['p99_us']:9.1f} {s['best_ms']:9.3f} {share:>12s}")
+
+    baseline = Path(args.baseline)
+    if args.save:
+        baseline.write_text(json.dumps({
+            "machine": platform.node(), "python": platform.python_version(),
+            "texts": len(corpus), "synthetic_dict": args.synthetic_dict, "stages": result,
+        }, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        print(f"baseline written to {baseline}")
+    elif baseline.exists():
+        saved = json.loads(baseline.read_text(encoding="utf-8"))
+        if (saved.get("texts"), saved.get("synthetic_dict")) != (len(corpus), args.synthetic_dict):
+            print(f"baseline {baseline} was taken on another corpus / dictionary, not comparing")
+        else:
+            for name, s in result.items():
+                before = saved["stages"].get(name)
+                if before is None:
+                    continue
+                slower = s["best_ms"] - before["best_ms"]
+                if slower > args.min_ms and s["best_ms"] > before["best_ms"] * (1 + args.threshold):
+                    print(f"REGRESSION  {name}: {before['best_ms']:.3f} -> {s['best_ms']:.3f} ms per pass "
+                          f"(+{slower / before['best_ms'] * 100:.0f}%)")
+                    failures += 1
+            print(f"compared with {baseline} ({saved.get('machine')}): {failures} regressions")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
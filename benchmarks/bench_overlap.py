@@ -0,0 +1,146 @@
+"""
+Benchmark and check: normalization overlapped with synthesis.
+
+  sequential  the whole document is normalized, then synthesized
+              (_execute_sync before OVERLAP_NORMALIZATION).
+  overlapped  the document is split into sentences that are normalized on
+              a thread pool (NormalizedStream); each block of finished
+              sentences is synthesized as soon as it is handed out.
+
+Synthesis is a stand-in that sleeps like the accelerator would (releasing
+the GIL): --block-overhead per call plus the text length over
+--synth-cps. Normalization is real, with the LLM stage against
+benchmarks/fake_llm_server.py (--latency per round trip plus
+--latency-per-char of text, as an LLM's answer grows with it). The sentence
+cache, the LLM extraction cache and the learned dictionary are kept out
+of the way so that both modes do the same normalization work.
+
+It reports the time per document, how long synthesis waited for
+normalized text and the blocks per document. It exits with status 1 if a
+document comes out with a different normalized text in the two modes, a
+stream hands out sentences out of order or a stopped stream leaves its
+queued sentences running.
+
+Usage (from the repo root):
+    python -m benchmarks.bench_overlap
+    python -m benchmarks.bench_overlap --docs 20 --sentences 30 --latency 0.3 --synth-cps 200
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from benchmarks.fake_llm_server import start_server
+
+_server, _url = start_server()
+os.environ["LLM_API_URL"] = _url
+os.environ["USE_LLM_NORMALIZER"] = "true"
+os.environ["SENTENCE_CACHE"] = "false"
+os.environ["LLM_CACHE_PATH"] = ""
+
+from app.normalizer import dictionary_cache  # noqa: E402
+from app.normalizer.dictionary_cache import DictionaryCache  # noqa: E402
+from app.normalizer.pipeline import NormalizationPipeline  # noqa: E402
+from app.normalizer.sentence_cache import split_sentences  # noqa: E402
+
+DEFAULT_CORPUS = Path(__file__).parent / "data" / "normalization_corpus.txt"
+
+
+def make_docs(path, docs, sentences, seed=0) -> list:
+    with open(path, encoding="utf-8") as f:
+        corpus = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    rng = random.Random(seed)
+    return ["\n".join(rng.choice(corpus) for _ in range(sentences)) for _ in range(docs)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default=str(DEFAULT_CORPUS), help="one input text per line")
+    parser.add_argument("--docs", type=int, default=6, help="documents")
+    parser.add_argument("--sentences", type=int, default=12, help="corpus texts per document")
+    parser.add_argument("--latency", type=float, default=0.15, help="LLM server seconds per response")
+    parser.add_argument("--latency-per-char", type=float, default=0.001, help="LLM server seconds per character")
+    parser.add_argument("--synth-cps", type=float, default=400, help="characters synthesized per second")
+    parser.add_argument("--block-overhead", type=float, default=0.05, help="seconds per synthesis call")
+    parser.add_argument("--workers", type=int, default=4, help="NORMALIZE_WORKERS")
+    args = parser.parse_args()
+
+    logging.getLogger("app.normalizer").setLevel(logging.ERROR)
+    logging.getLogger().setLevel(logging.ERROR)
+    _server.latency, _server.latency_per_char = args.latency, args.latency_per_char
+    docs = make_docs(args.corpus, args.docs, args.sentences)
+    pipeline = NormalizationPipeline()
+    pool = ThreadPoolExecutor(max_workers=args.workers, thread_name_prefix="normalize")
+    failures = 0
+
+    def synthesize(text):
+        time.sleep(args.block_overhead + len(text) / args.synth_cps)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{args.docs} documents x {args.sentences} sentences, LLM latency {args.latency * 1000:.0f} ms "
+              f"+ {args.latency_per_char * 1000:.1f} ms/char, "
+              f"synthesis {args.synth_cps:.0f} chars/s + {args.block_overhead * 1000:.0f} ms per call")
+
+        # Fresh learned dictionary per mode: pairs learned by the first must not spare the second LLM calls
+        dictionary_cache._instance = DictionaryCache(os.path.join(tmp, "sequential.json"))
+        sequential, wait = [], 0.0
+        t0 = time.perf_counter()
+        for doc in docs:
+            start = time.perf_counter()
+            text = pipeline.normalize(doc)
+            wait += time.perf_counter() - start
+            synthesize(text)
+            sequential.append(text)
+        elapsed = time.perf_counter() - t0
+        print(f"sequential  {elapsed / len(docs):6.2f} s/doc  waiting for normalization "
+              f"{wait / len(docs):5.2f} s/doc  1.0 blocks/doc")
+
+        dictionary_cache._instance = DictionaryCache(os.path.join(tmp, "overlapped.json"))
+        overlapped, wait, blocks = [], 0.0, 0
+        t0 = time.perf_counter()
+        for doc in docs:
+            sentences = split_sentences(doc)
+            stream = pipeline.normalize_stream(doc, pool)
+            handed_out = []
+            for block in stream:
+                synthesize(block)
+                handed_out.append(block)
+                blocks += 1
+            wait += stream.wait_seconds
+            overlapped.append(stream.text)
+            if " ".join(handed_out) != stream.text or len(stream.normalized) != len(sentences):
+                print("FAIL  stream handed out blocks that do not add up to the document")
+                failures += 1
+        elapsed = time.perf_counter() - t0
+        differ = sum(a != b for a, b in zip(sequential, overlapped))
+        print(f"overlapped  {elapsed / len(docs):6.2f} s/doc  waiting for normalization "
+              f"{wait / len(docs):5.2f} s/doc  {blocks / len(docs):.1f} blocks/doc  "
+              f"normalized text differs in {differ}/{len(docs)} documents")
+        if differ:
+            print("FAIL  the overlapped path changes the normalized text")
+            failures += 1
+
+        # A job cancelled while its text is being normalized: the queued sentences must not run
+        dictionary_cache._instance = DictionaryCache(os.path.join(tmp, "cancelled.json"))
+        stream = pipeline.normalize_stream("\n".join([docs[0]] * 5), pool)
+        stream.cancel()
+        time.sleep(args.latency * 3)
+        cancelled = sum(f.cancelled() for f in stream._futures)
+        print(f"cancelled while normalizing: {cancelled}/{len(stream)} sentences cancelled")
+        if not cancelled:
+            print("FAIL  stopping the stream did not cancel its queued sentences")
+            failures += 1
+
+    pool.shutdown()
+    _server.shutdown()
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark and check: EspeakTokenizer.g2p flattening and phoneme cache.
+
+  reduce  the previous flattening of phonemize_espeak()'s per-sentence
+          lists, reduce(lambda x, y: x + y, ...): every step copies the
+          tokens so far, quadratic in the sentence count.
+  chain   list(itertools.chain.from_iterable(...)), linear.
+
+Both flatten lists shaped like espeak's output (--tokens per sentence)
+for 1 to --max-sentences sentences and must give the same tokens.
+
+If piper_phonemize (and the rest of zipvoice.tokenizer's dependencies) is
+installed, it then tokenizes a stream like the engine's: the prompt text
+of a voice before every corpus sentence, --repeat passes. It compares
+EspeakTokenizer(cache_size=0) with the default LRU phoneme cache, reports
+the texts per second and the cache stats, and checks that both give the
+same tokens. The script exits with status 1 if a check fails.
+
+Usage (from the repo root):
+    python -m benchmarks.bench_phonemizer
+    python -m benchmarks.bench_phonemizer --lang vi --repeat 5 --max-sentences 2000
+"""
+
+import argparse
+import random
+import sys
+import time
+from functools import reduce
+from itertools import chain
+from pathlib import Path
+
+DEFAULT_CORPUS = Path(__file__).parent / "data" / "normalization_corpus.txt"
+PROMPT_TEXT = "Xin chào, tôi là trợ lý ảo của tổng đài chăm sóc khách hàng."
+
+
+def espeak_like(sentences: int, tokens: int, rng) -> list:
+    phones = list("abdefhijklmnoprstuvwzæðŋɐɑɔəɛɡɪʃʊʌʒˈˌː ")
+    return [[rng.choice(phones) for _ in range(tokens)] for _ in range(sentences)]
+
+
+def bench_flatten(max_sentences: int, tokens: int) -> int:
+    rng, failures = random.Random(0), 0
+    sizes = sorted({1, 10, 100, max_sentences} & set(range(1, max_sentences + 1)))
+    for n in sizes:
+        lists = espeak_like(n, tokens, rng)
+        t0 = time.perf_counter()
+        legacy = reduce(lambda x, y: x + y, lists)
+        legacy_time = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        linear = list(chain.from_iterable(lists))
+        linear_time = time.perf_counter() - t0
+        print(f"flatten {n:6d} sentences: reduce {legacy_time * 1000:9.3f} ms  chain {linear_time * 1000:7.3f} ms  "
+              f"({legacy_time / max(linear_time, 1e-9):6.1f}x)")
+        if legacy != linear:
+            print("FAIL  chain flattening differs from reduce")
+            failures += 1
+    return failures
+
+
+def bench_cache(corpus: list, lang: str, repeat: int) -> int:
+    try:
+        from zipvoice.tokenizer.tokenizer import EspeakTokenizer
+    except Exception as e:
+        print(f"phoneme cache: skipped, zipvoice.tokenizer cannot be imported ({e.__class__.__name__}: {e})")
+        return 0
+    texts = [t for sentence in corpus for t in (PROMPT_TEXT, sentence)] * repeat
+    results, failures = {}, 0
+    for name, cache_size in (("uncached", 0), ("cached", 10000)):
+        tokenizer = EspeakTokenizer(lang=lang, cache_size=cache_size)
+        t0 = time.perf_counter()
+        results[name] = [tokenizer.texts_to_tokens([text])[0] for text in texts]
+        elapsed = time.perf_counter() - t0
+        stats = tokenizer.phoneme_cache.stats() if tokenizer.phoneme_cache else {}
+        print(f"{name:8s} {len(texts) / elapsed:9.1f} texts/s  {stats}")
+    if results["uncached"] != results["cached"]:
+        print("FAIL  cached phonemes differ from espeak's")
+        failures += 1
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default=str(DEFAULT_CORPUS), help="one input text per line")
+    parser.add_argument("--max-sentences", type=int, default=1000, help="largest text to flatten, in sentences")
+    parser.add_argument("--tokens", type=int, default=60, help="phoneme tokens per sentence")
+    parser.add_argument("--lang", default="vi", help="espeak language (LANG_TOKENIZER)")
+    parser.add_argument("--repeat", type=int, default=3, help="passes over the corpus")
+    args = parser.parse_args()
+
+    with open(args.corpus, encoding="utf-8") as f:
+        corpus = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    failures = bench_flatten(args.max_sentences, args.tokens)
+    failures += bench_cache(corpus, args.lang, args.repeat)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
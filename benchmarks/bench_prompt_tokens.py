@@ -0,0 +1,103 @@
+"""
+Benchmark and check: per-voice cached prompt tokens.
+
+  per call  _prepare_chunks() without tokenized_prompt: add_punctuation()
+            and tokenization of the voice's prompt text on every call, so
+            once per bracket segment.
+  cached    _prepare_chunks() with the voice's PromptTokens
+            (Voice.cached_prompt_tokens, from tokenize_prompt()).
+
+Both run over the corpus texts at several speeds and must give the same
+prompt duration, token duration, chunks and prompt token ids; a
+PromptTokens made from another prompt text must be ignored. The script
+reports the time per call of both and exits with status 1 if a check
+fails.
+
+The espeak tokenizer (EspeakTokenizer with the phoneme cache off, as for a
+text it has not seen) is used if zipvoice.tokenizer can be imported;
+otherwise a character tokenizer stands in, which only checks the
+equivalence and understates the saving.
+
+Usage (from the repo root):
+    python -m benchmarks.bench_prompt_tokens
+    python -m benchmarks.bench_prompt_tokens --lang vi --repeat 10
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import torch
+
+from app.cached_inference import _prepare_chunks, tokenize_prompt
+
+DEFAULT_CORPUS = Path(__file__).parent / "data" / "normalization_corpus.txt"
+PROMPT_TEXT = "Xin chào, tôi là trợ lý ảo của tổng đài chăm sóc khách hàng"
+SAMPLING_RATE = 24000
+
+
+class CharTokenizer:
+    """One token per character, ids assigned on first sight."""
+
+    def __init__(self):
+        self.token2id = {}
+
+    def texts_to_tokens(self, texts):
+        return [list(text) for text in texts]
+
+    def tokens_to_token_ids(self, tokens):
+        return [[self.token2id.setdefault(t, len(self.token2id)) for t in seq] for seq in tokens]
+
+
+def make_tokenizer(lang: str):
+    try:
+        from zipvoice.tokenizer.tokenizer import EspeakTokenizer
+        return EspeakTokenizer(lang=lang, cache_size=0), "espeak"
+    except Exception as e:
+        print(f"zipvoice.tokenizer cannot be imported ({e.__class__.__name__}: {e}), using a character tokenizer")
+        return CharTokenizer(), "char"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default=str(DEFAULT_CORPUS), help="one input text per line")
+    parser.add_argument("--lang", default="vi", help="espeak language (LANG_TOKENIZER)")
+    parser.add_argument("--prompt-seconds", type=float, default=4.0, help="length of the prompt wav")
+    parser.add_argument("--repeat", type=int, default=3, help="passes over the corpus")
+    args = parser.parse_args()
+
+    with open(args.corpus, encoding="utf-8") as f:
+        corpus = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    tokenizer, name = make_tokenizer(args.lang)
+    prompt_wav = torch.zeros(1, int(args.prompt_seconds * SAMPLING_RATE))
+    cached = tokenize_prompt(PROMPT_TEXT, prompt_wav, tokenizer, SAMPLING_RATE)
+    other = tokenize_prompt(PROMPT_TEXT + " nhé", prompt_wav, tokenizer, SAMPLING_RATE)
+    print(f"{name} tokenizer, prompt {len(cached.tokens)} tokens, {len(corpus)} texts x {args.repeat} passes")
+
+    failures = 0
+    for speed in (1.0, 0.5, 1.3):
+        for text in corpus:
+            expected = _prepare_chunks(PROMPT_TEXT, prompt_wav, text, tokenizer, speed, SAMPLING_RATE)
+            if _prepare_chunks(PROMPT_TEXT, prompt_wav, text, tokenizer, speed, SAMPLING_RATE, cached) != expected:
+                print(f"FAIL  cached prompt tokens change the chunks at speed {speed}: {text[:60]!r}")
+                failures += 1
+            if _prepare_chunks(PROMPT_TEXT, prompt_wav, text, tokenizer, speed, SAMPLING_RATE, other) != expected:
+                print(f"FAIL  prompt tokens of another prompt text were used at speed {speed}: {text[:60]!r}")
+                failures += 1
+
+    timings = {}
+    for mode, tokenized_prompt in (("per call", None), ("cached", cached)):
+        t0 = time.perf_counter()
+        for _ in range(args.repeat):
+            for text in corpus:
+                _prepare_chunks(PROMPT_TEXT, prompt_wav, text, tokenizer, 1.0, SAMPLING_RATE, tokenized_prompt)
+        timings[mode] = (time.perf_counter() - t0) / (args.repeat * len(corpus))
+        print(f"{mode:8s} {timings[mode] * 1000:8.3f} ms/call")
+    print(f"saved {(timings['per call'] - timings['cached']) * 1000:.3f} ms per call and per bracket segment "
+          f"({timings['per call'] / max(timings['cached'], 1e-9):.1f}x)")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark: normalize_vietnamese_text, whole documents vs the sentence cache.
+
+  document  every document normalized from scratch (SENTENCE_CACHE=false).
+  sentence  documents split into sentences, only sentences missing from a
+            SentenceCache are normalized.
+
+Documents are made of --sentences corpus texts each, drawn with a skewed
+(Zipf-like) popularity so that some sentences repeat across documents as
+they do in production traffic. It reports the time per document, the
+cache hit rate, and how many documents come out different; the script
+exits with status 1 if any does (every sentence must be normalized with
+the document's DocumentContext decisions). The LLM step is disabled
+(USE_LLM_NORMALIZER=false), so the saving shown is the rule-based work
+only; with the LLM enabled every hit also skips its share of the
+extraction round trip.
+
+Usage (from the repo root):
+    python -m benchmarks.bench_sentence_cache
+    python -m benchmarks.bench_sentence_cache --docs 2000 --sentences 8 --skew 1.2
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("USE_LLM_NORMALIZER", "false")
+
+from app.normalizer.pipeline import NormalizationPipeline  # noqa: E402
+from app.normalizer.processing import normalize_vietnamese_text  # noqa: E402
+from app.normalizer.sentence_cache import SentenceCache  # noqa: E402
+
+DEFAULT_CORPUS = Path(__file__).parent / "data" / "normalization_corpus.txt"
+
+
+def load_corpus(path) -> list:
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+
+def make_docs(corpus, n_docs, per_doc, skew, rng) -> list:
+    weights = [1 / (rank + 1) ** skew for rank in range(len(corpus))]
+    return [" ".join(rng.choices(corpus, weights, k=per_doc)) for _ in range(n_docs)]
+
+
+def run(docs, fn) -> tuple:
+    outputs = []
+    t0 = time.perf_counter()
+    for doc in docs:
+        outputs.append(fn(doc))
+    return time.perf_counter() - t0, outputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default=str(DEFAULT_CORPUS), help="one input text per line")
+    parser.add_argument("--docs", type=int, default=500, help="documents to normalize")
+    parser.add_argument("--sentences", type=int, default=5, help="corpus texts per document")
+    parser.add_argument("--skew", type=float, default=1.0, help="Zipf exponent of sentence popularity")
+    parser.add_argument("--cache-size", type=int, default=50000, help="SentenceCache entries")
+    args = parser.parse_args()
+
+    # Per-call INFO logging would dominate the timings
+    logging.getLogger("app.normalizer").setLevel(logging.WARNING)
+    logging.getLogger().setLevel(logging.WARNING)
+
+    corpus = load_corpus(args.corpus)
+    docs = make_docs(corpus, args.docs, args.sentences, args.skew, random.Random(0))
+    pipeline = NormalizationPipeline()
+    cache = SentenceCache(args.cache_size)
+    pipeline.normalize(corpus[0])  # warm up lazily imported modules
+
+    doc_time, doc_out = run(docs, lambda d: normalize_vietnamese_text(d, pipeline))
+    sent_time, sent_out = run(docs, lambda d: normalize_vietnamese_text(d, pipeline, cache))
+    st = cache.stats()
+    differ = sum(a != b for a, b in zip(doc_out, sent_out))
+
+    print(f"{len(docs)} documents x {args.sentences} texts, {len(corpus)} distinct texts, skew {args.skew}")
+    print(f"document  {doc_time / len(docs) * 1000:8.2f} ms/doc")
+    print(f"sentence  {sent_time / len(docs) * 1000:8.2f} ms/doc  ({doc_time / sent_time:.1f}x), "
+          f"hit rate {st['hit_rate']:.1%} ({st['hits']} hits, {st['misses']} misses)")
+    print(f"documents with different output: {differ}/{len(docs)}")
+    if differ:
+        print("FAIL  the sentence cache changes the normalized text")
+    sys.exit(1 if differ else 0)
+
+
+if __name__ == "__main__":
+    main()
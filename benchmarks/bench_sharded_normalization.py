@@ -0,0 +1,112 @@
+"""
+Benchmark and check: sentence-sharded rule-based normalization.
+
+  serial   post_processing(normalize(doc)) over the whole document
+           (steps 1-2 of normalize_vietnamese_text()).
+  sharded  ShardedNormalizer: the document cut at sentence boundaries into
+           --shard-chars shards, normalized on --workers processes.
+
+Documents are built from the corpus lines at several lengths, joined
+with spaces or line breaks (half of them with lines in lowercase and
+without a final dot, whose breaks normalize() reads as ". "). For each
+length the script reports the time per document of both modes; every
+sharded result must be byte-identical to the serial one.
+
+It also counts how many documents would differ if the shards were
+normalized without the document's context (a shard deciding on its own
+sentences whether a-b is a score), and checks that a document whose sport
+words only appear once an abbreviation is expanded ("VĐQG") is
+normalized again with the corrected context. The script exits with
+status 1 if a check fails.
+
+Usage (from the repo root):
+    python -m benchmarks.bench_sharded_normalization
+    python -m benchmarks.bench_sharded_normalization --lengths 100 1000 3000 --workers 8
+"""
+
+import argparse
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+
+from app.metrics import SHARDED_NORMALIZATIONS
+from app.normalizer.normalizer import TextNormalizer
+from app.normalizer.processing import normalize, post_processing
+from app.normalizer.sharding import ShardedNormalizer, make_shards
+
+DEFAULT_CORPUS = Path(__file__).parent / "data" / "normalization_corpus.txt"
+
+RERUN_DOC = ("Giải VĐQG mùa này có 14 câu lạc bộ. Lượt đi bắt đầu lúc 19:00 ngày 5/3. "
+             "Giá vé từ 100-200 nghìn đồng.")
+
+
+def make_docs(path, docs, sentences, seed=0) -> list:
+    with open(path, encoding="utf-8") as f:
+        corpus = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    rng = random.Random(seed)
+    texts = []
+    for i in range(docs):
+        lines = [rng.choice(corpus) for _ in range(sentences)]
+        if i % 2:
+            # Pasted text: lines that start in lowercase and do not end with a dot
+            lines = [line[0].lower() + line[1:].rstrip(".") if rng.random() < 0.5 else line for line in lines]
+        texts.append(rng.choice([" ", "\n", "\n\n"]).join(lines))
+    return texts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default=str(DEFAULT_CORPUS), help="one input text per line")
+    parser.add_argument("--lengths", type=int, nargs="+", default=[30, 300, 1500], help="corpus texts per document")
+    parser.add_argument("--docs", type=int, default=10, help="documents per length")
+    parser.add_argument("--workers", type=int, default=4, help="NORMALIZE_SHARD_WORKERS")
+    parser.add_argument("--shard-chars", type=int, default=2000, help="NORMALIZE_SHARD_CHARS")
+    args = parser.parse_args()
+
+    logging.getLogger("app.normalizer").setLevel(logging.ERROR)
+    logging.getLogger().setLevel(logging.ERROR)
+    normalizer = TextNormalizer()
+    sharded = ShardedNormalizer(args.workers, args.shard_chars, min_chars=0)
+    sharded.normalize(RERUN_DOC * 40, normalizer)  # start the workers
+    failures = 0
+
+    print(f"{args.workers} workers, {args.shard_chars} chars per shard")
+    for length in args.lengths:
+        docs = make_docs(args.corpus, args.docs, length, seed=length)
+        t0 = time.perf_counter()
+        serial = [post_processing(normalize(doc, normalizer)) for doc in docs]
+        serial_time = (time.perf_counter() - t0) / len(docs)
+        t0 = time.perf_counter()
+        results = [sharded.normalize(doc, normalizer) for doc in docs]
+        sharded_time = (time.perf_counter() - t0) / len(docs)
+        mismatches = sum(a != b for a, b in zip(serial, results))
+        no_context = sum(
+            post_processing(" ".join(normalize(s, normalizer) for s in make_shards(doc, args.shard_chars))) != a
+            for doc, a in zip(docs, serial))
+        print(f"{length:5d} sentences ({sum(map(len, docs)) // len(docs):7d} chars): "
+              f"serial {serial_time:7.3f} s/doc  sharded {sharded_time:7.3f} s/doc  "
+              f"({serial_time / sharded_time:4.1f}x)  differ: {mismatches}/{len(docs)}, "
+              f"without document context {no_context}/{len(docs)}")
+        if mismatches:
+            print(f"FAIL  sharded normalization differs from serial in {mismatches} documents")
+            failures += 1
+
+    # Sport words that only exist after norm_abbre: the raw-text guess is wrong
+    doc = RERUN_DOC * 40
+    reruns = SHARDED_NORMALIZATIONS._values.get(("rerun",), 0)
+    result = sharded.normalize(doc, normalizer)
+    reruns = SHARDED_NORMALIZATIONS._values.get(("rerun",), 0) - reruns
+    print(f"context found only after abbreviations: rerun {int(reruns)} time(s), "
+          f"identical to serial: {result == post_processing(normalize(doc, normalizer))}")
+    if not reruns or result != post_processing(normalize(doc, normalizer)):
+        print("FAIL  wrong document context guess not corrected")
+        failures += 1
+
+    sharded.shutdown()
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
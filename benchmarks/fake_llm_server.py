@@ -0,0 +1,143 @@
+"""
+Local stand-in for the LLM chat-completions endpoint.
+
+Answers POST /v1/chat/completions with a deterministic extraction result:
+all-uppercase ASCII words of the user message are returned as acronyms,
+other ASCII-only words as foreign words with a made-up "spelling". A
+batched request ({"items": [{"id", "text"}, ...]} as the user message)
+gets one such result per item. Latency (fixed, plus per character of the
+user message as generation time grows with the answer) and failures can
+be injected (--bad-batch answers batched requests with broken JSON), and the server
+counts requests, batched items and the TCP connections it accepted.
+
+Usage (from the repo root):
+    python -m benchmarks.fake_llm_server --port 8099 --latency 0.05
+    LLM_API_URL=http://127.0.0.1:8099/v1/chat/completions python -m ...
+
+or in-process: server, url = start_server(latency=0.05); ...; server.shutdown()
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_WORD_RE = re.compile(r"[A-Za-z][A-Za-z0-9]*")
+
+
+def extract(text: str) -> dict:
+    acronyms, pairs = [], {}
+    for word in _WORD_RE.findall(text):
+        if word.isupper() and len(word) <= 5:
+            if word not in acronyms:
+                acronyms.append(word)
+        else:
+            pairs.setdefault(word, " ".join(word.lower()[i:i + 2] for i in range(0, len(word), 2)))
+    return {
+        "acronyms": acronyms,
+        "foreign_vietnamese_pairs": [{"foreign_word": k, "vietnamese_spelling": v} for k, v in pairs.items()],
+    }
+
+
+def _batch_items(user: str):
+    """The items of a batched extraction request, None for a plain one."""
+    if not user.startswith('{"items"'):
+        return None
+    try:
+        return json.loads(user)["items"]
+    except (ValueError, KeyError):
+        return None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    wbufsize = 1 << 16  # headers and body in one send; split writes stall on delayed ACKs
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def do_POST(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with server.lock:
+            server.requests += 1
+        payload = json.loads(body)
+        user = next(m["content"] for m in payload["messages"] if m["role"] == "user")
+        if server.latency or server.latency_per_char:
+            time.sleep(server.latency + server.latency_per_char * len(user))
+        if server.rng.random() < server.fail_rate:
+            self._reply(503, {"error": "injected failure"})
+            return
+        items = _batch_items(user)
+        if items is None:
+            content = json.dumps(extract(user), ensure_ascii=False)
+        elif server.bad_batch:
+            content = '{"items": [{"id": "0", "acro'
+        else:
+            with server.lock:
+                server.batched_items += len(items)
+            content = json.dumps({"items": [{"id": item["id"], **extract(item["text"])} for item in items]},
+                                 ensure_ascii=False)
+        self._reply(200, {"choices": [{"message": {"role": "assistant", "content": content}}]})
+
+    def _reply(self, status: int, obj: dict):
+        data = json.dumps(obj, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class FakeLLMServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, latency: float = 0.0, fail_rate: float = 0.0, bad_batch: bool = False,
+                 latency_per_char: float = 0.0, seed: int = 0):
+        super().__init__(address, _Handler)
+        self.latency = latency
+        self.latency_per_char = latency_per_char
+        self.fail_rate = fail_rate
+        self.bad_batch = bad_batch
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.batched_items = 0
+        self.connections = 0
+
+    def process_request(self, request, client_address):
+        with self.lock:
+            self.connections += 1
+        super().process_request(request, client_address)
+
+
+def start_server(port: int = 0, **kwargs):
+    """Serve on 127.0.0.1:port (0: any free port) in a daemon thread; returns (server, url)."""
+    server = FakeLLMServer(("127.0.0.1", port), **kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1/chat/completions"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per response")
+    parser.add_argument("--latency-per-char", type=float, default=0.0, help="extra seconds per character of text")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    parser.add_argument("--bad-batch", action="store_true", help="answer batched requests with broken JSON")
+    args = parser.parse_args()
+    server, url = start_server(args.port, latency=args.latency, fail_rate=args.fail_rate,
+                               bad_batch=args.bad_batch, latency_per_char=args.latency_per_char)
+    print(f"serving {url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+"""
+Settings are read from the environment when app.settings is imported, so
+they are pinned here, before any test imports the app: no LLM, no log
+files, and the learned dictionary and caches kept out of the source tree.
+"""
+
+import os
+import tempfile
+
+_tmp = tempfile.mkdtemp(prefix="zipvoice-tests-")
+
+os.environ.setdefault("USE_LLM_NORMALIZER", "false")
+os.environ.setdefault("NORMALIZE_LOG_DIR", "")
+os.environ.setdefault("LLM_CACHE_PATH", "")
+os.environ.setdefault("LEARNED_DICT_PATH", os.path.join(_tmp, "learned_dict.json"))
@@ -0,0 +1,38 @@
+"""norm_abbre() regressions of the str.replace() implementation it replaced."""
+
+import pytest
+
+from app.normalizer.abbre import ABBRE
+from app.normalizer.abbreviations import AbbreviationMatcher
+from app.normalizer.normalizer import TextNormalizer
+
+
+@pytest.fixture(scope="module")
+def normalizer():
+    return TextNormalizer()
+
+
+@pytest.mark.parametrize("text, expected", [
+    # "GB" inside "128GB" is not a word, wherever "GB" occurs on its own
+    ("Máy có RAM 8 GB và SSD 128GB.", "Máy có RAM 8 ghi ga bai và SSD 128GB."),
+    ("SSD 128GB, RAM 8 GB.", "SSD 128GB, RAM 8 ghi ga bai."),
+    # "NĐT" is a key of its own, not "NĐ" followed by "T"
+    ("Các NĐT đang chờ quyết định của NHNN.", "Các nhà đầu tư đang chờ quyết định của ngân hàng nhà nước."),
+    ("NĐT và NĐ", "nhà đầu tư và nghị định"),
+    # keys containing spaces
+    ("Bộ NN & PTNT họp với các DN.", "Bộ nông nghiệp và phát triển nông thôn họp với các doanh nghiệp."),
+    ("Nhiệt độ ngoài trời là 30 độ C.", "Nhiệt độ ngoài trời là 30 độ xê."),
+    # the longest key wins
+    ("Trận đấu được phát sóng Full HD.", "Trận đấu được phát sóng full hát đê."),
+    # keys glued to other text by '/'
+    ("Nghị định 100/2019/NĐ-CP", "Nghị định 100/2019/nghị định chính phủ"),
+])
+def test_norm_abbre(normalizer, text, expected):
+    assert normalizer.norm_abbre(text, ABBRE) == expected
+
+
+def test_matcher_only_expands_whole_words():
+    matcher = AbbreviationMatcher({"GB": "ghi ga bai", "TP": "thành phố", "TP.HCM": "thành phố hồ chí minh"})
+    assert matcher.expand("128GB GB GBs") == "128GB ghi ga bai GBs"
+    assert matcher.expand("TP.HCM và TP Huế") == "thành phố hồ chí minh và thành phố Huế"
+    assert matcher.expand("không có gì") == "không có gì"
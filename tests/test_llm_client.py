@@ -0,0 +1,201 @@
+"""LLMNormalizer extraction against an in-process fake endpoint (httpx.MockTransport)."""
+
+import asyncio
+import json
+import threading
+
+import httpx
+
+from app.normalizer.extraction_cache import ExtractionCache
+from app.normalizer.llm_client import BATCH_EXTRACTION_SYSTEM_PROMPT, ExtractionCoalescer, LLMNormalizer
+from app.normalizer.llm_transport import AsyncLLMTransport, CircuitBreaker
+
+URL = "http://llm.test/v1/chat/completions"
+
+
+class FakeLLM:
+    """
+    Chat-completions stand-in answering extraction requests: every
+    capitalized word is a foreign word. Batched requests are answered in
+    reverse order, so only the ids tie an entry to its chunk; batch_mode
+    "partial" drops the last item of the request, "garbled" answers with
+    text that is not JSON.
+    """
+
+    def __init__(self, batch_mode: str = "ok"):
+        self.batch_mode = batch_mode
+        self.requests = []
+        self.batches = []
+
+    @staticmethod
+    def extraction(text: str) -> dict:
+        words = [w.strip(".,!?") for w in text.split()]
+        return {
+            "acronyms": [],
+            "foreign_vietnamese_pairs": [
+                {"foreign_word": w, "vietnamese_spelling": w.lower() + " phiên âm"}
+                for w in words if w[:1].isupper() and w.isascii()
+            ],
+        }
+
+    def answer_batch(self, user_prompt: str) -> str:
+        items = json.loads(user_prompt)["items"]
+        self.batches.append(len(items))
+        if self.batch_mode == "garbled":
+            return "Sure! Here are the extractions you asked for:"
+        if self.batch_mode == "partial":
+            items = items[:-1]
+        return json.dumps(
+            {"items": [{"id": item["id"], **self.extraction(item["text"])} for item in reversed(items)]},
+            ensure_ascii=False,
+        )
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        system_prompt, user_prompt = (m["content"] for m in payload["messages"])
+        self.requests.append(user_prompt)
+        if system_prompt == BATCH_EXTRACTION_SYSTEM_PROMPT:
+            content = self.answer_batch(user_prompt)
+        else:
+            content = json.dumps(self.extraction(user_prompt), ensure_ascii=False)
+        return httpx.Response(200, json={"choices": [{"message": {"role": "assistant", "content": content}}]})
+
+
+def make_normalizer(endpoint, **kwargs) -> LLMNormalizer:
+    llm = LLMNormalizer(api_url=URL, model="fake", api_key="key", **kwargs)
+    llm.transport = AsyncLLMTransport(
+        URL, "key", timeout=5.0, deadline=5.0, max_concurrency=4, max_retries=0,
+        breaker=CircuitBreaker(5, 1.0), http_transport=httpx.MockTransport(endpoint),
+    )
+    return llm
+
+
+class RecordingCache(ExtractionCache):
+    """ExtractionCache noting the thread of every get() and put()."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.threads = []
+
+    def get(self, chunk):
+        self.threads.append(threading.get_ident())
+        return super().get(chunk)
+
+    def put(self, chunk, result):
+        self.threads.append(threading.get_ident())
+        super().put(chunk, result)
+
+
+def test_extraction_cache_io_runs_off_the_event_loop(tmp_path):
+    endpoint = FakeLLM()
+    cache = RecordingCache(str(tmp_path / "llm.sqlite"), ttl_seconds=3600, max_entries=100)
+    llm = make_normalizer(endpoint, extraction_cache=cache, batch_wait_ms=0)
+    loop_thread = llm.transport.run(_current_thread())
+
+    text = "Gọi cho tôi ngay, ông Tom."
+    first = llm.extract_acronyms_and_pairs(text)
+    second = llm.extract_acronyms_and_pairs(text)
+
+    assert first["foreign_vietnamese_pairs"] == [{"foreign_word": "Tom", "vietnamese_spelling": "tom phiên âm"}]
+    assert second["foreign_vietnamese_pairs"] == first["foreign_vietnamese_pairs"]
+    assert len(endpoint.requests) == 1
+    assert llm.calls_avoided["cache"] == 1
+    assert len(cache.threads) == 3  # get, put, get
+    assert loop_thread not in cache.threads
+
+
+def test_chunk_without_candidates_is_not_sent():
+    endpoint = FakeLLM()
+    llm = make_normalizer(endpoint, batch_wait_ms=0)
+    result = llm.extract_acronyms_and_pairs("Xin chào, hôm nay trời đẹp quá.")
+    assert result["foreign_vietnamese_pairs"] == []
+    assert endpoint.requests == []
+    assert llm.calls_avoided["no_candidates"] == 1
+
+
+# ── ExtractionCoalescer ──────────────────────────────────────────────
+
+JOBS = [
+    "Gọi cho tôi ngay, ông Tom.",
+    "Chị Anna sẽ đến vào thứ hai.",
+    "Hôm qua anh Peter đi làm muộn.",
+    "Bạn của em là cô Linda.",
+    "Sáng nay bác Henry tập thể dục.",
+]
+
+
+def extract_concurrently(llm, texts):
+    async def jobs():
+        return await asyncio.gather(*(llm.aextract_acronyms_and_pairs(text) for text in texts))
+    return llm.transport.run(jobs())
+
+
+def pairs_of(result):
+    return [(p["foreign_word"], p["vietnamese_spelling"]) for p in result["foreign_vietnamese_pairs"]]
+
+
+def expected_pairs(text):
+    return pairs_of(FakeLLM.extraction(text))
+
+
+def test_concurrent_jobs_get_their_own_results():
+    endpoint = FakeLLM()
+    llm = make_normalizer(endpoint, batch_wait_ms=50, batch_max_items=8)
+    results = extract_concurrently(llm, JOBS)
+
+    assert endpoint.batches == [len(JOBS)]
+    assert len(endpoint.requests) == 1
+    for text, result in zip(JOBS, results):
+        assert pairs_of(result) == expected_pairs(text)
+        assert result["failed_chunks"] == 0
+    assert llm.coalescer.stats()["fallbacks"] == 0
+
+
+def test_batches_are_split_at_max_items():
+    endpoint = FakeLLM()
+    llm = make_normalizer(endpoint, batch_wait_ms=50, batch_max_items=2)
+    results = extract_concurrently(llm, JOBS)
+
+    assert sorted(endpoint.batches) == [2, 2]  # the fifth chunk goes out alone
+    assert len(endpoint.requests) == 3
+    for text, result in zip(JOBS, results):
+        assert pairs_of(result) == expected_pairs(text)
+
+
+def test_items_missing_from_the_batch_are_asked_one_by_one():
+    endpoint = FakeLLM(batch_mode="partial")
+    llm = make_normalizer(endpoint, batch_wait_ms=50, batch_max_items=8)
+    results = extract_concurrently(llm, JOBS)
+
+    assert endpoint.batches == [len(JOBS)]
+    assert endpoint.requests[1:] == [JOBS[-1]]
+    for text, result in zip(JOBS, results):
+        assert pairs_of(result) == expected_pairs(text)
+        assert result["failed_chunks"] == 0
+    assert llm.coalescer.stats()["fallbacks"] == 1
+
+
+def test_unparsable_batch_falls_back_to_single_requests():
+    endpoint = FakeLLM(batch_mode="garbled")
+    llm = make_normalizer(endpoint, batch_wait_ms=50, batch_max_items=8)
+    results = extract_concurrently(llm, JOBS)
+
+    assert endpoint.batches == [len(JOBS)]
+    assert sorted(endpoint.requests[1:]) == sorted(JOBS)
+    for text, result in zip(JOBS, results):
+        assert pairs_of(result) == expected_pairs(text)
+        assert result["failed_chunks"] == 0
+    assert llm.coalescer.stats()["fallbacks"] == len(JOBS)
+
+
+def test_entries_of_other_chunks_are_dropped():
+    item = {"id": "0", "acronyms": ["NASA"], "foreign_vietnamese_pairs": [
+        {"foreign_word": "Tom", "vietnamese_spelling": "tôm"},
+        {"foreign_word": "Anna", "vietnamese_spelling": "an na"},
+    ]}
+    own = ExtractionCoalescer._own_entries("Gọi cho tôi ngay, ông Tom.", item)
+    assert own == {"acronyms": [], "foreign_vietnamese_pairs": [{"foreign_word": "Tom", "vietnamese_spelling": "tôm"}]}
+
+
+async def _current_thread():
+    return threading.get_ident()
@@ -0,0 +1,155 @@
+"""AsyncLLMTransport against an in-process fake endpoint (httpx.MockTransport)."""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.normalizer.llm_transport import AsyncLLMTransport, CircuitBreaker, CircuitOpenError
+
+URL = "http://llm.test/v1/chat/completions"
+PAYLOAD = {"model": "fake", "messages": [{"role": "user", "content": "xin chào"}]}
+
+
+class FakeEndpoint:
+    """Chat-completions stand-in: answers after delay with status, counts requests and concurrency."""
+
+    def __init__(self, status: int = 200, delay: float = 0.0):
+        self.status = status
+        self.delay = delay
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.delay:
+                await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        if self.status != 200:
+            return httpx.Response(self.status, json={"error": "unavailable"})
+        return httpx.Response(200, json={"choices": [{"message": {"role": "assistant", "content": "{}"}}]})
+
+
+@pytest.fixture
+def endpoint():
+    return FakeEndpoint()
+
+
+def make_transport(endpoint, failures=2, reset=0.1, deadline=5.0, max_concurrency=4, max_retries=0):
+    return AsyncLLMTransport(
+        URL, "key", timeout=5.0, deadline=deadline, max_concurrency=max_concurrency,
+        max_retries=max_retries, breaker=CircuitBreaker(failures, reset),
+        http_transport=httpx.MockTransport(endpoint),
+    )
+
+
+def test_post_returns_the_response(endpoint):
+    transport = make_transport(endpoint)
+    data = transport.run(transport.post(PAYLOAD))
+    assert data["choices"][0]["message"]["content"] == "{}"
+    assert transport.breaker.state == "closed"
+
+
+def test_breaker_opens_half_opens_and_closes(endpoint):
+    transport = make_transport(endpoint, failures=2, reset=0.1)
+    breaker = transport.breaker
+
+    endpoint.status = 503
+    for _ in range(2):
+        with pytest.raises(httpx.HTTPStatusError):
+            transport.run(transport.post(PAYLOAD))
+    assert breaker.state == "open"
+
+    # Open: nothing is sent
+    with pytest.raises(CircuitOpenError):
+        transport.run(transport.post(PAYLOAD))
+    assert endpoint.requests == 2
+
+    # After reset_timeout one probe goes out; it fails, so the circuit opens again
+    time.sleep(0.15)
+    with pytest.raises(httpx.HTTPStatusError):
+        transport.run(transport.post(PAYLOAD))
+    assert endpoint.requests == 3
+    assert breaker.state == "open"
+
+    # A successful probe closes it
+    endpoint.status = 200
+    time.sleep(0.15)
+    transport.run(transport.post(PAYLOAD))
+    assert breaker.state == "closed"
+    assert breaker.failures == 0
+    transport.run(transport.post(PAYLOAD))
+    assert endpoint.requests == 5
+
+
+def test_half_open_lets_a_single_probe_through(endpoint):
+    transport = make_transport(endpoint, failures=1, reset=0.1)
+    endpoint.status = 503
+    with pytest.raises(httpx.HTTPStatusError):
+        transport.run(transport.post(PAYLOAD))
+    endpoint.status, endpoint.delay = 200, 0.2
+    time.sleep(0.15)
+
+    async def probe_and_another():
+        probe = asyncio.create_task(transport.post(PAYLOAD))
+        await asyncio.sleep(0.05)
+        with pytest.raises(CircuitOpenError):
+            await transport.post(PAYLOAD)
+        return await probe
+
+    transport.run(probe_and_another())
+    assert endpoint.requests == 2
+    assert transport.breaker.state == "closed"
+
+
+def test_cancelled_probe_releases_the_probe_slot(endpoint):
+    transport = make_transport(endpoint, failures=1, reset=0.1)
+    endpoint.status = 503
+    with pytest.raises(httpx.HTTPStatusError):
+        transport.run(transport.post(PAYLOAD))
+    endpoint.status, endpoint.delay = 200, 10.0
+    time.sleep(0.15)
+
+    async def cancel_probe():
+        probe = asyncio.create_task(transport.post(PAYLOAD))
+        await asyncio.sleep(0.05)
+        assert transport.breaker.state == "half_open"
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+
+    transport.run(cancel_probe())
+    assert transport.breaker.state == "half_open"
+
+    # The next request is the probe; it succeeds and closes the circuit
+    endpoint.delay = 0.0
+    transport.run(transport.post(PAYLOAD))
+    assert transport.breaker.state == "closed"
+
+
+def test_deadline_covers_every_attempt(endpoint):
+    endpoint.delay = 5.0
+    transport = make_transport(endpoint, failures=10, deadline=0.3, max_retries=3)
+    start = time.monotonic()
+    with pytest.raises(TimeoutError):
+        transport.run(transport.post(PAYLOAD))
+    assert time.monotonic() - start < 1.0
+    assert endpoint.requests == 1
+
+
+def test_semaphore_bounds_requests_in_flight(endpoint):
+    endpoint.delay = 0.05
+    transport = make_transport(endpoint, max_concurrency=2)
+
+    async def many():
+        return await asyncio.gather(*(transport.post(PAYLOAD) for _ in range(8)))
+
+    assert len(transport.run(many())) == 8
+    assert endpoint.requests == 8
+    assert endpoint.max_in_flight == 2
@@ -0,0 +1,117 @@
+"""NormalizedStream against NormalizationPipeline.normalize() on the same document."""
+
+import random
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from app.normalizer import pipeline as pipeline_module
+from app.normalizer import processing
+from app.normalizer.pipeline import NormalizationPipeline
+from app.normalizer.sentence_cache import SentenceCache
+
+CORPUS = Path(__file__).parent.parent / "benchmarks" / "data" / "normalization_corpus.txt"
+
+
+@pytest.fixture(scope="module")
+def pipeline():
+    return NormalizationPipeline()
+
+
+@pytest.fixture(scope="module")
+def pool():
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        yield executor
+
+
+@pytest.fixture(autouse=True)
+def sentence_cache(monkeypatch):
+    cache = SentenceCache(1000)
+    monkeypatch.setattr(pipeline_module, "get_sentence_cache", lambda: cache)
+    return cache
+
+
+def streamed(pipeline, pool, doc):
+    stream = pipeline.normalize_stream(doc, pool)
+    blocks = list(stream)
+    assert " ".join(blocks) == stream.text
+    assert len(stream.normalized) == len(stream)
+    return stream.text
+
+
+@pytest.mark.parametrize("doc", [
+    "Tỉ lệ ủng hộ là 3:1. Cuộc họp bắt đầu lúc 9:15.",
+    "Trận bóng đá hôm qua rất hay. Kết quả 3-1 cho đội khách.",
+    "Giải VĐQG mùa này có 14 câu lạc bộ. Lượt về kết thúc 2-1.",
+])
+def test_sentences_take_the_document_decisions(pipeline, pool, doc):
+    assert streamed(pipeline, pool, doc) == pipeline.normalize(doc)
+
+
+def test_cached_sentences_give_the_same_text(pipeline, pool):
+    doc = "Trận bóng đá hôm qua rất hay. Kết quả 3-1 cho đội khách."
+    first = streamed(pipeline, pool, doc)
+    assert streamed(pipeline, pool, doc) == first
+    assert streamed(pipeline, pool, "Giá vé tăng mạnh. Kết quả 3-1 cho đội khách.") == \
+        pipeline.normalize("Giá vé tăng mạnh. Kết quả 3-1 cho đội khách.")
+
+
+def test_corpus_documents_match_normalize(pipeline, pool):
+    with open(CORPUS, encoding="utf-8") as f:
+        corpus = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    rng = random.Random(0)
+    for _ in range(50):
+        doc = rng.choice([" ", "\n"]).join(rng.choice(corpus) for _ in range(rng.randint(2, 8)))
+        assert streamed(pipeline, pool, doc) == pipeline.normalize(doc)
+
+
+@pytest.mark.parametrize("doc", [
+    "Hà nội có 3 người\ntừ hôm nay trời mưa\nGiá 5 triệu",
+    "Hà nội có 3 người.\n\ntừ hôm nay trời mưa\n  Giá 5 triệu\n",
+])
+def test_line_breaks_end_sentences(pipeline, pool, doc):
+    text = streamed(pipeline, pool, doc)
+    assert text == pipeline.normalize(doc) == processing.normalize_vietnamese_text(doc, pipeline)
+    assert "người. Từ" in text and "mưa. Giá" in text
+
+
+def test_multi_line_corpus_documents_match_normalize(pipeline, pool):
+    with open(CORPUS, encoding="utf-8") as f:
+        corpus = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    rng = random.Random(1)
+    for _ in range(50):
+        lines = [rng.choice(corpus) for _ in range(rng.randint(2, 8))]
+        lines = [line[0].lower() + line[1:].rstrip(".") if rng.random() < 0.5 else line for line in lines]
+        doc = "".join(line + rng.choice([" ", "\n", "\n\n"]) for line in lines)
+        assert streamed(pipeline, pool, doc) == processing.normalize_vietnamese_text(doc, pipeline)
+
+
+def test_later_blocks_take_the_sentence_case_of_the_whole_text():
+    # As normalize_sentence_case() reads the joined text: only [a-z] after . ! ? is capitalized
+    assert processing._final_stages("xin chào", "App Store.") == "Xin chào"
+    assert processing._final_stages("xin chào", "App Store,") == "xin chào"
+    assert processing._final_stages("ứng dụng", "App Store.") == "ứng dụng"
+    assert processing._final_stages("ứng dụng") == "Ứng dụng"
+
+
+def test_one_llm_extraction_per_document(pipeline, pool, monkeypatch):
+    extracted = []
+
+    def fake_extract(text, dict_cache):
+        extracted.append(text)
+        return [], [{"foreign_word": "Tom", "vietnamese_spelling": "tôm"}], True
+
+    monkeypatch.setattr(processing, "USE_LLM_NORMALIZER", True)
+    monkeypatch.setattr(processing, "_llm_extract", fake_extract)
+    doc = "Gọi cho tôi ngay, ông Tom. Tỉ lệ ủng hộ là 3:1. Cuộc họp bắt đầu lúc 9:15."
+
+    text = streamed(pipeline, pool, doc)
+    assert len(extracted) == 1
+    assert "Tom" in extracted[0] and "chín" in extracted[0]
+    assert "tôm" in text
+    # Served from the sentence cache this time: no extraction at all
+    assert pipeline.normalize(doc) == text
+    assert len(extracted) == 1
+    assert processing.normalize_vietnamese_text(doc, pipeline, SentenceCache(100)) == text
+    assert extracted[1] == extracted[0]
@@ -0,0 +1,69 @@
+"""The sentence cache path of normalize_vietnamese_text() against the whole-document path."""
+
+import random
+from pathlib import Path
+
+import pytest
+
+from app.normalizer.pipeline import NormalizationPipeline
+from app.normalizer.processing import normalize_vietnamese_text
+from app.normalizer.sentence_cache import SentenceCache
+
+CORPUS = Path(__file__).parent.parent / "benchmarks" / "data" / "normalization_corpus.txt"
+
+
+@pytest.fixture(scope="module")
+def pipeline():
+    return NormalizationPipeline()
+
+
+def test_document_context_reaches_every_sentence(pipeline):
+    cache = SentenceCache(100)
+    sport = "Trận bóng đá hôm qua rất hay. Kết quả 3-1 cho đội khách."
+    assert "ba một" in normalize_vietnamese_text(sport, pipeline, cache)
+    assert normalize_vietnamese_text(sport, pipeline, cache) == normalize_vietnamese_text(sport, pipeline)
+
+
+def test_cached_reading_is_not_served_to_other_documents(pipeline):
+    cache = SentenceCache(100)
+    sport = "Trận bóng đá hôm qua rất hay. Kết quả 3-1 cho đội khách."
+    other = "Giá vé tăng mạnh. Kết quả 3-1 cho đội khách."
+    for doc in (sport, other, sport):
+        assert normalize_vietnamese_text(doc, pipeline, cache) == normalize_vietnamese_text(doc, pipeline)
+
+
+def test_decision_found_after_abbreviation_expansion(pipeline):
+    # "VĐQG" only becomes "vô địch quốc gia" (a sport word) in norm_abbre
+    doc = "Giải VĐQG mùa này có 14 câu lạc bộ. Lượt về kết thúc 2-1."
+    assert normalize_vietnamese_text(doc, pipeline, SentenceCache(100)) == normalize_vietnamese_text(doc, pipeline)
+
+
+def test_corpus_documents_match_whole_document_path(pipeline):
+    with open(CORPUS, encoding="utf-8") as f:
+        corpus = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    rng, cache = random.Random(0), SentenceCache(10000)
+    for _ in range(100):
+        doc = rng.choice([" ", "\n"]).join(rng.choice(corpus) for _ in range(rng.randint(2, 8)))
+        assert normalize_vietnamese_text(doc, pipeline, cache) == normalize_vietnamese_text(doc, pipeline)
+
+
+@pytest.mark.parametrize("doc", [
+    "Hà nội có 3 người\ntừ hôm nay trời mưa",
+    "Hà nội có 3 người.\n\ntừ hôm nay trời mưa\n  Giá 5 triệu\n",
+    "Xin chào quý khách,\ncảm ơn quý khách đã gọi đến tổng đài",
+])
+def test_line_breaks_end_sentences(pipeline, doc):
+    expected = normalize_vietnamese_text(doc, pipeline)
+    assert normalize_vietnamese_text(doc, pipeline, SentenceCache(100)) == expected
+
+
+def test_multi_line_corpus_documents_match_whole_document_path(pipeline):
+    with open(CORPUS, encoding="utf-8") as f:
+        corpus = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    rng, cache = random.Random(1), SentenceCache(10000)
+    for _ in range(100):
+        # Lines that do not end with a dot and start in lowercase, as in pasted text
+        lines = [rng.choice(corpus) for _ in range(rng.randint(2, 8))]
+        lines = [line[0].lower() + line[1:].rstrip(".") if rng.random() < 0.5 else line for line in lines]
+        doc = "".join(line + rng.choice([" ", "\n", "\n\n", " \n  "]) for line in lines)
+        assert normalize_vietnamese_text(doc, pipeline, cache) == normalize_vietnamese_text(doc, pipeline)
@@ -0,0 +1,34 @@
+"""make_shards(): shards normalized with the document's context add up to the whole document."""
+
+import pytest
+
+from app.normalizer.normalizer import TextNormalizer
+from app.normalizer.processing import DocumentContext, normalize, post_processing
+from app.normalizer.sharding import make_shards
+
+
+@pytest.fixture(scope="module")
+def normalizer():
+    return TextNormalizer()
+
+
+def sharded(text, normalizer, shard_chars):
+    forced = DocumentContext.detect(normalizer, text)
+    shards = make_shards(text, shard_chars)
+    return post_processing(" ".join(normalize(s, normalizer, DocumentContext(forced)) for s in shards))
+
+
+@pytest.mark.parametrize("doc", [
+    "Hà nội có 3 người\nTừ hôm nay trời mưa\n\nGiá 5 triệu đồng một mét vuông đất.\nXin chào.",
+    "Gửi email tới hotro@example.com.\n\nlượng mưa trung bình 200-300mm\nDung lượng pin 5000mAh.",
+    "Trận bóng đá hôm qua rất hay.\nKết quả 3-1 cho đội khách.\n\nGiá vé 100-200 nghìn đồng.",
+])
+def test_shards_keep_line_breaks(normalizer, doc):
+    assert len(make_shards(doc, 20)) > 1
+    assert sharded(doc, normalizer, 20) == post_processing(normalize(doc, normalizer))
+
+
+def test_shards_are_slices_of_the_text():
+    doc = "Câu một.\nCâu hai.  Câu ba.\n\nCâu bốn."
+    assert make_shards(doc, 10) == ["Câu một.\nCâu hai.", "Câu ba.\n\nCâu bốn."]
+    assert make_shards(doc, 1000) == [doc]
@@ -0,0 +1,30 @@
+"""has_llm_candidates(): the pre-check that lets the extraction stage skip a chunk."""
+
+import pytest
+
+from app.normalizer.special_token_detector import has_llm_candidates, undiacritized_words
+
+
+@pytest.mark.parametrize("text", [
+    "Gọi cho tôi ngay, ông Tom",
+    "Chị Anna sẽ đến vào thứ hai.",
+    "Anh ấy dùng Docker trên server.",
+    "Giá mỗi m² là 50 triệu.",
+    "Công ty vừa tuyển CEO mới.",
+])
+def test_texts_with_candidates(text):
+    assert has_llm_candidates(text)
+
+
+@pytest.mark.parametrize("text", [
+    "Xin chào, hôm nay trời đẹp quá.",
+    "Anh đi đâu. Con ở nhà.",
+    "Đội tuyển Việt Nam thắng Thái Lan.",
+    "“Cho em hỏi” chị nói.",
+])
+def test_vietnamese_texts_have_none(text):
+    assert not has_llm_candidates(text)
+
+
+def test_undiacritized_words():
+    assert undiacritized_words("Gọi cho tôi ngay, ông Tom") == ["cho", "ngay", "Tom"]
@@ -0,0 +1,26 @@
+"""norm_unit() readings of units, rates and numbers glued to them."""
+
+import pytest
+
+from app.normalizer.normalizer import TextNormalizer
+from app.normalizer.processing import normalize
+
+
+@pytest.fixture(scope="module")
+def normalizer():
+    return TextNormalizer()
+
+
+@pytest.mark.parametrize("text, expected", [
+    # rate units glued to a number are read with it, not as "Mb" + "/s"
+    ("tốc độ 100Mb/s", "tốc độ một trăm mê ga bít trên giây"),
+    ("Khoảng 12,5Mb/s.", "Khoảng mười hai phảy năm mê ga bít trên giây."),
+    ("tốc độ 3.000 Mb/s mỗi ngày", "tốc độ ba nghìn mê ga bít trên giây mỗi ngày"),
+    ("tối đa 50km/h trong khu dân cư", "tối đa năm mươi ki lô mét trên giờ trong khu dân cư"),
+    # rates that start with '/' do not take the number
+    ("giá 100/kg, còn lại", "giá một trăm trên một ki lô gam, còn lại"),
+    # plain units
+    ("Mỗi viên chứa 500mg", "Mỗi viên chứa năm trăm mi li gam"),
+])
+def test_units_after_numbers(normalizer, text, expected):
+    assert normalize(text, normalizer) == expected
@@ -15,7 +15,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Optional, Union
+from typing import Callable, Optional, Union
 
 import torch
 
@@ -190,6 +190,7 @@ class EulerSolver:
         t_start: float = 0.0,
         t_end: float = 1.0,
         t_shift: float = 1.0,
+        step_callback: Optional[Callable[[int, int], None]] = None,
         **kwargs
     ) -> torch.Tensor:
         """
@@ -211,6 +212,9 @@ class EulerSolver:
             t_shift: shift the t toward smaller numbers so that the sampling
                 will emphasize low SNR region. Should be in the range of (0, 1].
                 The shifting will be more significant when the number is smaller.
+            step_callback: called after each step with (steps_done, num_step).
+                It may raise to abort sampling, or block to let other work use
+                the device before the next step.
 
         Returns:
             The approximated solution at time `t_end`.
@@ -237,6 +241,8 @@ class EulerSolver:
                 **kwargs
             )
             x = x + v * (timesteps[step + 1] - timesteps[step])
+            if step_callback is not None:
+                step_callback(step + 1, num_step)
         return x
 
 
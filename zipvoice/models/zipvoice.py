@@ -15,7 +15,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import List, Optional
+from typing import Callable, List, Optional
 
 import torch
 import torch.nn as nn
@@ -397,6 +397,7 @@ class ZipVoice(nn.Module):
         duration: str = "predict",
         num_step: int = 5,
         guidance_scale: float = 0.5,
+        step_callback: Optional[Callable[[int, int], None]] = None,
     ) -> torch.Tensor:
         """
         Generate acoustic features, given text tokens, prompts feature
@@ -414,6 +415,8 @@ class ZipVoice(nn.Module):
                 feature length is given by features_lens.
             num_step: the number of steps to use in the ODE solver.
             guidance_scale: the guidance scale for classifier-free guidance.
+            step_callback: called after each ODE step with (steps_done, num_step);
+                see EulerSolver.sample().
         """
 
         assert duration in ["real", "predict"]
@@ -465,6 +468,7 @@ class ZipVoice(nn.Module):
             num_step=num_step,
             guidance_scale=guidance_scale,
             t_shift=t_shift,
+            step_callback=step_callback,
         )
         x1_wo_prompt_lens = (~padding_mask).sum(-1) - prompt_features_lens
         x1_prompt = torch.zeros(
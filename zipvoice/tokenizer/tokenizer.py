@@ -18,9 +18,11 @@
 
 import logging
 import re
+import threading
 from abc import ABC, abstractmethod
-from functools import reduce
-from typing import Dict, List, Optional
+from collections import OrderedDict
+from itertools import chain
+from typing import Dict, List, Optional, Tuple
 
 import jieba
 from lhotse import CutSet
@@ -124,20 +126,77 @@ class SimpleTokenizer(Tokenizer):
         return token_ids_list
 
 
+class PhonemeCache:
+    """Bounded LRU of g2p results (text -> phoneme tokens) with hit counters.
+
+    Prompt texts and common phrases are phonemized again and again; espeak
+    is deterministic for a given text and language, so its output can be
+    reused. Only the size survives pickling, a copy starts empty.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[str, ...]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, text: str) -> Optional[Tuple[str, ...]]:
+        with self._lock:
+            tokens = self._entries.get(text)
+            if tokens is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(text)
+            self.hits += 1
+            return tokens
+
+    def put(self, text: str, tokens: Tuple[str, ...]):
+        with self._lock:
+            self._entries[text] = tokens
+            self._entries.move_to_end(text)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / max(self.hits + self.misses, 1),
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+            }
+
+    def __getstate__(self):
+        return {"max_entries": self.max_entries}
+
+    def __setstate__(self, state):
+        self.__init__(state["max_entries"])
+
+
 class EspeakTokenizer(Tokenizer):
     """A simple tokenizer with Espeak g2p function."""
 
-    def __init__(self, token_file: Optional[str] = None, lang: str = "en-us"):
+    def __init__(
+        self,
+        token_file: Optional[str] = None,
+        lang: str = "en-us",
+        cache_size: int = 10000,
+    ):
         """
         Args:
           tokens: the file that contains information that maps tokens to ids,
             which is a text file with '{token}\t{token_id}' per line.
           lang: the language identifier, see
             https://github.com/rhasspy/espeak-ng/blob/master/docs/languages.md
+          cache_size: texts whose phonemes are kept in an LRU cache,
+            0 to phonemize every text.
         """
         # Parse token file
         self.has_tokens = False
         self.lang = lang
+        self.phoneme_cache = PhonemeCache(cache_size) if cache_size > 0 else None
         if token_file is None:
             logging.debug(
                 "Initialize Tokenizer without tokens file, \
@@ -156,13 +215,19 @@ class EspeakTokenizer(Tokenizer):
         self.has_tokens = True
 
     def g2p(self, text: str) -> List[str]:
+        if self.phoneme_cache is not None:
+            cached = self.phoneme_cache.get(text)
+            if cached is not None:
+                return list(cached)
         try:
             tokens = phonemize_espeak(text, self.lang)
-            tokens = reduce(lambda x, y: x + y, tokens)
-            return tokens
+            tokens = list(chain.from_iterable(tokens))
         except Exception as ex:
             logging.warning(f"Tokenization of {self.lang} texts failed: {ex}")
             return []
+        if self.phoneme_cache is not None:
+            self.phoneme_cache.put(text, tuple(tokens))
+        return tokens
 
     def texts_to_token_ids(
         self,
@@ -322,7 +387,7 @@ class EmiliaTokenizer(Tokenizer):
         try:
             text = self.english_normalizer.normalize(text)
             tokens = phonemize_espeak(text, "en-us")
-            tokens = reduce(lambda x, y: x + y, tokens)
+            tokens = list(chain.from_iterable(tokens))
             return tokens
         except Exception as ex:
             logging.warning(f"Tokenization of English texts failed: {ex}")